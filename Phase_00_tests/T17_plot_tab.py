@@ -44,6 +44,7 @@ if not yoda_files:
 test_file = yoda_files[0]
 print(f"Loading: {test_file.name}")
 tab.load_yoda_path(str(test_file))
+assert tab.wait_for_loads(), "load did not finish"
 
 # 3. combo should have items
 count = tab.combo_obs.count()
@@ -58,6 +58,7 @@ def test_workflow_analysis_to_plots():
     if yoda_files:
         yoda_path = str(yoda_files[0])
         analysis_tab.run_succeeded.emit(yoda_path)
+        assert plot_tab.wait_for_loads(), "load did not finish"
         assert tabs.currentWidget() is plot_tab, "should switch to Plots tab"
         assert plot_tab.combo_obs.count() > 0, "combo should have items after loading .yoda"
         print(f"OK  workflow: Analysis -> Plots (loaded {yoda_files[0].name}, {plot_tab.combo_obs.count()} observables)")
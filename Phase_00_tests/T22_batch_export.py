@@ -0,0 +1,144 @@
+"""T22 -- plot pipeline + background batch export (PNG / SVG / multi-page PDF)."""
+
+import copy
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from PySide6.QtWidgets import QApplication
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+from hep_gui.core.batch_export import BatchExportWorker, export_filename
+from hep_gui.core.plot_pipeline import build_figure
+from hep_gui.core.yoda_parser import parse_yoda, filter_plottable
+from hep_gui.gui.plot_tab import PlotTab
+from yoda_fixtures import write_yoda
+
+tmp = Path(tempfile.mkdtemp())
+yoda_a = write_yoda(tmp / "a.yoda", n_obs=40, seed=1)
+yoda_b = write_yoda(tmp / "b.yoda", n_obs=40, seed=2)
+datasets = {
+    "a": {"path": yoda_a, "histos": filter_plottable(parse_yoda(yoda_a))},
+    "b": {"path": yoda_b, "histos": filter_plottable(parse_yoda(yoda_b))},
+}
+paths = sorted(datasets["a"]["histos"])
+
+
+def run_worker(fmt, out):
+    worker = BatchExportWorker(datasets, paths, fmt, out)
+    result = {}
+    worker.finished.connect(lambda n: result.setdefault("n", n))
+    worker.error.connect(lambda msg: result.setdefault("err", msg))
+    t0 = time.perf_counter()
+    worker.start()
+    while "n" not in result and "err" not in result:
+        app.processEvents()
+        time.sleep(0.01)
+    worker.wait()
+    assert "err" not in result, result.get("err")
+    return result["n"], time.perf_counter() - t0
+
+
+# -- test 1: build_figure --
+fig = build_figure(datasets, "/MC_TEST/obs_0")
+assert fig is not None
+assert [s.label for s in fig.series] == ["a", "b"]
+assert fig.ylabel == "normalized"
+assert fig.series[0].color != fig.series[1].color
+assert build_figure(datasets, "/MC_TEST/missing") is None
+fig_log = build_figure(datasets, "/MC_TEST/obs_0", logy=True)
+assert fig_log.ylog and (fig_log.series[0].plot_vals > 0).all()
+print("[OK] test 1: build_figure")
+
+# -- test 2: export_filename --
+assert export_filename("/MC_JETS/jet_pT_1", "png") == "MC_JETS_jet_pT_1.png"
+print("[OK] test 2: export_filename")
+
+# -- test 3: png / svg batches --
+for fmt in ("png", "svg"):
+    out = tmp / fmt
+    n, dt = run_worker(fmt, out)
+    files = list(out.glob(f"*.{fmt}"))
+    assert n == len(paths) == len(files), f"{fmt}: {n} written, {len(files)} files"
+    assert all(f.stat().st_size > 0 for f in files)
+    print(f"[OK] test 3: {fmt} batch ({n} plots, {n / dt * 60:.0f} plots/min)")
+
+# -- test 4: multi-page pdf --
+pdf = tmp / "all.pdf"
+n, dt = run_worker("pdf", pdf)
+assert n == len(paths)
+assert pdf.read_bytes().count(b"/Type /Page\n") + pdf.read_bytes().count(b"/Type /Page ") >= 1
+print(f"[OK] test 4: pdf ({n} pages, {dt:.2f}s)")
+
+# -- test 5: cancel --
+worker = BatchExportWorker(datasets, paths * 20, "png", tmp / "cancel")
+worker.cancel()
+worker.start()
+worker.wait()
+assert len(list((tmp / "cancel").glob("*.png"))) == 0
+print("[OK] test 5: cancel before start writes nothing")
+
+# -- test 6: a malformed histogram fails alone, the batch still finishes --
+broken = {label: {**ds, "histos": dict(ds["histos"])} for label, ds in datasets.items()}
+bad = broken["b"]["histos"]["/MC_TEST/obs_1"] = copy.copy(datasets["b"]["histos"]["/MC_TEST/obs_1"])
+bad.values = bad.values[:-3]
+for fmt, out in (("svg", tmp / "broken"), ("pdf", tmp / "broken.pdf")):
+    worker = BatchExportWorker(broken, paths, fmt, out)
+    result, failed = {}, []
+    worker.failed.connect(lambda path, msg: failed.append(path))
+    worker.finished.connect(lambda n: result.setdefault("n", n))
+    worker.error.connect(lambda msg: result.setdefault("err", msg))
+    worker.start()
+    while not result:
+        app.processEvents()
+        time.sleep(0.01)
+    worker.wait()
+    app.processEvents()
+    assert result == {"n": len(paths) - 1} and failed == ["/MC_TEST/obs_1"], (fmt, result, failed)
+print("[OK] test 6: malformed histogram reported, batch finished")
+
+# -- test 7: svg / pdf across worker processes, same files --
+code = """
+import pickle, sys
+import hep_gui.core.batch_export as be
+be.MIN_PER_JOB = 1
+datasets, paths = pickle.load(open(sys.argv[1], "rb"))
+for fmt, out in (("svg", sys.argv[2]), ("pdf", sys.argv[2] + ".pdf")):
+    worker = be.BatchExportWorker(datasets, paths, fmt, out, max_workers=2)
+    failed = []
+    worker.failed.connect(lambda path, msg: failed.append(path))
+    worker.finished.connect(lambda n: print(fmt, n, failed))
+    worker.error.connect(lambda msg: print(fmt, msg))
+    worker.run()
+"""
+with open(tmp / "broken.pkl", "wb") as f:
+    pickle.dump((broken, paths), f)
+env = dict(os.environ, PYTHONPATH=str(ROOT / "src"), QT_QPA_PLATFORM="offscreen")
+r = subprocess.run([sys.executable, "-c", code, str(tmp / "broken.pkl"), str(tmp / "procs")],
+                   env=env, capture_output=True, text=True, timeout=120)
+assert r.returncode == 0, r.stderr
+assert r.stdout.splitlines() == [f"{fmt} {len(paths) - 1} ['/MC_TEST/obs_1']" for fmt in ("svg", "pdf")], r.stdout
+for svg in (tmp / "broken").glob("*.svg"):
+    assert (tmp / "procs" / svg.name).read_bytes() == svg.read_bytes(), svg.name
+assert (tmp / "procs.pdf").read_bytes() == (tmp / "broken.pdf").read_bytes()
+print("[OK] test 7: svg / pdf across worker processes")
+
+# -- test 8: PlotTab still plots through the pipeline --
+tab = PlotTab()
+tab.load_yoda_path(str(yoda_a))
+tab.load_yoda_path(str(yoda_b))
+assert tab.wait_for_loads()
+assert tab.combo_obs.count() == len(paths)
+assert tab.edit_ylabel.text() == "normalized"
+assert tab.btn_export_all is not None
+print("[OK] test 8: PlotTab plot + Export all button")
+
+print("\n=== ALL T22 TESTS PASSED ===")
@@ -0,0 +1,112 @@
+"""T23 -- native HTML report (index + SVGs, incremental by content hash)."""
+
+import copy
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from PySide6.QtWidgets import QApplication
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+from hep_gui.core.html_report import write_html_report, report_relpath, MANIFEST_NAME
+from hep_gui.core.plot_pipeline import histo_digest
+from hep_gui.core.yoda_parser import parse_yoda, filter_plottable
+from hep_gui.gui.plot_tab import PlotTab
+from yoda_fixtures import write_yoda
+
+tmp = Path(tempfile.mkdtemp())
+datasets = {}
+for label, seed in (("a", 1), ("b", 2)):
+    path = write_yoda(tmp / f"{label}.yoda", n_obs=60, seed=seed)
+    datasets[label] = {"path": path, "histos": filter_plottable(parse_yoda(path))}
+n_paths = len(datasets["a"]["histos"])
+out = tmp / "report"
+
+# -- test 1: report_relpath --
+assert report_relpath("/MC_JETS/jet_pT_1") == "MC_JETS/jet_pT_1.svg"
+assert report_relpath("/lonely") == "misc/lonely.svg"
+print("[OK] test 1: report_relpath")
+
+# -- test 2: full render --
+t0 = time.perf_counter()
+rendered, skipped = write_html_report(datasets, out)
+dt = time.perf_counter() - t0
+assert (rendered, skipped) == (n_paths, 0), (rendered, skipped)
+assert (out / "index.html").exists() and (out / MANIFEST_NAME).exists()
+svgs = list(out.rglob("*.svg"))
+assert len(svgs) == n_paths
+index = (out / "index.html").read_text()
+assert "MC_TEST/obs_0.svg" in index
+print(f"[OK] test 2: full render ({rendered} SVGs in {dt:.2f}s)")
+
+# -- test 3: rerun with nothing changed --
+t0 = time.perf_counter()
+rendered, skipped = write_html_report(datasets, out)
+assert (rendered, skipped) == (0, n_paths), (rendered, skipped)
+print(f"[OK] test 3: unchanged rerun skips all ({time.perf_counter() - t0:.3f}s)")
+
+# -- test 4: one changed histogram -> one re-render --
+h = datasets["b"]["histos"]["/MC_TEST/obs_3"]
+before = histo_digest(h)
+h.values = h.values * 2.0
+assert histo_digest(h) != before
+rendered, skipped = write_html_report(datasets, out)
+assert (rendered, skipped) == (1, n_paths - 1), (rendered, skipped)
+print("[OK] test 4: only the changed observable is re-rendered")
+
+# -- test 5: option change invalidates everything --
+rendered, _ = write_html_report(datasets, out, normalize=False)
+assert rendered == n_paths
+print("[OK] test 5: normalize toggle re-renders all")
+
+# -- test 6: deleted SVG is regenerated --
+(out / "MC_TEST" / "obs_0.svg").unlink()
+rendered, _ = write_html_report(datasets, out, normalize=False)
+assert rendered == 1
+print("[OK] test 6: missing SVG regenerated")
+
+# -- test 7: a malformed histogram is reported, the rest rendered, retried next time --
+broken = {label: {**ds, "histos": dict(ds["histos"])} for label, ds in datasets.items()}
+bad = broken["a"]["histos"]["/MC_TEST/obs_5"] = copy.copy(datasets["a"]["histos"]["/MC_TEST/obs_5"])
+bad.values = bad.values[:-2]
+errors = []
+rendered, _ = write_html_report(broken, tmp / "broken", on_error=lambda p, msg: errors.append(p))
+assert rendered == n_paths - 1 and errors == ["/MC_TEST/obs_5"], (rendered, errors)
+assert "MC_TEST/obs_5.svg" not in (tmp / "broken" / MANIFEST_NAME).read_text()
+print("[OK] test 7: failing figure reported")
+
+# -- test 8: worker processes write the same report --
+code = f"""
+import pickle, sys
+import hep_gui.core.html_report as hr
+hr.MIN_PER_JOB = 1
+datasets = pickle.load(open(sys.argv[1], "rb"))
+errors = []
+print(hr.write_html_report(datasets, sys.argv[2], max_workers=2, on_error=lambda p, m: errors.append(p)), errors)
+"""
+with open(tmp / "broken.pkl", "wb") as f:
+    pickle.dump(broken, f)
+env = dict(os.environ, PYTHONPATH=str(ROOT / "src"), QT_QPA_PLATFORM="offscreen")
+r = subprocess.run([sys.executable, "-c", code, str(tmp / "broken.pkl"), str(tmp / "procs")],
+                   env=env, capture_output=True, text=True, timeout=120)
+assert r.returncode == 0, r.stderr
+assert r.stdout.strip() == f"({n_paths - 1}, 0) ['/MC_TEST/obs_5']", r.stdout
+for svg in (tmp / "broken").rglob("*.svg"):
+    assert (tmp / "procs" / svg.relative_to(tmp / "broken")).read_bytes() == svg.read_bytes()
+print("[OK] test 8: rendered across worker processes")
+
+# -- test 9: PlotTab menu --
+tab = PlotTab()
+assert tab.btn_html.text() == "Export HTML"
+assert tab.action_html_native is not None and tab.action_html_docker is not None
+print("[OK] test 9: PlotTab Export HTML menu")
+
+print("\n=== ALL T23 TESTS PASSED ===")
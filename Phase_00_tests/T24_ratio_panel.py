@@ -0,0 +1,82 @@
+"""T24 -- vectorized ratios + ratio panel in PlotTab."""
+
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from PySide6.QtWidgets import QApplication
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+from hep_gui.core.plot_pipeline import FigureCache, build_figure
+from hep_gui.core.yoda_parser import parse_yoda, filter_plottable
+from hep_gui.gui.plot_tab import PlotTab
+from hep_gui.utils.ratios import compute_ratios, ratio_range
+from yoda_fixtures import write_yoda
+
+# -- test 1: compute_ratios --
+vals = np.array([[2.0, 4.0, 0.0], [1.0, 8.0, 3.0]])
+err = np.array([[0.2, 0.4, 0.0], [0.1, 0.8, 0.3]])
+r, rdn, rup = compute_ratios(vals, err, err, 0)
+assert np.allclose(r[0, :2], 1.0) and np.isnan(r[0, 2])
+assert np.allclose(r[1, :2], [0.5, 2.0]) and np.isnan(r[1, 2]), r
+# reference row: own relative error only
+assert np.allclose(rdn[0, :2], [0.1, 0.1])
+# other rows: both relative errors in quadrature
+assert np.allclose(rdn[1, 0], 0.5 * np.hypot(0.1, 0.1))
+r_none, dn_none, _ = compute_ratios(vals, None, None, 1)
+assert np.allclose(r_none[1], 1.0) and np.allclose(dn_none[0, :2], 0.0)
+print("[OK] test 1: compute_ratios")
+
+# -- test 2: ratio_range --
+lo, hi = ratio_range(r, rdn, rup)
+assert 0.0 <= lo < 1.0 < hi <= 3.0
+assert ratio_range(np.full((2, 3), np.nan), rdn, rup) == (0.5, 1.5)
+print("[OK] test 2: ratio_range")
+
+# -- test 3: build_figure ratio block --
+tmp = Path(tempfile.mkdtemp())
+datasets = {}
+for label, seed in (("a", 1), ("b", 2), ("c", 3)):
+    path = write_yoda(tmp / f"{label}.yoda", n_obs=5, seed=seed)
+    datasets[label] = {"path": path, "histos": filter_plottable(parse_yoda(path))}
+
+fig = build_figure(datasets, "/MC_TEST/obs_0", ref_label="b")
+assert fig.ratio is not None and fig.ratio.ref_label == "b"
+assert fig.ratio.values.shape == (3, 30)
+assert np.allclose(fig.ratio.values[1], 1.0)
+assert build_figure({"a": datasets["a"]}, "/MC_TEST/obs_0").ratio is None
+print("[OK] test 3: build_figure ratio panel")
+
+# -- test 4: FigureCache --
+cache = FigureCache(max_size=2)
+f1 = cache.get(datasets, "/MC_TEST/obs_0", normalize=True, ref_label="a")
+assert cache.get(datasets, "/MC_TEST/obs_0", normalize=True, ref_label="a") is f1
+assert cache.get(datasets, "/MC_TEST/obs_0", normalize=True, ref_label="b") is not f1
+cache.get(datasets, "/MC_TEST/obs_1", normalize=True, ref_label="a")
+assert cache.get(datasets, "/MC_TEST/obs_0", normalize=True, ref_label="a") is not f1, "LRU should evict"
+print("[OK] test 4: FigureCache")
+
+# -- test 5: PlotTab ratio panel --
+tab = PlotTab()
+tab.show()
+tab.load_yoda_path(str(datasets["a"]["path"]))
+assert tab.wait_for_loads()
+assert tab.ratio_widget.isHidden(), "ratio should be hidden with one dataset"
+tab.load_yoda_path(str(datasets["b"]["path"]))
+assert tab.wait_for_loads()
+assert not tab.ratio_widget.isHidden(), "ratio should show with two datasets"
+assert tab.combo_ref.count() == 2
+tab.combo_ref.setCurrentIndex(1)
+tab.cb_ratio.setChecked(False)
+assert tab.ratio_widget.isHidden()
+tab.cb_ratio.setChecked(True)
+tab.cb_logx.setChecked(True)
+print("[OK] test 5: PlotTab ratio panel")
+
+print("\n=== ALL T24 TESTS PASSED ===")
@@ -0,0 +1,99 @@
+"""T25 -- statistical comparison engine + sortable table."""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QApplication
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+from hep_gui.core.comparison import compare_datasets, symmetric_errors
+from hep_gui.core.yoda_parser import YodaHisto1D
+from hep_gui.gui.plot_tab import PlotTab
+from hep_gui.gui.comparison_dialog import ComparisonDialog
+from hep_gui.models.comparison_model import ComparisonTableModel
+
+
+def histo(path, edges, vals, err):
+    vals = np.asarray(vals, dtype=float)
+    err = np.asarray(err, dtype=float)
+    return YodaHisto1D(path, "", list(edges), vals, -err, err.copy())
+
+
+# -- test 1: exact values on a tiny case --
+edges = [0.0, 1.0, 2.0]
+ds = {
+    "a": {"histos": {"/X/h": histo("/X/h", edges, [1.0, 3.0], [1.0, 1.0])}},
+    "b": {"histos": {"/X/h": histo("/X/h", edges, [3.0, 1.0], [1.0, 1.0])}},
+}
+(c,) = compare_datasets(ds, normalize=False)
+assert (c.label_a, c.label_b, c.ndf) == ("a", "b", 2)
+assert np.isclose(c.chi2_ndf, (4 / 2 + 4 / 2) / 2), c.chi2_ndf
+assert np.isclose(c.max_pull, 2 / np.sqrt(2))
+assert np.isclose(c.ks, 0.5), c.ks  # cdfs [0.25, 1] vs [0.75, 1]
+same = {"a": ds["a"], "b": {"histos": dict(ds["a"]["histos"])}}
+(c0,) = compare_datasets(same, normalize=False)
+assert c0.chi2_ndf == 0 and c0.ks == 0 and c0.max_pull == 0
+print("[OK] test 1: chi2/ndf, KS, max pull")
+
+# -- test 2: sumw2 errors for raw histos, missing / different binning --
+h = YodaHisto1D("/X/r", "", edges, np.array([4.0, 9.0]), sumw2=np.array([4.0, 9.0]))
+assert np.allclose(symmetric_errors(h, 2), [2.0, 3.0])
+ds["a"]["histos"]["/X/only_a"] = histo("/X/only_a", edges, [1, 1], [1, 1])
+ds["a"]["histos"]["/X/bins"] = histo("/X/bins", edges, [1, 1], [1, 1])
+ds["b"]["histos"]["/X/bins"] = histo("/X/bins", [0, 1, 2, 3], [1, 1, 1], [1, 1, 1])
+paths = {c.path for c in compare_datasets(ds)}
+assert paths == {"/X/h"}, paths
+print("[OK] test 2: only shared observables with identical binning")
+
+# -- test 3: 10k observable x pair comparisons --
+rng = np.random.default_rng(0)
+n_ds, n_obs = 5, 1000  # 10 pairs x 1000 observables
+binnings = [np.linspace(0, 100, n + 1) for n in (10, 20, 40, 50)]
+big = {}
+for d in range(n_ds):
+    histos = {}
+    for o in range(n_obs):
+        e = binnings[o % len(binnings)]
+        v = rng.exponential(10.0, len(e) - 1)
+        histos[f"/MC_TEST/obs_{o}"] = histo(f"/MC_TEST/obs_{o}", e, v, np.sqrt(v))
+    big[f"ds{d}"] = {"histos": histos}
+t0 = time.perf_counter()
+results = compare_datasets(big)
+dt = time.perf_counter() - t0
+assert len(results) == 10 * n_obs, len(results)
+assert dt < 1.0, f"{len(results)} comparisons took {dt:.2f}s"
+print(f"[OK] test 3: {len(results)} comparisons in {dt * 1000:.0f} ms")
+
+# -- test 4: table model sorting --
+model = ComparisonTableModel(results)
+model.sort(3, Qt.DescendingOrder)
+top = [model.comparison(i).chi2_ndf for i in range(5)]
+assert top == sorted(top, reverse=True)
+assert top[0] == max(r.chi2_ndf for r in results)
+model.sort(0, Qt.AscendingOrder)
+assert model.comparison(0).path <= model.comparison(1).path
+print("[OK] test 4: model sorting")
+
+# -- test 5: dialog -> PlotTab jump --
+tab = PlotTab()
+tab._datasets = {k: {"path": Path(k), "histos": v["histos"], "titles": {}} for k, v in big.items() if k in ("ds0", "ds1")}
+tab._rebuild_paths()
+tab._rebuild_ref_combo()
+tab._apply_filter()
+tab.filter_edit.setText("obs_1")
+dlg = ComparisonDialog(tab, tab._datasets)
+dlg.observable_selected.connect(tab.select_observable)
+worst = dlg._model.comparison(0)
+dlg.observable_selected.emit(worst.path)
+assert tab.combo_obs.currentData() == worst.path
+print(f"[OK] test 5: jump to {worst.path}")
+
+print("\n=== ALL T25 TESTS PASSED ===")
@@ -0,0 +1,91 @@
+"""T26 -- vectorized rebinning (merge N / custom edges) + PlotTab controls."""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from PySide6.QtWidgets import QApplication
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+from hep_gui.core.plot_pipeline import build_figure
+from hep_gui.core.yoda_parser import parse_yoda, filter_plottable
+from hep_gui.gui.plot_tab import PlotTab
+from hep_gui.utils.rebinning import merge_starts, edges_starts, rebin, parse_edges_text
+from yoda_fixtures import write_yoda
+
+# -- test 1: merge_starts / edges_starts --
+assert list(merge_starts(7, 3)) == [0, 3, 6]
+edges = np.array([0.0, 1.0, 2.0, 4.0, 8.0])
+starts, stop = edges_starts(edges, [0, 2, 8])
+assert list(starts) == [0, 2] and stop == 4
+starts, stop = edges_starts(edges, [1.0000000001, 4])
+assert list(starts) == [1] and stop == 3
+try:
+    edges_starts(edges, [0, 3])
+    raise AssertionError("3 is not an edge")
+except ValueError:
+    pass
+assert parse_edges_text("0, 10 20,50") == [0, 10, 20, 50]
+print("[OK] test 1: start indices")
+
+# -- test 2: density rebin conserves area, errors --
+vals = np.array([[1.0, 3.0, 2.0, 0.5], [2.0, 2.0, 2.0, 2.0]])
+err = np.full_like(vals, 0.1)
+new_edges, nv, nd, nu = rebin(edges, vals, err, err, *edges_starts(edges, [0, 2, 8]))
+assert list(new_edges) == [0, 2, 8]
+assert np.allclose((nv * np.diff(new_edges)).sum(axis=1), (vals * np.diff(edges)).sum(axis=1))
+assert np.allclose(nv[1], 2.0)
+# first merged bin: widths 1,1 -> sqrt(0.1^2 + 0.1^2) / 2
+assert np.isclose(nd[0, 0], np.sqrt(0.02) / 2)
+print("[OK] test 2: density rebin")
+
+# -- test 3: sumw rebin adds, sumw2 in quadrature, partial last group --
+new_edges, nv, nd, _ = rebin(edges, vals[0], np.sqrt(vals[0]), None, merge_starts(4, 3), density=False)
+assert list(new_edges) == [0, 4, 8]
+assert np.allclose(nv, [6.0, 0.5])
+assert np.allclose(nd, np.sqrt([6.0, 0.5]))
+print("[OK] test 3: sumw rebin")
+
+# -- test 4: build_figure applies rebin to every dataset --
+tmp = Path(tempfile.mkdtemp())
+datasets = {}
+for label, seed in (("a", 1), ("b", 2)):
+    path = write_yoda(tmp / f"{label}.yoda", n_obs=3, n_bins=100, seed=seed)
+    datasets[label] = {"path": path, "histos": filter_plottable(parse_yoda(path))}
+fig = build_figure(datasets, "/MC_TEST/obs_0", rebin=4)
+assert all(len(s.vals) == 25 for s in fig.series)
+assert fig.ratio.values.shape == (2, 25)
+fig = build_figure(datasets, "/MC_TEST/obs_0", rebin=(0.0, 50.0, 100.0))
+assert all(len(s.vals) == 2 for s in fig.series)
+fig = build_figure(datasets, "/MC_TEST/obs_0", rebin=(0.0, 33.3333))
+assert all(len(s.vals) == 100 for s in fig.series), "incompatible edges: unchanged"
+h = build_figure(datasets, "/MC_TEST/raw_histo", normalize=False, rebin=10)
+raw = datasets["a"]["histos"]["/MC_TEST/raw_histo"].values
+assert np.isclose(h.series[0].vals.sum(), np.nansum(raw))
+print("[OK] test 4: build_figure rebin")
+
+# -- test 5: PlotTab control, cached response --
+tab = PlotTab()
+tab.load_yoda_path(str(datasets["a"]["path"]))
+tab.load_yoda_path(str(datasets["b"]["path"]))
+assert tab.wait_for_loads()
+tab.select_observable("/MC_TEST/obs_0")
+tab.spin_rebin.setValue(5)
+tab.spin_rebin.setValue(1)
+t0 = time.perf_counter()
+tab.spin_rebin.setValue(5)
+dt = time.perf_counter() - t0
+tab.edit_rebin_edges.setText("0, 50, 100")
+assert tab._rebin_option() == (0.0, 50.0, 100.0)
+tab.edit_rebin_edges.setText("nonsense")
+assert tab._rebin_option() == 5
+print(f"[OK] test 5: PlotTab rebin controls (cached replot {dt * 1000:.1f} ms)")
+
+print("\n=== ALL T26 TESTS PASSED ===")
@@ -0,0 +1,131 @@
+"""T27 -- parameter scan family + slider viewer."""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from PySide6.QtWidgets import QApplication
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+import hep_gui.gui.plot_tab as plot_tab
+from hep_gui.core.scan import (
+    RUN_SCRIPT_NAME, parse_scan_params, find_run_script, load_scan, record_run_name, run_name_of,
+)
+from hep_gui.gui.plot_tab import PlotTab
+from hep_gui.gui.scan_viewer import ScanViewer
+from yoda_fixtures import write_yoda
+
+SCRIPT = (ROOT / "data" / "scripts" / "test_ggH_100_30.txt").read_text(encoding="utf-8")
+
+# -- test 1: parse_scan_params --
+params = parse_scan_params(SCRIPT)
+assert params["ms1"] == 30 and params["ms2"] == 30 and params["nevents"] == 100
+assert params["wh"] == 7.290534e-03, "last `set wh` wins"
+assert "use_syst" not in params and "Ws1" not in params, "non-numeric values skipped"
+print("[OK] test 1: parse_scan_params")
+
+# -- test 2: family of runs tagged from their scripts --
+tmp = Path(tempfile.mkdtemp())
+n_points = 200
+masses = np.linspace(10, 60, n_points)
+files = []
+for i, ms in enumerate(masses[::-1]):  # written out of order on purpose
+    name = f"scan_ms_{i:03d}"
+    text = SCRIPT.replace("test_ggH_100_30", name).replace("set ms1 30", f"set ms1 {ms:g}")
+    (tmp / f"{name}.txt").write_text(text)
+    files.append(write_yoda(tmp / f"{name}.yoda", n_obs=4, n_bins=50, seed=i, scale=1 + i / 50))
+assert find_run_script(files[0], [tmp]) == tmp / "scan_ms_000.txt"
+
+t0 = time.perf_counter()
+family = load_scan(files, [tmp])
+print(f"    loaded {n_points} runs in {time.perf_counter() - t0:.2f}s")
+assert family.scan_keys[0] == "ms1", family.scan_keys
+assert family.scan_keys[-1] == "run"
+assert family.values["/MC_TEST/obs_0"].shape == (n_points, 50)
+order = family.order("ms1")
+assert np.all(np.diff([family.params[k]["ms1"] for k in order]) > 0)
+norm = family.normalized("/MC_TEST/obs_0")
+assert np.allclose((norm * np.diff(family.edges["/MC_TEST/obs_0"])).sum(axis=1), 1.0)
+print("[OK] test 2: load_scan")
+
+# -- test 3: runs without scripts fall back to their index --
+bare_dir = tmp / "bare"
+bare_dir.mkdir()
+bare_files = [write_yoda(bare_dir / f"r{i}.yoda", n_obs=2, seed=i) for i in range(3)]
+bare = load_scan(bare_files, [bare_dir])
+assert bare.scan_keys == ["run"]
+print("[OK] test 3: untagged runs")
+
+# -- test 4: app-generated runs: .yoda named after the events, run found through the note --
+runs = tmp / "runs"
+analysis = tmp / "analysis"
+analysis.mkdir()
+app_files = []
+for ms in (10, 20, 30):
+    run_dir = runs / f"ggH_ms_{ms}"
+    (run_dir / "Events" / "run_01").mkdir(parents=True)
+    (run_dir / RUN_SCRIPT_NAME).write_text(SCRIPT.replace("set ms1 30", f"set ms1 {ms}"))
+    hepmc = run_dir / "Events" / "run_01" / "tag_1_pythia8_events.hepmc.gz"
+    assert run_name_of(hepmc, runs) == f"ggH_ms_{ms}"
+    (analysis / f"ms_{ms}").mkdir()
+    yoda = write_yoda(analysis / f"ms_{ms}" / "tag_1_pythia8_events.yoda", n_obs=2, seed=ms)
+    record_run_name(yoda, hepmc, runs)
+    assert find_run_script(yoda, [bare_dir], runs) == run_dir / RUN_SCRIPT_NAME
+    app_files.append(yoda)
+assert run_name_of(tmp / "elsewhere.hepmc", runs) is None
+record_run_name(app_files[0], tmp / "elsewhere.hepmc", runs)  # stale note removed
+assert find_run_script(app_files[0], [bare_dir], runs) is None
+record_run_name(app_files[0], runs / "ggH_ms_10" / "Events" / "run_01" / "tag_1_pythia8_events.hepmc.gz", runs)
+print("[OK] test 4: run script found through the run name note")
+
+# -- test 5: PlotTab loads the scan off the GUI thread --
+plot_tab.QFileDialog.getOpenFileNames = staticmethod(lambda *a, **k: ([str(f) for f in app_files], ""))
+import hep_gui.core.scan as scan
+scan.RUNS_DIR = runs
+shown = []
+plot_tab.ScanViewer = lambda parent, family: type("V", (), {"show": lambda self: shown.append(family)})()
+tab = PlotTab()
+tab._on_scan()
+assert not tab.btn_scan.isEnabled() and tab._scan_worker is not None  # returned before parsing
+deadline = time.monotonic() + 20
+while not shown and time.monotonic() < deadline:
+    app.processEvents()
+    time.sleep(0.005)
+(scan_family,) = shown
+assert scan_family.scan_keys[0] == "ms1" and [t["ms1"] for t in scan_family.params] == [10, 20, 30]
+assert tab.btn_scan.isEnabled() and tab.btn_scan.text() == "Scan..."
+print("[OK] test 5: background scan load, tagged from run_script.txt")
+
+# -- test 6: viewer slides with one setData per step --
+viewer = ScanViewer(None, family)
+viewer.show()
+calls = []
+orig = viewer.curve.setData
+viewer.curve.setData = lambda *a, **k: (calls.append(1), orig(*a, **k))
+t0 = time.perf_counter()
+for i in range(n_points):
+    viewer.slider.setValue(i)
+    app.processEvents()
+dt = time.perf_counter() - t0
+assert len(calls) == n_points - 1, len(calls)  # value 0 was already shown
+assert "ms1=60" in viewer.label_point.text(), viewer.label_point.text()
+fps = n_points / dt
+print(f"[OK] test 6: {n_points} slider steps at {fps:.0f} steps/s")
+
+viewer.cb_logy.setChecked(True)
+viewer.combo_obs.setCurrentIndex(1)
+viewer.btn_play.setChecked(True)
+t_end = time.perf_counter() + 0.2
+while time.perf_counter() < t_end:
+    app.processEvents()
+viewer.btn_play.setChecked(False)
+print("[OK] test 7: log y / observable switch / play")
+
+print("\n=== ALL T27 TESTS PASSED ===")
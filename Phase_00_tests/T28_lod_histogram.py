@@ -0,0 +1,88 @@
+"""T28 -- level-of-detail step histogram item for very fine binnings."""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from PySide6.QtWidgets import QApplication
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+import pyqtgraph as pg
+
+from hep_gui.gui.histogram_item import StepHistogramItem
+from hep_gui.gui.plot_tab import PlotTab
+from yoda_fixtures import write_yoda
+
+N = 100_000
+rng = np.random.default_rng(3)
+edges = np.linspace(0.0, 1000.0, N + 1)
+vals = rng.exponential(1.0, N)
+spike = 54_321
+vals[spike] = 500.0  # single-bin peak that must survive decimation
+
+pw = pg.PlotWidget()
+pw.resize(800, 600)
+pw.show()
+item = StepHistogramItem(edges, vals, pen="k", brush=(0, 0, 255, 80))
+pw.addItem(item)
+pw.setXRange(0, 1000, padding=0)
+app.processEvents()
+
+# -- test 1: zoomed out -> one stroke per pixel column, peak kept --
+n_px = int(pw.getViewBox().width())
+n_elem = item._line_path.elementCount()
+assert n_elem <= 2 * n_px + 4, (n_elem, n_px)
+fill_rect = item._fill_path.boundingRect()
+assert np.isclose(fill_rect.bottom(), 500.0), fill_rect
+print(f"[OK] test 1: {N} bins drawn with {n_elem} points over {n_px} px")
+
+# -- test 2: zoomed in -> full detail of the visible bins only --
+x0 = edges[spike - 20]
+pw.setXRange(x0, edges[spike + 20], padding=0)
+app.processEvents()
+i0, i1, _ = item._visible_slice()
+assert i0 <= spike - 20 and i1 >= spike + 20 and i1 - i0 < 50, (i0, i1)
+assert item._line_path.elementCount() == 2 * (i1 - i0) + 2
+print("[OK] test 2: zoom in restores full detail")
+
+# -- test 3: panning stays interactive --
+pw.setXRange(0, 1000, padding=0)
+app.processEvents()
+vb = pw.getViewBox()
+t0 = time.perf_counter()
+steps = 100
+for k in range(steps):
+    vb.translateBy(x=3.0)
+    app.processEvents()
+dt = (time.perf_counter() - t0) / steps
+assert dt < 0.05, f"{dt * 1000:.1f} ms per pan step"
+print(f"[OK] test 3: pan at {dt * 1000:.1f} ms/step")
+
+# -- test 4: log mode follows the plot --
+pw.setLogMode(x=False, y=True)
+app.processEvents()
+assert item._log == (False, True)
+assert np.isclose(item._fill_path.boundingRect().bottom(), np.log10(500.0))
+lo, hi = item.dataBounds(1)
+assert np.isclose(hi, np.log10(500.0)) and lo < 0
+print("[OK] test 4: log y")
+
+# -- test 5: PlotTab uses the item and skips error bars on huge binnings --
+tmp = Path(tempfile.mkdtemp())
+tab = PlotTab()
+tab.load_yoda_path(write_yoda(tmp / "fine.yoda", n_obs=1, n_bins=20_000, seed=1))
+assert tab.wait_for_loads()
+tab.select_observable("/MC_TEST/obs_0")
+items = tab.plot_widget.getPlotItem().items
+assert sum(isinstance(i, StepHistogramItem) for i in items) == 1
+assert not any(isinstance(i, pg.ErrorBarItem) for i in items)
+print("[OK] test 5: PlotTab integration")
+
+print("\n=== ALL T28 TESTS PASSED ===")
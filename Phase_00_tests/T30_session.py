@@ -0,0 +1,114 @@
+"""T30 -- PlotTab session bundles (save / memory-mapped restore)."""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from PySide6.QtWidgets import QApplication
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+from hep_gui.core.session import save_session, load_session
+from hep_gui.core.yoda_parser import parse_yoda, filter_plottable, YodaHisto1D
+from hep_gui.gui.plot_tab import PlotTab
+from yoda_fixtures import write_yoda
+
+tmp = Path(tempfile.mkdtemp())
+
+# -- test 1: round trip, source files not needed --
+datasets = {}
+for label, seed in (("nominal", 1), ("variation", 2)):
+    p = write_yoda(tmp / f"{label}.yoda", n_obs=10, n_bins=25, seed=seed)
+    datasets[label] = {"path": p, "histos": filter_plottable(parse_yoda(p))}
+bundle = tmp / "two.hepsession"
+save_session(bundle, datasets, {"observable": "/MC_TEST/obs_3"})
+for ds in datasets.values():
+    Path(ds["path"]).unlink()
+
+restored, view = load_session(bundle)
+assert view == {"observable": "/MC_TEST/obs_3"}
+assert list(restored) == ["nominal", "variation"]
+for label, ds in datasets.items():
+    got = restored[label]
+    assert got["path"] == Path(ds["path"])
+    assert set(got["histos"]) == set(ds["histos"])
+    for path, h in ds["histos"].items():
+        r = got["histos"][path]
+        assert r.title == h.title and r.metadata == h.metadata and r.edges == h.edges
+        for name in ("values", "err_dn", "err_up", "sumw2"):
+            a, b = getattr(h, name), getattr(r, name)
+            assert (a is None) == (b is None), (path, name)
+            if a is not None:
+                assert np.array_equal(a, b, equal_nan=True), (path, name)
+assert not restored["nominal"]["histos"]["/MC_TEST/obs_0"].values.flags.writeable
+print("[OK] test 1: round trip")
+
+# -- test 2: not a session --
+try:
+    load_session(write_yoda(tmp / "plain.yoda", n_obs=1))
+    raise AssertionError("yoda file accepted as session")
+except ValueError:
+    pass
+print("[OK] test 2: bad magic")
+
+# -- test 3: restore time does not grow with the source files --
+rng = np.random.default_rng(0)
+edges = list(np.linspace(0, 100, 61))
+big = {}
+for d in range(20):
+    histos = {}
+    for i in range(3000):
+        vals = rng.random(60)
+        histos[f"/MC_BIG/obs_{i}"] = YodaHisto1D(
+            path=f"/MC_BIG/obs_{i}", title=f"obs {i}", edges=edges, values=vals,
+            err_dn=vals * 0.1, err_up=vals * 0.1, metadata={"Type": "ESTIMATE1D"},
+        )
+    big[f"run_{d:02d}"] = {"path": tmp / f"run_{d:02d}.yoda", "histos": histos}
+t0 = time.perf_counter()
+save_session(tmp / "big.hepsession", big)
+t_save = time.perf_counter() - t0
+t0 = time.perf_counter()
+restored, _ = load_session(tmp / "big.hepsession")
+t_load = time.perf_counter() - t0
+size = (tmp / "big.hepsession").stat().st_size / 1e6
+print(f"    60000 histos, {size:.0f} MB: save {t_save:.2f}s, restore {t_load:.2f}s")
+assert t_load < 1.0
+assert np.array_equal(restored["run_19"]["histos"]["/MC_BIG/obs_2999"].values,
+                      big["run_19"]["histos"]["/MC_BIG/obs_2999"].values)
+print("[OK] test 3: restore time")
+
+# -- test 4: PlotTab restores datasets and view state --
+p = write_yoda(tmp / "tab_a.yoda", n_obs=12, seed=5)
+q = write_yoda(tmp / "tab_b.yoda", n_obs=12, seed=6)
+tab = PlotTab()
+tab.load_yoda_path(p)
+tab.load_yoda_path(q)
+assert tab.wait_for_loads()
+tab.filter_edit.setText("obs_1")
+tab.select_observable("/MC_TEST/obs_11")
+tab.cb_logy.setChecked(True)
+tab.spin_rebin.setValue(3)
+tab.combo_ref.setCurrentIndex(1)
+state = tab.view_state()
+tab.save_session(tmp / "tab.hepsession")
+Path(p).unlink()
+Path(q).unlink()
+
+tab2 = PlotTab()
+plots = []
+orig = tab2._do_plot
+tab2._do_plot = lambda path: (plots.append(path), orig(path))
+tab2.restore_session(tmp / "tab.hepsession")
+assert tab2.view_state() == state, (tab2.view_state(), state)
+assert list(tab2._datasets) == ["tab_a", "tab_b"]
+assert tab2.combo_obs.count() == 3  # obs_1, obs_10, obs_11
+assert plots == ["/MC_TEST/obs_11"], plots
+print("[OK] test 4: PlotTab restore_session")
+
+print("\n=== ALL T30 TESTS PASSED ===")
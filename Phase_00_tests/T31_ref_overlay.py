@@ -0,0 +1,124 @@
+"""T31 -- indexed local reference data + data overlay in PlotTab."""
+
+import gzip
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from PySide6.QtWidgets import QApplication
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+import pyqtgraph as pg
+
+import hep_gui.core.ref_index as ref_index_module
+from hep_gui.core.figure_painter import render_png
+from hep_gui.core.plot_pipeline import build_figure
+from hep_gui.core.ref_index import open_ref_index, index_file_for, ref_key, RefIndex
+from hep_gui.core.yoda_parser import parse_yoda, filter_plottable
+from hep_gui.gui.plot_tab import PlotTab
+from yoda_fixtures import write_yoda, estimate_block
+
+tmp = Path(tempfile.mkdtemp())
+cache = tmp / "cache"
+ref_dir = tmp / "refdata"
+(ref_dir / "sub").mkdir(parents=True)
+
+edges = np.linspace(0, 100, 31)
+rng = np.random.default_rng(7)
+blocks = []
+for i in range(20):
+    vals = rng.random(30) * 5 + 1
+    blocks.append(estimate_block(f"/REF/MC_TEST/obs_{i}", edges, vals, vals * 0.1, title=f"data {i}"))
+(ref_dir / "MC_TEST.yoda").write_text("".join(blocks))
+with gzip.open(ref_dir / "sub" / "OTHER.yoda.gz", "wt") as f:
+    f.write(estimate_block("/REF/OTHER/h1", edges[:11], np.ones(10), np.full(10, 0.1)))
+(ref_dir / "notes.txt").write_text("not a yoda file")
+
+# -- test 1: build, lookup, single-block read --
+assert ref_key("/MC_TEST:MODE=A/obs_1") == "/MC_TEST/obs_1"
+index = open_ref_index(ref_dir, cache)
+assert len(index) == 21
+assert index_file_for(ref_dir, cache).exists()
+f, off = index.lookup("/MC_TEST/obs_5")
+assert f == ref_dir / "MC_TEST.yoda"
+assert f.read_bytes()[off:].startswith(b"BEGIN YODA_ESTIMATE1D_V3 /REF/MC_TEST/obs_5")
+h = index.get("/MC_TEST:MODE=A/obs_5")
+assert h.path == "/REF/MC_TEST/obs_5" and h.title == "data 5" and len(h.values) == 30
+assert index.get("/OTHER/h1") is not None, ".yoda.gz unpacked and indexed"
+assert index.get("/MC_TEST/missing") is None
+print("[OK] test 1: index + lookup")
+
+# -- test 2: stored index reused, only changed files re-indexed --
+calls = []
+orig_index_yoda = ref_index_module.index_yoda
+ref_index_module.index_yoda = lambda p: (calls.append(Path(p).name), orig_index_yoda(p))[1]
+again = open_ref_index(ref_dir, cache)
+assert calls == [] and again.entries == index.entries
+time.sleep(0.01)
+text = (ref_dir / "MC_TEST.yoda").read_text()
+(ref_dir / "MC_TEST.yoda").write_text(text.replace("/REF/MC_TEST/obs_19", "/REF/MC_TEST/obs_99"))
+again = open_ref_index(ref_dir, cache)
+assert calls == ["MC_TEST.yoda"], calls
+assert again.lookup("/MC_TEST/obs_99") and not again.lookup("/MC_TEST/obs_19")
+assert RefIndex.load(index_file_for(ref_dir, cache)).entries == again.entries
+ref_index_module.index_yoda = orig_index_yoda
+index = again
+print("[OK] test 2: incremental refresh")
+
+# -- test 3: lookups are cheap --
+t0 = time.perf_counter()
+for _ in range(100):
+    for i in range(19):
+        index.get(f"/MC_TEST/obs_{i}")
+dt = (time.perf_counter() - t0) / 1900
+assert dt < 1e-4, f"{dt * 1e6:.0f} us per lookup"
+print(f"[OK] test 3: {dt * 1e6:.1f} us per cached lookup")
+
+# -- test 4: build_figure overlays the reference, rebinned + normalized --
+mc = write_yoda(tmp / "mc.yoda", n_obs=5, n_bins=30, seed=1)
+datasets = {"mc": {"path": mc, "histos": filter_plottable(parse_yoda(mc))}}
+fig = build_figure(datasets, "/MC_TEST/obs_2", references=index)
+r = fig.reference
+assert r is not None and r.label == "Data" and r.color["line"] == (0, 0, 0)
+assert np.isclose((r.vals * np.diff(r.edges)).sum(), 1.0)
+fig3 = build_figure(datasets, "/MC_TEST/obs_2", references=index, rebin=3)
+assert len(fig3.reference.vals) == 10
+assert build_figure(datasets, "/MC_TEST/obs_2").reference is None
+assert build_figure(datasets, "/MC_TEST/raw_histo", references=index).reference is None
+render_png(fig, tmp / "with_ref.png")
+assert (tmp / "with_ref.png").stat().st_size > 0
+print("[OK] test 4: build_figure + painter")
+
+# -- test 5: PlotTab overlay --
+tab = PlotTab()
+tab.set_reference_dir(ref_dir, remember=False, cache_dir=cache)
+deadline = time.monotonic() + 10
+while tab.reference_index() is None and time.monotonic() < deadline:
+    app.processEvents()
+assert tab.reference_index() is not None and tab.cb_refdata.isEnabled()
+tab.load_yoda_path(mc)
+assert tab.wait_for_loads()
+tab.select_observable("/MC_TEST/obs_2")
+
+
+def data_items():
+    return [i for i in tab.plot_widget.getPlotItem().items
+            if isinstance(i, pg.PlotDataItem) and i.name() == "Data"]
+
+
+assert len(data_items()) == 1
+tab.cb_refdata.setChecked(False)
+assert not data_items()
+tab.cb_refdata.setChecked(True)
+tab.cb_logy.setChecked(True)
+assert len(data_items()) == 1
+print("[OK] test 5: PlotTab data overlay")
+
+print("\n=== ALL T31 TESTS PASSED ===")
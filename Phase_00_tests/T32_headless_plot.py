@@ -0,0 +1,131 @@
+"""T32 -- headless rendering API and the python -m hep_gui.plot CLI."""
+
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from PySide6.QtWidgets import QApplication
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+from hep_gui.core.batch_export import export_filename
+from hep_gui.core.headless import (
+    load_datasets, observable_paths, render_all, render_figure, unique_label,
+)
+from hep_gui.core.plot_pipeline import build_figure
+from hep_gui.core.ref_index import open_ref_index
+from hep_gui.gui.plot_tab import PlotTab
+from yoda_fixtures import write_yoda, estimate_block
+
+tmp = Path(tempfile.mkdtemp())
+env = dict(os.environ, PYTHONPATH=str(ROOT / "src"), QT_QPA_PLATFORM="offscreen")
+a = write_yoda(tmp / "run.yoda", n_obs=12, n_bins=20, seed=1)
+(tmp / "other").mkdir()
+b = write_yoda(tmp / "other" / "run.yoda", n_obs=12, n_bins=20, seed=2)
+
+# -- test 1: no widget module needed --
+code = ("import sys; import hep_gui.core.headless, hep_gui.plot; "
+        "assert 'PySide6.QtWidgets' not in sys.modules, 'QtWidgets imported'")
+r = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True)
+assert r.returncode == 0, r.stderr
+print("[OK] test 1: headless modules don't import QtWidgets")
+
+# -- test 2: datasets, labels, paths --
+assert unique_label("run", {"run": 0, "run_2": 0}) == "run_3"
+datasets = load_datasets([a, b])
+assert list(datasets) == ["run", "run_2"]
+paths = observable_paths(datasets)
+assert paths == sorted(datasets["run"]["histos"]) and len(paths) == 13
+assert observable_paths(datasets, "OBS_1") == ["/MC_TEST/obs_1", "/MC_TEST/obs_10", "/MC_TEST/obs_11"]
+print("[OK] test 2: load_datasets / observable_paths")
+
+# -- test 3: render_figure picks the format from the suffix --
+fig = build_figure(datasets, "/MC_TEST/obs_0")
+for name, magic in (("f.png", b"\x89PNG"), ("f.svg", b"<?xml"), ("f.pdf", b"%PDF")):
+    assert render_figure(fig, tmp / name)
+    assert (tmp / name).read_bytes().startswith(magic), name
+try:
+    render_figure(fig, tmp / "f.gif")
+    raise AssertionError("gif accepted")
+except ValueError:
+    pass
+print("[OK] test 3: render_figure png/svg/pdf")
+
+# -- test 4: render_all in process --
+seen = []
+written, errors = render_all(datasets, tmp / "serial", "svg", paths[:5], jobs=1,
+                             progress=lambda d, t: seen.append((d, t)), logy=True)
+assert (written, errors) == (5, []) and seen[-1] == (5, 5)
+assert sorted(p.name for p in (tmp / "serial").iterdir()) == sorted(
+    export_filename(p, "svg") for p in paths[:5])
+assert render_all(datasets, tmp / "none", "png", ["/MC_TEST/missing"], jobs=1) == (0, [])
+print("[OK] test 4: render_all in process")
+
+# -- test 5: CLI across worker processes, with reference data --
+ref_dir = tmp / "ref"
+ref_dir.mkdir()
+(ref_dir / "MC_TEST.yoda").write_text(estimate_block(
+    "/REF/MC_TEST/obs_3", np.linspace(0, 100, 21), np.ones(20), np.full(20, 0.1)))
+out = tmp / "cli"
+r = subprocess.run(
+    [sys.executable, "-m", "hep_gui.plot", str(a), str(b), "-o", str(out),
+     "-f", "png", "-j", "2", "--rebin", "2", "--ref-dir", str(ref_dir),
+     "--cache-dir", str(tmp / "cache"), "-q"],
+    env=env, capture_output=True, text=True, timeout=120,
+)
+assert r.returncode == 0, r.stdout + r.stderr
+assert "13 plots written" in r.stdout, r.stdout
+files = sorted(out.iterdir())
+assert [f.name for f in files] == sorted(export_filename(p, "png") for p in paths)
+assert all(f.stat().st_size > 1000 for f in files)
+r = subprocess.run([sys.executable, "-m", "hep_gui.plot", str(tmp / "nope.yoda")],
+                   env=env, capture_output=True, text=True)
+assert r.returncode == 2 and "file not found" in r.stderr
+print("[OK] test 5: CLI with -j 2")
+
+# -- test 6: RefIndex goes to worker processes by pickle --
+index = open_ref_index(ref_dir, tmp / "cache")
+assert index.get("/MC_TEST/obs_3") is not None
+again = pickle.loads(pickle.dumps(index))
+assert again.entries == index.entries and again.get("/MC_TEST/obs_3").title == index.get("/MC_TEST/obs_3").title
+print("[OK] test 6: RefIndex pickles")
+
+# -- test 7: PlotTab exports through the same renderer --
+tab = PlotTab()
+tab.resize(900, 700)
+tab.load_yoda_path(a)
+assert tab.wait_for_loads()
+tab.select_observable("/MC_TEST/obs_2")
+tab.cb_logy.setChecked(True)
+tab.edit_title.setText("edited title")
+fig = tab.current_figure()
+ref = build_figure(tab._datasets, "/MC_TEST/obs_2", logy=True)
+assert fig.title == "edited title" and fig.xlabel == ref.xlabel
+assert np.allclose(fig.view, ref.view, rtol=1e-6), (fig.view, ref.view)
+assert render_figure(fig, tmp / "tab.png")
+print("[OK] test 7: PlotTab.current_figure")
+
+# -- test 8: --ref-label and --no-ratio change the figures --
+def cli_svg(*extra):
+    out = tmp / ("cli_svg" + "".join(extra).replace("-", "_"))
+    r = subprocess.run([sys.executable, "-m", "hep_gui.plot", str(a), str(b), "-o", str(out),
+                        "-f", "svg", "-j", "1", "--filter", "obs_0", "-q", *extra],
+                       env=env, capture_output=True, text=True, timeout=120)
+    assert r.returncode == 0, r.stdout + r.stderr
+    return (out / export_filename("/MC_TEST/obs_0", "svg")).read_text()
+
+
+first, second, flat = cli_svg(), cli_svg("--ref-label", "run_2"), cli_svg("--no-ratio")
+assert ">ratio</text>" in first and ">ratio</text>" in second and ">ratio</text>" not in flat
+assert first != second
+print("[OK] test 8: --ref-label / --no-ratio")
+
+print("\n=== ALL T32 TESTS PASSED ===")
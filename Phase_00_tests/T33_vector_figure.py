@@ -0,0 +1,127 @@
+"""T33 -- direct SVG/PDF writer (core/vector_figure.py)."""
+
+import dataclasses
+import re
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from PySide6.QtWidgets import QApplication
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+from PySide6.QtCore import QSize
+from PySide6.QtGui import QImage
+from PySide6.QtPdf import QPdfDocument
+
+from hep_gui.core.figure_painter import render_png
+from hep_gui.core.headless import load_datasets
+from hep_gui.core.plot_pipeline import build_figure
+from hep_gui.core.ref_index import open_ref_index
+from hep_gui.core.vector_figure import VectorPdf, figure_svg, layout_figure, write_pdf, write_svg
+from hep_gui.utils.plot_helpers import build_step_coords
+from yoda_fixtures import write_yoda, estimate_block
+
+tmp = Path(tempfile.mkdtemp())
+a = write_yoda(tmp / "a.yoda", n_obs=4, seed=1)
+b = write_yoda(tmp / "b.yoda", n_obs=4, seed=2, scale=1.5)
+ref_dir = tmp / "ref"
+ref_dir.mkdir()
+(ref_dir / "MC_TEST.yoda").write_text(estimate_block(
+    "/REF/MC_TEST/obs_1", np.linspace(0, 100, 31), np.full(30, 5.0), np.full(30, 0.5)))
+datasets = load_datasets([a, b])
+refs = open_ref_index(ref_dir, tmp / "cache")
+fig = build_figure(datasets, "/MC_TEST/obs_1", logy=True, references=refs)
+
+
+def pixels(img):
+    img = img.convertToFormat(QImage.Format_RGB888)
+    rows = np.frombuffer(img.constBits(), np.uint8).reshape(img.height(), img.bytesPerLine())
+    return rows[:, :img.width() * 3].reshape(img.height(), img.width(), 3).astype(int)
+
+
+# -- test 1: step coords (vectorized) --
+x, y = build_step_coords(np.array([0.0, 1.0, 3.0]), np.array([2.0, 5.0]))
+assert x.tolist() == [0, 0, 1, 1, 3, 3] and y.tolist() == [0, 2, 2, 5, 5, 0]
+print("[OK] test 1: build_step_coords")
+
+# -- test 2: SVG is well-formed, one outline per series, text escaped --
+odd = dataclasses.replace(fig, title="a < b & \"c\"")
+root = ET.fromstring(figure_svg(odd).encode())
+ns = "{http://www.w3.org/2000/svg}"
+assert len(root.findall(f".//{ns}polyline")) == len(fig.series) == 2
+assert len(root.findall(f".//{ns}circle")) == 30 + 1  # data points + legend dot
+assert 'a < b & "c"' in [t.text for t in root.iter(f"{ns}text")]
+assert write_svg(fig, tmp / "f.svg") and (tmp / "f.svg").stat().st_size > 0
+print("[OK] test 2: svg")
+
+# -- test 3: PDF structure, readable by QtPdf --
+assert write_pdf(fig, tmp / "f.pdf")
+data = (tmp / "f.pdf").read_bytes()
+assert data.startswith(b"%PDF-1.4") and data.endswith(b"%%EOF\n")
+xref = int(re.search(rb"startxref\n(\d+)", data).group(1))
+offsets = [int(o) for o in re.findall(rb"(\d{10}) 00000 n", data[xref:])]
+for num, off in enumerate(offsets, 1):
+    assert data[off:].startswith(f"{num} 0 obj".encode()), num
+pdf = VectorPdf(tmp / "multi.pdf")
+for path in ("/MC_TEST/obs_0", "/MC_TEST/obs_1", "/MC_TEST/obs_2"):
+    pdf.add_page(build_figure(datasets, path))
+pdf.close()
+doc = QPdfDocument()
+doc.load(str(tmp / "multi.pdf"))
+assert doc.status() == QPdfDocument.Status.Ready and doc.pageCount() == 3
+print("[OK] test 3: pdf")
+
+# -- test 4: looks like the QPainter rendering --
+render_png(fig, tmp / "painter.png")
+doc.load(str(tmp / "f.pdf"))
+diff = np.abs(pixels(QImage(str(tmp / "painter.png"))) - pixels(doc.render(0, QSize(800, 600)))).max(axis=2)
+assert (diff > 64).mean() < 0.02, (diff > 64).mean()
+print(f"[OK] test 4: {100 * (diff > 64).mean():.2f}% pixels differ from the painter")
+
+# -- test 5: everything drawn inside the axes stays inside --
+zoom = dataclasses.replace(fig, view=(20.0, 60.0, 1e-3, 2e-2))
+for op in layout_figure(zoom):
+    if op[0] in ("polyline", "area"):
+        assert op[1].min() >= 80 and op[1].max() <= 780 and op[2].min() >= 40 and op[2].max() <= 545
+print("[OK] test 5: clamped to the data area")
+
+# -- test 6: hundreds of figures per second on one core --
+n = 200
+t0 = time.perf_counter()
+for _ in range(n):
+    figure_svg(fig)
+svg_rate = n / (time.perf_counter() - t0)
+pdf = VectorPdf(tmp / "speed.pdf")
+t0 = time.perf_counter()
+for _ in range(n):
+    pdf.add_page(fig)
+pdf.close()
+pdf_rate = n / (time.perf_counter() - t0)
+print(f"    svg {svg_rate:.0f}/s, pdf {pdf_rate:.0f} pages/s")
+assert svg_rate > 100 and pdf_rate > 100
+print("[OK] test 6: speed")
+
+# -- test 7: ratio panel under the plot, reference as a band around 1 --
+assert fig.ratio is not None and fig.ratio.ref_label == "a"
+flat = build_figure(datasets, "/MC_TEST/obs_1", logy=True, references=refs, ratio=False)
+texts = [op[3] for op in layout_figure(fig) if op[0] == "text"]
+assert "ratio" in texts and "ratio" not in [op[3] for op in layout_figure(flat) if op[0] == "text"]
+other = build_figure(datasets, "/MC_TEST/obs_1", logy=True, references=refs, ref_label="b")
+assert other.ratio.ref_label == "b" and figure_svg(other) != figure_svg(fig)
+root = ET.fromstring(figure_svg(fig).encode())
+assert "ratio" in [t.text for t in root.iter(f"{ns}text")]
+render_png(flat, tmp / "flat.png")
+painter, plain = pixels(QImage(str(tmp / "painter.png"))), pixels(QImage(str(tmp / "flat.png")))
+frames = lambda img: [y for y in range(400, 440) if (img[y, 90:770].max(axis=1) < 96).mean() > 0.9]
+assert len(frames(painter)) == 2 and not frames(plain)  # bottom of the plot, top of the panel
+print("[OK] test 7: ratio panel")
+
+print("\n=== ALL T33 TESTS PASSED ===")
@@ -0,0 +1,91 @@
+"""T34 -- observable thumbnails cached by content hash."""
+
+import dataclasses
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from PySide6.QtWidgets import QApplication
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+from PySide6.QtGui import QImage
+
+import hep_gui.core.thumbnails as thumbnails_module
+from hep_gui.core.headless import load_datasets, observable_paths
+from hep_gui.core.thumbnails import THUMB_SIZE, ThumbnailWorker, thumbnail_file
+from hep_gui.gui.plot_tab import PlotTab
+from yoda_fixtures import write_yoda
+
+tmp = Path(tempfile.mkdtemp())
+cache = tmp / "thumbs"
+a = write_yoda(tmp / "a.yoda", n_obs=10, seed=1)
+b = write_yoda(tmp / "b.yoda", n_obs=10, seed=2)
+datasets = load_datasets([a, b])
+paths = observable_paths(datasets)
+
+
+def run(worker):
+    """Run synchronously. Returns (batches, rendered)."""
+    batches, done = [], []
+    worker.ready.connect(lambda batch: batches.append(batch))
+    worker.finished.connect(done.append)
+    worker.error.connect(lambda msg: (_ for _ in ()).throw(AssertionError(msg)))
+    worker.run()
+    return batches, done[0]
+
+
+# -- test 1: first run renders every observable --
+batches, rendered = run(ThumbnailWorker(datasets, paths, cache))
+got = {p: f for batch in batches for p, f in batch.items()}
+assert rendered == len(paths) == 11 and set(got) == set(paths)
+img = QImage(got["/MC_TEST/obs_0"])
+assert (img.width(), img.height()) == THUMB_SIZE
+assert not list(cache.glob("*.tmp.png"))
+print("[OK] test 1: rendered")
+
+# -- test 2: later sessions find them all, in one batch, nothing rendered --
+calls = []
+orig = thumbnails_module.render_thumbnail
+thumbnails_module.render_thumbnail = lambda *args: (calls.append(args), orig(*args))[1]
+t0 = time.perf_counter()
+batches, rendered = run(ThumbnailWorker(load_datasets([a, b]), paths, cache))
+dt = time.perf_counter() - t0
+assert rendered == 0 and calls == [] and len(batches) == 1 and batches[0] == got
+print(f"[OK] test 2: {len(paths)} cached icons in {dt * 1000:.1f} ms")
+
+# -- test 3: only the changed histogram is re-rendered --
+h = datasets["b"]["histos"]["/MC_TEST/obs_4"]
+datasets["b"]["histos"]["/MC_TEST/obs_4"] = dataclasses.replace(h, values=h.values * 2)
+batches, rendered = run(ThumbnailWorker(datasets, paths, cache))
+assert rendered == 1 and len(calls) == 1
+assert batches[-1] == {"/MC_TEST/obs_4": str(thumbnail_file(datasets, "/MC_TEST/obs_4", cache))}
+assert thumbnail_file(datasets, "/MC_TEST/obs_3", cache) == Path(got["/MC_TEST/obs_3"])
+thumbnails_module.render_thumbnail = orig
+print("[OK] test 3: changed histogram only")
+
+# -- test 4: PlotTab shows them in the observable list --
+tab = PlotTab()
+tab.thumbnail_dir = cache
+tab.load_yoda_path(a)
+tab.load_yoda_path(b)
+assert tab.wait_for_loads()
+
+
+def icons():
+    return [not tab.combo_obs.itemIcon(i).isNull() for i in range(tab.combo_obs.count())]
+
+
+deadline = time.monotonic() + 10
+while not all(icons()) and time.monotonic() < deadline:
+    app.processEvents()
+assert icons() and all(icons())
+tab.filter_edit.setText("obs_1")
+assert tab.combo_obs.count() == 1 and all(icons())
+print("[OK] test 4: PlotTab icons")
+
+print("\n=== ALL T34 TESTS PASSED ===")
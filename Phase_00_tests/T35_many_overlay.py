@@ -0,0 +1,106 @@
+"""T35 -- many-dataset overlay: one batched curve item and a quantile band."""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from PySide6.QtWidgets import QApplication
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+from hep_gui.config.constants import MANY_DATASETS
+from hep_gui.core.plot_pipeline import build_band, build_figure
+from hep_gui.core.yoda_parser import YodaHisto1D
+from hep_gui.gui.histogram_item import StepBandItem, StepBundleItem, StepHistogramItem
+from hep_gui.gui.plot_tab import PlotTab
+from yoda_fixtures import write_yoda
+
+N, BINS = 500, 60
+rng = np.random.default_rng(7)
+edges = np.linspace(0.0, 100.0, BINS + 1)
+shape = np.exp(-edges[:-1] / 30.0)
+
+
+def histo(vals):
+    err = np.sqrt(vals)
+    return YodaHisto1D("/MC_TEST/obs", "", list(edges), vals, -err, err.copy())
+
+
+datasets = {
+    f"ds{i:03d}": {"path": Path(f"ds{i:03d}.yoda"), "histos": {"/MC_TEST/obs": histo(
+        1000 * shape * rng.uniform(0.5, 1.5) * rng.normal(1.0, 0.05, BINS).clip(0.5))}, "titles": {}}
+    for i in range(N)
+}
+
+# -- test 1: band values are the per-bin quantiles --
+fig = build_figure(datasets, "/MC_TEST/obs", normalize=False)
+band = build_band(fig.series)
+stack = np.stack([s.plot_vals for s in fig.series])
+assert band.n == N
+assert np.allclose(band.lo, np.quantile(stack, 0.16, axis=0))
+assert np.allclose(band.median, np.median(stack, axis=0))
+assert np.allclose(band.hi, np.quantile(stack, 0.84, axis=0))
+assert build_band(fig.series[:2]) is None
+print("[OK] test 1: build_band")
+
+# -- test 2: one item, one path per color bucket, curves not joined --
+bundle = StepBundleItem(edges, stack)
+assert len(bundle) == N and len(bundle._paths) == 16
+assert sum(path.elementCount() for _, path in bundle._paths) == N * 2 * BINS
+x0, x1 = bundle.dataBounds(0)
+y0, y1 = bundle.dataBounds(1)
+assert (x0, x1) == (0.0, 100.0) and np.isclose(y0, stack.min()) and np.isclose(y1, stack.max())
+assert bundle.curve_color(0) != bundle.curve_color(N - 1)
+few = StepBundleItem([edges, edges[:11]], [stack[0], stack[1, :10]])
+assert len(few) == 2 and len(few._paths) == 2
+bundle.setLogMode(False, True)
+assert np.isclose(bundle.dataBounds(1)[1], np.log10(stack.max()))
+print("[OK] test 2: StepBundleItem")
+
+# -- test 3: PlotTab draws 500 datasets as one item --
+tab = PlotTab()
+tab.resize(1000, 700)
+tab.show()
+tab._datasets = datasets
+tab.cb_many.setChecked(True)
+tab.cb_band.setChecked(True)
+tab._rebuild_paths()
+tab._rebuild_ref_combo()
+tab._apply_filter()
+items = tab.plot_widget.getPlotItem().items
+assert sum(isinstance(i, StepBundleItem) for i in items) == 1
+assert sum(isinstance(i, StepBandItem) for i in items) == 1
+assert not any(isinstance(i, StepHistogramItem) for i in items)
+assert sum(isinstance(i, StepBundleItem) for i in tab.ratio_widget.getPlotItem().items) == 1
+assert tab.view_state()["many"] and tab.view_state()["band"]
+print("[OK] test 3: one item for", N, "datasets")
+
+# -- test 4: panning repaints quickly --
+vb = tab.plot_widget.getViewBox()
+tab.plot_widget.grab()
+t0 = time.perf_counter()
+for k in range(20):
+    vb.translateBy(x=1.0)
+    tab.plot_widget.grab()
+dt = (time.perf_counter() - t0) / 20
+print(f"    {dt * 1000:.1f} ms per pan frame")
+assert dt < 0.1
+print("[OK] test 4: pan")
+
+# -- test 5: switches itself on past MANY_DATASETS files --
+small = write_yoda(Path(tempfile.mkdtemp()) / "small.yoda", n_obs=1)
+tab2 = PlotTab()
+for i in range(MANY_DATASETS):
+    tab2.load_yoda_path(small)
+assert not tab2.cb_many.isChecked()
+tab2.load_yoda_path(small)
+assert tab2.cb_many.isChecked() and tab2.wait_for_loads()
+print("[OK] test 5: on past", MANY_DATASETS, "datasets")
+
+print("\n=== ALL T35 TESTS PASSED ===")
@@ -0,0 +1,100 @@
+"""T36 -- hover readout of bin contents (BinReadout, PlotTab crosshair)."""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from PySide6.QtWidgets import QApplication
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+from PySide6.QtCore import QPointF
+
+from hep_gui.core.plot_pipeline import BinReadout, build_figure
+from hep_gui.core.yoda_parser import YodaHisto1D
+from hep_gui.gui.plot_tab import PlotTab
+from yoda_fixtures import write_yoda
+
+
+def histo(edges, vals, err):
+    vals = np.asarray(vals, dtype=float)
+    err = np.asarray(err, dtype=float)
+    return YodaHisto1D("/X/h", "", list(edges), vals, -err, err.copy())
+
+
+# -- test 1: values, errors and ratio of the bin under x --
+edges = [0.0, 1.0, 2.0, 4.0]
+ds = {
+    "a": {"histos": {"/X/h": histo(edges, [1.0, 4.0, 2.0], [0.5, 1.0, 0.5])}},
+    "b": {"histos": {"/X/h": histo(edges, [2.0, 2.0, 6.0], [0.5, 0.5, 1.0])}},
+}
+fig = build_figure(ds, "/X/h", normalize=False, ref_label="a")
+readout = BinReadout(fig)
+a, b = readout.at(1.5)
+assert (a.label, a.lo, a.hi, a.value, a.err_up, a.ratio) == ("a", 1.0, 2.0, 4.0, 1.0, 1.0)
+assert (b.label, b.value, b.err_dn, b.ratio) == ("b", 2.0, 0.5, 0.5)
+assert readout.at(2.0)[1].value == 6.0  # an edge belongs to the bin it opens
+assert readout.at(-0.1) == [] and readout.at(4.0) == []
+print("[OK] test 1: BinReadout.at")
+
+# -- test 2: one lookup per binning, fast with many datasets --
+n_bins = 100_000
+big_edges = np.linspace(0, 1, n_bins + 1)
+rng = np.random.default_rng(3)
+many = {f"d{i}": {"histos": {"/X/h": histo(big_edges, rng.random(n_bins), np.full(n_bins, 0.1))}}
+        for i in range(200)}
+readout = BinReadout(build_figure(many, "/X/h", normalize=False))
+t0 = time.perf_counter()
+for x in rng.random(200):
+    rows = readout.at(x)
+dt = (time.perf_counter() - t0) / 200
+assert len(rows) == 200
+i = int(x * n_bins)
+assert rows[7].value == many["d7"]["histos"]["/X/h"].values[i]
+print(f"    {dt * 1e3:.2f} ms per lookup (200 datasets x {n_bins} bins)")
+assert dt < 0.01
+print("[OK] test 2: speed")
+
+# -- test 3: PlotTab crosshair and readout line --
+tmp = Path(tempfile.mkdtemp())
+tab = PlotTab()
+tab.resize(1000, 700)
+tab.show()
+tab.load_yoda_path(write_yoda(tmp / "one.yoda", n_obs=2, seed=1))
+tab.load_yoda_path(write_yoda(tmp / "two.yoda", n_obs=2, seed=2))
+assert tab.wait_for_loads()
+tab.select_observable("/MC_TEST/obs_0")
+app.processEvents()
+vb = tab.plot_widget.getViewBox()
+(x0, x1), (y0, y1) = vb.viewRange()
+x = x0 + 0.4 * (x1 - x0)
+tab._on_mouse_moved((vb.mapViewToScene(QPointF(x, (y0 + y1) / 2)),))
+assert tab.crosshair.isVisible() and abs(tab.crosshair.value() - x) < 1e-6 * (x1 - x0)
+text = tab.label_readout.text()
+assert "one:" in text and "two:" in text and "±" in text
+fig = tab.current_figure()
+rows = BinReadout(fig).at(x)
+assert f"{rows[1].value:.4g}" in text and f"({rows[1].ratio:.3f})" in text
+tab._on_mouse_moved((QPointF(-10, -10),))
+assert not tab.crosshair.isVisible()
+print("[OK] test 3: PlotTab readout")
+
+# -- test 4: same bin is not redrawn, log x maps back to data units --
+tab.label_readout.setText("sentinel")
+tab.show_readout(x)
+assert tab.label_readout.text() == "sentinel"
+tab.cb_logx.setChecked(True)
+(x0, x1), (y0, y1) = vb.viewRange()
+lx = x0 + 0.5 * (x1 - x0)
+tab._on_mouse_moved((vb.mapViewToScene(QPointF(lx, (y0 + y1) / 2)),))
+row = BinReadout(tab.current_figure()).at(10 ** lx)[0]
+assert f"[{row.lo:.6g}, {row.hi:.6g}]" in tab.label_readout.text()
+print("[OK] test 4: bin cache, log x")
+
+print("\n=== ALL T36 TESTS PASSED ===")
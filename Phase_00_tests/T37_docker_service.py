@@ -0,0 +1,129 @@
+"""T37 -- shared Docker service: one client, cached daemon and image state."""
+
+import queue
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+import docker
+
+from hep_gui.core.docker_interface import DockerService, docker_service
+
+
+class Events:
+    """Blocking events stream fed from the test, like docker's CancellableStream."""
+
+    def __init__(self):
+        self.q = queue.Queue()
+
+    def __iter__(self):
+        while True:
+            item = self.q.get()
+            if item is None:
+                return
+            yield item
+
+    def close(self):
+        self.q.put(None)
+
+
+class Images:
+    def __init__(self, client):
+        self.client = client
+
+    def get(self, tag):
+        self.client.calls.append("images.get")
+        if tag not in self.client.tags:
+            raise docker.errors.ImageNotFound(tag)
+
+
+class Client:
+    def __init__(self):
+        self.calls = []
+        self.tags = {"hep:1"}
+        self.up = True
+        self.images = Images(self)
+        self.stream = None
+
+    def ping(self):
+        self.calls.append("ping")
+        if not self.up:
+            raise docker.errors.DockerException("connection refused")
+
+    def version(self):
+        self.calls.append("version")
+        return {"Version": "27.0"}
+
+    def events(self, decode, filters):
+        self.stream = Events()
+        return self.stream
+
+
+def wait(cond, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not cond() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return cond()
+
+
+# -- test 1: cached within the TTL, one client --
+connects = []
+client = Client()
+svc = DockerService(ttl=60, connect=lambda: connects.append(1) or client)
+svc._watch = lambda: None  # no events stream for this test
+assert svc.status() == (True, "27.0") and svc.has_image("hep:1") and not svc.has_image("other:2")
+n = len(client.calls)
+for _ in range(100):
+    assert svc.status()[0] and svc.has_image("hep:1") and svc.client is client
+assert len(client.calls) == n and connects == [1]
+print("[OK] test 1: cached")
+
+# -- test 2: TTL expiry and invalidate --
+svc.ttl = 0.0
+assert svc.status()[0] and len(client.calls) == n + 2
+svc.ttl = 60
+svc.invalidate("hep:1")
+client.tags.discard("hep:1")
+assert not svc.has_image("hep:1")
+client.up = False
+assert svc.status(refresh=True) == (False, "connection refused")
+print("[OK] test 2: ttl, invalidate")
+
+# -- test 3: events stream keeps image state current --
+client = Client()
+svc = DockerService(ttl=0.0, connect=lambda: client)
+assert svc.status()[0] and not svc.has_image("new:1")
+assert wait(lambda: svc.watching and client.stream is not None)
+n = len(client.calls)
+# ttl is 0, but while watching nothing goes back to the daemon
+assert svc.status()[0] and not svc.has_image("new:1") and len(client.calls) == n
+client.stream.q.put({"Type": "image", "Action": "pull", "Actor": {"Attributes": {"name": "new:1"}}})
+assert wait(lambda: svc.has_image("new:1")) and len(client.calls) == n
+client.stream.q.put({"Type": "image", "Action": "delete", "Actor": {"Attributes": {}}})
+assert wait(lambda: not svc._images)
+print("[OK] test 3: events")
+
+# -- test 4: stream lost -> cache dropped, daemon asked again --
+client.stream.close()
+assert wait(lambda: not svc.watching)
+assert svc._status is None
+client.up = False
+assert svc.status()[0] is False
+svc.stop()
+print("[OK] test 4: stream lost")
+
+# -- test 5: no daemon at all --
+def refuse():
+    raise docker.errors.DockerException("Error while fetching server API version")
+
+
+svc = DockerService(connect=refuse)
+ok, info = svc.status()
+assert not ok and "server API version" in info and svc.client is None and not svc.has_image("hep:1")
+assert docker_service() is docker_service()
+print("[OK] test 5: no daemon")
+
+print("\n=== ALL T37 TESTS PASSED ===")
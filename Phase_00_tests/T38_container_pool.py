@@ -0,0 +1,154 @@
+"""T38 -- warm container pool, jobs run through exec."""
+
+import sys
+import threading
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from PySide6.QtWidgets import QApplication
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+from hep_gui.config.constants import DOCKER_SHELL
+from hep_gui.core.compiler_cache import with_ccache
+from hep_gui.core.container_pool import POOL_LABEL, ContainerPool, ExecWorker, exec_argv, parse_env
+from hep_gui.core.rivet_build import build_rivetbuild_command
+
+
+class Container:
+    def __init__(self, client, n):
+        self.client = client
+        self.id = f"c{n}"
+        self.status = "running"
+        self.env_captures = 0
+
+    def exec_run(self, argv):
+        assert argv == ["bash", "-l", "-c", "env -0"]
+        self.env_captures += 1
+        return 0, b"PATH=/usr/bin:/opt/rivet/bin\0RIVET_DATA_PATH=/opt/rivet/share\0SHLVL=1\0"
+
+    def reload(self):
+        pass
+
+    def kill(self):
+        self.status = "exited"
+        self.client.api.killed.set()
+
+    def remove(self, force=False):
+        self.client.removed.append(self.id)
+
+
+class Containers:
+    def __init__(self, client):
+        self.client = client
+        self.started = []
+
+    def run(self, image, cmd, volumes, labels, detach, init):
+        assert cmd == ["sleep", "infinity"] and labels == {POOL_LABEL: "1"} and detach
+        c = Container(self.client, len(self.started))
+        self.started.append(c)
+        return c
+
+    def list(self, all, filters):
+        assert filters == {"label": POOL_LABEL}
+        return [Container(self.client, "stale")]
+
+
+class Api:
+    def __init__(self):
+        self.execs = {}
+        self.killed = threading.Event()
+        self.block = False
+
+    def exec_create(self, container_id, argv, environment, workdir):
+        exec_id = f"e{len(self.execs)}"
+        self.execs[exec_id] = (container_id, argv, environment)
+        return {"Id": exec_id}
+
+    def exec_start(self, exec_id, stream, demux):
+        yield b"Compiling Rivet_X.so\n", None
+        if self.block:
+            self.killed.wait(5)
+            return
+        yield b"line 2\nline 3\n", None
+
+    def exec_inspect(self, exec_id):
+        return {"ExitCode": 3 if "fail" in self.execs[exec_id][1][-1] else 0}
+
+
+class Client:
+    def __init__(self):
+        self.removed = []
+        self.containers = Containers(self)
+        self.api = Api()
+
+
+def run(worker):
+    lines, codes, errors = [], [], []
+    worker.log_lines.connect(lambda batch: lines.extend(line.text for line in batch))
+    worker.finished.connect(codes.append)
+    worker.error.connect(errors.append)
+    worker.run()
+    assert not errors, errors
+    return lines, codes[0]
+
+
+# -- test 1: login shell dropped, environment parsed once --
+cmd = build_rivetbuild_command("MY_ANA.cc")
+assert cmd.startswith(DOCKER_SHELL)
+build = with_ccache("cd /data/analysis && rivet-build RivetMY_ANA.so MY_ANA.cc", "/data/analysis")
+assert exec_argv(cmd) == ["bash", "-c", build]
+assert exec_argv(["rivet", "--list"]) == ["rivet", "--list"]
+assert parse_env(b"A=1\0B=x=y\0_=/usr/bin/env\0") == {"A": "1", "B": "x=y"}
+print("[OK] test 1: exec_argv, parse_env")
+
+# -- test 2: second job reuses the warm container --
+client = Client()
+pool = ContainerPool(client, max_jobs=3)
+lines, code = run(ExecWorker(pool, "hep:1", cmd))
+assert lines == ["Compiling Rivet_X.so", "line 2", "line 3"] and code == 0
+assert client.removed == ["cstale"]  # left over from an earlier session
+lines, code = run(ExecWorker(pool, "hep:1", 'bash -l -c "false fail"'))
+assert code == 3 and len(client.containers.started) == 1
+c = client.containers.started[0]
+assert c.env_captures == 1
+_, argv, env = client.api.execs["e1"]
+assert argv == ["bash", "-c", "false fail"] and env["RIVET_DATA_PATH"] == "/opt/rivet/share"
+assert "SHLVL" not in env
+print("[OK] test 2: warm reuse")
+
+# -- test 3: replaced after max_jobs, or when no longer running --
+run(ExecWorker(pool, "hep:1", cmd))
+assert client.removed == ["cstale", "c0"] and not pool._idle["hep:1"]
+run(ExecWorker(pool, "hep:1", cmd))
+client.containers.started[1].status = "exited"
+run(ExecWorker(pool, "hep:1", cmd))
+assert len(client.containers.started) == 3 and "c1" in client.removed
+print("[OK] test 3: recycled")
+
+# -- test 4: cancel kills the container, which is not reused --
+client.api.block = True
+worker = ExecWorker(pool, "hep:1", cmd)
+codes = []
+worker.finished.connect(codes.append)
+threading.Timer(0.1, worker.stop_container).start()  # the GUI thread, in the app
+worker.run()
+assert codes == [137] and "c2" in client.removed
+assert not pool._idle["hep:1"] and not pool._busy
+print("[OK] test 4: cancel")
+
+# -- test 5: idle list bounded, shutdown removes everything --
+client.api.block = False
+pool = ContainerPool(Client(), max_idle=1)
+a, b = pool.acquire("hep:1"), pool.acquire("hep:1")
+pool.release(a)
+pool.release(b)
+assert pool._idle["hep:1"] == [a] and b.container.id in pool.client.removed
+busy = pool.acquire("hep:2")
+pool.shutdown()
+assert {a.container.id, busy.container.id} <= set(pool.client.removed)
+print("[OK] test 5: idle bound, shutdown")
+
+print("\n=== ALL T38 TESTS PASSED ===")
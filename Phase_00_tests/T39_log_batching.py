@@ -0,0 +1,151 @@
+"""T39 -- batched log delivery (LineBatcher, DockerWorker.log_lines, LogPanel.append_lines)."""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from PySide6.QtWidgets import QApplication
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+from PySide6.QtCore import QEventLoop, QTimer
+from PySide6.QtGui import QColor
+
+from hep_gui.core.docker_interface import DockerWorker, LineBatcher
+from hep_gui.core.log_framing import LOG_BATCH_INTERVAL, LOG_BATCH_LINES, frame_output
+from hep_gui.gui.log_panel import LogPanel
+
+N_LINES = 200_000
+
+
+class Container:
+    id = "c0"
+
+    def wait(self):
+        return {"StatusCode": 0}
+
+    def remove(self):
+        pass
+
+
+class Containers:
+    def run(self, image, cmd, volumes, environment, detach):
+        return Container()
+
+
+# program output as docker hands it over: 4 KiB frames cutting lines anywhere
+OUTPUT = "".join(f"gfortran -c file_{i}.f\n" if i % 2 else f"event {i} done\n" for i in range(N_LINES)).encode()
+
+
+class Api:
+    def attach(self, container_id, stream, logs, demux):
+        for i in range(0, len(OUTPUT), 4096):
+            yield OUTPUT[i:i + 4096], None
+
+
+class Client:
+    containers = Containers()
+    api = Api()
+
+
+# -- test 1: batches by size, by time, in order --
+batches = []
+batcher = LineBatcher(batches.append, interval=0.05, max_lines=100)
+batcher.add([str(i) for i in range(250)])
+assert [len(b) for b in batches] == [250]  # over max_lines: sent at once
+batcher.add(["a"])
+batcher.add(["b"])
+assert len(batches) == 1
+time.sleep(0.15)
+assert batches[1] == ["a", "b"]  # the tail goes out after the window, without more lines
+batcher.add(["c"])
+batcher.flush()
+batcher.flush()
+assert batches[2] == ["c"] and len(batches) == 3
+print("[OK] test 1: LineBatcher")
+
+# -- test 2: LogPanel bulk append, colors, build filter --
+panel = LogPanel()
+panel.append_line("starting")
+panel.append_lines(["ok 1", "ERROR: bad", "Warning: meh", "ok 2"])
+doc = panel._text_edit.document()
+assert doc.isEmpty()  # drawn on the next render tick
+panel.flush()
+assert doc.blockCount() == 5 and doc.toPlainText().splitlines()[3] == "Warning: meh"
+
+
+def color(block):
+    return doc.findBlockByNumber(block).begin().fragment().charFormat().foreground().color()
+
+
+assert color(2) == QColor("#cc0000") and color(3) == QColor("#cc7700") and color(4) != color(2)
+panel.append_lines(["gfortran -c a.f", "done"])
+panel.flush()
+panel._btn_filter.setChecked(True)
+assert "gfortran" not in doc.toPlainText() and doc.blockCount() == 6
+panel._btn_filter.setChecked(False)
+assert doc.blockCount() == 7 and len(panel._lines) == 7
+print("[OK] test 2: append_lines")
+
+# -- test 3: worker -> panel throughput --
+panel = LogPanel()
+panel.resize(800, 400)
+panel.show()
+worker = DockerWorker(Client(), "img", "cmd")
+received, done, sizes = [], [], []
+worker.log_lines.connect(lambda lines: sizes.append(len(lines)))
+worker.log_lines.connect(panel.append_lines)
+worker.finished.connect(done.append)
+# the event loop idles as in the app; a 10 ms timer measures how late it gets
+loop = QEventLoop()
+worker.finished.connect(lambda _code: loop.quit())
+ticks = []
+timer = QTimer()
+timer.timeout.connect(lambda: ticks.append(time.perf_counter()))
+timer.start(10)
+t0 = time.perf_counter()
+worker.start()
+loop.exec()
+worker.wait()
+panel.flush()
+timer.stop()
+stalls = np.diff(ticks) if len(ticks) > 1 else [0.0]
+dt = time.perf_counter() - t0
+rate = N_LINES / dt
+assert sum(sizes) == N_LINES == len(panel._lines) and done == [0]
+assert panel._text_edit.document().blockCount() == N_LINES
+print(f"    {rate:,.0f} lines/s in {len(sizes)} batches, longest GUI stall {max(stalls) * 1000:.0f} ms")
+assert rate > 100_000
+# with one CPU the producer thread takes turns with the GUI thread, test 4 covers the panel
+assert max(stalls) < 0.05 or os.cpu_count() == 1
+print("[OK] test 3: throughput")
+
+# -- test 4: a flood of lines is drawn in short slices --
+panel = LogPanel()
+panel.resize(800, 400)
+panel.show()
+lines = [line for batch in frame_output(Client.api.attach("c0", True, True, True)) for line in batch]
+batches = [lines[i:i + LOG_BATCH_LINES] for i in range(0, N_LINES, LOG_BATCH_LINES)]
+# batches arrive as fast as LineBatcher sends full ones, the 10 ms timer measures the GUI
+feed = QTimer()
+feed.timeout.connect(lambda: panel.append_lines(batches.pop(0)) if batches else None)
+feed.start(int(LOG_BATCH_INTERVAL * 1000))
+ticks = []
+timer.start(10)
+while batches or panel._pending:
+    app.processEvents(QEventLoop.WaitForMoreEvents)
+timer.stop()
+feed.stop()
+stalls = np.diff(ticks)
+assert panel._text_edit.document().blockCount() == N_LINES
+print(f"    longest GUI stall {max(stalls) * 1000:.0f} ms")
+assert max(stalls) < 0.05
+print("[OK] test 4: responsive under a flood")
+
+print("\n=== ALL T39 TESTS PASSED ===")
@@ -0,0 +1,85 @@
+"""T40 -- container output cut into lines (core/log_framing.py)."""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from hep_gui.core.log_framing import LineFramer, LogLine, format_line, frame_output
+
+
+def texts(batches):
+    return [line.text for batch in batches for line in batch]
+
+
+# -- test 1: lines split and merged across frames --
+f = LineFramer("out")
+assert f.feed(b"Generating ev", 1.0) == []
+assert f.feed(b"ents\nINFO: done\nlast", 2.0) == [LogLine("out", 2.0, "Generating events"), LogLine("out", 2.0, "INFO: done")]
+assert f.feed(b"\n\n   \n", 3.0) == [LogLine("out", 3.0, "last")]  # blank lines dropped
+assert f.close(4.0) == []
+f.feed(b"no newline at the end", 5.0)
+assert f.close(6.0) == [LogLine("out", 6.0, "no newline at the end")]
+print("[OK] test 1: frame boundaries")
+
+# -- test 2: multibyte UTF-8 cut mid-character --
+data = "σ = 1.2 pb ± 3 %\n→ écrit\n".encode()
+cut = data.index("±".encode()) + 1
+f = LineFramer("out")
+lines = f.feed(data[:cut], 0) + f.feed(data[cut:], 0)
+assert [l.text for l in lines] == ["σ = 1.2 pb ± 3 %", "→ écrit"]
+assert LineFramer("err").feed(b"bad \xff byte\n", 0)[0].text == "bad � byte"
+print("[OK] test 2: utf-8")
+
+# -- test 3: \r progress lines keep their last state, \r\n is a plain newline --
+f = LineFramer("out")
+assert f.feed(b"  10%\r  20%\r", 0) == []
+assert f._partial == "  20%\r"  # bounded while the bar runs
+assert [l.text for l in f.feed(b"  30%\r 100%\nnext line\r\n", 0)] == [" 100%", "next line"]
+f.feed(b"windows\r", 0)
+assert [l.text for l in f.feed(b"\nok\n", 0)] == ["windows", "ok"]
+print("[OK] test 3: carriage returns")
+
+# -- test 4: demuxed stdout / stderr, stamped with arrival time --
+clock = iter([10.0, 11.0, 12.0, 13.0]).__next__
+batches = list(frame_output([(b"out 1\nout", None), (None, b"err 1\n"), (b" 2\n", b"err 2\n")], clock))
+assert batches == [
+    [LogLine("out", 10.0, "out 1")],
+    [LogLine("err", 11.0, "err 1")],
+    [LogLine("out", 12.0, "out 2"), LogLine("err", 12.0, "err 2")],
+]
+assert list(frame_output([(b"tail", None)], iter([1.0, 2.0]).__next__)) == [[LogLine("out", 2.0, "tail")]]
+line = format_line(LogLine("err", time.mktime((2026, 1, 31, 14, 5, 9, 0, 0, -1)) + 0.25, "x"))
+assert line == "2026-01-31 14:05:09.250 err x"
+print("[OK] test 4: demux, timestamps")
+
+# -- test 5: any chunking gives the same lines --
+rng = np.random.default_rng(5)
+source = "".join(
+    f"event {i}: é±→ {'x' * rng.integers(0, 200)}{chr(13) + 'progress' if i % 7 == 0 else ''}\n"
+    for i in range(3000)
+).encode()
+expected = texts(frame_output([(source, None)]))
+assert len(expected) == 3000 and expected[7].endswith("progress")
+for _ in range(20):
+    cuts = np.sort(rng.integers(0, len(source), rng.integers(1, 2000)))
+    pieces = [source[a:b] for a, b in zip(np.r_[0, cuts], np.r_[cuts, len(source)])]
+    assert texts(frame_output([(p, None) for p in pieces])) == expected
+print("[OK] test 5: chunking independent")
+
+# -- test 6: throughput on 64 KiB frames --
+big = b"".join(f"Compiling file_{i}.f with gfortran -O2\n".encode() for i in range(500_000))
+frames = [(big[i:i + 65536], None) for i in range(0, len(big), 65536)]
+t0 = time.perf_counter()
+n = sum(len(batch) for batch in frame_output(frames))
+rate = n / (time.perf_counter() - t0)
+assert n == 500_000
+print(f"    {rate:,.0f} lines/s")
+assert rate > 300_000
+print("[OK] test 6: throughput")
+
+print("\n=== ALL T40 TESTS PASSED ===")
@@ -0,0 +1,247 @@
+"""T41 -- job scheduler: priority queue, concurrent jobs, Docker resource limits."""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+import requests
+from PySide6.QtWidgets import QApplication, QTabWidget, QWidget
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+import hep_gui.core.job_scheduler as job_scheduler_module
+from hep_gui.config.constants import DOCKER_IMAGE
+from hep_gui.core.docker_interface import DockerWorker
+from hep_gui.core.fake_docker import FakeDockerClient
+from hep_gui.core.job_scheduler import (
+    CANCELLED, FAILED, FINISHED, QUEUED, RUNNING,
+    DockerBackend, Job, JobScheduler, Resources, cpuset_size,
+)
+from hep_gui.core.workflow_engine import WorkflowEngine
+from hep_gui.gui.analysis_tab import AnalysisTab
+from hep_gui.gui.generate_tab import GenerateTab
+from hep_gui.gui.script_tab import ScriptTab
+
+
+class Container:
+    def __init__(self, n, cmd):
+        self.id = f"c{n}"
+        self.cmd = cmd
+        self.release = threading.Event()
+        self.code = 0
+
+    def wait(self):
+        return {"StatusCode": self.code}
+
+    def kill(self):
+        self.code = 137
+        self.release.set()
+
+    def remove(self):
+        pass
+
+
+class Containers:
+    def __init__(self):
+        self.started = []   # (cmd, limits)
+        self.live = {}
+
+    def run(self, image, cmd, volumes, environment, detach, **limits):
+        c = Container(len(self.started), cmd)
+        self.started.append((cmd, limits))
+        self.live[cmd] = c
+        return c
+
+
+class Api:
+    def __init__(self, containers):
+        self.containers = containers
+
+    def attach(self, container_id, stream, logs, demux):
+        c = next(c for c in self.containers.live.values() if c.id == container_id)
+        yield f"{c.cmd} started\n".encode(), None
+        c.release.wait(5)
+
+
+class Client:
+    def __init__(self):
+        self.containers = Containers()
+        self.api = Api(self.containers)
+
+    def finish(self, cmd):
+        self.containers.live[cmd].release.set()
+
+
+def spin(cond, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not cond() and time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.005)
+    return cond()
+
+
+def started(client):
+    return [cmd for cmd, _ in client.containers.started]
+
+
+# -- test 1: resources as Docker limits --
+assert cpuset_size("0-7,16,20-21") == 11
+r = Resources(cpus=2.5, mem="8g", cpuset="0-3")
+assert r.docker_kwargs() == {"nano_cpus": 2_500_000_000, "mem_limit": "8g", "cpuset_cpus": "0-3"}
+assert r.cost == 2.5 and Resources(cpuset="0-3").cost == 4 and Resources().cost == 1
+assert Resources().docker_kwargs() == {}
+print("[OK] test 1: Resources")
+
+# -- test 2: N at once, the rest by priority then submission order --
+client = Client()
+sched = JobScheduler(max_jobs=2, client=client)
+states, logs = [], []
+sched.job_state.connect(lambda job: states.append((job.name, job.state)))
+sched.job_log.connect(lambda job, lines: logs.extend((job.name, line.text) for line in lines))
+jobs = {name: Job("hep:1", name, resources=Resources(cpus=4, mem="2g"), priority=prio, name=name)
+        for name, prio in [("a", 0), ("b", 0), ("c", 0), ("d", 5), ("e", 0)]}
+for job in jobs.values():
+    sched.submit(job)
+assert spin(lambda: len(logs) == 2)
+assert set(started(client)) == {"a", "b"} and [j.name for j in sched.queued] == ["d", "c", "e"]
+assert client.containers.started[0][1] == {"nano_cpus": 4_000_000_000, "mem_limit": "2g"}
+assert set(logs) == {("a", "a started"), ("b", "b started")}
+client.finish("b")
+assert spin(lambda: jobs["b"].state == FINISHED and jobs["d"].state == RUNNING)
+assert started(client)[2] == "d" and jobs["b"].exit_code == 0
+for name in ("a", "d", "c", "e"):
+    assert spin(lambda: name in client.containers.live)
+    client.finish(name)
+assert spin(lambda: all(job.done for job in jobs.values()))
+assert started(client)[2:] == ["d", "c", "e"]
+assert [s for n, s in states if n == "c"] == [QUEUED, RUNNING, FINISHED]
+print("[OK] test 2: concurrency and priority")
+
+# -- test 3: CPU budget, a big job is not overtaken --
+client = Client()
+sched = JobScheduler(max_jobs=8, cpu_budget=8, client=client)
+small = [sched.submit(Job("hep:1", f"s{i}", resources=Resources(cpus=3))) for i in range(2)]
+big = sched.submit(Job("hep:1", "big", resources=Resources(cpuset="0-5")))
+late = sched.submit(Job("hep:1", "late", resources=Resources(cpus=1)))
+assert spin(lambda: len(client.containers.started) == 2)
+assert big.state == QUEUED and late.state == QUEUED  # 6 + 6 > 8, late waits behind big
+client.finish("s0")
+time.sleep(0.05)
+assert spin(lambda: small[0].done) and big.state == QUEUED
+client.finish("s1")
+assert spin(lambda: big.state == RUNNING and late.state == RUNNING)
+assert client.containers.started[2][1] == {"cpuset_cpus": "0-5"}
+client.finish("big")
+client.finish("late")
+assert spin(lambda: big.done and late.done)
+print("[OK] test 3: CPU budget")
+
+# -- test 4: cancel queued and running jobs --
+client = Client()
+sched = JobScheduler(max_jobs=1, client=client)
+first = sched.submit(Job("hep:1", "first"))
+second = sched.submit(Job("hep:1", "second"))
+assert spin(lambda: "first" in client.containers.live)
+sched.cancel(second)
+assert second.state == CANCELLED
+sched.cancel(first)
+assert spin(lambda: first.done) and first.state == CANCELLED and first.exit_code == 137
+assert started(client) == ["first"] and not sched.jobs()
+print("[OK] test 4: cancel")
+
+# -- test 5: tabs queue several runs, WorkflowEngine counts them --
+client = Client()
+sched = JobScheduler(max_jobs=1, client=client)
+tabs = QTabWidget()
+gen_tab = GenerateTab(ScriptTab(), scheduler=sched)
+analysis_tab = AnalysisTab(scheduler=sched)
+tabs.addTab(gen_tab, "Generation")
+tabs.addTab(analysis_tab, "Analysis")
+tabs.addTab(QWidget(), "Plots")
+wf = WorkflowEngine(tabs, gen_tab, analysis_tab, tabs.widget(2), scheduler=sched)
+for name in ("run_x", "run_y"):
+    job = Job("hep:1", name, name=name, owner="generate")
+    gen_tab._jobs[job] = Path(f"/nonexistent/_run_{name}.txt")
+    sched.submit(job)
+    gen_tab._set_state_running()
+assert tabs.tabText(0) == "Generation (2)" and tabs.tabText(1) == "Analysis"
+assert gen_tab.label_status.text() == "Running 1, queued 1" and gen_tab.btn_cancel.isEnabled()
+panel = gen_tab.log_panel
+assert spin(lambda: panel.flush() or "[run_x] run_x started" in panel._text_edit.toPlainText())
+gen_tab.cancel_run()
+assert spin(lambda: not gen_tab._jobs)
+assert tabs.tabText(0) == "Generation" and not gen_tab.btn_cancel.isEnabled()
+assert started(client) == ["run_x"]
+print("[OK] test 5: tabs and WorkflowEngine")
+
+# -- test 6: pooled jobs don't wait for a generation --
+class Unpooled(DockerBackend):
+    """Pooled jobs in containers of the fake client too."""
+
+    def make_worker(self, job):
+        return DockerWorker(self._client, job.image, job.cmd)
+
+
+client = Client()
+sched = JobScheduler(max_jobs=1, cpu_budget=8, backend=Unpooled(client), max_pooled=2)
+gen = sched.submit(Job("hep:1", "gen", resources=Resources(cpus=8)))
+gen_2 = sched.submit(Job("hep:1", "gen_2", resources=Resources(cpus=8)))
+rivet = [sched.submit(Job("hep:1", f"rivet_{i}", resources=Resources(cpus=1), pooled=True)) for i in range(3)]
+assert spin(lambda: len(client.containers.started) == 3)
+assert gen.state == RUNNING and gen_2.state == QUEUED
+assert [j.state for j in rivet] == [RUNNING, RUNNING, QUEUED]
+client.finish("rivet_0")
+assert spin(lambda: rivet[2].state == RUNNING) and gen_2.state == QUEUED
+for name in ("gen", "rivet_1", "rivet_2", "gen_2"):
+    assert spin(lambda: name in client.containers.live)
+    client.finish(name)
+assert spin(lambda: all(j.done for j in [gen, gen_2, *rivet]))
+print("[OK] test 6: pooled jobs in their own slots")
+
+# -- test 7: a job whose stream breaks frees its slot --
+fake = FakeDockerClient()
+attach = fake.api.attach
+
+
+def broken_attach(container, **kwargs):
+    """The daemon restarts mid-run, once."""
+    fake.api.attach = attach
+    yield b"started\n", None
+    raise requests.exceptions.ConnectionError("Connection aborted.")
+
+
+fake.api.attach = broken_attach
+sched = JobScheduler(max_jobs=1, client=fake)
+broken = sched.submit(Job(DOCKER_IMAGE, "sleep infinity", name="broken"))
+after = sched.submit(Job(DOCKER_IMAGE, "true", name="after"))
+assert spin(lambda: broken.done)
+assert broken.state == FAILED and "Connection aborted" in broken.error
+assert spin(lambda: after.state == FINISHED) and after.exit_code == 0
+assert fake._containers == {}  # the broken job's container removed, not left running
+assert spin(lambda: not any(t.name == "container-stats" for t in threading.enumerate()))
+print("[OK] test 7: unexpected worker error")
+
+# -- test 8: no Docker client, the job fails at once --
+class NoDaemon:
+    client = None
+
+    def status(self):
+        return False, "connection refused"
+
+
+sched = JobScheduler(max_jobs=1)
+service, job_scheduler_module.docker_service = job_scheduler_module.docker_service, NoDaemon
+try:
+    first = sched.submit(Job(DOCKER_IMAGE, "true", name="first"))
+    second = sched.submit(Job(DOCKER_IMAGE, "true", name="second"))
+finally:
+    job_scheduler_module.docker_service = service
+assert first.state == second.state == FAILED and not sched.running and not sched.queued
+assert first.error == "Docker is not reachable: connection refused"
+print("[OK] test 8: no Docker client")
+
+print("\n=== ALL T41 TESTS PASSED ===")
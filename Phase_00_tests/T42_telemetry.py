@@ -0,0 +1,142 @@
+"""T42 -- container resource telemetry: stats sampling, series, live view, telemetry.json."""
+
+import json
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from PySide6.QtWidgets import QApplication
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+import hep_gui.gui.generate_tab as generate_tab
+from hep_gui.core.job_scheduler import FINISHED, Job, JobScheduler
+from hep_gui.core.telemetry import (
+    TELEMETRY_FILE, StatsRecorder, StatsSample, TelemetrySeries, stats_sample,
+)
+from hep_gui.gui.generate_tab import GenerateTab
+from hep_gui.gui.script_tab import ScriptTab
+from hep_gui.gui.telemetry_view import SPARK_POINTS, format_bytes
+
+GB = 1024 ** 3
+
+
+def stats(i, v2=False):
+    """Docker stats document i: 2 of 8 cores busy, memory growing by 100 MB per sample."""
+    mem_detail = {"inactive_file": 50 << 20} if v2 else {"cache": 50 << 20}
+    read, write = ("read", "write") if v2 else ("Read", "Write")
+    return {
+        "cpu_stats": {"cpu_usage": {"total_usage": 2_000_000_000 * (i + 1)},
+                      "system_cpu_usage": 8_000_000_000 * (i + 1), "online_cpus": 8},
+        "precpu_stats": {"cpu_usage": {"total_usage": 2_000_000_000 * i},
+                         "system_cpu_usage": 8_000_000_000 * i},
+        "memory_stats": {"usage": (150 + 100 * i) << 20, "stats": mem_detail},
+        "blkio_stats": {"io_service_bytes_recursive": [
+            {"op": read, "value": 1000 * i}, {"op": write, "value": 500}, {"op": "Total", "value": 9}]},
+        "networks": {"eth0": {"rx_bytes": 10 * i, "tx_bytes": 5}},
+    }
+
+
+# -- test 1: one stats document -> StatsSample --
+for v2 in (False, True):
+    s = stats(3, v2)
+    sample = stats_sample(s, now=7.0)
+    assert sample == StatsSample(7.0, 200.0, 400 << 20, 3500, 35), sample
+assert stats_sample({"cpu_stats": {}, "precpu_stats": {}}) is None  # first document of a stream
+print("[OK] test 1: stats_sample")
+
+# -- test 2: series keeps one per interval, bounded --
+series = TelemetrySeries(interval=1.0, max_points=100)
+assert series.add(StatsSample(0.0, 1, 1, 0, 0)) and not series.add(StatsSample(0.5, 1, 1, 0, 0))
+for t in range(1, 250):
+    series.add(StatsSample(float(t), t, t * GB, 0, 0))
+assert len(series) <= 100 and series.interval == 4.0
+times = [s.time for s in series.samples()]
+assert times[0] == 0.0 and all(b - a >= 1.0 for a, b in zip(times, times[1:]))
+summary = series.summary()
+assert summary["cpu_peak"] == times[-1] and summary["rss_peak"] == times[-1] * GB
+print("[OK] test 2: TelemetrySeries")
+
+# -- test 3: recorder thread, stopped with the container --
+class Container:
+    id = "c0"
+
+    def __init__(self, n, period, runtime=0.3):
+        self.n, self.period, self.runtime = n, period, runtime
+        self.done = threading.Event()
+
+    def stats(self, stream, decode):
+        assert stream and decode
+        for i in range(self.n):
+            if self.done.wait(self.period):
+                return
+            yield stats(i)
+
+    def wait(self):
+        time.sleep(self.runtime)
+        self.done.set()
+        return {"StatusCode": 0}
+
+    def remove(self):
+        pass
+
+
+got = []
+rec = StatsRecorder(Container(5, 0.0), got.append, TelemetrySeries(interval=0.0)).start()
+rec._thread.join(2)
+assert len(got) == 5 == len(rec.series) and got[4].rss == 500 << 20
+# I/O counted from the first sample, as for a pooled container used before
+assert [(g.blk, g.net) for g in got] == [(1000 * i, 10 * i) for i in range(5)] and got == rec.series.samples()
+assert rec.series.to_dict()["blk_bytes"][0] == 0 and rec.series.summary()["net_bytes"] == 40
+rec = StatsRecorder(object()).start()  # no stats() at all: ends quietly
+rec._thread.join(2)
+assert not rec._thread.is_alive() and len(rec.series) == 0
+print("[OK] test 3: StatsRecorder")
+
+
+# -- test 4: DockerWorker -> scheduler -> tab view and telemetry.json --
+class Containers:
+    def run(self, image, cmd, volumes, environment, detach, **limits):
+        return Container(1000, 0.1, runtime=2.3)  # ~3 samples a second apart
+
+
+class Api:
+    def attach(self, container_id, stream, logs, demux):
+        yield b"working\n", None
+
+
+class Client:
+    containers = Containers()
+    api = Api()
+
+
+tmp = Path(tempfile.mkdtemp())
+generate_tab.RUNS_DIR = tmp
+sched = JobScheduler(max_jobs=2, client=Client())
+tab = GenerateTab(ScriptTab(), scheduler=sched)
+view = tab.telemetry_view
+assert not view.isVisibleTo(tab)
+job = Job("hep:1", "mg5", name="run_t", owner="generate")
+tab._jobs[job] = tmp / "_run_t.txt"
+sched.submit(job)
+deadline = time.monotonic() + 5
+while job.state != FINISHED and time.monotonic() < deadline:
+    app.processEvents()
+    time.sleep(0.005)
+assert job.state == FINISHED and len(job.telemetry) >= 2
+assert view.isVisibleTo(tab) and view.label_job.text() == "run_t"
+assert 0 < len(view.spark_cpu._values) <= SPARK_POINTS and view.label_cpu.text() == "CPU 200%"
+saved = json.loads((tmp / "run_t" / TELEMETRY_FILE).read_text())
+assert len(saved["time"]) == len(saved["rss_bytes"]) == len(job.telemetry)
+assert saved["summary"]["cpu_peak"] == 200.0 and saved["time"][0] == 0.0
+assert format_bytes(512) == "512 B" and format_bytes(3 * GB // 2) == "1.5 GB"
+view.resize(600, 30)
+view.grab()  # paints the sparklines
+print("[OK] test 4: live view, telemetry.json")
+
+print("\n=== ALL T42 TESTS PASSED ===")
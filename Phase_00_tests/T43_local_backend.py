@@ -0,0 +1,213 @@
+"""T43 -- native execution backend: path mapping, LocalWorker with DockerWorker semantics."""
+
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from PySide6.QtWidgets import QApplication
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+from hep_gui.config.constants import DOCKER_IMAGE, MG5_BIN, PYTHIA8_LIB
+from hep_gui.core.container_pool import ContainerPool, ExecWorker
+from hep_gui.core.docker_interface import DockerWorker
+from hep_gui.core.execution import (
+    ExecutionBackend, JobWorker, LocalBackend, LocalWorker, PathMap, cpuset_cores, exit_status, local_argv,
+)
+from hep_gui.core.fake_docker import FakeDockerClient
+from hep_gui.core.job_scheduler import FINISHED, DockerBackend, Job, JobScheduler, execution_backend
+from hep_gui.core.rivet_build import build_rivet_command
+from hep_gui.gui.generate_tab import _build_command
+
+tmp = Path(tempfile.mkdtemp())
+pmap = PathMap({"/data": tmp / "data", "/work": tmp / "work", "/work/MG5_aMC": tmp / "mg5"})
+
+
+def run(worker):
+    lines, codes, errors = [], [], []
+    worker.log_lines.connect(lines.extend)
+    worker.finished.connect(codes.append)
+    worker.error.connect(errors.append)
+    worker.start()  # as in the app: every signal queued to this thread, in order
+    while not worker.wait(10):
+        app.processEvents()
+    app.processEvents()
+    return [(line.stream, line.text) for line in lines], codes, errors
+
+
+# -- test 1: container paths mapped by whole components --
+cmd = pmap.map(_build_command("_run_1.txt", "ggH"))
+assert f"{tmp}/mg5/bin/mg5_aMC {tmp}/data/scripts/_run_1.txt" in cmd
+assert f"LD_PRELOAD={tmp}/mg5/HEPTools/pythia8/lib/libpythia8.so" in cmd
+assert f"cp -r {tmp}/work/ggH/Events {tmp}/data/runs/ggH/" in cmd
+assert pmap.map("/workspace /data2 x/data /work") == f"/workspace /data2 x/data {tmp}/work"
+assert pmap.map("output /work/ggH\nlaunch /work/ggH") == f"output {tmp}/work/ggH\nlaunch {tmp}/work/ggH"
+argv = local_argv(build_rivet_command(["MC_JETS"], "/data/runs/a.hepmc", "/data/analysis/a.yoda"), pmap)
+assert argv[:3] == ["bash", "-l", "-c"] and f"{tmp}/data/runs/a.hepmc" in argv[3]
+assert cpuset_cores("0-2,5") == [0, 1, 2, 5] and exit_status(-9) == 137 and exit_status(3) == 3
+print("[OK] test 1: PathMap")
+
+# -- test 2: streaming, stdout / stderr kept apart, exit code --
+worker = LocalWorker(["bash", "-c", "printf 'one\\ntw'; sleep 0.05; echo o; sleep 0.05; echo bad >&2; exit 3"], pmap)
+assert isinstance(worker, JobWorker)
+lines, codes, errors = run(worker)
+assert lines == [("out", "one"), ("out", "two"), ("err", "bad")] and codes == [3] and not errors
+print("[OK] test 2: output and exit code")
+
+# -- test 3: same lines and code as DockerWorker on the same output --
+class Container:
+    id = "c0"
+
+    def wait(self):
+        return {"StatusCode": 3}
+
+    def remove(self):
+        pass
+
+    def stats(self, stream, decode):
+        return iter(())
+
+
+class Containers:
+    def run(self, image, cmd, volumes, environment, detach):
+        return Container()
+
+
+class Api:
+    def attach(self, container_id, stream, logs, demux):
+        yield b"one\ntw", None
+        yield b"o\n", b"bad\n"
+
+
+class Client:
+    containers = Containers()
+    api = Api()
+
+
+assert run(DockerWorker(Client(), "img", "cmd")) == (lines, codes, errors)
+print("[OK] test 3: same as DockerWorker")
+
+# -- test 4: cancel kills the whole process group, 137 like a killed container --
+pid_file = tmp / "child.pid"
+worker = LocalWorker(["bash", "-c", f"sleep 30 & echo $! > {pid_file}; echo started; wait"], pmap)
+threading.Timer(0.3, worker.stop_container).start()
+t0 = time.perf_counter()
+lines, codes, errors = run(worker)
+assert codes == [137] and lines == [("out", "started")] and time.perf_counter() - t0 < 5
+child = int(pid_file.read_text())
+time.sleep(0.1)
+try:
+    os.kill(child, 0)
+    state = Path(f"/proc/{child}/stat").read_text().split()[2]
+    assert state == "Z", "sleep survived the cancel"
+except ProcessLookupError:
+    pass
+assert run(LocalWorker(["bash", "-c", "kill -TERM $$"], pmap))[1] == [143]
+assert run(LocalWorker(["/nonexistent/mg5_aMC"], pmap))[2]  # error, no finished
+cancelled = LocalWorker(["true"], pmap)
+cancelled.stop_container()
+assert run(cancelled)[1] == [137]
+print("[OK] test 4: cancel, signals, errors")
+
+# -- test 5: a generation run end to end through the scheduler, no container --
+mg5 = tmp / "mg5" / "bin" / "mg5_aMC"
+mg5.parent.mkdir(parents=True)
+mg5.write_text(
+    "#!/bin/bash\n"
+    "out=$(sed -n 's/^output //p' \"$1\")\n"
+    "mkdir -p \"$out/Events/run_01\" && echo HepMC > \"$out/Events/run_01/events.hepmc\"\n"
+    "echo \"INFO: 100 events in $out\"\n"
+)
+mg5.chmod(0o755)
+backend = LocalBackend(pmap, work_dir=tmp / "work")
+ok, info = backend.check("MG5")
+assert ok and str(mg5) in info
+# no rivet on PATH: analysis jobs can't run, nor is the backend ready for all jobs
+(tmp / "bash-only").mkdir()
+(tmp / "bash-only" / "bash").symlink_to(shutil.which("bash"))
+with patch.dict(os.environ, {"PATH": str(tmp / "bash-only")}):
+    assert backend.check("rivet") == (False, f"MG5 at {mg5}, rivet not found") and not backend.check()[0]
+with patch.dict(os.environ, {"PATH": ""}):
+    assert backend.check("MG5") == (False, "bash not found")
+(tmp / "data" / "scripts").mkdir(parents=True)
+script = "generate p p > h\noutput /work/ggH\nlaunch /work/ggH\n"
+(tmp / "data" / "scripts" / "_run_1.txt").write_text(backend.map_text(script))
+sched = JobScheduler(max_jobs=2, backend=backend)
+job = sched.submit(Job("unused", _build_command("_run_1.txt", "ggH"), name="ggH"))
+out = []
+sched.job_log.connect(lambda j, batch: out.extend(line.text for line in batch))
+deadline = time.monotonic() + 10
+while not job.done and time.monotonic() < deadline:
+    app.processEvents()
+    time.sleep(0.01)
+assert job.state == FINISHED and job.exit_code == 0, (job.state, job.exit_code, out)
+assert (tmp / "data" / "runs" / "ggH" / "Events" / "run_01" / "events.hepmc").exists()
+assert f"INFO: 100 events in {tmp}/work/ggH" in out
+print("[OK] test 5: local generation run")
+
+# -- test 6: backend from the settings --
+assert isinstance(execution_backend({"backend": "docker"}), DockerBackend)
+local = execution_backend({"backend": "local", "local_mg5_dir": str(tmp / "mg5")})
+assert isinstance(local, LocalBackend) and local.path_map.map(MG5_BIN) == str(mg5)
+assert local.path_map.map(PYTHIA8_LIB) == f"{tmp}/mg5/HEPTools/pythia8/lib"
+print("[OK] test 6: execution_backend")
+
+# -- test 7: jobs start in their workdir, abstract bases --
+(tmp / "data" / "analysis").mkdir()
+job = sched.submit(Job("unused", ["pwd"], name="pwd", pooled=True, workdir="/data/analysis"))
+out.clear()
+deadline = time.monotonic() + 10
+while not job.done and time.monotonic() < deadline:
+    app.processEvents()
+    time.sleep(0.01)
+assert job.exit_code == 0 and out == [str(tmp / "data" / "analysis")], out
+
+
+class Unstoppable(JobWorker):
+    def run(self):
+        pass
+
+
+for cls in (Unstoppable, ExecutionBackend):
+    try:
+        cls()
+        raise AssertionError(f"{cls.__name__} instantiated")
+    except TypeError:
+        pass
+print("[OK] test 7: workdir, abstract bases")
+
+# -- test 8: every worker ends with exactly one of finished / error, whatever fails --
+def breaks(*args, **kwargs):
+    """A stream that fails in a way no worker expects."""
+    yield b"started\n", None
+    raise RuntimeError("stream broke")
+
+
+fake = FakeDockerClient()
+fake.api.attach = breaks
+pool = ContainerPool(fake, {})
+pool.exec_stream = lambda pc, cmd, workdir=None: ("exec", breaks())
+local = LocalWorker(["sleep", "30"], pmap)
+with patch("hep_gui.core.execution._read_pipes", breaks):
+    results = {
+        "local": run(local),
+        "docker": run(DockerWorker(fake, DOCKER_IMAGE, "sleep infinity")),
+        "exec": run(ExecWorker(pool, DOCKER_IMAGE, "true")),
+    }
+for name, (lines, codes, errors) in results.items():
+    assert codes == [] and errors == ["stream broke"], (name, codes, errors)
+    assert lines == [("out", "started")], (name, lines)
+assert local._proc.poll() is not None  # killed, not left running
+assert fake._containers == {}          # container removed, pooled one discarded
+pool.shutdown()
+print("[OK] test 8: worker contract on unexpected errors")
+
+print("\n=== ALL T43 TESTS PASSED ===")
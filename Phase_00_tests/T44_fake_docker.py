@@ -0,0 +1,176 @@
+"""T44 -- in-process fake Docker: GUI pipeline end to end without a daemon, timed."""
+
+import gzip
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+# before the app creates its client: docker_service() hands out the fake
+os.environ["HEP_GUI_FAKE_DOCKER"] = "1"
+os.environ["HEP_GUI_FAKE_LINES"] = "50000"
+
+from PySide6.QtCore import QTimer
+from PySide6.QtWidgets import QApplication
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+import docker
+
+import hep_gui.gui.generate_tab as generate_tab
+from hep_gui.config.constants import DOCKER_IMAGE
+from hep_gui.core.container_pool import ContainerPool, ExecWorker
+from hep_gui.core.docker_interface import DockerService, DockerWorker, PullWorker, docker_service
+from hep_gui.core.fake_docker import FakeConfig, FakeDockerClient
+from hep_gui.core.job_scheduler import FINISHED, Job, JobScheduler, Resources
+from hep_gui.core.rivet_build import build_mkhtml_command, build_rivet_command, build_rivetbuild_command
+from hep_gui.core.yoda_parser import parse_yoda
+from hep_gui.gui.generate_tab import GenerateTab, _build_command
+from hep_gui.gui.script_tab import ScriptTab
+
+tmp = Path(tempfile.mkdtemp())
+volumes = {str(tmp): {"bind": "/data", "mode": "rw"}}
+for name in ("scripts", "runs", "analysis"):
+    (tmp / name).mkdir()
+SCRIPT = "import model sm\ngenerate g g > h\noutput /work/ggH\nlaunch /work/ggH\nset nevents 250\n"
+
+
+def spin(cond, timeout=20):
+    deadline = time.monotonic() + timeout
+    while not cond() and time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.002)
+    assert cond(), "timed out"
+
+
+def run(worker):
+    lines, codes, errors = [], [], []
+    worker.log_lines.connect(lines.extend)
+    worker.finished.connect(codes.append)
+    worker.error.connect(errors.append)
+    worker.start()
+    while not worker.wait(10):
+        app.processEvents()
+    app.processEvents()
+    return lines, codes, errors
+
+
+# -- test 1: a generation run through GenerateTab, timed --
+assert isinstance(docker_service().client, FakeDockerClient)
+generate_tab.DATA_DIR, generate_tab.SCRIPTS_DIR, generate_tab.RUNS_DIR = tmp, tmp / "scripts", tmp / "runs"
+script_tab = ScriptTab()
+script_tab.editor.setPlainText(SCRIPT)
+sched = JobScheduler(max_jobs=2)
+tab = GenerateTab(script_tab, scheduler=sched)
+tab.resize(900, 600)
+tab.show()
+ticks = []
+timer = QTimer()
+timer.timeout.connect(lambda: ticks.append(time.perf_counter()))
+timer.start(10)
+t0 = time.perf_counter()
+tab.start_run()
+(job,) = tab._jobs
+spin(lambda: job.done)
+dt = time.perf_counter() - t0
+tab.log_panel.flush()
+timer.stop()
+assert job.state == FINISHED and job.exit_code == 0, (job.state, job.exit_code)
+hepmc = tmp / "runs" / "ggH" / "Events" / "run_01" / "tag_1_pythia8_events.hepmc.gz"
+with gzip.open(hepmc, "rt") as f:
+    assert sum(line.startswith("E ") for line in f) == 250
+texts = [line.text for line in tab.log_panel._lines]
+n_lines = len(texts)
+assert n_lines > 50_000 and texts[-1].startswith("--- HepMC files at:")
+assert any(line.stream == "err" and line.text.startswith("Warning: Unused") for line in tab.log_panel._lines)
+assert not list(tmp.glob("scripts/_run_*.txt"))  # temp script cleaned up
+stalls = np.diff(ticks) if len(ticks) > 1 else [0.0]
+print(f"    {n_lines / dt:,.0f} lines/s end to end, longest GUI stall {max(stalls) * 1000:.0f} ms")
+assert max(stalls) < 1.0
+print("[OK] test 1: generation run, no daemon")
+
+# -- test 2: rivet in the warm pool on the generated events --
+client = FakeDockerClient(FakeConfig(lines=200))
+pool = ContainerPool(client, volumes)
+sched = JobScheduler(max_jobs=2, client=client, pool=pool)
+cmd = build_rivet_command(["MC_JETS", "MC_HIGGS"], "/data/runs/ggH/Events/run_01/tag_1_pythia8_events.hepmc.gz",
+                          "/data/analysis/ggH.yoda")
+jobs = [sched.submit(Job(DOCKER_IMAGE, cmd, resources=Resources(cpus=1), pooled=True)) for _ in range(2)]
+spin(lambda: all(j.done for j in jobs))
+assert [j.exit_code for j in jobs] == [0, 0]
+histos = parse_yoda(str(tmp / "analysis" / "ggH.yoda"))
+assert {"/MC_JETS/pT", "/MC_JETS/eta", "/MC_HIGGS/mass"} <= set(histos)
+assert len(histos["/MC_JETS/pT"].values) == 20
+assert parse_yoda(str(tmp / "analysis" / "ggH.yoda")).keys() == histos.keys()  # same seed, same file
+assert len(client.containers.list(filters={"label": "hep_gui.pool"})) == 2  # reused, not removed
+print("[OK] test 2: pooled rivet, YODA output")
+
+# -- test 3: other commands, failures --
+(tmp / "analysis" / "MY_ANA.cc").write_text("// analysis\n")
+out = client.containers.run(DOCKER_IMAGE, build_rivetbuild_command("MY_ANA"), volumes=volumes)
+assert b"g++" in out and (tmp / "analysis" / "RivetMY_ANA.so").exists()
+client.containers.run(DOCKER_IMAGE, build_mkhtml_command(["/data/analysis/ggH.yoda"], "/data/analysis/html"),
+                      volumes=volumes)
+assert "ggH.yoda" in (tmp / "analysis" / "html" / "index.html").read_text()
+try:
+    client.containers.run(DOCKER_IMAGE, build_rivet_command(["MC_JETS"], "/data/none.hepmc", "/data/x.yoda"),
+                          volumes=volumes)
+    raise AssertionError("missing input accepted")
+except docker.errors.ContainerError as e:
+    assert e.exit_status == 1
+try:
+    client.containers.run("no/such:image", "true")
+    raise AssertionError("missing image accepted")
+except docker.errors.ImageNotFound:
+    pass
+print("[OK] test 3: rivet-build, rivet-mkhtml, errors")
+
+# -- test 4: paced replay of a recorded log, cancel --
+logs = tmp / "logs"
+logs.mkdir()
+(logs / "mg5.log").write_text("".join(f"recorded line {i}\n" for i in range(400)))
+(tmp / "scripts" / "_run_1.txt").write_text(SCRIPT)
+paced = FakeDockerClient(FakeConfig(rate=1000, log_dir=logs))
+t0 = time.perf_counter()
+lines, codes, errors = run(DockerWorker(paced, DOCKER_IMAGE, _build_command("_run_1.txt", "ggH"), volumes))
+dt = time.perf_counter() - t0
+assert [line.text for line in lines] == [f"recorded line {i}" for i in range(400)] and codes == [0]
+assert 0.3 < dt < 2.0, dt
+slow = FakeDockerClient(FakeConfig(rate=50))
+worker = DockerWorker(slow, DOCKER_IMAGE, _build_command("_run_1.txt", "ggH"), volumes)
+threading.Timer(0.3, worker.stop_container).start()
+t0 = time.perf_counter()
+lines, codes, errors = run(worker)
+assert codes == [137] and 0 < len(lines) < 100 and time.perf_counter() - t0 < 2
+assert not slow.containers.list(all=True)
+pool = ContainerPool(slow, volumes)
+worker = ExecWorker(pool, DOCKER_IMAGE, build_rivet_command(["MC_JETS"], "/data/runs/ggH/Events/run_01/"
+                                                            "tag_1_pythia8_events.hepmc.gz", "/data/y.yoda"))
+threading.Timer(0.3, worker.stop_container).start()
+assert run(worker)[1] == [137] and not (tmp / "y.yoda").exists()
+print("[OK] test 4: paced replay, cancel")
+
+# -- test 5: image pull seen through the events stream --
+bare = FakeDockerClient(images=())
+service = DockerService(connect=lambda: bare)
+assert service.status() == (True, "27.0.0-fake") and not service.has_image(DOCKER_IMAGE)
+progress, done = [], []
+pull = PullWorker(bare, DOCKER_IMAGE)
+pull.progress.connect(progress.append)
+pull.finished.connect(done.append)
+pull.start()
+spin(lambda: done)
+assert done == [True] and progress
+spin(lambda: service._images.get(DOCKER_IMAGE, (False,))[0])  # from the pull event, no query
+assert service.has_image(DOCKER_IMAGE)
+service.stop()
+print("[OK] test 5: pull, events")
+
+print("\n=== ALL T44 TESTS PASSED ===")
@@ -0,0 +1,134 @@
+"""T45 -- ccache in the generation and rivet-build commands (run natively, stub ccache; real one if installed)."""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from PySide6.QtWidgets import QApplication
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+from hep_gui.core.compiler_cache import with_ccache
+from hep_gui.core.container_pool import exec_argv
+from hep_gui.core.execution import LocalWorker, PathMap
+from hep_gui.core.rivet_build import build_rivetbuild_command
+from hep_gui.gui.generate_tab import _build_command
+
+tmp = Path(tempfile.mkdtemp())
+pmap = PathMap({"/data": tmp / "data", "/work": tmp / "work", "/work/MG5_aMC": tmp / "mg5"})
+for d in ("data/scripts", "data/analysis", "work", "mg5/bin", "mg5/HEPTools/pythia8/lib", "bin", "tools"):
+    (tmp / d).mkdir(parents=True)
+# something LD_PRELOAD can load
+libm = next(p for p in map(Path, ("/lib/x86_64-linux-gnu/libm.so.6", "/lib64/libm.so.6", "/usr/lib/libm.so.6"))
+            if p.exists())
+(tmp / "mg5" / "HEPTools" / "pythia8" / "lib" / "libpythia8.so").symlink_to(libm)
+
+# ccache stand-in: called as a compiler, logs the call and runs the real one
+# found after the link directory, as ccache's masquerade mode does
+ccache = tmp / "bin" / "ccache"
+ccache.write_text(
+    "#!/bin/bash\n"
+    "name=$(basename \"$0\")\n"
+    "if [ \"$name\" = ccache ]; then\n"
+    "  [ \"$1\" = --show-log-stats ] && echo \"Compiler calls: $(wc -l < $CCACHE_STATSLOG)\"\n"
+    "  exit 0\n"
+    "fi\n"
+    "echo \"$name $CCACHE_DIR $CCACHE_BASEDIR\" >> $CCACHE_STATSLOG\n"
+    "PATH=${PATH#*ccache-bin:} exec $name \"$@\"\n"
+)
+ccache.chmod(0o755)
+tools = f"{tmp / 'tools'}:{os.environ['PATH']}"
+with_stub = {"PATH": f"{tmp / 'bin'}:{tools}"}
+
+mg5 = tmp / "mg5" / "bin" / "mg5_aMC"
+mg5.write_text(
+    "#!/bin/bash\n"
+    "out=$(sed -n 's/^output //p' \"$1\")\n"
+    "mkdir -p \"$out/Events\" && cd \"$out\" || exit 2\n"
+    "echo 'int f(void) { return 1; }' > matrix.c\n"
+    "gcc -c matrix.c -o matrix.o || exit 3\n"
+    "exit 1  # MG5 3.6.7 on quit\n"
+)
+mg5.chmod(0o755)
+(tmp / "data" / "scripts" / "_run_1.txt").write_text(f"output {tmp}/work/ggH\nlaunch\n")
+
+
+def run(worker):
+    """Lines and exit code of worker; commands run without -l, as in the pool, to keep the stub PATH."""
+    lines, codes, errors = [], [], []
+    worker.cmd = exec_argv(worker.cmd)
+    worker.log_lines.connect(lines.extend)
+    worker.finished.connect(codes.append)
+    worker.error.connect(errors.append)
+    worker.start()
+    while not worker.wait(10):
+        app.processEvents()
+    app.processEvents()
+    assert not errors, errors
+    return [line.text for line in lines], codes[0]
+
+
+# -- test 1: generation compiles through ccache, cache under data/.cache --
+lines, code = run(LocalWorker(_build_command("_run_1.txt", "ggH"), pmap, environment=with_stub))
+assert code == 0 and (tmp / "work" / "ggH" / "matrix.o").exists(), lines
+assert (tmp / "data" / "runs" / "ggH" / "Events").is_dir()
+assert lines[-2:] == ["--- ccache ---", "Compiler calls: 1"], lines
+assert not list(Path("/tmp").glob("ccache.*.log"))  # stats log removed
+print("[OK] test 1: generation through ccache")
+
+# -- test 2: what the compiler saw: cache dir and base dir mapped, per job log --
+probe = tmp / "probe.sh"
+probe.write_text("#!/bin/bash\ncat $CCACHE_STATSLOG\n")
+probe.chmod(0o755)
+cmd = ["bash", "-c", with_ccache(f"gcc --version >/dev/null && {probe}", "/work")]
+lines, code = run(LocalWorker(cmd, pmap, environment=with_stub))
+assert code == 0 and f"gcc {tmp}/data/.cache/ccache {tmp}/work" in lines, lines
+print("[OK] test 2: CCACHE_DIR / CCACHE_BASEDIR")
+
+# -- test 3: rivet-build, exit code kept through the report --
+rivet_build = tmp / "tools" / "rivet-build"
+rivet_build.write_text("#!/bin/bash\ng++ -x c++ -shared -fPIC -o \"$1\" \"$2\"\n")
+rivet_build.chmod(0o755)
+(tmp / "data" / "analysis" / "MY_ANA.cc").write_text("int analysis() { return 0; }\n")
+lines, code = run(LocalWorker(build_rivetbuild_command("MY_ANA.cc"), pmap, environment=with_stub))
+assert code == 0 and (tmp / "data" / "analysis" / "RivetMY_ANA.so").exists(), lines
+assert lines[-1] == "Compiler calls: 1"
+(tmp / "data" / "analysis" / "BAD.cc").write_text("not c++\n")
+lines, code = run(LocalWorker(build_rivetbuild_command("BAD.cc"), pmap, environment=with_stub))
+assert code != 0 and "--- ccache ---" in lines
+print("[OK] test 3: rivet-build")
+
+# -- test 4: no ccache in the image: compiled as before, noted in the log --
+no_ccache = {"PATH": tools}
+lines, code = run(LocalWorker(build_rivetbuild_command("MY_ANA.cc"), pmap, environment=no_ccache))
+assert code == 0 and lines[0] == "ccache not found in the image, compiling without cache", lines
+assert "--- ccache ---" not in lines
+print("[OK] test 4: without ccache")
+
+# -- test 5: the real ccache: the same source under another run name hits --
+real = shutil.which("ccache")
+if real is None:
+    print("SKIP: test 5, ccache not installed")
+else:
+    env = {"CCACHE_DIR": str(tmp / "data" / ".cache" / "ccache")}
+    for run_name in ("run_a", "run_b"):
+        src = tmp / "work" / run_name / "matrix.c"
+        src.parent.mkdir()
+        src.write_text("int f(void) { return 1; }\n")
+        cmd = ["bash", "-c", with_ccache(f"cd {src.parent} && gcc -c matrix.c -o matrix.o", "/work")]
+        lines, code = run(LocalWorker(cmd, pmap))
+        assert code == 0 and (src.parent / "matrix.o").exists() and "--- ccache ---" in lines, lines
+    out = subprocess.run([real, "--print-stats"], env=dict(os.environ, **env),
+                         capture_output=True, text=True, check=True).stdout
+    stats = dict(line.split("\t") for line in out.splitlines() if "\t" in line)
+    hits = int(stats.get("direct_cache_hit", 0)) + int(stats.get("preprocessed_cache_hit", 0))
+    assert (hits, int(stats.get("cache_miss", 0))) == (1, 1), stats
+    print("[OK] test 5: real ccache, 1 hit of 2")
+
+print("\n=== ALL T45 TESTS PASSED ===")
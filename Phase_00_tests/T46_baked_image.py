@@ -0,0 +1,198 @@
+"""T46 -- derived image with the environment baked in, exec-form commands."""
+
+import os
+import sys
+import tarfile
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+os.environ["HEP_GUI_FAKE_DOCKER"] = "1"
+os.environ["HEP_GUI_FAKE_LINES"] = "200"
+
+from docker import errors as docker_errors
+from PySide6.QtWidgets import QApplication
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+import hep_gui.core.baked_image as baked_image
+import hep_gui.gui.analysis_tab as analysis_tab
+import hep_gui.gui.generate_tab as generate_tab
+from hep_gui.config.constants import DOCKER_IMAGE, DOCKER_IMAGE_BAKED, DOCKER_SHELL
+from hep_gui.core.baked_image import (
+    BASE_LABEL, GENERATE_SCRIPT, RUN_SCRIPT, ImageBaker, build_context, exec_form, image_baker,
+)
+from hep_gui.core.container_pool import ContainerPool
+from hep_gui.core.docker_interface import docker_service
+from hep_gui.core.execution import LocalWorker, PathMap
+from hep_gui.core.fake_docker import FakeDockerClient
+from hep_gui.core.job_scheduler import FINISHED, Job, JobScheduler
+from hep_gui.core.rivet_build import build_rivet_command, rivet_argv, rivetbuild_argv
+from hep_gui.gui.analysis_tab import AnalysisTab
+from hep_gui.gui.generate_tab import GenerateTab, _build_argv
+from hep_gui.gui.script_tab import ScriptTab
+
+tmp = Path(tempfile.mkdtemp())
+
+
+def spin(cond, timeout=20):
+    deadline = time.monotonic() + timeout
+    while not cond() and time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.002)
+    assert cond(), "timed out"
+
+
+# -- test 1: argv lists, no shell, no quoting --
+assert _build_argv("_run_1.txt", "ggH") == [
+    "hep-gui-run", "/work", "hep-gui-generate", "/data/scripts/_run_1.txt", "ggH"]
+assert rivet_argv(["MC_JETS", " MC_XS "], "/data/runs/a b.hepmc", "/data/analysis/a.yoda") == [
+    "rivet", "--analysis=MC_JETS,MC_XS", "/data/runs/a b.hepmc", "-o", "/data/analysis/a.yoda"]
+assert rivetbuild_argv("MY_ANA.cc") == ["hep-gui-run", "/data/analysis", "rivet-build", "RivetMY_ANA.so", "MY_ANA.cc"]
+assert build_rivet_command(["MC_JETS"], "/data/a.hepmc", "/data/a.yoda").startswith(DOCKER_SHELL)  # kept
+print("[OK] test 1: argv builders")
+
+# -- test 2: the image: base label, login environment, scripts --
+client = FakeDockerClient()
+baker = ImageBaker(client)
+assert baker.ensure() and baker.wait(10), baker.error
+image = client.images.get(DOCKER_IMAGE_BAKED)
+base_id = client.images.get(DOCKER_IMAGE).id
+assert image.labels[BASE_LABEL] == base_id
+assert image.env["RIVET_ANALYSIS_PATH"] == "/data/analysis" and "HOSTNAME" not in image.env
+assert image.files == {"hep-gui-run": RUN_SCRIPT, "hep-gui-generate": GENERATE_SCRIPT}
+assert not baker.ensure()  # current: nothing to do
+again = ImageBaker(client)
+assert again.ensure() and again.wait(10)
+assert client.images.get(DOCKER_IMAGE_BAKED).id == image.id  # not rebuilt
+client._add_image(DOCKER_IMAGE)  # base pulled again
+again = ImageBaker(client)
+assert again.ensure() and again.wait(10)
+assert client.images.get(DOCKER_IMAGE_BAKED).labels[BASE_LABEL] == client.images.get(DOCKER_IMAGE).id != base_id
+with tarfile.open(fileobj=build_context(DOCKER_IMAGE, "sha256:x", {"A": 'say "hi"'})) as tar:
+    assert tar.getmember("hep-gui-run").mode == 0o755
+    text = tar.extractfile("Dockerfile").read().decode()
+assert text.splitlines()[:3] == [f"FROM {DOCKER_IMAGE}", 'LABEL hep_gui.base="sha256:x"', 'ENV A="say \\"hi\\""']
+print("[OK] test 2: ImageBaker")
+
+# -- test 3: the helper scripts run as they would in the image --
+pmap = PathMap({"/data": tmp / "data", "/work": tmp / "work", "/work/MG5_aMC": tmp / "mg5"})
+for d in ("data/scripts", "work", "mg5/bin", "mg5/HEPTools/pythia8/lib", "bin"):
+    (tmp / d).mkdir(parents=True)
+for name, text in (("hep-gui-run", RUN_SCRIPT), ("hep-gui-generate", GENERATE_SCRIPT)):
+    (tmp / "bin" / name).write_text(pmap.map(text))
+    (tmp / "bin" / name).chmod(0o755)
+libm = next(p for p in map(Path, ("/lib/x86_64-linux-gnu/libm.so.6", "/lib64/libm.so.6", "/usr/lib/libm.so.6"))
+            if p.exists())
+(tmp / "mg5" / "HEPTools" / "pythia8" / "lib" / "libpythia8.so").symlink_to(libm)
+mg5 = tmp / "mg5" / "bin" / "mg5_aMC"
+mg5.write_text(
+    "#!/bin/bash\n"
+    "out=$(sed -n 's/^output //p' \"$1\")\n"
+    "mkdir -p \"$out/Events/run_01\" && echo HepMC > \"$out/Events/run_01/events.hepmc\"\n"
+    "echo \"preload $LD_PRELOAD\"\n"
+    "exit 1  # MG5 3.6.7 on quit\n"
+)
+mg5.chmod(0o755)
+(tmp / "data" / "scripts" / "_run_1.txt").write_text(f"output {tmp}/work/ggH\nlaunch\n")
+env = {"PATH": f"{tmp / 'bin'}:{os.environ['PATH']}"}
+
+
+def run(worker):
+    lines, codes = [], []
+    worker.log_lines.connect(lines.extend)
+    worker.finished.connect(codes.append)
+    worker.start()
+    while not worker.wait(10):
+        app.processEvents()
+    app.processEvents()
+    return [line.text for line in lines], codes
+
+
+lines, codes = run(LocalWorker(_build_argv("_run_1.txt", "ggH"), pmap, environment=env))
+assert codes == [0], (lines, codes)
+assert f"preload {tmp}/mg5/HEPTools/pythia8/lib/libpythia8.so" in lines
+assert (tmp / "data" / "runs" / "ggH" / "Events" / "run_01" / "events.hepmc").exists()
+lines, codes = run(LocalWorker(["hep-gui-run", "/work", "bash", "-c", "exit 7"], pmap, environment=env))
+assert codes == [7]
+print("[OK] test 3: hep-gui-run, hep-gui-generate")
+
+# -- test 4: the tabs switch to the baked image once it is ready --
+data = tmp / "app"
+for d in ("scripts", "runs", "analysis"):
+    (data / d).mkdir(parents=True)
+generate_tab.DATA_DIR, generate_tab.SCRIPTS_DIR, generate_tab.RUNS_DIR = data, data / "scripts", data / "runs"
+analysis_tab.ANALYSIS_DIR, analysis_tab.RUNS_DIR = data / "analysis", data / "runs"
+analysis_tab.local_to_docker_path = lambda p: "/data/" + Path(p).relative_to(data).as_posix()
+fake = docker_service().client
+sched = JobScheduler(max_jobs=2, client=fake, pool=ContainerPool(fake, {str(data): {"bind": "/data", "mode": "rw"}}))
+
+script_tab = ScriptTab()
+script_tab.editor.setPlainText("generate g g > h\noutput /work/run_a\nlaunch /work/run_a\nset nevents 20\n")
+gen = GenerateTab(script_tab, scheduler=sched)
+assert not exec_form(sched.backend)
+gen.start_run()
+(job,) = gen._jobs
+assert job.image == DOCKER_IMAGE and isinstance(job.cmd, str)
+assert any(f"Building {DOCKER_IMAGE_BAKED}" in line.text for line in gen.log_panel._lines)
+spin(lambda: job.done)
+assert image_baker().wait(10) and exec_form(sched.backend)
+script_tab.editor.setPlainText("generate g g > h\noutput /work/run_b\nlaunch /work/run_b\nset nevents 20\n")
+gen.start_run()
+(job,) = gen._jobs
+assert job.image == DOCKER_IMAGE_BAKED and job.cmd == _build_argv(job.cmd[3].rsplit("/", 1)[1], "run_b")
+spin(lambda: job.done)
+assert job.state == FINISHED and job.exit_code == 0
+hepmc = data / "runs" / "run_b" / "Events" / "run_01" / "tag_1_pythia8_events.hepmc.gz"
+assert hepmc.exists()
+
+ana = AnalysisTab(scheduler=sched)
+ana.set_hepmc_path(str(hepmc))
+ana.input_analyses.setText("MC_JETS")
+(data / "analysis").rmdir()  # made again on the host for the exec-form job
+ana.start_run()
+(job,) = ana._jobs
+assert job.image == DOCKER_IMAGE_BAKED and job.cmd[0] == "rivet"
+spin(lambda: job.done)
+assert job.exit_code == 0 and (data / "analysis" / "tag_1_pythia8_events.yoda").exists()
+assert (data / "analysis" / "tag_1_pythia8_events.run_name").read_text() == "run_b\n"  # for the scan viewer
+(data / "analysis" / "MY_ANA.cc").write_text("// analysis\n")
+job = sched.submit(Job(DOCKER_IMAGE_BAKED, rivetbuild_argv("MY_ANA.cc"), pooled=True, workdir="/data/analysis"))
+spin(lambda: job.done)
+assert job.exit_code == 0 and (data / "analysis" / "RivetMY_ANA.so").exists()
+print("[OK] test 4: tabs on the baked image")
+
+# -- test 5: a failed build is logged once, not retried until the base changes --
+client = FakeDockerClient()
+builds = []
+
+
+def failing_build(**kwargs):
+    builds.append(kwargs["tag"])
+    raise docker_errors.BuildError("no space left on device", [])
+
+
+client.images.build = failing_build
+baker = baked_image._baker = ImageBaker(client)
+results = []
+gen._start_bake()
+assert not baker.wait(10) and builds == [DOCKER_IMAGE_BAKED] and "no space" in baker.error
+assert not baker.ensure(on_done=results.append) and results == [False]
+for _ in range(2):
+    gen._start_bake()
+    ana._start_bake()
+texts = [line.text for line in gen.log_panel._lines + ana.log_panel._lines]
+assert sum(f"ERROR: building {DOCKER_IMAGE_BAKED} failed" in t for t in texts) == 1, texts
+assert len(builds) == 1 and baker.take_error() is None
+client._add_image(DOCKER_IMAGE)  # base pulled again: worth another try
+del client.images.build
+assert baker.ensure(on_done=results.append) and baker.wait(10) and baker.error is None
+assert results == [False, True]
+baker.ensure(on_done=results.append)  # settled: called at once
+assert results == [False, True, True]
+print("[OK] test 5: failed build not retried on the same base")
+
+print("\n=== ALL T46 TESTS PASSED ===")
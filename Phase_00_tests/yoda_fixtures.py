@@ -0,0 +1,74 @@
+# yoda_fixtures.py -- write small synthetic YODA V3 files for tests
+#
+# data/analysis/*.yoda is not versioned, so tests that need a parsed file
+# build one here instead of skipping.
+
+import numpy as np
+
+
+def _fmt(x):
+    return "nan" if np.isnan(x) else f"{x:.6e}"
+
+
+def estimate_block(path, edges, values, errs, title=""):
+    lines = [
+        f"BEGIN YODA_ESTIMATE1D_V3 {path}",
+        f"Path: {path}",
+        f"Title: {title}",
+        "Type: Estimate1D",
+        "---",
+        "Edges(A1): [" + ", ".join(f"{e:.6e}" for e in edges) + "]",
+        'ErrorLabels: ["stats"]',
+        "# value\terrDn(1)\terrUp(1)",
+        "nan\t---\t---",
+    ]
+    for v, e in zip(values, errs):
+        lines.append(f"{_fmt(v)}\t{_fmt(-e)}\t{_fmt(e)}")
+    lines.append("nan\t---\t---")
+    lines.append("END YODA_ESTIMATE1D_V3")
+    return "\n".join(lines) + "\n\n"
+
+
+def histo_block(path, edges, sumw, sumw2, title=""):
+    lines = [
+        f"BEGIN YODA_HISTO1D_V3 {path}",
+        f"Path: {path}",
+        f"Title: {title}",
+        "Type: Histo1D",
+        "---",
+        "Edges(A1): [" + ", ".join(f"{e:.6e}" for e in edges) + "]",
+        "# sumW\tsumW2\tsumW(A1)\tsumW2(A1)\tnumEntries",
+        "0\t0\t0\t0\t0",
+    ]
+    for w, w2 in zip(sumw, sumw2):
+        lines.append(f"{_fmt(w)}\t{_fmt(w2)}\t0\t0\t1")
+    lines.append("0\t0\t0\t0\t0")
+    lines.append("END YODA_HISTO1D_V3")
+    return "\n".join(lines) + "\n\n"
+
+
+def counter_block(path, sumw, sumw2, n):
+    return (
+        f"BEGIN YODA_COUNTER_V3 {path}\nPath: {path}\nType: Counter\n---\n"
+        f"# sumW\tsumW2\tnumEntries\n{sumw}\t{sumw2}\t{n}\nEND YODA_COUNTER_V3\n\n"
+    )
+
+
+def write_yoda(path, n_obs=20, n_bins=30, seed=0, scale=1.0):
+    """Write a file with n_obs estimates, one raw histo and one counter.
+
+    Observables are /MC_TEST/obs_<i>; the same seed gives the same content.
+    """
+    rng = np.random.default_rng(seed)
+    edges = np.linspace(0.0, 100.0, n_bins + 1)
+    parts = [counter_block("/_EVTCOUNT", 100.0, 100.0, 100)]
+    for i in range(n_obs):
+        vals = scale * rng.exponential(10.0, n_bins) + 0.1
+        parts.append(estimate_block(f"/MC_TEST/obs_{i}", edges, vals, np.sqrt(vals) * 0.1,
+                                    title=f"observable {i}"))
+    sumw = rng.poisson(20, n_bins).astype(float)
+    parts.append(histo_block("/MC_TEST/raw_histo", edges, sumw, sumw))
+    parts.append(histo_block("/RAW/MC_TEST/obs_0", edges, sumw, sumw))
+    with open(path, "w") as f:
+        f.write("".join(parts))
+    return path
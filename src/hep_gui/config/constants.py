@@ -1,3 +1,4 @@
+import os
 import sys
 from pathlib import Path
 
@@ -12,6 +13,15 @@ MODELS_DIR   = DATA_DIR / "models"
 SCRIPTS_DIR  = DATA_DIR / "scripts"
 RUNS_DIR     = DATA_DIR / "runs"
 ANALYSIS_DIR = DATA_DIR / "analysis"
+SESSIONS_DIR = DATA_DIR / "sessions"
+CACHE_DIR    = DATA_DIR / ".cache"
+THUMBNAIL_DIR = CACHE_DIR / "thumbnails"
+# /work of the native backend: MG5 process directories
+LOCAL_WORK_DIR = DATA_DIR / "work"
+# compiler cache of generation and rivet-build jobs: data/.cache/ccache
+# seen through the /data mount
+CCACHE_DOCKER_DIR = "/data/.cache/ccache"
+CCACHE_MAX_SIZE   = "5G"
 
 SETTINGS_FILE = ROOT / "settings.json"
 
@@ -20,6 +30,9 @@ APP_VERSION = "1.0.0-beta"
 
 DOCKER_IMAGE          = "hepstore/rivet-tutorial:4.1.2"
 DOCKER_IMAGE_FALLBACK = "hepstore/rivet-tutorial:4.0.1"
+# built locally from DOCKER_IMAGE: login environment and helper scripts
+# baked in, commands run as argv lists (core/baked_image.py)
+DOCKER_IMAGE_BAKED    = "hep-gui/rivet-tutorial:4.1.2"
 
 # 4.1.2 has broken ROOT/cling, rivet-mkhtml can't run on it.
 # 4.0.2 works and reads 4.1.2 .yoda files fine.
@@ -35,6 +48,15 @@ DOCKER_SHELL = "bash -l -c"
 # MG5 bundles Pythia8 8.316 but system has 8.315, ABI mismatch
 PYTHIA8_LIB = "/work/MG5_aMC/HEPTools/pythia8/lib"
 
+# job scheduler: jobs running side by side, and the share of the machine
+# each generation container gets (nano_cpus); no memory limit by default
+JOB_SLOTS = max(1, (os.cpu_count() or 1) // 8)
+JOB_CPUS  = (os.cpu_count() or 1) / JOB_SLOTS
+JOB_MEM   = None
+# pooled jobs (rivet, rivet-build: short, one core) running side by side,
+# apart from JOB_SLOTS so they don't queue behind a generation
+POOLED_SLOTS = max(2, JOB_SLOTS)
+
 # YODA files don't contain axis labels -- these come from Rivet .plot files
 # prefix match on histogram path -> (xlabel, ylabel)
 # palette for multi-dataset overlay (line = opaque RGB, fill = semi-transparent RGBA)
@@ -47,6 +69,16 @@ COLORS = [
     {"line": (140, 86, 75),  "fill": (140, 86, 75, 60)},    # brown
 ]
 
+# reference data overlay: black points with error bars
+REF_COLOR = {"line": (0, 0, 0), "fill": (0, 0, 0, 0)}
+REF_LABEL = "Data"
+
+# many-dataset overlay: one batched item, colors along a colormap,
+# switched on by itself past this many datasets
+MANY_DATASETS  = 12
+OVERLAY_CMAP   = "viridis"
+BAND_COLOR     = {"line": (0, 0, 0), "fill": (0, 0, 0, 45)}
+
 RIVET_ANALYSES = {
     "Tier 1 (general)": [
         "MC_XS", "MC_JETS", "MC_MET", "MC_FSPARTICLES", "MC_SUSY",
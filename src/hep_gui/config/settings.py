@@ -6,6 +6,9 @@ DEFAULTS = {
     "last_script_dir": "",
     "last_yoda_dir": "",
     "normalize_default": True,
+    "ref_data_dir": "",
+    "backend": "docker",      # or "local": MG5 / Rivet installed on this machine
+    "local_mg5_dir": "",      # local MG5_aMC directory, default: from mg5_aMC on PATH
     "window_width": 1200,
     "window_height": 800,
 }
@@ -0,0 +1,189 @@
+"""Derived image with the job environment baked in, for exec-form commands.
+
+DOCKER_IMAGE only has its environment in a login shell, so every command
+used to be `bash -l -c "..."`: a shell start sourcing /etc/profile.d
+before the job, a Pythia8 LD_PRELOAD export in front of MG5, and the
+command line quoted into one string. ImageBaker derives
+DOCKER_IMAGE_BAKED from the local DOCKER_IMAGE, once, in the background:
+
+- the environment of `bash -l` in the base image, as ENV lines
+- hep-gui-run BASE_DIR CMD...: CMD compiled through ccache
+  (compiler_cache), its hit report, CMD's exit code
+- hep-gui-generate SCRIPT RUN_NAME: MG5 + Pythia8 with the preload, then
+  the Events copied to /data/runs/RUN_NAME
+
+Jobs then run argv lists like ["rivet", "--analysis=...", ...] directly.
+The image carries the id of its base as a label and is rebuilt when the
+base changes (a new pull). Until it is ready, and on the local backend,
+the tabs keep the DOCKER_SHELL command strings.
+"""
+
+import io
+import json
+import tarfile
+import threading
+
+import docker
+
+from hep_gui.config.constants import (
+    DOCKER_IMAGE, DOCKER_IMAGE_BAKED, MG5_BIN, PYTHIA8_LIB,
+)
+from hep_gui.core.compiler_cache import with_ccache
+from hep_gui.core.container_pool import parse_env
+from hep_gui.core.docker_interface import docker_service
+
+BASE_LABEL = "hep_gui.base"
+
+# per-container values, not part of the environment to bake
+_NOT_BAKED = {"HOSTNAME"}
+
+RUN_SCRIPT = (
+    "#!/bin/bash\n"
+    "# hep-gui-run BASE_DIR CMD [ARG...]: CMD through ccache, paths under BASE_DIR relative\n"
+    + with_ccache('shift ; "$@"', '"$1"') + "\n"
+)
+
+GENERATE_SCRIPT = (
+    "#!/bin/bash\n"
+    "# hep-gui-generate SCRIPT RUN_NAME: MG5 + Pythia8, Events copied to /data/runs/RUN_NAME\n"
+    "# MG5 bundles Pythia8 8.316 but the system has 8.315\n"
+    f"export LD_PRELOAD={PYTHIA8_LIB}/libpythia8.so\n"
+    # MG5 3.6.7 exits 1 on quit: the copy decides
+    f'{MG5_BIN} "$1"\n'
+    'mkdir -p "/data/runs/$2" && cp -r "/work/$2/Events" "/data/runs/$2/"\n'
+)
+
+SCRIPTS = {"hep-gui-run": RUN_SCRIPT, "hep-gui-generate": GENERATE_SCRIPT}
+
+
+def capture_env(client, image):
+    """{name: value} of a login shell in image."""
+    output = client.containers.run(image, ["bash", "-l", "-c", "env -0"], remove=True)
+    return {k: v for k, v in parse_env(output).items() if k not in _NOT_BAKED}
+
+
+def dockerfile(base, base_id, env):
+    lines = [f"FROM {base}", f"LABEL {BASE_LABEL}={json.dumps(base_id)}"]
+    if env:
+        lines.append("ENV " + " \\\n    ".join(f"{k}={json.dumps(v)}" for k, v in sorted(env.items())))
+    lines.append(f"COPY {' '.join(SCRIPTS)} /usr/local/bin/")
+    return "\n".join(lines) + "\n"
+
+
+def build_context(base, base_id, env):
+    """In-memory tar build context: the Dockerfile and the helper scripts."""
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w") as tar:
+        files = {"Dockerfile": (dockerfile(base, base_id, env), 0o644)}
+        files.update({name: (text, 0o755) for name, text in SCRIPTS.items()})
+        for name, (text, mode) in files.items():
+            data = text.encode()
+            info = tarfile.TarInfo(name)
+            info.size, info.mode = len(data), mode
+            tar.addfile(info, io.BytesIO(data))
+    buf.seek(0)
+    return buf
+
+
+class ImageBaker:
+    """Builds tag from base once per session, in a thread; ready once it is current.
+
+    A failed build is kept in error and not tried again until the base
+    image changes (a new pull).
+    """
+
+    def __init__(self, client=None, base=DOCKER_IMAGE, tag=DOCKER_IMAGE_BAKED):
+        self._client = client
+        self.base = base
+        self.tag = tag
+        self.ready = False
+        self.error = None
+        self._failed_base = None   # id of the base the last build failed on
+        self._error_taken = False
+        self._on_done = []
+        self._busy = False         # a build is under way, its callbacks not yet called
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def ensure(self, on_done=None):
+        """Start checking / building unless done, under way or failed on
+        this base. True if started now.
+
+        on_done(ready) is called once the image is ready or the build has
+        failed, from the build thread, or at once if already settled.
+        """
+        with self._lock:
+            running = self._busy
+            settled = self.ready or (
+                not running and self.error is not None and self._failed_base == self._base_id())
+            if not settled and on_done is not None:
+                self._on_done.append(on_done)
+            start = not (settled or running)
+            if start:
+                self.error = None
+                self._error_taken = False
+                self._busy = True
+                self._thread = threading.Thread(target=self._bake, name="image-baker", daemon=True)
+                self._thread.start()
+        if settled and on_done is not None:
+            on_done(self.ready)
+        return start
+
+    def take_error(self):
+        """error of the last build, the first time it is asked for; else None."""
+        with self._lock:
+            if self.error is None or self._error_taken:
+                return None
+            self._error_taken = True
+            return self.error
+
+    def wait(self, timeout=None):
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        return self.ready
+
+    def _base_id(self):
+        try:
+            return (self._client or docker_service().client).images.get(self.base).id
+        except docker.errors.DockerException:
+            return None
+
+    def _bake(self):
+        client = self._client or docker_service().client
+        base_id = None
+        try:
+            base_id = client.images.get(self.base).id
+            try:
+                current = client.images.get(self.tag).labels.get(BASE_LABEL) == base_id
+            except docker.errors.ImageNotFound:
+                current = False
+            if not current:
+                context = build_context(self.base, base_id, capture_env(client, self.base))
+                client.images.build(fileobj=context, custom_context=True, tag=self.tag, rm=True)
+            self.ready = True
+        except Exception as e:
+            self._failed_base = base_id
+            self.error = str(e)
+        with self._lock:
+            self._busy = False
+            callbacks, self._on_done = self._on_done, []
+        for callback in callbacks:
+            callback(self.ready)
+
+
+_baker = None
+
+
+def image_baker():
+    """The shared ImageBaker."""
+    global _baker
+    if _baker is None:
+        _baker = ImageBaker()
+    return _baker
+
+
+def exec_form(backend):
+    """True if jobs on backend run in the baked image with argv lists."""
+    baker = image_baker()
+    return backend.name == "docker" and baker.ready and docker_service().has_image(baker.tag)
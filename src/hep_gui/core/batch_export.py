@@ -0,0 +1,143 @@
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from PySide6.QtCore import QThread, Signal
+
+from hep_gui.core.figure_painter import render_png
+from hep_gui.core.headless import (
+    MIN_PER_JOB, _pdf_task, _render_task, export_filename, job_count, map_chunks,
+)
+from hep_gui.core.plot_pipeline import build_figure
+from hep_gui.core.vector_figure import VectorPdf
+from hep_gui.utils.plot_helpers import FIGURE_SIZE
+
+
+class BatchExportWorker(QThread):
+    """Render many observables offscreen.
+
+    png/svg: one file per observable in out_path (a directory). pdf: one
+    multi-page document at out_path. svg files and pdf pages are made in
+    spawned worker processes (headless.map_chunks) once there are enough
+    observables to pay for them, in this thread otherwise; png files are
+    painted in a thread pool.
+    An observable that fails to build or render is reported through
+    failed and skipped; finished or error is always emitted last.
+    """
+
+    progress = Signal(int, int)  # done, total
+    finished = Signal(int)       # number of plots written
+    failed = Signal(str, str)    # histo_path, message
+    error = Signal(str)
+
+    def __init__(self, datasets, histo_paths, fmt, out_path,
+                 normalize=True, logx=False, logy=False, rebin=None, max_workers=None,
+                 references=None, ref_label=None, ratio=True):
+        super().__init__()
+        # shallow copy: the tab may load more files while we render
+        self.datasets = dict(datasets)
+        self.histo_paths = list(histo_paths)
+        self.fmt = fmt
+        self.out_path = Path(out_path)
+        self.normalize = normalize
+        self.logx = logx
+        self.logy = logy
+        self.rebin = rebin
+        self.references = references
+        self.ref_label = ref_label
+        self.ratio = ratio
+        self.max_workers = max_workers or min(8, os.cpu_count() or 1)
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def _figure(self, histo_path):
+        return build_figure(self.datasets, histo_path, **self._options())
+
+    def run(self):
+        try:
+            if self.fmt == "pdf":
+                written = self._run_pdf()
+            elif self.fmt == "svg":
+                written = self._run_svg()
+            elif self.fmt == "png":
+                written = self._run_png()
+            else:
+                self.error.emit(f"unknown export format: {self.fmt}")
+                return
+            self.finished.emit(written)
+        except Exception as e:
+            self.error.emit(str(e))
+
+    def _options(self):
+        return dict(normalize=self.normalize, logx=self.logx, logy=self.logy, rebin=self.rebin,
+                    references=self.references, ref_label=self.ref_label, ratio=self.ratio)
+
+    def _map(self, task, context):
+        """map_chunks() over histo_paths, in processes for large batches."""
+        jobs = job_count(len(self.histo_paths), self.max_workers, MIN_PER_JOB)
+        return map_chunks(task, self.datasets, self.histo_paths, context, jobs,
+                          is_cancelled=lambda: self._cancelled)
+
+    def _run_svg(self):
+        self.out_path.mkdir(parents=True, exist_ok=True)
+        total = len(self.histo_paths)
+        done = written = 0
+        context = (str(self.out_path), "svg", FIGURE_SIZE, self._options())
+        for chunk, (w, errors) in self._map(_render_task, context):
+            for histo_path, message in errors:
+                self.failed.emit(histo_path, message)
+            done += len(chunk)
+            written += w
+            self.progress.emit(done, total)
+        return written
+
+    def _run_png(self):
+        self.out_path.mkdir(parents=True, exist_ok=True)
+        total = len(self.histo_paths)
+
+        def job(histo_path):
+            if self._cancelled:
+                return False
+            try:
+                fig = self._figure(histo_path)
+                return fig is not None and render_png(fig, self.out_path / export_filename(histo_path, "png"))
+            except Exception as e:
+                self.failed.emit(histo_path, str(e))
+                return False
+
+        done = written = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = [pool.submit(job, p) for p in self.histo_paths]
+            for fut in as_completed(futures):
+                if self._cancelled:
+                    for f in futures:
+                        f.cancel()
+                    break
+                done += 1
+                if fut.result():
+                    written += 1
+                self.progress.emit(done, total)
+        return written
+
+    def _run_pdf(self):
+        self.out_path.parent.mkdir(parents=True, exist_ok=True)
+        pdf = VectorPdf(self.out_path, title="HEP-GUI plots")
+        total = len(self.histo_paths)
+        # pages come back as chunks complete, the document keeps the list order
+        pages, done = {}, 0
+        for chunk, results in self._map(_pdf_task, ((pdf.width, pdf.height), self._options())):
+            for histo_path, page, message in results:
+                if message is not None:
+                    self.failed.emit(histo_path, message)
+                pages[histo_path] = page
+            done += len(chunk)
+            self.progress.emit(done, total)
+        for histo_path in self.histo_paths:
+            if pages.get(histo_path) is not None:
+                pdf.add_rendered(*pages[histo_path])
+        written = len(pdf)
+        if written:
+            pdf.close()
+        return written
@@ -0,0 +1,124 @@
+"""Rank observables by how much datasets disagree.
+
+Every pair of datasets is compared on every observable they share.
+Observables with identical binning are stacked into one (obs x bins)
+array per dataset, so each binning group costs a handful of numpy ops
+for all pairs at once.
+"""
+
+from dataclasses import dataclass
+from itertools import combinations
+
+import numpy as np
+
+from hep_gui.core.plot_pipeline import extract_arrays
+from hep_gui.utils.normalization import normalize_to_area
+
+
+@dataclass
+class Comparison:
+    path: str
+    label_a: str
+    label_b: str
+    chi2_ndf: float
+    ndf: int
+    ks: float
+    max_pull: float
+
+
+def symmetric_errors(histo, n_bins):
+    """Per-bin symmetric uncertainty: mean of down/up for estimates, sqrt(sumw2) for histos."""
+    if histo.err_dn is not None:
+        err = (np.abs(histo.err_dn[:n_bins]) + np.abs(histo.err_up[:n_bins])) / 2.0
+    elif histo.sumw2 is not None:
+        err = np.sqrt(np.abs(histo.sumw2[:n_bins]))
+    else:
+        return np.zeros(n_bins)
+    return np.where(np.isnan(err), 0.0, err)
+
+
+def _group_by_binning(datasets, normalize):
+    """{edges_key: (edges, {label: {path: (vals, err)}})} for every observable."""
+    groups = {}
+    for label, ds in datasets.items():
+        for path, histo in ds["histos"].items():
+            edges, vals, _, _ = extract_arrays(histo)
+            err = symmetric_errors(histo, len(vals))
+            if normalize:
+                vals, err, _ = normalize_to_area(edges, vals, err, err)
+            key = edges.tobytes()
+            if key not in groups:
+                groups[key] = (edges, {})
+            groups[key][1].setdefault(label, {})[path] = (vals, err)
+    return groups
+
+
+def compare_group(edges, vals, errs):
+    """Pairwise statistics for one binning group.
+
+    vals, errs: (datasets, obs, bins) arrays, NaN rows where a dataset lacks
+    an observable. Returns (pairs, chi2, ndf, ks, max_pull), each statistic
+    of shape (pairs, obs).
+    """
+    n_ds = vals.shape[0]
+    pairs = np.array(list(combinations(range(n_ds), 2)), dtype=int).reshape(-1, 2)
+    a, b = vals[pairs[:, 0]], vals[pairs[:, 1]]
+    ea2, eb2 = errs[pairs[:, 0]] ** 2, errs[pairs[:, 1]] ** 2
+
+    diff = a - b
+    var = ea2 + eb2
+    used = var > 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pull2 = np.where(used, diff * diff / np.where(used, var, 1.0), 0.0)
+    chi2 = pull2.sum(axis=2)
+    ndf = used.sum(axis=2)
+    max_pull = np.sqrt(pull2.max(axis=2))
+
+    # KS on the bin-content CDFs (values are densities -> weight by width)
+    widths = np.diff(edges)
+    ca = np.cumsum(np.abs(a) * widths, axis=2)
+    cb = np.cumsum(np.abs(b) * widths, axis=2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ca = ca / ca[..., -1:]
+        cb = cb / cb[..., -1:]
+    ks = np.nanmax(np.abs(ca - cb), axis=2, initial=0.0)
+    return pairs, chi2, ndf, ks, max_pull
+
+
+def compare_datasets(datasets, normalize=True):
+    """Compare all dataset pairs on all shared observables.
+
+    Returns a list of Comparison, unsorted.
+    """
+    labels = list(datasets)
+    if len(labels) < 2:
+        return []
+
+    results = []
+    for edges, per_label in _group_by_binning(datasets, normalize).values():
+        present = [lab for lab in labels if lab in per_label]
+        if len(present) < 2:
+            continue
+        paths = sorted({p for lab in present for p in per_label[lab]})
+        n_bins = len(edges) - 1
+        vals = np.full((len(present), len(paths), n_bins), np.nan)
+        errs = np.full_like(vals, np.nan)
+        index = {p: k for k, p in enumerate(paths)}
+        for d, lab in enumerate(present):
+            for p, (v, e) in per_label[lab].items():
+                vals[d, index[p]] = v
+                errs[d, index[p]] = e
+
+        pairs, chi2, ndf, ks, max_pull = compare_group(edges, vals, errs)
+        # NaN rows (observable missing in one of the two) drop out here
+        ok = ~np.isnan(vals).all(axis=2)
+        shared = ok[pairs[:, 0]] & ok[pairs[:, 1]]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            chi2_ndf = np.where(ndf > 0, chi2 / np.maximum(ndf, 1), np.nan)
+        for k, o in zip(*np.nonzero(shared)):
+            i, j = pairs[k]
+            results.append(Comparison(
+                paths[o], present[i], present[j],
+                float(chi2_ndf[k, o]), int(ndf[k, o]), float(ks[k, o]), float(max_pull[k, o]),
+            ))
+    return results
@@ -0,0 +1,54 @@
+"""ccache for the compile steps of generation and rivet-build jobs.
+
+MG5 compiles the matrix element code of every run, rivet-build an
+analysis every time it is built. with_ccache() wraps a job's shell
+command line so that gcc, cc, g++ and c++ resolve to ccache symlinks
+(ccache then calls the real compiler found further down PATH), with the
+cache in data/.cache/ccache: data/ is mounted at /data in every
+container and mapped by the local backend, so all jobs share the cache
+and it outlives the containers. CCACHE_BASEDIR makes paths under the run
+directory relative, so the same process generated under another run
+name hits too. Rebuilding an unchanged analysis, and the C/C++ parts of
+an unchanged process, then costs the cache lookups.
+
+ccache does not cache Fortran, so the Fortran matrix element code that
+MG5 compiles with gfortran is compiled in full every run. gfortran is
+not put behind ccache at all, since it would only add a lookup per call.
+
+After the command, the hits and misses of this job alone (ccache's
+stats log, ccache >= 4.4) are printed to the log. Images without
+ccache compile as before, with a note in the log.
+"""
+
+from hep_gui.config.constants import CCACHE_DOCKER_DIR, CCACHE_MAX_SIZE
+
+_LINK_DIR = "/tmp/ccache-bin"
+_COMPILERS = ("gcc", "cc", "g++", "c++")
+# one stats log per job; $$ is the job's shell, unique in a shared pool container
+_STATS_LOG = "/tmp/ccache.$$.log"
+
+
+def ccache_setup(base_dir):
+    """Shell line putting ccache in front of the compilers, if the image has it."""
+    return (
+        f"if command -v ccache >/dev/null ; then "
+        f"mkdir -p {_LINK_DIR} && for c in {' '.join(_COMPILERS)} ; "
+        f"do ln -sf $(command -v ccache) {_LINK_DIR}/$c ; done ; "
+        f"export PATH={_LINK_DIR}:$PATH CCACHE_DIR={CCACHE_DOCKER_DIR} "
+        f"CCACHE_BASEDIR={base_dir} CCACHE_NOHASHDIR=1 "
+        f"CCACHE_MAXSIZE={CCACHE_MAX_SIZE} CCACHE_STATSLOG={_STATS_LOG} ; "
+        f"else echo 'ccache not found in the image, compiling without cache' ; fi"
+    )
+
+
+def ccache_report():
+    """Shell line printing the ccache hits and misses of this job."""
+    return (
+        f"if [ -f {_STATS_LOG} ] ; then "
+        f"echo '--- ccache ---' ; ccache --show-log-stats ; rm -f {_STATS_LOG} ; fi"
+    )
+
+
+def with_ccache(script, base_dir):
+    """script (a shell command line) compiled through ccache, its exit code kept."""
+    return f"{ccache_setup(base_dir)} ; {script} ; rc=$? ; {ccache_report()} ; exit $rc"
@@ -0,0 +1,265 @@
+"""Long-lived containers that run short jobs through exec.
+
+A fresh container per rivet / rivet-build / rivet-mkhtml call costs
+container create + start, a login shell sourcing /etc/profile.d, then
+removal: seconds for a job that may itself take a fraction of one.
+ContainerPool keeps idle containers per image (sleeping, /data
+mounted), captures the login environment once when each one starts,
+and runs commands in them with exec. A container is checked before
+each job and replaced after POOL_MAX_JOBS jobs, so state left behind
+by jobs stays bounded.
+
+MG5 generation still gets a fresh container (DockerWorker): it writes
+under /work inside the container and runs for minutes anyway.
+"""
+
+import atexit
+import shlex
+import threading
+
+import docker
+
+from hep_gui.config.constants import DATA_DIR
+from hep_gui.core.docker_interface import docker_service
+from hep_gui.core.execution import JobWorker
+from hep_gui.core.log_framing import LineBatcher, frame_output
+from hep_gui.core.telemetry import StatsRecorder
+
+POOL_MAX_JOBS = 20   # jobs per container before it is replaced
+POOL_MAX_IDLE = 2    # idle containers kept per image
+POOL_LABEL = "hep_gui.pool"
+
+_KILLED = 137
+
+# variables of the capturing shell itself, not of the environment
+_SHELL_VARS = {"_", "PWD", "OLDPWD", "SHLVL"}
+
+
+def exec_argv(cmd):
+    """argv for exec from a DOCKER_SHELL command string.
+
+    The login environment is passed explicitly, so `bash -l -c` becomes
+    `bash -c` and skips /etc/profile.d. Lists are returned as they are.
+    """
+    if not isinstance(cmd, str):
+        return list(cmd)
+    argv = shlex.split(cmd)
+    if argv[:3] == ["bash", "-l", "-c"]:
+        argv = ["bash", "-c", *argv[3:]]
+    return argv
+
+
+def parse_env(output):
+    """{name: value} from `env -0` output."""
+    env = {}
+    for item in output.decode(errors="replace").split("\0"):
+        name, sep, value = item.partition("=")
+        if sep and name and name not in _SHELL_VARS:
+            env[name] = value
+    return env
+
+
+class PooledContainer:
+    def __init__(self, container, image, env):
+        self.container = container
+        self.image = image
+        self.env = env
+        self.jobs = 0
+
+
+class ContainerPool:
+    """Idle containers per image, handed out by acquire() and given back by release()."""
+
+    def __init__(self, client, volumes=None, max_jobs=POOL_MAX_JOBS, max_idle=POOL_MAX_IDLE):
+        self.client = client
+        self.volumes = volumes
+        self.max_jobs = max_jobs
+        self.max_idle = max_idle
+        self._idle = {}   # image -> [PooledContainer]
+        self._busy = set()
+        self._lock = threading.Lock()
+        self._reaped = False
+
+    def _reap(self):
+        """Remove pool containers left by an earlier session that did not shut down."""
+        with self._lock:
+            if self._reaped:
+                return
+            self._reaped = True
+        for c in self.client.containers.list(all=True, filters={"label": POOL_LABEL}):
+            self._remove(c)
+
+    def _start(self, image):
+        self._reap()
+        container = self.client.containers.run(
+            image, ["sleep", "infinity"],
+            volumes=self.volumes, labels={POOL_LABEL: "1"},
+            detach=True, init=True,
+        )
+        try:
+            code, output = container.exec_run(["bash", "-l", "-c", "env -0"])
+            if code != 0:
+                raise docker.errors.DockerException(f"environment capture failed (exit {code})")
+        except Exception:
+            self._remove(container)
+            raise
+        return PooledContainer(container, image, parse_env(output))
+
+    @staticmethod
+    def _healthy(pc):
+        try:
+            pc.container.reload()
+            return pc.container.status == "running"
+        except docker.errors.DockerException:
+            return False
+
+    @staticmethod
+    def _remove(container):
+        try:
+            container.remove(force=True)
+        except docker.errors.DockerException:
+            pass
+
+    def acquire(self, image):
+        """A running container of image, from the idle list or started now."""
+        while True:
+            with self._lock:
+                idle = self._idle.get(image)
+                pc = idle.pop() if idle else None
+            if pc is None:
+                pc = self._start(image)
+            elif not self._healthy(pc):
+                self._remove(pc.container)
+                continue
+            with self._lock:
+                self._busy.add(pc)
+            return pc
+
+    def release(self, pc, reusable=True):
+        """Give pc back after a job. Worn out, broken or surplus containers are removed."""
+        pc.jobs += 1
+        with self._lock:
+            self._busy.discard(pc)
+            idle = self._idle.setdefault(pc.image, [])
+            keep = reusable and pc.jobs < self.max_jobs and len(idle) < self.max_idle
+            if keep:
+                idle.append(pc)
+        if not keep:
+            self._remove(pc.container)
+
+    def warm(self, image):
+        """Start one idle container of image in the background, if none is idle."""
+        def start():
+            with self._lock:
+                if self._idle.get(image):
+                    return
+            try:
+                pc = self._start(image)
+            except docker.errors.DockerException:
+                return
+            with self._lock:
+                self._idle.setdefault(image, []).append(pc)
+
+        threading.Thread(target=start, name="container-warm", daemon=True).start()
+
+    def exec_stream(self, pc, cmd, workdir=None):
+        """Run cmd in pc. Returns (exec id, iterator over (stdout, stderr) chunks)."""
+        api = self.client.api
+        exec_id = api.exec_create(
+            pc.container.id, exec_argv(cmd), environment=pc.env, workdir=workdir,
+        )["Id"]
+        return exec_id, api.exec_start(exec_id, stream=True, demux=True)
+
+    def exit_code(self, exec_id):
+        return self.client.api.exec_inspect(exec_id)["ExitCode"]
+
+    def shutdown(self):
+        """Remove every container of the pool, idle or busy."""
+        with self._lock:
+            containers = [pc.container for idle in self._idle.values() for pc in idle]
+            containers += [pc.container for pc in self._busy]
+            self._idle.clear()
+            self._busy.clear()
+        for c in containers:
+            self._remove(c)
+
+
+_pool = None
+
+
+def container_pool():
+    """The shared pool, on the docker_service() client with data/ mounted at /data.
+    None if Docker is not reachable."""
+    global _pool
+    if _pool is None:
+        client = docker_service().client
+        if client is None:
+            return None
+        _pool = ContainerPool(client, {str(DATA_DIR): {"bind": "/data", "mode": "rw"}})
+    return _pool
+
+
+@atexit.register
+def _shutdown_pool():
+    if _pool is not None:
+        _pool.shutdown()
+
+
+class ExecWorker(JobWorker):
+    """DockerWorker counterpart running cmd in a pooled container.
+
+    Same signals and stop_container(). Cancelling kills the whole
+    container (an exec has no kill of its own), finished then reports
+    137 as for a killed DockerWorker container, and the pool starts a
+    new container for the next job.
+    """
+
+    def __init__(self, pool, image, cmd, workdir=None):
+        super().__init__()
+        self.pool = pool
+        self.image = image
+        self.cmd = cmd
+        self.workdir = workdir
+        self._pc = None
+        self._cancelled = False
+        self.series = None
+
+    def run(self):
+        pc = None
+        batcher = LineBatcher(self.log_lines.emit)
+        recorder = None
+        try:
+            pc = self._pc = self.pool.acquire(self.image)
+            # a busy pooled container runs this job only: its stats are the job's
+            recorder = StatsRecorder(pc.container, self.telemetry.emit).start()
+            self.series = recorder.series
+            if not self._cancelled:
+                exec_id, output = self.pool.exec_stream(pc, self.cmd, self.workdir)
+                for lines in frame_output(output):
+                    batcher.add(lines)
+            batcher.flush()
+            recorder.stop()
+            # a killed container reports like DockerWorker's: 128 + SIGKILL
+            code = _KILLED if self._cancelled else self.pool.exit_code(exec_id)
+            self.pool.release(pc, reusable=not self._cancelled)
+            pc = None
+            self.finished.emit(code)
+        except Exception as e:
+            batcher.flush()
+            if recorder is not None:
+                recorder.stop()
+            if pc is not None:
+                self.pool.release(pc, reusable=False)
+            if self._cancelled:
+                self.finished.emit(_KILLED)
+            else:
+                self.error.emit(str(e))
+
+    def stop_container(self):
+        self._cancelled = True
+        pc = self._pc
+        if pc is not None:
+            try:
+                pc.container.kill()
+            except docker.errors.DockerException:
+                pass
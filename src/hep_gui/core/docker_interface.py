@@ -1,10 +1,29 @@
+import atexit
+import threading
+import time
+
 import docker
 from PySide6.QtCore import QThread, Signal
 
+from hep_gui.core.execution import JobWorker
+from hep_gui.core.fake_docker import FakeDockerClient, fake_docker_enabled
+from hep_gui.core.log_framing import LineBatcher, frame_output
+from hep_gui.core.telemetry import StatsRecorder
+
+# seconds a daemon / image check is trusted without the events stream
+STATUS_TTL = 30.0
+
+
+def client_from_env():
+    """docker.from_env(), or a FakeDockerClient if HEP_GUI_FAKE_DOCKER is set."""
+    if fake_docker_enabled():
+        return FakeDockerClient.from_env()
+    return docker.from_env()
+
 
 def get_docker_client():
     try:
-        client = docker.from_env()
+        client = client_from_env()
         client.ping()
         return client
     except docker.errors.DockerException:
@@ -13,7 +32,7 @@ def get_docker_client():
 
 def check_docker():
     try:
-        client = docker.from_env()
+        client = client_from_env()
         client.ping()
         version = client.version().get("Version", "?")
         return True, version
@@ -29,39 +48,216 @@ def check_image(client, tag):
         return False
 
 
-class DockerWorker(QThread):
-    log_line = Signal(str)
-    finished = Signal(int)
-    error = Signal(str)
+class DockerService:
+    """One Docker client for the whole app, with daemon and image state cached.
+
+    status() and has_image() answer from cache for ttl seconds. Once the
+    daemon has answered, a thread follows its events stream: image pulls,
+    tags and deletions update the cache as they happen, and while the
+    stream is up the cached state does not expire at all. If the stream
+    drops (daemon stopped), the cache is cleared and the next call asks
+    the daemon again. Use docker_service() for the shared instance.
+    """
+
+    def __init__(self, ttl=STATUS_TTL, connect=client_from_env):
+        self.ttl = ttl
+        self._connect = connect
+        self._lock = threading.RLock()
+        self._client = None
+        self._connect_error = None
+        self._status = None   # (ok, info, time.monotonic())
+        self._images = {}     # tag -> (present, time.monotonic())
+        self._events = None   # open events stream, closed by stop()
+        self._watcher = None
+        self._stopped = False
+
+    @property
+    def client(self):
+        """The shared client, created on first use. None if Docker is not reachable."""
+        with self._lock:
+            if self._client is None:
+                try:
+                    self._client = self._connect()
+                    self._connect_error = None
+                except docker.errors.DockerException as e:
+                    self._connect_error = str(e)
+            return self._client
+
+    @property
+    def watching(self):
+        """True while the events stream keeps the cache current."""
+        return self._watcher is not None and self._watcher.is_alive()
 
-    def __init__(self, client, image, cmd, volumes=None, environment=None):
+    def _fresh(self, stamp):
+        return self.watching or time.monotonic() - stamp < self.ttl
+
+    def status(self, refresh=False):
+        """(True, daemon version) or (False, error message), like check_docker()."""
+        with self._lock:
+            if self._status and not refresh and self._fresh(self._status[2]):
+                return self._status[:2]
+        client = self.client
+        if client is None:
+            result = (False, self._connect_error or "cannot connect to Docker")
+        else:
+            try:
+                client.ping()
+                result = (True, client.version().get("Version", "?"))
+            except docker.errors.DockerException as e:
+                result = (False, str(e))
+        with self._lock:
+            self._status = (*result, time.monotonic())
+        if result[0]:
+            self._watch()
+        return result
+
+    def has_image(self, tag, refresh=False):
+        """True if tag is present locally, like check_image()."""
+        with self._lock:
+            cached = self._images.get(tag)
+            if cached and not refresh and self._fresh(cached[1]):
+                return cached[0]
+        client = self.client
+        if client is None:
+            return False
+        try:
+            client.images.get(tag)
+            present = True
+        except docker.errors.ImageNotFound:
+            present = False
+        except docker.errors.DockerException:
+            return False  # daemon trouble, not an answer worth caching
+        with self._lock:
+            self._images[tag] = (present, time.monotonic())
+        return present
+
+    def invalidate(self, tag=None):
+        """Forget the cached state of tag, or everything."""
+        with self._lock:
+            if tag is None:
+                self._status = None
+                self._images.clear()
+            else:
+                self._images.pop(tag, None)
+
+    def stop(self):
+        """Close the events stream and stop following it."""
+        self._stopped = True
+        events = self._events
+        if events is not None:
+            try:
+                events.close()
+            except Exception:
+                pass
+        if self._watcher is not None:
+            self._watcher.join(timeout=2)
+
+    # -- events --
+
+    def _watch(self):
+        with self._lock:
+            if self._stopped or self.watching:
+                return
+            self._watcher = threading.Thread(target=self._follow_events, name="docker-events", daemon=True)
+            self._watcher.start()
+
+    def _follow_events(self):
+        try:
+            self._events = self._client.events(decode=True, filters={"type": "image"})
+            for event in self._events:
+                self._on_event(event)
+        except Exception:
+            pass  # connection lost; any error ends the stream the same way
+        finally:
+            self._events = None
+            if not self._stopped:
+                self.invalidate()
+
+    def _on_event(self, event):
+        action = event.get("Action") or event.get("status", "")
+        name = event.get("Actor", {}).get("Attributes", {}).get("name") or event.get("id", "")
+        with self._lock:
+            if action in ("pull", "tag", "load", "import") and name:
+                if ":" not in name:
+                    name += ":latest"
+                self._images[name] = (True, time.monotonic())
+            elif action in ("untag", "delete"):
+                # the tag is not always in these events, ask again next time
+                self._images.clear()
+
+
+_service = None
+
+
+def docker_service():
+    """The shared DockerService."""
+    global _service
+    if _service is None:
+        _service = DockerService()
+    return _service
+
+
+@atexit.register
+def _stop_service():
+    if _service is not None:
+        _service.stop()
+
+
+class DockerWorker(JobWorker):
+    def __init__(self, client, image, cmd, volumes=None, environment=None, resources=None):
         super().__init__()
         self.client = client
         self.image = image
         self.cmd = cmd
         self.volumes = volumes
         self.environment = environment
+        self.resources = resources  # extra containers.run() limits: nano_cpus, mem_limit, ...
         self.container = None
+        self.series = None  # TelemetrySeries of the run, once started
 
     def run(self):
+        batcher = LineBatcher(self.log_lines.emit)
+        recorder = None
         try:
             self.container = self.client.containers.run(
                 self.image, self.cmd,
                 volumes=self.volumes,
                 environment=self.environment,
                 detach=True,
+                **(self.resources or {}),
             )
-            for chunk in self.container.logs(stream=True):
-                line = chunk.decode().rstrip()
-                if line:
-                    self.log_line.emit(line)
+            recorder = StatsRecorder(self.container, self.telemetry.emit).start()
+            self.series = recorder.series
+            # demuxed attach instead of logs(): stdout and stderr stay apart,
+            # logs=True replays what was written before the attach
+            output = self.client.api.attach(
+                self.container.id, stream=True, logs=True, demux=True,
+            )
+            for lines in frame_output(output):
+                batcher.add(lines)
+            batcher.flush()
             result = self.container.wait()
+            recorder.stop()
             self.container.remove()
             self.container = None
             self.finished.emit(result["StatusCode"])
-        except docker.errors.DockerException as e:
+        except Exception as e:
+            # any error (a dropped connection while streaming too) must end
+            # the job, the scheduler frees its slot on error
+            batcher.flush()
+            if recorder is not None:
+                recorder.stop()
+            self._remove_container()
             self.error.emit(str(e))
 
+    def _remove_container(self):
+        container, self.container = self.container, None
+        if container is not None:
+            try:
+                container.remove(force=True)
+            except Exception:
+                pass  # the daemon may be gone as well
+
     def stop_container(self):
         if self.container:
             try:
@@ -0,0 +1,264 @@
+"""Where jobs run: the execution backend interface and the native backend.
+
+An ExecutionBackend turns a Job into a JobWorker. Every worker keeps the
+same contract, whatever runs the command:
+
+- log_lines(list of LogLine) while it runs, framed by log_framing and
+  batched by LineBatcher
+- telemetry(StatsSample) while it runs, if the backend can sample
+- finished(exit code) once the command has ended: its own exit code,
+  128 + n if signal n killed it, 137 after stop_container()
+- error(message) instead of finished if the command could not run, or
+  if anything else went wrong: exactly one of the two always ends a
+  run, the JobScheduler frees the job's slot on it
+
+DockerBackend (job_scheduler) runs jobs in containers with DockerWorker
+and ExecWorker. LocalBackend runs the same command strings natively,
+for nodes where MG5, Pythia8 and Rivet are installed. A PathMap maps the
+container paths in the command and in the MG5 script onto local ones.
+No container is started, nothing is bind-mounted, and /work is a local
+directory (LOCAL_WORK_DIR, inside DATA_DIR: one filesystem) the Events
+are copied from, as in the container. /work/<run> is not mapped onto
+data/runs/<run>: that directory already holds the run's script when the
+job starts, and the rest of the MG5 process directory (sources, compiled
+libraries) would end up where the scan viewer and the analysis tab look
+for runs.
+"""
+
+import os
+import queue
+import re
+import shlex
+import shutil
+import signal
+import subprocess
+import threading
+from abc import ABC, ABCMeta, abstractmethod
+from pathlib import Path
+
+from PySide6.QtCore import QThread, Signal
+
+from hep_gui.config.constants import DATA_DIR, LOCAL_WORK_DIR, MG5_BIN
+from hep_gui.core.log_framing import LineBatcher, frame_output
+
+_KILLED = 137
+_READ_SIZE = 65536
+
+
+def cpuset_cores(cpuset):
+    """Core numbers of a cpuset string like '0-7,16'."""
+    cores = []
+    for part in cpuset.split(","):
+        lo, _, hi = part.strip().partition("-")
+        cores.extend(range(int(lo), int(hi or lo) + 1))
+    return cores
+
+
+def exit_status(returncode):
+    """Popen returncode as a shell / Docker exit code: -9 (SIGKILL) -> 137."""
+    return 128 - returncode if returncode < 0 else returncode
+
+
+class _QABCMeta(ABCMeta, type(QThread)):
+    """ABCMeta for QObject subclasses, which have Shiboken's metaclass."""
+
+
+class JobWorker(QThread, metaclass=_QABCMeta):
+    """Base of the workers of every backend; see the module docstring."""
+
+    log_lines = Signal(list)
+    telemetry = Signal(object)
+    finished = Signal(int)
+    error = Signal(str)
+
+    series = None  # TelemetrySeries of the run, if the backend samples one
+
+    def __init__(self, parent=None):
+        # Shiboken makes QObjects without object.__new__, where ABCs are checked
+        if self.__abstractmethods__:
+            raise TypeError(f"Can't instantiate abstract class {type(self).__name__} "
+                            f"without {', '.join(sorted(self.__abstractmethods__))}")
+        super().__init__(parent)
+
+    @abstractmethod
+    def stop_container(self):
+        """Kill the job; finished then reports 137."""
+
+
+class ExecutionBackend(ABC):
+    """Makes the worker that runs a Job."""
+
+    name = ""
+
+    @abstractmethod
+    def check(self, tool=None):
+        """(True, description) if jobs can run, else (False, error message).
+
+        tool: the program the job needs ("MG5" or "rivet"), None for all.
+        """
+
+    def map_text(self, text):
+        """text (an MG5 script) with container paths made valid for this backend."""
+        return text
+
+    @abstractmethod
+    def make_worker(self, job):
+        """The JobWorker that runs job."""
+
+
+class PathMap:
+    """Container path prefixes -> local directories, longest prefix first.
+
+    A prefix only matches whole path components: with /work mapped,
+    /work/run is mapped but /workspace is not.
+    """
+
+    def __init__(self, mapping):
+        self.mapping = {prefix.rstrip("/"): Path(local).as_posix() for prefix, local in mapping.items()}
+        prefixes = sorted(self.mapping, key=len, reverse=True)
+        self._re = re.compile(
+            r"(?<![\w./-])(" + "|".join(map(re.escape, prefixes)) + r")(?=/|[^\w.-]|$)"
+        )
+
+    def map(self, text):
+        return self._re.sub(lambda m: self.mapping[m.group(1)], text)
+
+
+def local_path_map(mg5_dir=None, work_dir=LOCAL_WORK_DIR, data_dir=DATA_DIR):
+    """PathMap for the app's containers: /data, /work and the MG5 install in /work.
+
+    mg5_dir defaults to the install holding the mg5_aMC found on PATH.
+    """
+    mg5_home = str(Path(MG5_BIN).parent.parent)  # /work/MG5_aMC
+    mapping = {"/data": data_dir, "/work": work_dir}
+    if not mg5_dir:
+        found = shutil.which("mg5_aMC")
+        mg5_dir = Path(found).resolve().parent.parent if found else None
+    if mg5_dir:
+        mapping[mg5_home] = mg5_dir
+    return PathMap(mapping)
+
+
+def local_argv(cmd, path_map):
+    """argv of cmd (DOCKER_SHELL string or list) with container paths mapped."""
+    if isinstance(cmd, str):
+        return shlex.split(path_map.map(cmd))
+    return [path_map.map(arg) for arg in cmd]
+
+
+def _read_pipes(proc):
+    """(stdout, stderr) chunks of proc as they come, like a demuxed Docker stream."""
+    chunks = queue.Queue()
+
+    def pump(pipe, index):
+        try:
+            while data := pipe.read1(_READ_SIZE):
+                chunks.put((data, None) if index == 0 else (None, data))
+        finally:
+            chunks.put(index)
+
+    for index, pipe in enumerate((proc.stdout, proc.stderr)):
+        threading.Thread(target=pump, args=(pipe, index), name="local-output", daemon=True).start()
+    open_pipes = 2
+    while open_pipes:
+        item = chunks.get()
+        if isinstance(item, int):
+            open_pipes -= 1
+        else:
+            yield item
+
+
+class LocalWorker(JobWorker):
+    """Runs cmd as a local process group, with DockerWorker's signals and exit codes."""
+
+    def __init__(self, cmd, path_map, environment=None, cpuset=None, cwd=None):
+        super().__init__()
+        self.cmd = cmd
+        self.path_map = path_map
+        self.environment = environment
+        self.cpuset = cpuset
+        self.cwd = cwd
+        self._proc = None
+        self._cancelled = False
+        self._lock = threading.Lock()
+
+    def _popen(self):
+        env = dict(os.environ, **(self.environment or {}))
+        cores = cpuset_cores(self.cpuset) if self.cpuset and hasattr(os, "sched_setaffinity") else None
+        return subprocess.Popen(
+            local_argv(self.cmd, self.path_map),
+            stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            env=env, cwd=self.cwd,
+            # own process group: cancel kills MG5 and everything it started
+            start_new_session=True,
+            preexec_fn=(lambda: os.sched_setaffinity(0, cores)) if cores else None,
+        )
+
+    def run(self):
+        batcher = LineBatcher(self.log_lines.emit)
+        try:
+            with self._lock:
+                if not self._cancelled:
+                    self._proc = self._popen()
+            if self._proc is None:
+                self.finished.emit(_KILLED)
+                return
+            for lines in frame_output(_read_pipes(self._proc)):
+                batcher.add(lines)
+            batcher.flush()
+            code = exit_status(self._proc.wait())
+            self.finished.emit(_KILLED if self._cancelled else code)
+        except Exception as e:
+            # whatever went wrong, the job ends here and leaves no process behind
+            batcher.flush()
+            if self._proc is not None:
+                self._kill(self._proc)
+                self._proc.wait()
+            self.error.emit(str(e))
+
+    def stop_container(self):
+        with self._lock:
+            self._cancelled = True
+            proc = self._proc
+        if proc is not None:
+            self._kill(proc)
+
+    @staticmethod
+    def _kill(proc):
+        if proc.poll() is not None:
+            return
+        try:
+            if hasattr(os, "killpg"):
+                os.killpg(proc.pid, signal.SIGKILL)
+            else:
+                proc.kill()
+        except (ProcessLookupError, PermissionError):
+            pass
+
+
+class LocalBackend(ExecutionBackend):
+    """Jobs as native processes, container paths mapped by path_map."""
+
+    name = "local"
+
+    def __init__(self, path_map=None, work_dir=LOCAL_WORK_DIR):
+        self.path_map = path_map or local_path_map(work_dir=work_dir)
+        self.work_dir = work_dir
+
+    def check(self, tool=None):
+        shell = shutil.which("bash")
+        if shell is None:
+            return False, "bash not found"
+        mg5 = Path(self.path_map.map(MG5_BIN))
+        rivet = shutil.which("rivet")
+        info = f"MG5 {'at ' + str(mg5) if mg5.exists() else 'not found'}, rivet {rivet or 'not found'}"
+        found = {"MG5": mg5.exists(), "rivet": rivet is not None}
+        return (found[tool] if tool else all(found.values())), info
+
+    def map_text(self, text):
+        return self.path_map.map(text)
+
+    def make_worker(self, job):
+        self.work_dir.mkdir(parents=True, exist_ok=True)
+        cwd = self.path_map.map(job.workdir) if job.workdir else None
+        return LocalWorker(job.cmd, self.path_map, job.environment, job.resources.cpuset, cwd=cwd)
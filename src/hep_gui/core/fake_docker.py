@@ -0,0 +1,671 @@
+"""In-process stand-in for the Docker daemon, for tests and benchmarks.
+
+With HEP_GUI_FAKE_DOCKER=1 in the environment, client_from_env() (and
+so docker_service(), the workers and the pool) gets a FakeDockerClient
+instead of docker.from_env(). It implements the part of the docker SDK
+the app uses: ping / version / events, images.get / build, containers.run /
+list / get, container wait / kill / remove / reload / logs / stats /
+exec_run, and api.attach / exec_create / exec_start / exec_inspect /
+pull.
+
+Jobs are recognised by their command, as a DOCKER_SHELL string or as
+the argv lists of the baked image: MG5 runs, rivet, rivet-build,
+rivet-mkhtml, the pool's `env -0` and its idle `sleep infinity`. Each
+replays a log, recorded (HEP_GUI_FAKE_LOGS=<dir> holding mg5.log and
+rivet.log) or synthesized (HEP_GUI_FAKE_LINES long), at
+HEP_GUI_FAKE_RATE lines per second (0: as fast as possible), in frames
+cut anywhere like the daemon's. When the log is done the job writes the
+files the real one leaves in the mounted /data: Events/*.hepmc.gz, a
+.yoda with a few histograms per analysis, Rivet<name>.so, index.html.
+No daemon and no image, and the same seed gives the same files, so the
+GUI pipeline can be timed and regression-tested on any machine.
+"""
+
+import gzip
+import hashlib
+import itertools
+import json
+import os
+import re
+import shlex
+import tarfile
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+
+import docker
+import numpy as np
+
+from hep_gui.config.constants import DOCKER_IMAGE, DOCKER_IMAGE_MKHTML
+
+FAKE_DOCKER_ENV = "HEP_GUI_FAKE_DOCKER"
+
+_KILLED = 137
+
+_ENV = {
+    "PATH": "/usr/local/bin:/usr/bin:/bin:/work/MG5_aMC/bin",
+    "RIVET_ANALYSIS_PATH": "/data/analysis",
+    "LD_LIBRARY_PATH": "/usr/local/lib",
+}
+
+
+def fake_docker_enabled(env=os.environ):
+    return env.get(FAKE_DOCKER_ENV, "") not in ("", "0")
+
+
+@dataclass
+class FakeConfig:
+    rate: float = 0.0           # log lines per second, 0 = as fast as possible
+    lines: int = 2000           # length of synthesized logs
+    chunk: int = 4096           # bytes per stream frame
+    log_dir: Path | None = None  # recorded mg5.log / rivet.log replayed instead
+    seed: int = 0
+    stats_interval: float = 1.0
+
+    @classmethod
+    def from_env(cls, env=os.environ):
+        log_dir = env.get("HEP_GUI_FAKE_LOGS")
+        return cls(
+            rate=float(env.get("HEP_GUI_FAKE_RATE", 0)),
+            lines=int(env.get("HEP_GUI_FAKE_LINES", 2000)),
+            log_dir=Path(log_dir) if log_dir else None,
+            seed=int(env.get("HEP_GUI_FAKE_SEED", 0)),
+        )
+
+
+# -- logs --
+
+def _mg5_log(run_name, nevents, n_lines):
+    """(stream, text) lines shaped like an MG5 + Pythia8 run."""
+    yield "out", "*" * 60
+    yield "out", "*                    MadGraph5_aMC@NLO                     *"
+    yield "out", "*               VERSION 3.6.7     2025-02-18               *"
+    yield "out", "*" * 60
+    yield "out", "INFO: load configuration from /work/MG5_aMC/input/mg5_configuration.txt"
+    yield "out", "INFO: Checking for minimal orders which gives processes."
+    yield "out", "INFO: Organizing processes into subprocess groups"
+    yield "out", f"output /work/{run_name}"
+    yield "out", "INFO: Generating Helas calls for process: g g > h WEIGHTED<=2"
+    n_compile = max(n_lines * 2 // 5, 1)
+    for i in range(n_compile):
+        yield "out", f"gfortran -w -fPIC -O -ffixed-line-length-132 -c matrix{i % 97}.f -I../../Source/"
+        if i % 50 == 49:
+            yield "err", f"Warning: Unused variable 'jamp{i}' declared at (1) [-Wunused-variable]"
+    n_events = max(n_lines // 5, 1)
+    for i in range(n_events):
+        done = (i + 1) * nevents // n_events
+        # progress refreshed in place, as MG5 does on a terminal
+        yield "out", f"INFO:  Idle: 0,  Running: 4,  Completed: {done} [ {i // 10}s ]\r" \
+                     f"INFO:  Idle: 0,  Running: 0,  Completed: {done} [ {i // 10}s ]"
+    for i in range(max(n_lines - n_compile - n_events - 12, 0)):
+        yield "out", f" PYTHIA Info: event {i * nevents // max(n_lines, 1)}   sigma = 3.2189e+01 pb"
+    yield "out", "INFO: storing files of previous run"
+    yield "out", "INFO: Done"
+    yield "out", "quit"
+
+
+def _rivet_log(analyses, nevents, n_lines):
+    yield "out", "Rivet.AnalysisHandler: INFO  Using named weights"
+    for name in analyses:
+        yield "out", f"Rivet.AnalysisHandler: INFO  Adding analysis '{name}'"
+    steps = max(n_lines - len(analyses) - 3, 1)
+    for i in range(steps):
+        n = (i + 1) * nevents // steps
+        yield "out", f"Event {n} ({i // 10}:{i % 60:02d} elapsed / 0:00:{(steps - i) % 60:02d} left)"
+    yield "out", "Rivet.AnalysisHandler: INFO  Finalising analyses"
+    yield "out", f"Rivet.AnalysisHandler: INFO  Processed {nevents} events"
+
+
+def _recorded(path):
+    with open(path, encoding="utf-8", errors="replace", newline="") as f:
+        for line in f:
+            yield "out", line.rstrip("\n")
+
+
+def _frames(lines, chunk):
+    """(n_lines, stdout bytes, stderr bytes) frames of about chunk bytes, one stream each."""
+    for stream, group in itertools.groupby(lines, key=lambda item: item[0]):
+        buf, n = [], 0
+        size = 0
+        for _, text in group:
+            data = (text + "\n").encode()
+            buf.append(data)
+            n += 1
+            size += len(data)
+            if size >= chunk:
+                blob = b"".join(buf)
+                yield n, *_split(stream, blob)
+                buf, n, size = [], 0, 0
+        if buf:
+            yield n, *_split(stream, b"".join(buf))
+
+
+def _split(stream, blob):
+    return (blob, None) if stream == "out" else (None, blob)
+
+
+# -- canned outputs --
+
+def _hepmc_gz(path, nevents, seed):
+    rng = np.random.default_rng(seed)
+    lines = ["HepMC::Version 3.02.06", "HepMC::Asciiv3-START_EVENT_LISTING"]
+    for i in range(nevents):
+        lines.append(f"E {i} 1 3")
+        lines.append(f"P 1 0 25 0 0 {rng.normal(0, 50):.4e} {rng.uniform(125, 500):.4e} 1.25e+02 2")
+    lines.append("HepMC::Asciiv3-END_EVENT_LISTING")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with gzip.open(path, "wt") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def _yoda_text(analyses, nevents, seed):
+    """A few Estimate1D histograms per analysis, YODA V3 as rivet writes it."""
+    parts = [
+        "BEGIN YODA_COUNTER_V3 /_EVTCOUNT\nPath: /_EVTCOUNT\nType: Counter\n---\n"
+        f"# sumW\tsumW2\tnumEntries\n{nevents}\t{nevents}\t{nevents}\nEND YODA_COUNTER_V3\n\n"
+    ]
+    for a, name in enumerate(analyses):
+        rng = np.random.default_rng((seed, a))
+        for obs in ("pT", "eta", "mass"):
+            edges = np.linspace(0.0, 200.0 if obs != "eta" else 5.0, 21)
+            values = rng.exponential(10.0, 20) + 0.1
+            path = f"/{name}/{obs}"
+            rows = "\n".join(f"{v:.6e}\t{-0.1 * v:.6e}\t{0.1 * v:.6e}" for v in values)
+            parts.append(
+                f"BEGIN YODA_ESTIMATE1D_V3 {path}\nPath: {path}\nTitle: {obs}\nType: Estimate1D\n---\n"
+                "Edges(A1): [" + ", ".join(f"{e:.6e}" for e in edges) + "]\n"
+                'ErrorLabels: ["stats"]\n# value\terrDn(1)\terrUp(1)\nnan\t---\t---\n'
+                f"{rows}\nnan\t---\t---\nEND YODA_ESTIMATE1D_V3\n\n"
+            )
+    return "".join(parts)
+
+
+def _shell_text(command):
+    """The shell command line of a DOCKER_SHELL string or an argv list,
+    with the helper scripts of the baked image expanded."""
+    argv = shlex.split(command) if isinstance(command, str) else list(command)
+    if argv and argv[0] == "bash" and "-c" in argv[:3]:
+        return argv[argv.index("-c") + 1]
+    if argv[:1] == ["hep-gui-run"]:
+        argv = argv[2:]
+    if argv[:1] == ["hep-gui-generate"] and len(argv) == 3:
+        script, name = argv[1:]
+        return f"mg5_aMC {script} ; mkdir -p /data/runs/{name} && cp -r /work/{name}/Events /data/runs/{name}/"
+    return shlex.join(argv)
+
+
+# -- simulated processes --
+
+class _Program:
+    """What a command does: its log lines, the files it leaves, its exit code."""
+
+    def __init__(self, lines=(), finish=None, exit_code=0, idle=False):
+        self.lines = lines
+        self.finish = finish
+        self.exit_code = exit_code
+        self.idle = idle  # runs until killed (sleep infinity)
+
+
+class _Process:
+    """A program run in a thread, its frames kept for every reader (attach, logs, exec)."""
+
+    def __init__(self, program, config, killed):
+        self.program = program
+        self.config = config
+        self.killed = killed
+        self.frames = []
+        self.exit_code = None
+        self.started = time.time()
+        self._cond = threading.Condition()
+        threading.Thread(target=self._run, name="fake-docker-process", daemon=True).start()
+
+    def _run(self):
+        code = self.program.exit_code
+        try:
+            if self.program.idle:
+                self.killed.wait()
+                code = _KILLED
+                return
+            t0, sent = time.perf_counter(), 0
+            rate = self.config.rate
+            for n, out, err in _frames(self.program.lines, self.config.chunk):
+                if self.killed.is_set():
+                    code = _KILLED
+                    return
+                with self._cond:
+                    self.frames.append((out, err))
+                    self._cond.notify_all()
+                sent += n
+                if rate > 0:
+                    delay = t0 + sent / rate - time.perf_counter()
+                    if delay > 0 and self.killed.wait(delay):
+                        code = _KILLED
+                        return
+            if self.program.finish is not None:
+                self.program.finish()
+        finally:
+            with self._cond:
+                self.exit_code = code
+                self._cond.notify_all()
+
+    @property
+    def running(self):
+        return self.exit_code is None
+
+    def stream(self):
+        """Every frame from the start, following until the program ends."""
+        i = 0
+        while True:
+            with self._cond:
+                while i >= len(self.frames) and self.exit_code is None:
+                    self._cond.wait(0.5)
+                batch = self.frames[i:]
+                done = self.exit_code is not None
+            i += len(batch)
+            yield from batch
+            if done and i >= len(self.frames):
+                return
+
+    def wait(self, timeout=None):
+        with self._cond:
+            self._cond.wait_for(lambda: self.exit_code is not None, timeout)
+            return self.exit_code
+
+
+def _merged(frames):
+    for out, err in frames:
+        yield (out or b"") + (err or b"")
+
+
+class FakeContainer:
+    def __init__(self, client, image, command, mounts, labels, environment, limits, workdir=None):
+        self.client = client
+        self.id = f"{next(client._ids):064x}"
+        self.short_id = self.id[:12]
+        self.name = f"fake_{self.short_id}"
+        self.image = image
+        self.labels = dict(labels or {})
+        self.environment = environment
+        self.limits = limits
+        self.mounts = mounts
+        self._killed = threading.Event()
+        self._process = _Process(client._program(command, mounts, workdir), client.config, self._killed)
+
+    @property
+    def status(self):
+        return "running" if self._process.running else "exited"
+
+    def reload(self):
+        if self.id not in self.client._containers:
+            raise docker.errors.NotFound(f"No such container: {self.short_id}")
+
+    def wait(self, timeout=None):
+        return {"StatusCode": self._process.wait(timeout), "Error": None}
+
+    def kill(self, signal=None):
+        if not self._process.running:
+            raise docker.errors.APIError(f"container {self.short_id} is not running")
+        self._killed.set()
+        self._process.wait(5)
+
+    def remove(self, force=False, v=False):
+        if self._process.running:
+            if not force:
+                raise docker.errors.APIError(f"container {self.short_id} is running, stop it first")
+            self.kill()
+        self.client._containers.pop(self.id, None)
+
+    def logs(self, stream=False, follow=True, stdout=True, stderr=True):
+        frames = _merged(self._process.stream() if follow or stream else list(self._process.frames))
+        return frames if stream else b"".join(frames)
+
+    def stats(self, stream=True, decode=False):
+        docs = self._stats()
+        if not decode:
+            docs = (json.dumps(doc).encode() for doc in docs)
+        return docs if stream else next(docs)
+
+    def _stats(self):
+        """Docker-shaped stats documents, one per stats_interval while running."""
+        interval = self.client.config.stats_interval
+        cores = 4
+        prev_cpu = prev_sys = 0
+        i = 0
+        while self._process.running:
+            cpu = int((i + 1) * interval * cores * 0.8e9)
+            system = int((i + 1) * interval * 8e9)
+            yield {
+                "cpu_stats": {"cpu_usage": {"total_usage": cpu}, "system_cpu_usage": system, "online_cpus": 8},
+                "precpu_stats": {"cpu_usage": {"total_usage": prev_cpu}, "system_cpu_usage": prev_sys},
+                "memory_stats": {"usage": (200 + 10 * i) << 20, "stats": {"inactive_file": 20 << 20}},
+                "blkio_stats": {"io_service_bytes_recursive": [{"op": "read", "value": 4096 * i},
+                                                               {"op": "write", "value": 65536 * i}]},
+                "networks": {"eth0": {"rx_bytes": 100 * i, "tx_bytes": 50 * i}},
+            }
+            prev_cpu, prev_sys = cpu, system
+            i += 1
+            if self._killed.wait(interval):
+                return
+
+    def exec_run(self, cmd, environment=None, workdir=None, demux=False, **kwargs):
+        if not self._process.running:
+            raise docker.errors.APIError(f"container {self.short_id} is not running")
+        process = _Process(self.client._program(cmd, self.mounts, workdir), self.client.config, self._killed)
+        code = process.wait()
+        frames = list(process.stream())
+        if demux:
+            return code, (b"".join(o for o, _ in frames if o) or None, b"".join(e for _, e in frames if e) or None)
+        return code, b"".join(_merged(frames))
+
+
+class FakeContainers:
+    def __init__(self, client):
+        self.client = client
+
+    def run(self, image, command=None, volumes=None, environment=None, detach=False,
+            labels=None, init=False, remove=False, working_dir=None, **limits):
+        if image not in self.client._images:
+            raise docker.errors.ImageNotFound(f"No such image: {image}")
+        mounts = {spec["bind"]: Path(host) for host, spec in (volumes or {}).items()}
+        c = FakeContainer(self.client, image, command, mounts, labels, environment, limits, working_dir)
+        self.client._containers[c.id] = c
+        if detach:
+            return c
+        code = c.wait()["StatusCode"]
+        output = c.logs()
+        c.remove()
+        if code != 0:
+            raise docker.errors.ContainerError(c, code, command, image, output)
+        return output
+
+    def get(self, container_id):
+        for c in self.client._containers.values():
+            if container_id in (c.id, c.short_id, c.name):
+                return c
+        raise docker.errors.NotFound(f"No such container: {container_id}")
+
+    def list(self, all=False, filters=None):
+        label = (filters or {}).get("label")
+        return [
+            c for c in list(self.client._containers.values())
+            if (all or c.status == "running") and (label is None or label in c.labels)
+        ]
+
+
+class FakeImage:
+    def __init__(self, tag, labels=None, env=None, files=None, serial=0):
+        self.tags = [tag]
+        self.id = "sha256:" + hashlib.sha256(f"{tag}#{serial}".encode()).hexdigest()
+        self.labels = dict(labels or {})
+        self.env = dict(env or {})
+        self.files = dict(files or {})  # path -> text, of a build's COPY
+
+
+def _dockerfile(text):
+    """(FROM, LABEL, ENV, COPY sources) of the simple Dockerfiles the app builds."""
+    text = text.replace("\\\n", " ")
+    base, labels, env, copies = None, {}, {}, []
+    for line in text.splitlines():
+        op, _, rest = line.strip().partition(" ")
+        if op == "FROM":
+            base = rest.strip()
+        elif op in ("LABEL", "ENV"):
+            for item in shlex.split(rest):
+                key, _, value = item.partition("=")
+                (labels if op == "LABEL" else env)[key] = value
+        elif op == "COPY":
+            copies.extend(rest.split()[:-1])
+    return base, labels, env, copies
+
+
+class FakeImages:
+    def __init__(self, client):
+        self.client = client
+
+    def get(self, tag):
+        if tag not in self.client._images:
+            raise docker.errors.ImageNotFound(f"No such image: {tag}")
+        return self.client._images[tag]
+
+    def list(self):
+        return [self.client._images[tag] for tag in sorted(self.client._images)]
+
+    def build(self, fileobj=None, custom_context=False, tag=None, rm=True, **kwargs):
+        """Build from a tar context (custom_context) or a Dockerfile file object."""
+        if custom_context:
+            with tarfile.open(fileobj=fileobj) as tar:
+                files = {m.name: tar.extractfile(m).read().decode() for m in tar.getmembers() if m.isfile()}
+        else:
+            files = {"Dockerfile": fileobj.read().decode()}
+        base, labels, env, copies = _dockerfile(files["Dockerfile"])
+        if base not in self.client._images:
+            raise docker.errors.BuildError(f"pull access denied for {base}", [])
+        image = self.client._add_image(
+            tag, labels=labels, env={**self.client._images[base].env, **env},
+            files={name: files[name] for name in copies},
+        )
+        self.client._event({"Type": "image", "Action": "tag", "Actor": {"Attributes": {"name": tag}}})
+        return image, iter([{"stream": f"Successfully tagged {tag}\n"}])
+
+
+class FakeAPI:
+    def __init__(self, client):
+        self.client = client
+        self._execs = {}  # id -> [container, argv, workdir, _Process or None]
+
+    def attach(self, container, stream=False, logs=False, demux=False):
+        c = self.client.containers.get(container)
+        frames = c._process.stream()
+        if not demux:
+            frames = _merged(frames)
+        if stream:
+            return frames
+        frames = list(frames)
+        return frames if demux else b"".join(frames)
+
+    def exec_create(self, container, cmd, environment=None, workdir=None, **kwargs):
+        c = self.client.containers.get(container)
+        if not c._process.running:
+            raise docker.errors.APIError(f"container {c.short_id} is not running")
+        exec_id = f"{next(self.client._ids):064x}"
+        self._execs[exec_id] = [c, cmd, workdir, None]
+        return {"Id": exec_id}
+
+    def exec_start(self, exec_id, stream=False, demux=False, detach=False, **kwargs):
+        entry = self._execs[exec_id]
+        c, cmd, workdir, _ = entry
+        entry[3] = process = _Process(self.client._program(cmd, c.mounts, workdir), self.client.config, c._killed)
+        frames = process.stream()
+        if not demux:
+            frames = _merged(frames)
+        if stream:
+            return frames
+        frames = list(frames)
+        return frames if demux else b"".join(frames)
+
+    def exec_inspect(self, exec_id):
+        process = self._execs[exec_id][3]
+        running = process is not None and process.running
+        return {"ID": exec_id, "Running": running,
+                "ExitCode": None if process is None or running else process.exit_code}
+
+    def pull(self, repository, tag=None, stream=False, decode=False, **kwargs):
+        name = f"{repository}:{tag or 'latest'}"
+
+        def progress():
+            yield {"status": f"Pulling from {repository}", "id": tag or "latest"}
+            for layer in ("a1b2c3d4e5f6", "0f9e8d7c6b5a"):
+                for pct in (25, 50, 100):
+                    bar = "=" * (pct // 2 - 1) + ">"
+                    yield {"status": "Downloading", "id": layer, "progress": f"[{bar:<50}] {pct}%"}
+                yield {"status": "Pull complete", "id": layer}
+            self.client._add_image(name)
+            self.client._event({"Type": "image", "Action": "pull", "Actor": {"Attributes": {"name": name}}})
+            yield {"status": f"Status: Downloaded newer image for {name}"}
+
+        chunks = progress() if decode else (json.dumps(c).encode() + b"\r\n" for c in progress())
+        return chunks if stream else list(chunks)
+
+
+class _Events:
+    """Blocking events stream with close(), like docker's CancellableStream."""
+
+    def __init__(self):
+        self._items = []
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def put(self, event):
+        with self._cond:
+            self._items.append(event)
+            self._cond.notify_all()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def __iter__(self):
+        i = 0
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._closed or i < len(self._items))
+                if self._closed:
+                    return
+                event = self._items[i]
+            i += 1
+            yield event
+
+
+class FakeDockerClient:
+    """docker.DockerClient look-alike backed by simulated containers, see the module docstring."""
+
+    def __init__(self, config=None, images=(DOCKER_IMAGE, DOCKER_IMAGE_MKHTML)):
+        self.config = config or FakeConfig()
+        self._serial = itertools.count()
+        self._images = {}  # tag -> FakeImage
+        for tag in images:
+            self._add_image(tag)
+        self._containers = {}
+        self._streams = []
+        self._ids = itertools.count(1)
+        self.containers = FakeContainers(self)
+        self.images = FakeImages(self)
+        self.api = FakeAPI(self)
+
+    @classmethod
+    def from_env(cls):
+        return cls(FakeConfig.from_env())
+
+    def ping(self):
+        return True
+
+    def version(self):
+        return {"Version": "27.0.0-fake", "ApiVersion": "1.46"}
+
+    def events(self, decode=False, filters=None, **kwargs):
+        stream = _Events()
+        self._streams.append(stream)
+        return stream
+
+    def close(self):
+        for stream in self._streams:
+            stream.close()
+
+    def _event(self, event):
+        for stream in self._streams:
+            stream.put(event)
+
+    def _add_image(self, tag, **kwargs):
+        """A new image under tag; a new id each time, as for a pull of a changed image."""
+        image = self._images[tag] = FakeImage(tag, serial=next(self._serial), **kwargs)
+        return image
+
+    # -- what a command does --
+
+    def _program(self, command, mounts, workdir=None):
+        text = _shell_text(command)
+        config = self.config
+        seed = config.seed
+
+        def host(path):
+            """Host path of a container path under a mount, or None."""
+            p = PurePosixPath(path)
+            for bind in sorted(mounts, key=len, reverse=True):
+                if p == PurePosixPath(bind) or PurePosixPath(bind) in p.parents:
+                    return mounts[bind] / p.relative_to(bind)
+            return None
+
+        def log(name, synthesized):
+            if config.log_dir is not None and (config.log_dir / name).exists():
+                return _recorded(config.log_dir / name)
+            return synthesized
+
+        if re.search(r"\bsleep\s+infinity\b", text):
+            return _Program(idle=True)
+
+        if re.search(r"\benv\s+-0\b", text):
+            env = "".join(f"{k}={v}\0" for k, v in _ENV.items())
+            return _Program([("out", env)])
+
+        m = re.search(r"mg5_aMC\s+(\S+)", text)
+        if m:
+            script = host(m.group(1))
+            if script is None or not script.exists():
+                return _Program([("err", f"Error: file {m.group(1)} does not exist")], exit_code=1)
+            script_text = script.read_text(encoding="utf-8")
+            name = re.search(r"^output\s+/work/(\S+)", script_text, re.MULTILINE)
+            name = name.group(1) if name else "PROC"
+            nevents = re.search(r"^\s*set\s+nevents\s*=?\s*(\d+)", script_text, re.MULTILINE)
+            nevents = int(nevents.group(1)) if nevents else 100
+            events = host(f"/data/runs/{name}/Events") if f"/data/runs/{name}" in text else None
+
+            def finish():
+                if events is not None:
+                    _hepmc_gz(events / "run_01" / "tag_1_pythia8_events.hepmc.gz", nevents, seed)
+
+            return _Program(log("mg5.log", _mg5_log(name, nevents, config.lines)), finish)
+
+        m = re.search(r"rivet-build\s+(\S+)\s+(\S+)", text)
+        if m:
+            cwd = re.search(r"\bcd\s+(\S+)", text)
+            base = host(cwd.group(1) if cwd else workdir or "/")
+            lib, source = m.groups()
+            if base is None or not any((base / s).exists() for s in (source, source + ".cc")):
+                return _Program([("err", f"error: {source}: No such file or directory")], exit_code=1)
+            lines = [("out", f"g++ -o \"{lib}\" -shared -fPIC -std=c++17 -O2 {source}")]
+            return _Program(lines, lambda: (base / lib).write_bytes(b"\x7fELF fake rivet plugin\n"))
+
+        m = re.search(r"rivet-mkhtml\s+(.+?)\s+-o\s+(\S+)", text)
+        if m:
+            files, out = m.group(1).split(), host(m.group(2))
+
+            def finish():
+                if out is not None:
+                    out.mkdir(parents=True, exist_ok=True)
+                    items = "".join(f"<li>{PurePosixPath(f).name}</li>" for f in files)
+                    (out / "index.html").write_text(f"<html><body><ul>{items}</ul></body></html>\n")
+
+            lines = [("out", f"Making {len(files)} plots"), ("out", "Writing index.html")]
+            return _Program(lines, finish)
+
+        m = re.search(r"\brivet\s+--analysis[= ](\S+)\s+(\S+)\s+-o\s+(\S+)", text)
+        if m:
+            analyses = [a for a in m.group(1).split(",") if a]
+            hepmc, yoda = host(m.group(2)), host(m.group(3))
+            if hepmc is None or not hepmc.exists():
+                return _Program([("err", f"Rivet.Run: ERROR  Can't open file {m.group(2)}")], exit_code=1)
+            nevents = 100
+            if hepmc.suffix == ".gz":
+                with gzip.open(hepmc, "rt") as f:
+                    nevents = sum(1 for line in f if line.startswith("E ")) or nevents
+
+            def finish():
+                if yoda is not None:
+                    yoda.parent.mkdir(parents=True, exist_ok=True)
+                    yoda.write_text(_yoda_text(analyses, nevents, seed), encoding="utf-8")
+
+            return _Program(log("rivet.log", _rivet_log(analyses, nevents, config.lines)), finish)
+
+        return _Program()
@@ -0,0 +1,249 @@
+"""QPainter renderer for PlotFigure.
+
+Mirrors the PlotTab style (fill + step outline + error bars, grid, legend,
+ratio panel) without any widget or QGraphicsScene, so it can draw onto a
+QImage (or any QPaintDevice) from a worker thread. SVG and PDF are
+written by vector_figure from the same layout, without Qt; the ratio
+panel is painted here from vector_figure's drawing operations.
+"""
+
+import numpy as np
+from PySide6.QtCore import QPointF, QRectF, Qt
+from PySide6.QtGui import (
+    QBrush, QColor, QFont, QFontMetricsF, QImage, QPainter, QPainterPath, QPen, QPolygonF,
+)
+
+from hep_gui.core.vector_figure import layout_ratio
+from hep_gui.utils.plot_helpers import (
+    FIGURE_MARGINS, FIGURE_SIZE, FigureAxes, build_step_coords, data_areas, format_tick, ratio_axes,
+)
+
+_LEFT, _RIGHT, _TOP, _BOTTOM = FIGURE_MARGINS
+
+DEFAULT_SIZE = FIGURE_SIZE
+
+
+def _polyline(xs, ys):
+    return QPolygonF([QPointF(float(a), float(b)) for a, b in zip(xs, ys)])
+
+
+def _color(rgb):
+    return QColor(*rgb)
+
+
+def _paint_ops(painter, ops):
+    """Paint vector_figure drawing operations (rect, segments, area, text, clip)."""
+    for op in ops:
+        kind = op[0]
+        if kind == "rect":
+            _, x, y, w, h, fill, stroke, lw = op
+            painter.setPen(QPen(_color(stroke), lw) if stroke else Qt.NoPen)
+            painter.setBrush(_color(fill) if fill else Qt.NoBrush)
+            painter.drawRect(QRectF(x, y, w, h))
+        elif kind == "segments":
+            _, x1, y1, x2, y2, c, lw = op
+            painter.setPen(QPen(_color(c), lw))
+            for a, b, p, q in zip(x1.tolist(), y1.tolist(), x2.tolist(), y2.tolist()):
+                painter.drawLine(QPointF(a, b), QPointF(p, q))
+        elif kind == "area":
+            _, xs, ys, c = op
+            path = QPainterPath()
+            path.addPolygon(_polyline(xs, ys))
+            path.closeSubpath()
+            painter.fillPath(path, QBrush(_color(c)))
+        elif kind == "text":
+            _, x, y, text, size, rotated = op
+            font = QFont("Arial")
+            font.setPixelSize(round(size))
+            painter.setFont(font)
+            painter.setPen(Qt.black)
+            painter.save()
+            painter.translate(x, y)
+            if rotated:
+                painter.rotate(-90)
+            painter.drawText(QPointF(0, 0), text)
+            painter.restore()
+        elif kind == "clip":
+            _, x, y, w, h = op
+            painter.save()
+            painter.setClipRect(QRectF(x, y, w, h))
+        elif kind == "unclip":
+            painter.restore()
+    painter.setBrush(Qt.NoBrush)
+
+
+def paint_figure(painter, width, height, fig):
+    """Draw fig into a (width x height) area starting at the painter origin."""
+    painter.setRenderHint(QPainter.Antialiasing, True)
+    painter.fillRect(QRectF(0, 0, width, height), Qt.white)
+    if fig is None:
+        return
+
+    main, ratio = data_areas(fig, width, height)
+    rect = QRectF(*main)
+    ax = FigureAxes(fig, rect.left(), rect.top(), rect.width(), rect.height())
+
+    font = QFont("Arial", 9)
+    painter.setFont(font)
+    fm = QFontMetricsF(font)
+
+    # grid + tick labels
+    grid_pen = QPen(QColor(0, 0, 0, 77), 1)
+    xticks, yticks = ax.ticks()
+
+    for t, v in xticks:
+        px, _ = ax.px(v, 10 ** ax.y0 if ax.ylog else ax.y0)
+        if not rect.left() - 0.5 <= px <= rect.right() + 0.5:
+            continue
+        painter.setPen(grid_pen)
+        painter.drawLine(QPointF(px, rect.top()), QPointF(px, rect.bottom()))
+        if ratio is not None:
+            continue  # labelled under the ratio panel
+        text = format_tick(t, ax.xlog)
+        painter.setPen(Qt.black)
+        painter.drawText(QPointF(px - fm.horizontalAdvance(text) / 2, rect.bottom() + fm.height()), text)
+
+    for t, v in yticks:
+        _, py = ax.px(10 ** ax.x0 if ax.xlog else ax.x0, v)
+        if not rect.top() - 0.5 <= py <= rect.bottom() + 0.5:
+            continue
+        painter.setPen(grid_pen)
+        painter.drawLine(QPointF(rect.left(), py), QPointF(rect.right(), py))
+        text = format_tick(t, ax.ylog)
+        painter.setPen(Qt.black)
+        painter.drawText(QPointF(rect.left() - fm.horizontalAdvance(text) - 5, py + fm.ascent() / 2 - 1), text)
+
+    # data, clipped to the axes
+    painter.save()
+    painter.setClipRect(rect)
+    for s in fig.series:
+        step_x, step_y = build_step_coords(s.edges, s.plot_vals)
+        px, py = ax.px(step_x, step_y)
+        _, base_py = ax.px(step_x[:1], np.array([s.fill_base if ax.ylog else 0.0]))
+
+        fill = QPainterPath()
+        fill.addPolygon(_polyline(px, py))
+        fill.lineTo(float(px[-1]), float(base_py[0]))
+        fill.lineTo(float(px[0]), float(base_py[0]))
+        fill.closeSubpath()
+        painter.fillPath(fill, QBrush(QColor(*s.color["fill"])))
+
+        painter.setPen(QPen(_color(s.color["line"]), 1.5))
+        painter.drawPolyline(_polyline(px, py))
+
+        if s.err_dn is not None:
+            mask = s.vals > 0
+            if mask.any():
+                centers = (s.edges[:-1] + s.edges[1:]) / 2.0
+                c = centers[mask]
+                v = s.plot_vals[mask]
+                cx, top = ax.px(c, v + s.err_up[mask])
+                _, bot = ax.px(c, np.maximum(v - s.err_dn[mask], 1e-30) if ax.ylog else v - s.err_dn[mask])
+                painter.setPen(QPen(_color(s.color["line"]), 1.2))
+                for xx, t, b in zip(cx, top, bot):
+                    painter.drawLine(QPointF(xx, t), QPointF(xx, b))
+
+    # reference data: points with x (bin width) and y error bars
+    r = fig.reference
+    if r is not None:
+        centers = (r.edges[:-1] + r.edges[1:]) / 2.0
+        mask = r.vals > 0 if ax.ylog else np.isfinite(r.vals)
+        cx, cy = ax.px(centers[mask], r.plot_vals[mask])
+        lx, _ = ax.px(r.edges[:-1][mask], r.plot_vals[mask])
+        rx, _ = ax.px(r.edges[1:][mask], r.plot_vals[mask])
+        painter.setPen(QPen(_color(r.color["line"]), 1.2))
+        for xx, yy, a, b in zip(cx, cy, lx, rx):
+            painter.drawLine(QPointF(a, yy), QPointF(b, yy))
+        if r.err_dn is not None:
+            v = r.plot_vals[mask]
+            _, top = ax.px(centers[mask], v + r.err_up[mask])
+            lo = v - r.err_dn[mask]
+            _, bot = ax.px(centers[mask], np.maximum(lo, 1e-30) if ax.ylog else lo)
+            for xx, t, b in zip(cx, top, bot):
+                painter.drawLine(QPointF(xx, t), QPointF(xx, b))
+        painter.setBrush(_color(r.color["line"]))
+        for xx, yy in zip(cx, cy):
+            painter.drawEllipse(QPointF(xx, yy), 3.0, 3.0)
+        painter.setBrush(Qt.NoBrush)
+    painter.restore()
+
+    if ratio is not None:
+        _paint_ops(painter, layout_ratio(fig, ratio_axes(fig, *ratio)))
+        painter.setFont(font)
+
+    # frame
+    painter.setPen(QPen(Qt.black, 1))
+    painter.setBrush(Qt.NoBrush)
+    painter.drawRect(rect)
+
+    # title + axis labels
+    title_font = QFont("Arial", 11)
+    painter.setFont(title_font)
+    tfm = QFontMetricsF(title_font)
+    painter.drawText(QPointF((width - tfm.horizontalAdvance(fig.title)) / 2, _TOP - 12), fig.title)
+    painter.setFont(font)
+    painter.drawText(
+        QPointF(rect.center().x() - fm.horizontalAdvance(fig.xlabel) / 2, height - 12), fig.xlabel,
+    )
+    painter.save()
+    painter.translate(18, rect.center().y() + fm.horizontalAdvance(fig.ylabel) / 2)
+    painter.rotate(-90)
+    painter.drawText(QPointF(0, 0), fig.ylabel)
+    painter.restore()
+
+    # legend (top-left, offset 10,10 like pw.addLegend)
+    entries = fig.series + ([fig.reference] if fig.reference is not None else [])
+    if entries:
+        row_h = fm.height() + 4
+        box_w = 40 + max(fm.horizontalAdvance(s.label) for s in entries) + 10
+        box = QRectF(rect.left() + 10, rect.top() + 10, box_w, row_h * len(entries) + 6)
+        painter.setPen(QPen(QColor(0, 0, 0, 100), 1))
+        painter.setBrush(QColor(255, 255, 255, 200))
+        painter.drawRect(box)
+        for i, s in enumerate(entries):
+            y = box.top() + 3 + row_h * (i + 0.5)
+            if s is fig.reference:
+                painter.setPen(QPen(_color(s.color["line"]), 1.2))
+                painter.setBrush(_color(s.color["line"]))
+                painter.drawEllipse(QPointF(box.left() + 18, y), 3.0, 3.0)
+                painter.setBrush(Qt.NoBrush)
+            else:
+                painter.setPen(QPen(_color(s.color["line"]), 3))
+                painter.drawLine(QPointF(box.left() + 6, y), QPointF(box.left() + 30, y))
+            painter.setPen(Qt.black)
+            painter.drawText(QPointF(box.left() + 38, y + fm.ascent() / 2 - 1), s.label)
+
+
+def render_png(fig, path, width=DEFAULT_SIZE[0], height=DEFAULT_SIZE[1]):
+    image = QImage(width, height, QImage.Format_ARGB32)
+    painter = QPainter(image)
+    paint_figure(painter, width, height, fig)
+    painter.end()
+    return image.save(str(path), "PNG")
+
+
+def render_thumbnail(fig, path, width, height):
+    """Icon-sized PNG of fig: fills and outlines only, no text or grid."""
+    image = QImage(width, height, QImage.Format_ARGB32)
+    image.fill(Qt.white)
+    painter = QPainter(image)
+    painter.setRenderHint(QPainter.Antialiasing, True)
+    ax = FigureAxes(fig, 1, 1, width - 2, height - 2)
+    for s in fig.series:
+        step_x, step_y = build_step_coords(s.edges, s.plot_vals)
+        px, py = ax.px(step_x, step_y)
+        px, py = np.clip(px, ax.left, ax.right), np.clip(py, ax.top, ax.bottom)
+        _, base = ax.px(step_x[:1], np.array([s.fill_base if ax.ylog else 0.0]))
+        base = float(np.clip(base[0], ax.top, ax.bottom))
+        fill = QPainterPath()
+        fill.addPolygon(_polyline(px, py))
+        fill.lineTo(float(px[-1]), base)
+        fill.lineTo(float(px[0]), base)
+        fill.closeSubpath()
+        painter.fillPath(fill, QBrush(QColor(*s.color["fill"])))
+        painter.setPen(QPen(_color(s.color["line"]), 1))
+        painter.drawPolyline(_polyline(px, py))
+    painter.setPen(QPen(QColor(0, 0, 0, 77), 1))
+    painter.drawRect(QRectF(0.5, 0.5, width - 1, height - 1))
+    painter.end()
+    return image.save(str(path), "PNG")
@@ -0,0 +1,226 @@
+"""Plot rendering without widgets.
+
+build_figure() plus vector_figure (SVG/PDF, no Qt at all) or
+figure_painter (PNG, needs a QGuiApplication, fine on the offscreen
+platform) make the same figures as PlotTab. This module loads YODA files and writes
+figures to disk for scripts, the CLI (python -m hep_gui.plot) and
+PlotTab. render_all() spreads many observables over worker processes
+with map_chunks(), also used by the Export all and HTML report workers:
+the datasets are written once to a session bundle that every worker
+memory-maps instead of parsing the YODA files again.
+"""
+
+import math
+import multiprocessing
+import os
+import re
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from PySide6.QtGui import QGuiApplication
+
+from hep_gui.core.figure_painter import DEFAULT_SIZE, render_png
+from hep_gui.core.plot_pipeline import build_figure
+from hep_gui.core.session import save_session, load_session
+from hep_gui.core.vector_figure import pdf_page, write_pdf, write_svg
+from hep_gui.core.yoda_parser import parse_yoda, filter_plottable
+
+FORMATS = ("png", "svg", "pdf")
+
+# tasks per worker process, so a slow chunk doesn't leave the others idle
+_CHUNKS_PER_JOB = 4
+
+# observables per worker process below which spawning it costs more than
+# it saves: a worker takes ~0.5 s to start, one process writes ~800 SVGs/s
+MIN_PER_JOB = 200
+
+# state of a worker process, set by _init_worker
+_worker = {}
+
+
+def ensure_app():
+    """The QGuiApplication rendering needs, created on the offscreen
+    platform unless QT_QPA_PLATFORM says otherwise."""
+    app = QGuiApplication.instance()
+    if app is None:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        app = QGuiApplication([])
+    return app
+
+
+def export_filename(histo_path, fmt):
+    """/MC_JETS/jet_pT_1 -> MC_JETS_jet_pT_1.png"""
+    stem = re.sub(r"[^\w.-]+", "_", histo_path.strip("/"))
+    return f"{stem}.{fmt}"
+
+
+def unique_label(stem, taken):
+    """stem, or stem_2, stem_3... if already in taken."""
+    if stem not in taken:
+        return stem
+    i = 2
+    while f"{stem}_{i}" in taken:
+        i += 1
+    return f"{stem}_{i}"
+
+
+def load_datasets(yoda_paths):
+    """{label: {"path", "histos"}} for the plottable histos of each file,
+    labelled by file stem like PlotTab does."""
+    datasets = {}
+    for path in map(Path, yoda_paths):
+        label = unique_label(path.stem, datasets)
+        datasets[label] = {"path": path, "histos": filter_plottable(parse_yoda(path))}
+    return datasets
+
+
+def observable_paths(datasets, filter_text=""):
+    """Sorted union of histo paths, keeping those containing filter_text
+    (case-insensitive), as in the PlotTab observable list."""
+    filt = filter_text.strip().lower()
+    paths = set()
+    for ds in datasets.values():
+        paths.update(ds["histos"])
+    return sorted(p for p in paths if filt in p.lower())
+
+
+def render_figure(fig, path, fmt=None, size=DEFAULT_SIZE):
+    """Write fig to path; the format comes from the suffix unless given."""
+    fmt = (fmt or Path(path).suffix.lstrip(".")).lower()
+    if fmt == "png":
+        return render_png(fig, path, *size)
+    if fmt == "svg":
+        return write_svg(fig, path, *size)
+    if fmt == "pdf":
+        return write_pdf(fig, path, *size)
+    raise ValueError(f"unknown plot format: {fmt}")
+
+
+def _render_paths(datasets, histo_paths, out_dir, fmt, size, options):
+    """Render each path to out_dir. Returns (written, [(path, error)])."""
+    written, errors = 0, []
+    for histo_path in histo_paths:
+        try:
+            fig = build_figure(datasets, histo_path, **options)
+            if fig is not None and render_figure(fig, out_dir / export_filename(histo_path, fmt), fmt, size):
+                written += 1
+        except Exception as e:
+            errors.append((histo_path, str(e)))
+    return written, errors
+
+
+def _render_task(datasets, context, histo_paths):
+    out_dir, fmt, size, options = context
+    return _render_paths(datasets, histo_paths, Path(out_dir), fmt, size, options)
+
+
+def _pdf_task(datasets, context, histo_paths):
+    """[(histo_path, pdf_page() or None, error)] of each path, in order."""
+    size, options = context
+    pages = []
+    for histo_path in histo_paths:
+        try:
+            fig = build_figure(datasets, histo_path, **options)
+            pages.append((histo_path, None if fig is None else pdf_page(fig, *size), None))
+        except Exception as e:
+            pages.append((histo_path, None, str(e)))
+    return pages
+
+
+def _init_worker(bundle, needs_app, context):
+    if needs_app:
+        ensure_app()
+    _worker["datasets"], _ = load_session(bundle)
+    _worker["context"] = context
+
+
+def _run_chunk(task, chunk):
+    return task(_worker["datasets"], _worker["context"], chunk)
+
+
+def job_count(total, jobs=None, min_per_job=1):
+    """Worker processes for total observables: jobs (default one per CPU),
+    at most one per min_per_job observables, at least 1."""
+    return max(1, min(jobs or os.cpu_count() or 1, total // min_per_job))
+
+
+def map_chunks(task, datasets, items, context=None, jobs=None, needs_app=False, is_cancelled=None):
+    """Run task(datasets, context, chunk) over chunks of items, yielding
+    (chunk, result) as chunks complete.
+
+    jobs > 1: in spawned worker processes, so task must be a module-level
+    function and the calling program importable without side effects (the
+    usual __main__ guard). datasets go to the workers as one session bundle,
+    context once per worker. Otherwise in this process, one item per chunk.
+    needs_app: the task paints with Qt (PNG). Pending chunks are dropped
+    once is_cancelled() returns True.
+    """
+    items = list(items)
+    jobs = min(jobs or os.cpu_count() or 1, len(items))
+    if jobs <= 1:
+        if needs_app:
+            ensure_app()
+        for item in items:
+            if is_cancelled and is_cancelled():
+                return
+            yield [item], task(datasets, context, [item])
+        return
+
+    step = math.ceil(len(items) / (jobs * _CHUNKS_PER_JOB))
+    chunks = [items[i:i + step] for i in range(0, len(items), step)]
+    with tempfile.TemporaryDirectory(prefix="hep_gui_plot_") as tmp:
+        bundle = Path(tmp) / "datasets.hepsession"
+        save_session(bundle, datasets)
+        # spawn: forking a process that may already run Qt threads is unsafe
+        with ProcessPoolExecutor(
+            max_workers=jobs,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(str(bundle), needs_app, context),
+        ) as pool:
+            futures = {pool.submit(_run_chunk, task, c): c for c in chunks}
+            try:
+                for fut in as_completed(futures):
+                    if is_cancelled and is_cancelled():
+                        return
+                    yield futures[fut], fut.result()
+            finally:
+                for fut in futures:
+                    fut.cancel()
+
+
+def render_all(datasets, out_dir, fmt="png", histo_paths=None, jobs=None,
+               size=DEFAULT_SIZE, progress=None, is_cancelled=None, **options):
+    """Render every observable (or histo_paths) of datasets to out_dir.
+
+    One file per observable, named by export_filename(). options go to
+    build_figure() (normalize, logx, logy, ref_label, ratio, rebin,
+    references).
+    jobs: worker processes, default one per CPU; 1 renders in this process.
+    progress(done, total) is called as observables complete, is_cancelled()
+    polled between them. Returns (written, errors) with errors as
+    [(histo_path, message)].
+
+    Workers are spawned, not forked, so the calling program must be
+    importable without side effects (the usual __main__ guard).
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown plot format: {fmt}")
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    if histo_paths is None:
+        histo_paths = observable_paths(datasets)
+    histo_paths = list(histo_paths)
+    total = len(histo_paths)
+
+    written, errors, done = 0, [], 0
+    context = (str(out_dir), fmt, tuple(size), options)
+    for chunk, (w, e) in map_chunks(_render_task, datasets, histo_paths, context, jobs,
+                                    needs_app=fmt == "png", is_cancelled=is_cancelled):
+        written += w
+        errors += e
+        done += len(chunk)
+        if progress:
+            progress(done, total)
+    return written, errors
@@ -0,0 +1,175 @@
+"""In-process replacement for rivet-mkhtml.
+
+Writes <out>/index.html plus one SVG per observable under <out>/<ANALYSIS>/.
+A manifest keeps the content hash of every figure so a rerun only
+re-renders the observables whose input histograms (or options) changed.
+Large reports are rendered in worker processes (headless.map_chunks):
+write_svg is pure Python, threads would take turns on the GIL.
+"""
+
+import html
+import json
+from pathlib import Path
+
+from PySide6.QtCore import QThread, Signal
+
+from hep_gui.core.headless import MIN_PER_JOB, job_count, map_chunks
+from hep_gui.core.plot_pipeline import build_figure, figure_digest
+from hep_gui.core.vector_figure import write_svg
+
+MANIFEST_NAME = "report_manifest.json"
+# part of every figure hash: bumped when the figure layout changes, so
+# reports written before are redrawn (2: ratio panel)
+_LAYOUT_VERSION = 2
+
+
+def report_relpath(histo_path):
+    """/MC_JETS/jet_pT_1 -> MC_JETS/jet_pT_1.svg"""
+    parts = [p for p in histo_path.strip("/").split("/") if p]
+    if len(parts) < 2:
+        parts = ["misc"] + parts
+    return "/".join(parts[:-1]) + f"/{parts[-1]}.svg"
+
+
+def _load_manifest(out_dir):
+    try:
+        with open(out_dir / MANIFEST_NAME) as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def _write_index(out_dir, datasets, histo_paths, normalize):
+    by_analysis = {}
+    for p in histo_paths:
+        ana = report_relpath(p).rsplit("/", 1)[0]
+        by_analysis.setdefault(ana, []).append(p)
+
+    labels = ", ".join(html.escape(label) for label in datasets)
+    out = [
+        "<!DOCTYPE html>",
+        '<html><head><meta charset="utf-8"><title>HEP-GUI plots</title>',
+        "<style>body{font-family:sans-serif;margin:1em 2em}"
+        ".plot{display:inline-block;margin:4px;text-align:center;font-size:11px}"
+        ".plot img{width:400px;border:1px solid #ddd}</style></head><body>",
+        f"<h1>HEP-GUI plots</h1><p>Datasets: {labels}"
+        f"{' (normalized to unit area)' if normalize else ''}</p>",
+        "<ul>",
+    ]
+    for ana in sorted(by_analysis):
+        out.append(f'<li><a href="#{html.escape(ana)}">{html.escape(ana)}</a> '
+                   f"({len(by_analysis[ana])})</li>")
+    out.append("</ul>")
+    for ana in sorted(by_analysis):
+        out.append(f'<h2 id="{html.escape(ana)}">{html.escape(ana)}</h2>')
+        for p in by_analysis[ana]:
+            rel = html.escape(report_relpath(p))
+            name = html.escape(p.rsplit("/", 1)[-1])
+            out.append(f'<div class="plot"><a href="{rel}"><img src="{rel}" loading="lazy"></a>'
+                       f"<br>{name}</div>")
+    out.append("</body></html>")
+    (out_dir / "index.html").write_text("\n".join(out), encoding="utf-8")
+
+
+def _render_task(datasets, context, todo):
+    """[(rel, ok, error)] for the (histo_path, rel) pairs of todo."""
+    out_dir, normalize = context
+    results = []
+    for histo_path, rel in todo:
+        try:
+            fig = build_figure(datasets, histo_path, normalize)
+            target = Path(out_dir) / rel
+            target.parent.mkdir(parents=True, exist_ok=True)
+            results.append((rel, fig is not None and write_svg(fig, target), None))
+        except Exception as e:
+            results.append((rel, False, str(e)))
+    return results
+
+
+def write_html_report(datasets, out_dir, histo_paths=None, normalize=True,
+                      max_workers=None, progress=None, is_cancelled=None, on_error=None):
+    """Render the report. Returns (rendered, skipped).
+
+    progress(done, total) is called from this thread as figures complete,
+    on_error(histo_path, message) for each figure that failed to build or
+    render. is_cancelled() is polled between figures. max_workers: worker
+    processes, default one per CPU, fewer for small reports.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    if histo_paths is None:
+        paths = set()
+        for ds in datasets.values():
+            paths.update(ds["histos"].keys())
+        histo_paths = sorted(paths)
+
+    old = _load_manifest(out_dir)
+    manifest = {}
+    todo = []
+    for p in histo_paths:
+        rel = report_relpath(p)
+        digest = figure_digest(datasets, p, normalize, _LAYOUT_VERSION)
+        manifest[rel] = digest
+        if old.get(rel) != digest or not (out_dir / rel).exists():
+            todo.append((p, rel))
+
+    total = len(histo_paths)
+    skipped = total - len(todo)
+    done = skipped
+    if progress:
+        progress(done, total)
+
+    rendered = 0
+    pending = {rel for _, rel in todo}
+    jobs = job_count(len(todo), max_workers, MIN_PER_JOB)
+    for chunk, results in map_chunks(_render_task, datasets, todo, (str(out_dir), normalize), jobs,
+                                     is_cancelled=is_cancelled):
+        for (histo_path, _), (rel, ok, error) in zip(chunk, results):
+            if ok:
+                rendered += 1
+                pending.discard(rel)
+            elif error is not None and on_error:
+                on_error(histo_path, error)
+        done += len(chunk)
+        if progress:
+            progress(done, total)
+
+    # failed / cancelled figures must be retried next time
+    for rel in pending:
+        manifest.pop(rel, None)
+    with open(out_dir / MANIFEST_NAME, "w") as f:
+        json.dump(manifest, f, indent=1)
+    _write_index(out_dir, datasets, histo_paths, normalize)
+    return rendered, skipped
+
+
+class HtmlReportWorker(QThread):
+    """write_html_report() in the background; finished or error is always emitted last."""
+
+    progress = Signal(int, int)     # done, total
+    finished = Signal(int, int)     # rendered, skipped
+    failed = Signal(str, str)       # histo_path, message
+    error = Signal(str)
+
+    def __init__(self, datasets, out_dir, histo_paths=None, normalize=True):
+        super().__init__()
+        self.datasets = dict(datasets)
+        self.out_dir = Path(out_dir)
+        self.histo_paths = histo_paths
+        self.normalize = normalize
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self):
+        try:
+            rendered, skipped = write_html_report(
+                self.datasets, self.out_dir, self.histo_paths, self.normalize,
+                progress=self.progress.emit,
+                is_cancelled=lambda: self._cancelled,
+                on_error=self.failed.emit,
+            )
+            self.finished.emit(rendered, skipped)
+        except Exception as e:
+            self.error.emit(str(e))
@@ -0,0 +1,266 @@
+"""Jobs queued by priority and run side by side within a CPU budget.
+
+Tabs submit Jobs instead of starting workers themselves. Up to max_jobs
+run at once as long as their CPUs fit in cpu_budget (the machine by
+default); the rest wait in a heap, highest priority first, then in
+submission order. A job that does not fit waits at the head of the
+queue until enough running jobs end, so smaller jobs queued after it
+cannot starve it. Pooled jobs have a queue of their own with
+max_pooled slots, so a rivet run does not wait for a generation to end.
+
+The scheduler's ExecutionBackend makes the worker of each job. With
+DockerBackend each job gets its own container with its Resources
+applied as Docker limits (nano_cpus, mem_limit, cpuset_cpus). Pooled
+jobs (rivet, rivet-build) run by exec in the warm ContainerPool: the
+shared container has no per-job limits, and they are not counted
+against max_jobs or the budget. LocalBackend (settings "backend":
+"local") runs the same commands as native processes.
+
+job_state is emitted on every state change, job_log with each batch of
+log lines and job_telemetry with each resource sample, always in the
+GUI thread, for the tabs and the WorkflowEngine to follow.
+"""
+
+import heapq
+import itertools
+import os
+from dataclasses import dataclass, field
+from functools import partial
+
+import docker
+from PySide6.QtCore import QObject, Signal
+
+from hep_gui.config.constants import JOB_SLOTS, POOLED_SLOTS
+from hep_gui.config.settings import load_settings
+from hep_gui.core.container_pool import ExecWorker, container_pool
+from hep_gui.core.docker_interface import DockerWorker, docker_service
+from hep_gui.core.execution import ExecutionBackend, LocalBackend, cpuset_cores, local_path_map
+
+QUEUED = "queued"
+RUNNING = "running"
+FINISHED = "finished"     # ran to the end, whatever its exit code
+FAILED = "failed"         # Docker error or no worker, see Job.error
+CANCELLED = "cancelled"
+
+DONE = (FINISHED, FAILED, CANCELLED)
+
+_ids = itertools.count(1)
+
+
+def cpuset_size(cpuset):
+    """Number of cores in a cpuset string like '0-7,16'."""
+    return len(cpuset_cores(cpuset))
+
+
+@dataclass
+class Resources:
+    cpus: float | None = None       # CPUs the container may use
+    mem: str | int | None = None    # memory limit, Docker syntax ("8g") or bytes
+    cpuset: str | None = None       # cores to pin to, "0-7"
+
+    @property
+    def cost(self):
+        """CPUs counted against the scheduler budget."""
+        if self.cpus:
+            return self.cpus
+        if self.cpuset:
+            return cpuset_size(self.cpuset)
+        return 1
+
+    def docker_kwargs(self):
+        """containers.run() keyword arguments for these limits."""
+        kw = {}
+        if self.cpus:
+            kw["nano_cpus"] = int(self.cpus * 1e9)
+        if self.mem:
+            kw["mem_limit"] = self.mem
+        if self.cpuset:
+            kw["cpuset_cpus"] = self.cpuset
+        return kw
+
+
+@dataclass(eq=False)
+class Job:
+    image: str
+    cmd: str | list
+    volumes: dict | None = None
+    environment: dict | None = None
+    resources: Resources = field(default_factory=Resources)
+    priority: int = 0               # higher runs first
+    name: str = ""
+    owner: str = ""                 # who submitted it: "generate", "analysis"
+    pooled: bool = False            # exec in the warm pool instead of a new container
+    workdir: str | None = None
+    id: int = field(default_factory=lambda: next(_ids))
+    state: str = QUEUED
+    exit_code: int | None = None
+    error: str | None = None
+    telemetry: object = None        # TelemetrySeries, from the start of the run
+
+    @property
+    def done(self):
+        return self.state in DONE
+
+
+class DockerBackend(ExecutionBackend):
+    """Jobs in containers: a new one per job, or the warm pool for pooled jobs."""
+
+    name = "docker"
+
+    def __init__(self, client=None, pool=None):
+        self._client = client
+        self._pool = pool
+
+    def check(self, tool=None):
+        return docker_service().status()
+
+    def make_worker(self, job):
+        if job.pooled:
+            return ExecWorker(self._pool or container_pool(), job.image, job.cmd, job.workdir)
+        client = self._client or docker_service().client
+        if client is None:
+            raise docker.errors.DockerException(f"Docker is not reachable: {docker_service().status()[1]}")
+        return DockerWorker(
+            client, job.image, job.cmd,
+            volumes=job.volumes, environment=job.environment,
+            resources=job.resources.docker_kwargs(),
+        )
+
+
+def execution_backend(settings=None):
+    """The backend chosen in the settings: DockerBackend, or LocalBackend for "local"."""
+    settings = settings or load_settings()
+    if settings.get("backend") == "local":
+        return LocalBackend(local_path_map(settings.get("local_mg5_dir")))
+    return DockerBackend()
+
+
+class JobScheduler(QObject):
+    """Runs submitted Jobs, at most max_jobs and cpu_budget CPUs at a time,
+    and max_pooled pooled jobs besides."""
+
+    job_state = Signal(object)        # Job
+    job_log = Signal(object, list)    # Job, [LogLine]
+    job_telemetry = Signal(object, object)  # Job, StatsSample
+
+    def __init__(self, max_jobs=JOB_SLOTS, cpu_budget=None, client=None, pool=None,
+                 backend=None, max_pooled=POOLED_SLOTS, parent=None):
+        super().__init__(parent)
+        self.max_jobs = max_jobs
+        self.cpu_budget = cpu_budget
+        self.max_pooled = max_pooled
+        self.backend = backend or DockerBackend(client, pool)
+        # by Job.pooled: (-priority, id, Job), cancelled entries skipped when popped
+        self._queues = {False: [], True: []}
+        self._running = {}    # Job -> worker
+        self._cancelled = set()
+
+    # -- queries --
+
+    @property
+    def running(self):
+        return list(self._running)
+
+    @property
+    def queued(self):
+        entries = sorted(self._queues[False] + self._queues[True])
+        return [job for _, _, job in entries if job.state == QUEUED]
+
+    def jobs(self, owner=None):
+        """Running then queued jobs, of one owner or all."""
+        return [j for j in self.running + self.queued if owner is None or j.owner == owner]
+
+    def _cpus_in_use(self):
+        return sum(job.resources.cost for job in self._running if not job.pooled)
+
+    # -- control --
+
+    def submit(self, job):
+        heapq.heappush(self._queues[job.pooled], (-job.priority, job.id, job))
+        self.job_state.emit(job)
+        self._dispatch()
+        return job
+
+    def cancel(self, job):
+        """Drop a queued job, or kill a running one (it then ends as CANCELLED)."""
+        if job.state == QUEUED:
+            job.state = CANCELLED
+            self.job_state.emit(job)
+            self._dispatch()
+        elif job.state == RUNNING:
+            self._cancelled.add(job)
+            self._running[job].stop_container()
+
+    def cancel_all(self, owner=None):
+        for job in self.jobs(owner):
+            self.cancel(job)
+
+    # -- running --
+
+    def _dispatch(self):
+        for pooled, queue in self._queues.items():
+            slots = self.max_pooled if pooled else self.max_jobs
+            while queue and sum(job.pooled == pooled for job in self._running) < slots:
+                job = queue[0][2]
+                if job.state != QUEUED:
+                    heapq.heappop(queue)
+                    continue
+                in_use = 0 if pooled or self.cpu_budget is None else self._cpus_in_use()
+                if in_use and in_use + job.resources.cost > self.cpu_budget:
+                    break
+                heapq.heappop(queue)
+                self._start(job)
+
+    def _start(self, job):
+        try:
+            worker = self.backend.make_worker(job)
+        except Exception as e:
+            # no worker, nothing to wait for: the job fails here
+            job.error = str(e)
+            job.state = FAILED
+            self.job_state.emit(job)
+            return
+        worker.log_lines.connect(partial(self.job_log.emit, job))
+        worker.telemetry.connect(partial(self._on_telemetry, job))
+        worker.finished.connect(partial(self._on_finished, job))
+        worker.error.connect(partial(self._on_error, job))
+        self._running[job] = worker
+        job.state = RUNNING
+        self.job_state.emit(job)
+        worker.start()
+
+    def _on_telemetry(self, job, sample):
+        worker = self._running.get(job)
+        if worker is None:
+            return  # a last sample queued after the job ended
+        job.telemetry = worker.series
+        self.job_telemetry.emit(job, sample)
+
+    def _on_finished(self, job, exit_code):
+        job.exit_code = exit_code
+        self._end(job, CANCELLED if job in self._cancelled else FINISHED)
+
+    def _on_error(self, job, msg):
+        job.error = msg
+        self._end(job, CANCELLED if job in self._cancelled else FAILED)
+
+    def _end(self, job, state):
+        worker = self._running.pop(job)
+        worker.wait()  # run() is returning, the QThread must not be freed before
+        job.telemetry = worker.series
+        self._cancelled.discard(job)
+        job.state = state
+        self.job_state.emit(job)
+        self._dispatch()
+
+
+_scheduler = None
+
+
+def job_scheduler():
+    """The shared JobScheduler, JOB_SLOTS jobs within the machine's CPUs
+    and POOLED_SLOTS pooled ones, on the backend of the settings."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = JobScheduler(JOB_SLOTS, cpu_budget=os.cpu_count(), backend=execution_backend())
+    return _scheduler
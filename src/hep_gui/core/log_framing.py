@@ -0,0 +1,136 @@
+"""Container output streams cut into lines.
+
+Docker hands out output in frames of arbitrary size: a frame can end
+mid-line or mid-character, or hold thousands of lines. LineFramer
+decodes UTF-8 incrementally, joins partial lines across frames and
+keeps only the last state of `\\r` progress lines, as a terminal would
+show it. frame_output() runs one framer per stream over the
+(stdout, stderr) pairs of a demuxed attach/exec stream and stamps each
+line with the time its frame arrived. LineBatcher hands the lines on
+to the GUI in batches.
+"""
+
+import codecs
+import threading
+import time
+from typing import NamedTuple
+
+# log lines reach the GUI as one list per window, or per this many lines
+LOG_BATCH_INTERVAL = 0.03
+LOG_BATCH_LINES = 5000
+
+
+class LogLine(NamedTuple):
+    stream: str    # "out", "err", or "app" for messages of the GUI itself
+    time: float    # time.time() when received
+    text: str
+
+
+class LineFramer:
+    """Incremental splitter for one stream: bytes in, complete lines out."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._partial = ""
+
+    def feed(self, data, now):
+        """LogLines completed by data. Blank lines are dropped."""
+        text = self._decoder.decode(data)
+        if "\n" not in text:
+            self._partial = _last_state(self._partial + text, partial=True)
+            return []
+        parts = text.split("\n")
+        parts[0] = self._partial + parts[0]
+        self._partial = _last_state(parts.pop(), partial=True)
+        stream = self.stream
+        out = []
+        for part in parts:
+            if "\r" in part:
+                part = _last_state(part)
+            part = part.rstrip()
+            if part:
+                out.append(LogLine(stream, now, part))
+        return out
+
+    def close(self, now):
+        """The last line if the stream did not end with a newline."""
+        rest = _last_state(self._partial + self._decoder.decode(b"", final=True)).rstrip()
+        self._partial = ""
+        return [LogLine(self.stream, now, rest)] if rest else []
+
+
+def _last_state(text, partial=False):
+    """What a terminal shows after the carriage returns in text.
+
+    In a partial line a trailing \\r may still be the start of \\r\\n,
+    so it is kept until the line completes.
+    """
+    end = len(text) - 1 if partial else len(text.rstrip("\r"))
+    i = text.rfind("\r", 0, end)
+    return text[i + 1:] if i >= 0 else text
+
+
+def frame_output(pairs, clock=time.time):
+    """Lists of LogLines from (stdout bytes, stderr bytes) pairs, one per pair.
+
+    pairs is what attach(..., demux=True) or exec_start(..., demux=True)
+    streams; either side may be None.
+    """
+    out, err = LineFramer("out"), LineFramer("err")
+    for stdout, stderr in pairs:
+        now = clock()
+        lines = out.feed(stdout, now) if stdout else []
+        if stderr:
+            lines += err.feed(stderr, now)
+        if lines:
+            yield lines
+    now = clock()
+    tail = out.close(now) + err.close(now)
+    if tail:
+        yield tail
+
+
+def format_line(line):
+    """'2026-01-31 14:05:09.123 err  text', for saved logs."""
+    stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(line.time))
+    return f"{stamp}.{int(line.time % 1 * 1000):03d} {line.stream:<4}{line.text}"
+
+
+class LineBatcher:
+    """Collects log lines and hands them to emit() as lists.
+
+    A batch goes out LOG_BATCH_INTERVAL after its first line (from a
+    timer thread, so a line followed by silence is not held back), or as
+    soon as it holds LOG_BATCH_LINES. One queued signal per batch instead
+    of per line keeps the GUI event loop ahead of chatty jobs.
+    """
+
+    def __init__(self, emit, interval=LOG_BATCH_INTERVAL, max_lines=LOG_BATCH_LINES):
+        self._emit = emit
+        self.interval = interval
+        self.max_lines = max_lines
+        self._pending = []
+        self._timer = None
+        self._lock = threading.Lock()
+
+    def add(self, lines):
+        with self._lock:
+            self._pending.extend(lines)
+            if len(self._pending) < self.max_lines:
+                if self._timer is None:
+                    self._timer = threading.Timer(self.interval, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+                return
+        self.flush()
+
+    def flush(self):
+        # emit under the lock: batches from the timer and the worker stay in order
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self._pending:
+                batch, self._pending = self._pending, []
+                self._emit(batch)
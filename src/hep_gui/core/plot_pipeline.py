@@ -0,0 +1,359 @@
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from hep_gui.config.constants import COLORS, REF_COLOR, REF_LABEL
+from hep_gui.utils.normalization import normalize_to_area
+from hep_gui.utils.plot_helpers import auto_log_scale, compute_view_range, get_axis_labels
+from hep_gui.utils.ratios import compute_ratios
+from hep_gui.utils.rebinning import edges_starts, merge_starts, rebin as rebin_arrays
+
+
+@dataclass
+class PlotSeries:
+    label: str
+    edges: np.ndarray
+    vals: np.ndarray
+    plot_vals: np.ndarray  # vals with zeros clamped for log y
+    err_dn: np.ndarray | None
+    err_up: np.ndarray | None
+    color: dict
+    fill_base: float = 0.0
+
+
+@dataclass
+class RatioPanel:
+    ref_label: str
+    edges: np.ndarray
+    labels: list[str]
+    colors: list[dict]
+    values: np.ndarray  # (datasets, bins)
+    err_dn: np.ndarray
+    err_up: np.ndarray
+
+
+@dataclass
+class OverlayBand:
+    edges: np.ndarray
+    lo: np.ndarray
+    median: np.ndarray
+    hi: np.ndarray
+    n: int  # datasets it was computed from
+
+
+@dataclass
+class PlotFigure:
+    path: str
+    title: str
+    xlabel: str
+    ylabel: str
+    xlog: bool
+    ylog: bool
+    series: list[PlotSeries] = field(default_factory=list)
+    view: tuple = (0.0, 1.0, 0.0, 1.0)  # xmin, xmax, ymin, ymax (data units)
+    ratio: RatioPanel | None = None
+    reference: PlotSeries | None = None  # measured data, drawn as points
+
+
+def extract_arrays(histo):
+    """Extract plottable arrays, replacing NaN with 0."""
+    edges = np.array(histo.edges, dtype=float)
+    n_bins = len(edges) - 1
+    vals = histo.values[:n_bins].copy()
+    vals = np.where(np.isnan(vals), 0, vals)
+
+    err_dn = err_up = None
+    if histo.err_dn is not None:
+        err_dn = np.abs(histo.err_dn[:n_bins])
+        err_up = histo.err_up[:n_bins]
+        err_dn = np.where(np.isnan(err_dn), 0, err_dn)
+        err_up = np.where(np.isnan(err_up), 0, err_up)
+
+    return edges, vals, err_dn, err_up
+
+
+def _apply_rebin(rows, rebin):
+    """Rebin rows [label, edges, vals, err_dn, err_up, density] in place.
+
+    rebin: int (merge N adjacent bins) or a sequence of new edges.
+    Rows sharing binning are stacked and rebinned in one reduceat call.
+    Rows whose binning doesn't contain the requested edges are left as is.
+    """
+    groups = {}
+    for k, row in enumerate(rows):
+        key = (row[1].tobytes(), row[5], row[3] is not None)
+        groups.setdefault(key, []).append(k)
+
+    for ks in groups.values():
+        edges = rows[ks[0]][1]
+        density = rows[ks[0]][5]
+        n_bins = len(edges) - 1
+        try:
+            if isinstance(rebin, int):
+                starts, stop = merge_starts(n_bins, rebin), n_bins
+            else:
+                starts, stop = edges_starts(edges, rebin)
+        except ValueError:
+            continue
+        vals = np.stack([rows[k][2] for k in ks])
+        has_err = rows[ks[0]][3] is not None
+        err_dn = np.stack([rows[k][3] for k in ks]) if has_err else None
+        err_up = np.stack([rows[k][4] for k in ks]) if has_err else None
+        new_edges, vals, err_dn, err_up = rebin_arrays(
+            edges, vals, err_dn, err_up, starts, stop, density,
+        )
+        for i, k in enumerate(ks):
+            rows[k][1:5] = [
+                new_edges, vals[i],
+                err_dn[i] if has_err else None, err_up[i] if has_err else None,
+            ]
+
+
+def build_figure(datasets, histo_path, normalize=True, logx=False, logy=False,
+                 ref_label=None, rebin=None, references=None, ratio=True):
+    """Build the figure description for one observable.
+
+    datasets: {label: {"histos": dict, ...}} as held by PlotTab.
+    logx/logy force log axes on top of the auto-detection.
+    ref_label: dataset used as denominator of the ratio panel (None = first).
+    ratio: attach the ratio panel (fig.ratio, drawn under the plot by the
+    renderers) when two or more datasets share the binning.
+    rebin: None, N (merge N adjacent bins) or a tuple of new bin edges.
+    references: object with .get(histo_path) -> YodaHisto1D | None (a
+    RefIndex); the match becomes fig.reference, rebinned/normalized alike.
+    Returns None when no dataset has this observable.
+    """
+    rows = []
+    for label, ds in datasets.items():
+        histo = ds["histos"].get(histo_path)
+        if not histo:
+            continue
+        edges, vals, err_dn, err_up = extract_arrays(histo)
+        # estimates hold densities, raw histos hold sums of weights
+        rows.append([label, edges, vals, err_dn, err_up, histo.sumw2 is None])
+
+    if not rows:
+        return None
+
+    ref_row = None
+    ref_histo = references.get(histo_path) if references is not None else None
+    if ref_histo is not None:
+        edges, vals, err_dn, err_up = extract_arrays(ref_histo)
+        ref_row = [REF_LABEL, edges, vals, err_dn, err_up, ref_histo.sumw2 is None]
+        rows.append(ref_row)
+
+    if rebin is not None and rebin != 1:
+        _apply_rebin(rows, rebin)
+    if ref_row is not None:
+        rows.pop()
+        if normalize:
+            ref_row[2:5] = normalize_to_area(*ref_row[1:5])
+
+    plot_data = []
+    for label, edges, vals, err_dn, err_up, _ in rows:
+        if normalize:
+            vals, err_dn, err_up = normalize_to_area(edges, vals, err_dn, err_up)
+        plot_data.append((label, edges, vals, err_dn, err_up))
+
+    # log scale: auto-detect from first dataset, then override with checkboxes
+    ref_edges, ref_vals = plot_data[0][1], plot_data[0][2]
+    xlog, ylog = auto_log_scale(ref_edges, ref_vals)
+    xlog = xlog or logx
+    ylog = ylog or logy
+
+    xlabel, ylabel = get_axis_labels(histo_path)
+    if normalize:
+        ylabel = "normalized"
+    title = histo_path.rsplit("/", 1)[-1]
+
+    fig = PlotFigure(histo_path, title, xlabel, ylabel, xlog, ylog)
+    for i, (label, edges, vals, err_dn, err_up) in enumerate(plot_data):
+        # clamp zeros for log y
+        plot_vals = vals.copy()
+        fill_base = 0.0
+        if ylog:
+            positive = plot_vals[plot_vals > 0]
+            floor = positive.min() * 0.01 if len(positive) > 0 else 1e-10
+            plot_vals = np.where(plot_vals > 0, plot_vals, floor)
+            fill_base = plot_vals[plot_vals > 0].min() * 0.1 if np.any(plot_vals > 0) else 1e-10
+        fig.series.append(PlotSeries(
+            label, edges, vals, plot_vals, err_dn, err_up,
+            COLORS[i % len(COLORS)], fill_base,
+        ))
+
+    if ref_row is not None:
+        _, edges, vals, err_dn, err_up, _ = ref_row
+        plot_vals = vals
+        if ylog:
+            positive = vals[vals > 0]
+            floor = positive.min() * 0.01 if len(positive) > 0 else 1e-10
+            plot_vals = np.where(vals > 0, vals, floor)
+        fig.reference = PlotSeries(REF_LABEL, edges, vals, plot_vals, err_dn, err_up, REF_COLOR)
+
+    shown = fig.series + ([fig.reference] if fig.reference is not None else [])
+    fig.view = compute_view_range(
+        [s.edges for s in shown], [s.plot_vals for s in shown], xlog, ylog,
+    )
+    fig.ratio = build_ratio(fig.series, ref_label) if ratio else None
+    return fig
+
+
+def build_ratio(series, ref_label=None):
+    """Ratio of every series to the reference, over all bins at once.
+
+    Series whose binning differs from the reference are left out.
+    Returns None with fewer than two comparable series.
+    """
+    if len(series) < 2:
+        return None
+    ref = next((s for s in series if s.label == ref_label), series[0])
+    same = [s for s in series if np.array_equal(s.edges, ref.edges)]
+    if len(same) < 2:
+        return None
+
+    n = len(ref.vals)
+    vals = np.stack([s.vals for s in same])
+    err_dn = np.stack([s.err_dn if s.err_dn is not None else np.zeros(n) for s in same])
+    err_up = np.stack([s.err_up if s.err_up is not None else np.zeros(n) for s in same])
+    ratio, r_dn, r_up = compute_ratios(vals, err_dn, err_up, same.index(ref))
+    return RatioPanel(
+        ref.label, ref.edges, [s.label for s in same], [s.color for s in same],
+        ratio, r_dn, r_up,
+    )
+
+
+def build_band(series, quantiles=(0.16, 0.84)):
+    """Median and central quantile band over the datasets, per bin.
+
+    Uses the series sharing the first one's binning, stacked into one
+    (datasets x bins) array; plot_vals, so log-y clamping carries over.
+    Returns None with fewer than three such series.
+    """
+    if not series:
+        return None
+    edges = series[0].edges
+    same = [s.plot_vals for s in series if np.array_equal(s.edges, edges)]
+    if len(same) < 3:
+        return None
+    lo, median, hi = np.nanquantile(np.stack(same), (quantiles[0], 0.5, quantiles[1]), axis=0)
+    return OverlayBand(edges, lo, median, hi, len(same))
+
+
+@dataclass
+class BinValue:
+    label: str
+    lo: float     # bin edges
+    hi: float
+    value: float
+    err_dn: float
+    err_up: float
+    ratio: float  # to the ratio panel reference, nan without one
+
+
+class BinReadout:
+    """Bin contents under an x position, for every series of a figure.
+
+    Series are grouped by binning and their values stacked once, so a
+    lookup is one searchsorted per binning plus a column read, whatever
+    the number of datasets.
+    """
+
+    def __init__(self, fig):
+        groups = {}
+        for s in fig.series:
+            groups.setdefault(s.edges.tobytes(), []).append(s)
+        self._groups = []
+        for members in groups.values():
+            n = len(members[0].vals)
+
+            def errs(attr):
+                return np.stack([
+                    getattr(s, attr) if getattr(s, attr) is not None else np.full(n, np.nan)
+                    for s in members
+                ])
+
+            self._groups.append((
+                members[0].edges, [s.label for s in members],
+                np.stack([s.vals for s in members]), errs("err_dn"), errs("err_up"),
+            ))
+        self._ratio = fig.ratio
+        if fig.ratio is not None:
+            self._ratio_row = {label: i for i, label in enumerate(fig.ratio.labels)}
+
+    @staticmethod
+    def _bin(edges, x):
+        i = int(np.searchsorted(edges, x, side="right")) - 1
+        return i if 0 <= i < len(edges) - 1 else None
+
+    def at(self, x):
+        """[BinValue] of each series having a bin at x, grouped by binning."""
+        out = []
+        r = self._ratio
+        j = self._bin(r.edges, x) if r is not None else None
+        for edges, labels, vals, err_dn, err_up in self._groups:
+            i = self._bin(edges, x)
+            if i is None:
+                continue
+            for k, label in enumerate(labels):
+                row = self._ratio_row.get(label) if j is not None else None
+                out.append(BinValue(
+                    label, float(edges[i]), float(edges[i + 1]), float(vals[k, i]),
+                    float(err_dn[k, i]), float(err_up[k, i]),
+                    float(r.values[row, j]) if row is not None else float("nan"),
+                ))
+        return out
+
+
+class FigureCache:
+    """LRU cache of built figures, keyed by observable + display options.
+
+    Call clear() whenever the datasets change.
+    """
+
+    def __init__(self, max_size=256):
+        self._max_size = max_size
+        self._figures = OrderedDict()
+
+    def get(self, datasets, histo_path, **options):
+        key = (histo_path, tuple(sorted(options.items())))
+        if key in self._figures:
+            self._figures.move_to_end(key)
+            return self._figures[key]
+        fig = build_figure(datasets, histo_path, **options)
+        self._figures[key] = fig
+        if len(self._figures) > self._max_size:
+            self._figures.popitem(last=False)
+        return fig
+
+    def clear(self):
+        self._figures.clear()
+
+
+def histo_digest(histo):
+    """Content hash of one histogram (binning, values, errors)."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(histo.path.encode())
+    h.update(np.asarray(histo.edges, dtype=float).tobytes())
+    for arr in (histo.values, histo.err_dn, histo.err_up):
+        if arr is not None:
+            h.update(np.ascontiguousarray(arr, dtype=float).tobytes())
+    return h.hexdigest()
+
+
+def figure_digest(datasets, histo_path, *options):
+    """Content hash of everything that goes into one figure.
+
+    Covers dataset labels and order, the histograms themselves and any
+    display options (normalize, log flags, ...) passed in *options.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr(options).encode())
+    for label, ds in datasets.items():
+        histo = ds["histos"].get(histo_path)
+        if histo is None:
+            continue
+        h.update(label.encode())
+        h.update(histo_digest(histo).encode())
+    return h.hexdigest()
@@ -0,0 +1,221 @@
+"""Index of a local directory of Rivet reference data.
+
+Every /REF/<analysis>/<obs> block of the .yoda files in the directory is
+mapped to (file, byte offset) once and the map is kept in CACHE_DIR. A
+plotted observable then finds its reference with one dict lookup and
+reads that single block, never the whole file. Reopening the directory
+only re-indexes files whose size or mtime changed. .yoda.gz files are
+unpacked once into the cache so their blocks can be seeked to.
+Only YODA V3 files are understood, like the rest of the parser.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from PySide6.QtCore import QThread, Signal
+
+from hep_gui.config.constants import CACHE_DIR
+from hep_gui.core.yoda_parser import index_yoda, is_plottable_block, read_block_at, YodaHisto1D
+
+REF_PREFIX = "/REF"
+
+_INDEX_VERSION = 1
+_SUFFIXES = (".yoda", ".yoda.gz")
+
+
+def ref_key(histo_path):
+    """Analysis options are not part of the reference path: /ANA:OPT=1/h -> /ANA/h."""
+    parts = histo_path.split("/")
+    if len(parts) > 2:
+        parts[1] = parts[1].split(":", 1)[0]
+    return "/".join(parts)
+
+
+def _dir_id(ref_dir):
+    return hashlib.blake2b(str(Path(ref_dir).resolve()).encode(), digest_size=8).hexdigest()
+
+
+def index_file_for(ref_dir, cache_dir=CACHE_DIR):
+    return Path(cache_dir) / f"ref_index_{_dir_id(ref_dir)}.json"
+
+
+def _scan(ref_dir):
+    """{relpath: [size, mtime_ns]} of the reference files under ref_dir."""
+    out = {}
+    for root, _dirs, files in os.walk(ref_dir):
+        for name in files:
+            if name.endswith(_SUFFIXES):
+                p = Path(root) / name
+                st = p.stat()
+                out[p.relative_to(ref_dir).as_posix()] = [st.st_size, st.st_mtime_ns]
+    return out
+
+
+class RefIndex:
+    """O(1) lookup of reference histograms for plotted observables.
+
+    get(path) takes the MC path (/ANA/obs) and returns the parsed
+    /REF/ANA/obs block, or None. Parsed blocks are kept in a small LRU.
+    """
+
+    def __init__(self, ref_dir, files=None, entries=None, max_cached=512):
+        self.ref_dir = Path(ref_dir)
+        self.files = files or {}       # relpath -> [size, mtime_ns, readable .yoda path]
+        self.entries = entries or {}   # /ANA/obs -> [relpath, offset]
+        self._max_cached = max_cached
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __getstate__(self):
+        # picklable for worker processes: the lock and parsed blocks stay behind
+        return {"ref_dir": self.ref_dir, "files": self.files,
+                "entries": self.entries, "max_cached": self._max_cached}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def lookup(self, histo_path):
+        """(file, offset) of the reference for histo_path, or None."""
+        entry = self.entries.get(ref_key(histo_path))
+        if entry is None:
+            return None
+        return Path(self.files[entry[0]][2]), entry[1]
+
+    def get(self, histo_path):
+        key = ref_key(histo_path)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+        loc = self.lookup(key)
+        histo = None
+        if loc is not None:
+            try:
+                with open(loc[0], "r") as f:
+                    obj = read_block_at(f, loc[1])
+                histo = obj if isinstance(obj, YodaHisto1D) else None
+            except OSError:
+                histo = None
+        with self._lock:
+            self._cache[key] = histo
+            if len(self._cache) > self._max_cached:
+                self._cache.popitem(last=False)
+        return histo
+
+    def save(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps({
+            "version": _INDEX_VERSION,
+            "ref_dir": str(self.ref_dir),
+            "files": self.files,
+            "entries": self.entries,
+        }), encoding="utf-8")
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        """Index stored by save(), or None if missing / unreadable / old."""
+        try:
+            data = json.loads(Path(path).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if data.get("version") != _INDEX_VERSION:
+            return None
+        return cls(data["ref_dir"], data["files"], data["entries"])
+
+
+def _readable_copy(ref_dir, rel, cache_dir):
+    """Path parse-able by offset: the file itself, or its unpacked .gz copy."""
+    src = Path(ref_dir) / rel
+    if not rel.endswith(".gz"):
+        return src
+    dst = Path(cache_dir) / "ref_unpacked" / _dir_id(ref_dir) / rel[:-3]
+    if not dst.exists() or dst.stat().st_mtime_ns < src.stat().st_mtime_ns:
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        with gzip.open(src, "rb") as fin, open(dst, "wb") as fout:
+            shutil.copyfileobj(fin, fout)
+    return dst
+
+
+def build_ref_index(ref_dir, previous=None, cache_dir=CACHE_DIR, progress=None, is_cancelled=None):
+    """Index ref_dir, reusing the entries of `previous` for unchanged files.
+
+    Returns a RefIndex, or None if cancelled.
+    """
+    ref_dir = Path(ref_dir)
+    current = _scan(ref_dir)
+    old_files = previous.files if previous is not None else {}
+    old_by_file = {}
+    if previous is not None:
+        for key, (rel, off) in previous.entries.items():
+            old_by_file.setdefault(rel, []).append((key, off))
+
+    files, entries = {}, {}
+    total = len(current)
+    for done, (rel, stat) in enumerate(sorted(current.items()), 1):
+        if is_cancelled and is_cancelled():
+            return None
+        old = old_files.get(rel)
+        if old is not None and old[:2] == stat and Path(old[2]).exists():
+            files[rel] = old
+            for key, off in old_by_file.get(rel, ()):
+                entries[key] = [rel, off]
+        else:
+            data_file = _readable_copy(ref_dir, rel, cache_dir)
+            files[rel] = stat + [str(data_file)]
+            for b in index_yoda(data_file):
+                if b.path.startswith(REF_PREFIX + "/") and is_plottable_block(b):
+                    entries[ref_key(b.path[len(REF_PREFIX):])] = [rel, b.offset]
+        if progress:
+            progress(done, total)
+    return RefIndex(ref_dir, files, entries)
+
+
+def open_ref_index(ref_dir, cache_dir=CACHE_DIR, progress=None, is_cancelled=None):
+    """Load the stored index of ref_dir, bring it up to date and save it."""
+    store = index_file_for(ref_dir, cache_dir)
+    previous = RefIndex.load(store)
+    index = build_ref_index(ref_dir, previous, cache_dir, progress, is_cancelled)
+    if index is not None and (previous is None or index.files != previous.files):
+        index.save(store)
+    return index
+
+
+class RefIndexWorker(QThread):
+    """Open (and build or refresh if needed) the index of a reference directory."""
+
+    progress = Signal(int, int)  # files done, total
+    finished = Signal(object)    # RefIndex
+    error = Signal(str)
+
+    def __init__(self, ref_dir, cache_dir=CACHE_DIR):
+        super().__init__()
+        self.ref_dir = Path(ref_dir)
+        self.cache_dir = Path(cache_dir)
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self):
+        try:
+            index = open_ref_index(
+                self.ref_dir, self.cache_dir,
+                progress=self.progress.emit,
+                is_cancelled=lambda: self._cancelled,
+            )
+            if index is not None:
+                self.finished.emit(index)
+        except Exception as e:
+            self.error.emit(str(e))
@@ -1,6 +1,7 @@
 from pathlib import Path, PurePosixPath
 
 from hep_gui.config.constants import DATA_DIR, DOCKER_SHELL
+from hep_gui.core.compiler_cache import with_ccache
 
 
 def build_rivet_command(analyses, hepmc_docker_path, output_yoda_path):
@@ -16,14 +17,22 @@ def build_rivet_command(analyses, hepmc_docker_path, output_yoda_path):
 
 
 def build_rivetbuild_command(cc_filename):
-    """Build the rivet-build Docker command string."""
+    """Build the rivet-build Docker command string, compiling through ccache."""
     name = Path(cc_filename).stem
-    return (
-        f'{DOCKER_SHELL} "'
-        f"cd /data/analysis "
-        f"&& rivet-build Rivet{name}.so {cc_filename}"
-        f'"'
-    )
+    build = f"cd /data/analysis && rivet-build Rivet{name}.so {cc_filename}"
+    return f'{DOCKER_SHELL} "{with_ccache(build, "/data/analysis")}"'
+
+
+def rivet_argv(analyses, hepmc_docker_path, output_yoda_path):
+    """rivet as an argv list, for the baked image; the output directory must exist."""
+    ana_str = ",".join(a.strip() for a in analyses if a.strip())
+    return ["rivet", f"--analysis={ana_str}", hepmc_docker_path, "-o", output_yoda_path]
+
+
+def rivetbuild_argv(cc_filename):
+    """rivet-build through ccache as an argv list, for the baked image; run in /data/analysis."""
+    name = Path(cc_filename).stem
+    return ["hep-gui-run", "/data/analysis", "rivet-build", f"Rivet{name}.so", cc_filename]
 
 
 def build_mkhtml_command(yoda_docker_paths, output_dir):
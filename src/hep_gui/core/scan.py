@@ -0,0 +1,165 @@
+"""Parameter scans: a family of runs that only differ by a few `set` values.
+
+Every observable shared by the runs is stacked into one (points x bins)
+array, so the viewer can swap curves without touching the parser again.
+"""
+
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+from hep_gui.config.constants import RUNS_DIR, SCRIPTS_DIR
+from hep_gui.core.plot_pipeline import extract_arrays
+from hep_gui.core.yoda_parser import parse_yoda, filter_plottable
+
+RUN_SCRIPT_NAME = "run_script.txt"
+# <yoda stem>.run_name next to a .yoda: the data/runs directory of its events
+RUN_NAME_FILE = "run_name"
+
+# vary between runs without being physics parameters, offered last
+_CONTROL_PARAMS = ("iseed", "nevents", "run")
+
+_RE_SET = re.compile(r"^\s*set\s+(\w+)\s*=?\s*(\S+)", re.MULTILINE)
+_RE_OUTPUT = re.compile(r"^output\s+/work/(\S+)", re.MULTILINE)
+
+
+@dataclass
+class ScanFamily:
+    labels: list[str]
+    params: list[dict]            # one {name: value} per run, same order as labels
+    scan_keys: list[str]          # params that actually vary across the family
+    edges: dict = field(default_factory=dict)   # path -> (bins+1,)
+    values: dict = field(default_factory=dict)  # path -> (points, bins)
+
+    @property
+    def paths(self):
+        return sorted(self.values)
+
+    def order(self, key):
+        """Run indices sorted by one scan parameter."""
+        vals = [p.get(key, np.nan) for p in self.params]
+        return np.argsort(np.asarray(vals, dtype=float), kind="stable")
+
+    def normalized(self, path):
+        """values[path] with every row scaled to unit area."""
+        vals = self.values[path]
+        area = (vals * np.diff(self.edges[path])).sum(axis=1, keepdims=True)
+        return np.divide(vals, area, out=vals.copy(), where=area != 0)
+
+
+def parse_scan_params(script_text):
+    """Numeric `set <name> <value>` parameters of an MG5 script."""
+    params = {}
+    for name, value in _RE_SET.findall(script_text):
+        try:
+            params[name] = float(value)
+        except ValueError:
+            continue
+    return params
+
+
+def run_name_of(hepmc_path, runs_dir=None):
+    """Name of the run directory under runs_dir holding hepmc_path, or None.
+
+    data/runs/ggH_ms_30/Events/run_01/tag_1_pythia8_events.hepmc.gz -> ggH_ms_30
+    """
+    try:
+        parts = Path(hepmc_path).resolve().relative_to(Path(runs_dir or RUNS_DIR).resolve()).parts
+    except ValueError:
+        return None
+    return parts[0] if len(parts) > 1 else None
+
+
+def record_run_name(yoda_path, hepmc_path, runs_dir=None):
+    """Note next to yoda_path which run its events came from.
+
+    Rivet output is named after the HepMC file (tag_1_pythia8_events.yoda),
+    not the run, so find_run_script() could not get from it to
+    <runs>/<run>/run_script.txt otherwise. Removes a stale note when the
+    events are not from a run directory.
+    """
+    note = Path(yoda_path).with_name(f"{Path(yoda_path).stem}.{RUN_NAME_FILE}")
+    name = run_name_of(hepmc_path, runs_dir)
+    if name is None:
+        note.unlink(missing_ok=True)
+    else:
+        note.write_text(name + "\n", encoding="utf-8")
+
+
+def find_run_script(yoda_path, search_dirs=None, runs_dir=None):
+    """Locate the MG5 script that produced a .yoda file, or None.
+
+    Looks for <runs>/<run>/run_script.txt with the run named by the
+    <stem>.run_name note next to the file (record_run_name), then
+    <runs>/<stem>/run_script.txt, then <stem>.txt next to the file, then
+    any script in search_dirs whose `output /work/<name>` matches the
+    file stem.
+    """
+    yoda_path = Path(yoda_path)
+    stem = yoda_path.stem
+    runs_dir = Path(runs_dir or RUNS_DIR)
+    candidates = [runs_dir / stem / RUN_SCRIPT_NAME, yoda_path.with_suffix(".txt")]
+    try:
+        run = yoda_path.with_name(f"{stem}.{RUN_NAME_FILE}").read_text(encoding="utf-8").strip()
+        if run:
+            candidates.insert(0, runs_dir / run / RUN_SCRIPT_NAME)
+    except OSError:
+        pass
+    for c in candidates:
+        if c.exists():
+            return c
+    for d in search_dirs or (SCRIPTS_DIR,):
+        d = Path(d)
+        if not d.is_dir():
+            continue
+        for script in sorted(d.glob("*.txt")):
+            try:
+                m = _RE_OUTPUT.search(script.read_text(encoding="utf-8", errors="replace"))
+            except OSError:
+                continue
+            if m and m.group(1) == stem:
+                return script
+    return None
+
+
+def load_scan(yoda_paths, search_dirs=None, progress=None, is_cancelled=None):
+    """Parse a family of runs into a ScanFamily.
+
+    Runs without a script are tagged with their position ("run").
+    Only observables present with identical binning in every run are kept.
+    progress(done, total) is called after each run is parsed; once
+    is_cancelled() returns True, None is returned.
+    """
+    yoda_paths = list(yoda_paths)
+    labels, params, per_run = [], [], []
+    for i, p in enumerate(yoda_paths):
+        if is_cancelled and is_cancelled():
+            return None
+        p = Path(p)
+        script = find_run_script(p, search_dirs)
+        tags = parse_scan_params(script.read_text(encoding="utf-8")) if script else {}
+        tags.setdefault("run", float(i))
+        labels.append(p.stem)
+        params.append(tags)
+        per_run.append(filter_plottable(parse_yoda(str(p))))
+        if progress:
+            progress(i + 1, len(yoda_paths))
+
+    keys = set.intersection(*(set(t) for t in params)) if params else set()
+    varying = [k for k in keys if len({t[k] for t in params}) > 1]
+    scan_keys = sorted(varying, key=lambda k: (k in _CONTROL_PARAMS, k)) or ["run"]
+
+    family = ScanFamily(labels, params, scan_keys)
+    if not per_run:
+        return family
+    common = set.intersection(*(set(h) for h in per_run))
+    for path in sorted(common):
+        arrays = [extract_arrays(h[path]) for h in per_run]
+        edges = arrays[0][0]
+        if any(not np.array_equal(a[0], edges) for a in arrays[1:]):
+            continue
+        family.edges[path] = edges
+        family.values[path] = np.stack([a[1] for a in arrays])
+    return family
@@ -0,0 +1,139 @@
+"""PlotTab sessions saved as one binary bundle.
+
+Layout: 8-byte magic, little-endian uint64 header length, JSON header,
+padding to a 64-byte boundary, then every array as raw little-endian
+float64. Per histogram, the header keeps path/title/metadata in columns
+and one row of an int64 table (stored in the data part) gives each
+array as (offset, length) in elements. Restoring is one json.loads and
+one memory map: no YODA parsing, and the source files don't need to
+exist any more.
+"""
+
+import json
+import os
+import struct
+from pathlib import Path
+
+import numpy as np
+
+from hep_gui.core.yoda_parser import YodaHisto1D
+
+SESSION_SUFFIX = ".hepsession"
+
+_MAGIC = b"HEPSESS\x00"
+_VERSION = 1
+_ALIGN = 64
+_ARRAYS = ("edges", "values", "err_dn", "err_up", "sumw2")
+
+
+def save_session(path, datasets, view=None):
+    """Write datasets ({label: {"path", "histos"}}) and a view-state dict to path.
+
+    Identical binnings are stored once. The file is written next to path
+    and renamed over it at the end.
+    """
+    chunks = []
+    offset = 0
+    edges_seen = {}
+
+    def put(arr):
+        nonlocal offset
+        arr = np.ascontiguousarray(arr, dtype="<f8")
+        chunks.append(arr)
+        ref = (offset, len(arr))
+        offset += len(arr)
+        return ref
+
+    header_ds = []
+    table = []  # (n_histos, 2 * len(_ARRAYS)) offsets/lengths, -1 for None
+    for label, ds in datasets.items():
+        paths, titles, metadata = [], [], []
+        for hpath, h in ds["histos"].items():
+            paths.append(hpath)
+            titles.append(h.title)
+            metadata.append(h.metadata)
+            edges = np.asarray(h.edges, dtype="<f8")
+            key = edges.tobytes()
+            if key not in edges_seen:
+                edges_seen[key] = put(edges)
+            row = list(edges_seen[key])
+            for name in _ARRAYS[1:]:
+                arr = getattr(h, name)
+                row.extend((-1, 0) if arr is None else put(arr))
+            table.append(row)
+        header_ds.append({"label": label, "source": str(ds["path"]),
+                          "paths": paths, "titles": titles, "metadata": metadata})
+
+    # the offset table goes last in the data part, as float64-sized int64s
+    table = np.asarray(table, dtype="<i8").reshape(-1, 2 * len(_ARRAYS))
+    header = json.dumps({
+        "version": _VERSION,
+        "datasets": header_ds,
+        "view": view or {},
+        "table": [offset, table.size],
+    }).encode("utf-8")
+    data_start = _aligned(len(_MAGIC) + 8 + len(header))
+
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(_MAGIC)
+        f.write(struct.pack("<Q", len(header)))
+        f.write(header)
+        f.write(b"\x00" * (data_start - f.tell()))
+        if chunks:
+            np.concatenate(chunks).tofile(f)
+        table.tofile(f)
+    os.replace(tmp, path)
+
+
+def load_session(path):
+    """Read a bundle written by save_session. Returns (datasets, view).
+
+    Arrays are read-only views into a memory map of the file, so pages
+    are only read when a histogram is actually drawn.
+    """
+    with open(path, "rb") as f:
+        if f.read(len(_MAGIC)) != _MAGIC:
+            raise ValueError(f"{Path(path).name} is not a HEP-GUI session")
+        (n,) = struct.unpack("<Q", f.read(8))
+        header = json.loads(f.read(n).decode("utf-8"))
+    if header.get("version") != _VERSION:
+        raise ValueError(f"unsupported session version {header.get('version')}")
+
+    data_start = _aligned(len(_MAGIC) + 8 + n)
+    # plain ndarray view: slicing a np.memmap costs ~10x more per call
+    if os.path.getsize(path) > data_start:
+        mm = np.memmap(path, dtype="<f8", mode="r", offset=data_start)
+    else:  # no histograms at all, nothing to map
+        mm = np.empty(0)
+    blob = mm.view(np.ndarray)
+    t_off, t_len = header["table"]
+    table = mm.view("<i8")[t_off:t_off + t_len].reshape(-1, 2 * len(_ARRAYS)).tolist()
+
+    edges_cache = {}
+    rows = iter(table)
+    datasets = {}
+    for ds in header["datasets"]:
+        histos = {}
+        for hpath, title, meta in zip(ds["paths"], ds["titles"], ds["metadata"]):
+            e0, e1, v0, v1, d0, d1, u0, u1, s0, s1 = next(rows)
+            edges = edges_cache.get(e0)
+            if edges is None:
+                edges = edges_cache[e0] = blob[e0:e0 + e1].tolist()
+            histos[hpath] = YodaHisto1D(
+                path=hpath,
+                title=title,
+                edges=edges,
+                values=blob[v0:v0 + v1],
+                err_dn=blob[d0:d0 + d1] if d0 >= 0 else None,
+                err_up=blob[u0:u0 + u1] if u0 >= 0 else None,
+                metadata=meta,
+                sumw2=blob[s0:s0 + s1] if s0 >= 0 else None,
+            )
+        datasets[ds["label"]] = {"path": Path(ds["source"]), "histos": histos}
+    return datasets, header["view"]
+
+
+def _aligned(n):
+    return (n + _ALIGN - 1) // _ALIGN * _ALIGN
@@ -0,0 +1,164 @@
+"""Resource use of a running container, sampled from the Docker stats stream.
+
+StatsRecorder follows container.stats(stream=True) in a daemon thread.
+Docker pushes one JSON document per second; each is reduced to a
+StatsSample (CPU %, resident memory, cumulative block I/O and network
+bytes) and kept in a TelemetrySeries, which counts the I/O from its
+first sample: a pooled container has served other jobs before this one. The series holds at most
+TELEMETRY_MAX_POINTS samples: when full, every other sample is dropped
+and the interval doubles, so a run of hours stays a few hundred KB.
+The recorder only decodes one small document per second and hands the
+GUI one sample per second, so it costs the GUI nothing noticeable.
+
+Saved as telemetry.json next to the run outputs, to size parallel runs.
+"""
+
+import json
+import threading
+import time
+from typing import NamedTuple
+
+TELEMETRY_INTERVAL = 1.0     # seconds between kept samples
+TELEMETRY_MAX_POINTS = 3600
+
+TELEMETRY_FILE = "telemetry.json"
+
+
+class StatsSample(NamedTuple):
+    time: float     # time.time()
+    cpu: float      # percent of one core, 400 = four cores busy
+    rss: int        # bytes, page cache excluded
+    blk: int        # bytes read + written, since the first sample once in a series
+    net: int        # bytes received + sent, likewise
+
+
+def stats_sample(stats, now=None):
+    """StatsSample from one Docker stats document, None if it has no CPU data yet."""
+    cpu, pre = stats.get("cpu_stats", {}), stats.get("precpu_stats", {})
+    try:
+        cpu_delta = cpu["cpu_usage"]["total_usage"] - pre["cpu_usage"]["total_usage"]
+        system_delta = cpu["system_cpu_usage"] - pre["system_cpu_usage"]
+    except KeyError:
+        return None
+    ncpu = cpu.get("online_cpus") or len(cpu["cpu_usage"].get("percpu_usage") or ()) or 1
+    cpu_percent = cpu_delta / system_delta * ncpu * 100.0 if system_delta > 0 else 0.0
+
+    mem = stats.get("memory_stats", {})
+    detail = mem.get("stats", {})
+    # page cache is not the job's own memory: "cache" on cgroup v1, "inactive_file" on v2
+    cache = detail.get("cache", detail.get("inactive_file", 0))
+    rss = max(mem.get("usage", 0) - cache, 0)
+
+    blk = sum(
+        entry.get("value", 0)
+        for entry in (stats.get("blkio_stats", {}).get("io_service_bytes_recursive") or ())
+        if entry.get("op", "").lower() in ("read", "write")
+    )
+    net = sum(
+        iface.get("rx_bytes", 0) + iface.get("tx_bytes", 0)
+        for iface in (stats.get("networks") or {}).values()
+    )
+    return StatsSample(time.time() if now is None else now, cpu_percent, rss, blk, net)
+
+
+class TelemetrySeries:
+    """StatsSamples of one run, TELEMETRY_INTERVAL apart or more, bounded in length."""
+
+    def __init__(self, interval=TELEMETRY_INTERVAL, max_points=TELEMETRY_MAX_POINTS):
+        self.interval = interval
+        self.max_points = max_points
+        self._samples = []
+        self._base = None  # (blk, net) of the first sample
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._samples)
+
+    def add(self, sample):
+        """Keep sample unless it comes within the interval of the last one.
+
+        Returns the sample as kept, blk and net counted from the first
+        sample of the series, or None if dropped.
+        """
+        with self._lock:
+            if self._samples and sample.time - self._samples[-1].time < self.interval * 0.9:
+                return None
+            if self._base is None:
+                self._base = (sample.blk, sample.net)
+            sample = sample._replace(blk=sample.blk - self._base[0], net=sample.net - self._base[1])
+            self._samples.append(sample)
+            if len(self._samples) > self.max_points:
+                self._samples = self._samples[::2]
+                self.interval *= 2
+            return sample
+
+    def samples(self):
+        with self._lock:
+            return list(self._samples)
+
+    def summary(self):
+        samples = self.samples()
+        if not samples:
+            return {}
+        cpu = [s.cpu for s in samples]
+        return {
+            "duration": samples[-1].time - samples[0].time,
+            "cpu_mean": sum(cpu) / len(cpu),
+            "cpu_peak": max(cpu),
+            "rss_peak": max(s.rss for s in samples),
+            "blk_bytes": samples[-1].blk,
+            "net_bytes": samples[-1].net,
+        }
+
+    def to_dict(self):
+        samples = self.samples()
+        t0 = samples[0].time if samples else 0.0
+        return {
+            "start": t0,
+            "interval": self.interval,
+            "summary": self.summary(),
+            "time": [round(s.time - t0, 3) for s in samples],
+            "cpu_percent": [round(s.cpu, 2) for s in samples],
+            "rss_bytes": [s.rss for s in samples],
+            "blk_bytes": [s.blk for s in samples],
+            "net_bytes": [s.net for s in samples],
+        }
+
+    def save(self, path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict()), encoding="utf-8")
+
+
+class StatsRecorder:
+    """Samples container into a TelemetrySeries until stop() or the container ends.
+
+    on_sample(StatsSample) is called from the recorder thread for every
+    sample kept, as the series keeps it, at most once per interval.
+    """
+
+    def __init__(self, container, on_sample=None, series=None):
+        self.container = container
+        self.on_sample = on_sample
+        self.series = series if series is not None else TelemetrySeries()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._follow, name="container-stats", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop after the sample in progress; does not wait for it."""
+        self._stopped = True
+
+    def _follow(self):
+        try:
+            for stats in self.container.stats(stream=True, decode=True):
+                if self._stopped:
+                    return
+                sample = stats_sample(stats)
+                kept = self.series.add(sample) if sample is not None else None
+                if kept is not None and self.on_sample:
+                    self.on_sample(kept)
+        except Exception:
+            pass  # container gone or no stats support; the series stays as it is
@@ -0,0 +1,129 @@
+"""Thumbnail PNGs of the overlaid observables, cached on disk.
+
+One icon per observable for the current set of datasets, named by the
+content hash of the figure (the histograms of every dataset that has
+it, their order, the icon size). The same files are found again in
+later sessions, and a changed histogram gets a new name, so only those
+are re-rendered. Old icons are never looked up again and can be deleted
+with the cache directory at any time.
+"""
+
+import atexit
+import os
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from PySide6.QtCore import QThread, Signal
+
+from hep_gui.config.constants import THUMBNAIL_DIR
+from hep_gui.core.figure_painter import render_thumbnail
+from hep_gui.core.plot_pipeline import build_figure, figure_digest
+
+THUMB_SIZE = (64, 40)
+
+# bump when the thumbnail drawing changes, so old icons are not reused
+_STYLE_VERSION = 1
+# rendered icons are handed to the GUI at most this often (seconds)
+_BATCH_INTERVAL = 0.1
+
+# Qt aborts if a QThread is destroyed while running; workers still going
+# at interpreter exit (e.g. the window closed mid-render) are stopped first
+_running = weakref.WeakSet()
+
+
+@atexit.register
+def _stop_running():
+    for worker in list(_running):
+        worker.cancel()
+        worker.wait()
+
+
+def thumbnail_file(datasets, histo_path, cache_dir=THUMBNAIL_DIR, size=THUMB_SIZE):
+    digest = figure_digest(datasets, histo_path, "thumbnail", _STYLE_VERSION, tuple(size))
+    return Path(cache_dir) / f"{digest}.png"
+
+
+def ensure_thumbnail(datasets, histo_path, cache_dir=THUMBNAIL_DIR, size=THUMB_SIZE):
+    """Path of the cached icon, rendered first if missing. None if nothing to draw."""
+    target = thumbnail_file(datasets, histo_path, cache_dir, size)
+    if target.exists():
+        return target
+    fig = build_figure(datasets, histo_path)
+    if fig is None:
+        return None
+    # unique temp name: several threads or sessions may render the same icon
+    tmp = target.with_name(f"{target.stem}.{os.getpid()}.{id(fig)}.tmp.png")
+    if not render_thumbnail(fig, tmp, *size):
+        return None
+    os.replace(tmp, target)
+    return target
+
+
+class ThumbnailWorker(QThread):
+    """Find or render the icons of histo_paths.
+
+    Icons already on disk are emitted together first, then rendered ones
+    follow in batches from a thread pool.
+    """
+
+    ready = Signal(object)   # {histo_path: png path}, one batch
+    finished = Signal(int)   # icons rendered (cache misses)
+    error = Signal(str)
+
+    def __init__(self, datasets, histo_paths, cache_dir=THUMBNAIL_DIR, size=THUMB_SIZE,
+                 max_workers=None):
+        super().__init__()
+        self.datasets = dict(datasets)
+        self.histo_paths = list(histo_paths)
+        self.cache_dir = Path(cache_dir)
+        self.size = tuple(size)
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self._cancelled = False
+        _running.add(self)
+
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self):
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            cached, todo = {}, []
+            for p in self.histo_paths:
+                if self._cancelled:
+                    return
+                f = thumbnail_file(self.datasets, p, self.cache_dir, self.size)
+                if f.exists():
+                    cached[p] = str(f)
+                else:
+                    todo.append(p)
+            if cached:
+                self.ready.emit(cached)
+
+            rendered = 0
+            batch, last = {}, time.monotonic()
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                futures = {
+                    pool.submit(ensure_thumbnail, self.datasets, p, self.cache_dir, self.size): p
+                    for p in todo
+                }
+                for fut in as_completed(futures):
+                    if self._cancelled:
+                        for f in futures:
+                            f.cancel()
+                        return
+                    f = fut.result()
+                    if f is None:
+                        continue
+                    rendered += 1
+                    batch[futures[fut]] = str(f)
+                    now = time.monotonic()
+                    if now - last >= _BATCH_INTERVAL:
+                        self.ready.emit(batch)
+                        batch, last = {}, now
+            if batch:
+                self.ready.emit(batch)
+            self.finished.emit(rendered)
+        except Exception as e:
+            self.error.emit(str(e))
@@ -0,0 +1,504 @@
+"""SVG and PDF written straight from a PlotFigure's arrays.
+
+No QPainter, QGraphicsScene or font engine: the figure is laid out once
+as a short list of drawing operations (same geometry and style as
+figure_painter, from the same FigureAxes), and each backend serializes
+that list to text. Text is measured with the Helvetica metrics (Arial is
+metric-compatible), which is also the PDF base font, so nothing is
+embedded. A typical figure takes well under a millisecond per format,
+which makes this the path for batch SVG/PDF export; PNG still goes
+through figure_painter.
+"""
+
+import os
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+from hep_gui.utils.plot_helpers import (
+    FIGURE_MARGINS, FIGURE_SIZE, FigureAxes, build_step_coords, data_areas, format_tick, ratio_axes,
+)
+
+_LEFT, _RIGHT, _TOP, _BOTTOM = FIGURE_MARGINS
+
+# Arial 9pt / 11pt at 96 dpi, as figure_painter draws on a QImage
+_FONT_PX = 12.0
+_TITLE_PX = 14.667
+_ASCENT, _DESCENT = 0.905, 0.212  # per px of font size
+
+_BLACK = (0, 0, 0, 255)
+_WHITE = (255, 255, 255, 255)
+_GRID = (0, 0, 0, 77)
+
+# Helvetica advance widths (1/1000 em) for ASCII 32..126
+_WIDTHS = (
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+)
+
+
+def text_width(text, size=_FONT_PX):
+    total = 0
+    for ch in text:
+        o = ord(ch) - 32
+        total += _WIDTHS[o] if 0 <= o < len(_WIDTHS) else 556
+    return total * size / 1000.0
+
+
+def _rgba(c):
+    return tuple(c) if len(c) == 4 else (*c, 255)
+
+
+# -- layout -----------------------------------------------------------------
+#
+# operations, in drawing order (pixel coordinates, y down):
+#   ("rect", x, y, w, h, fill | None, stroke | None, width)
+#   ("segments", x1, y1, x2, y2, color, width)     arrays, one line each
+#   ("polyline", xs, ys, color, width)
+#   ("area", xs, ys, color)                         closed, filled
+#   ("dots", xs, ys, radius, color)                 filled + outlined
+#   ("text", x, y, text, size, rotated)             baseline start, black
+#   ("clip", x, y, w, h) ... ("unclip",)
+# colors are (r, g, b, a) with a in 0..255
+
+
+# Steps, error bars and data points are axis-aligned, so clamping them to
+# the data area clips them exactly; the clip op is kept on top for
+# viewers that honour it (QtSvg, for one, ignores clip-path).
+
+def _clamp(ax, x, y):
+    return np.clip(x, ax.left, ax.right), np.clip(y, ax.top, ax.bottom)
+
+
+def _vsegs(ax, x, y1, y2, color, width):
+    keep = (x >= ax.left) & (x <= ax.right)
+    return ("segments", x[keep], np.clip(y1[keep], ax.top, ax.bottom),
+            x[keep], np.clip(y2[keep], ax.top, ax.bottom), color, width)
+
+
+def _hsegs(ax, x1, x2, y, color, width):
+    keep = (y >= ax.top) & (y <= ax.bottom)
+    return ("segments", np.clip(x1[keep], ax.left, ax.right), y[keep],
+            np.clip(x2[keep], ax.left, ax.right), y[keep], color, width)
+
+
+def _grid(ax, x_labels=True):
+    """Grid lines and tick labels of ax (x labels left out above a ratio panel)."""
+    asc = _ASCENT * _FONT_PX
+    line_h = (_ASCENT + _DESCENT) * _FONT_PX
+    xticks, yticks = ax.ticks()
+    gx, labels = [], []
+    for t, v in xticks:
+        px, _ = ax.px(v, 10 ** ax.y0 if ax.ylog else ax.y0)
+        px = float(px)
+        if ax.left - 0.5 <= px <= ax.right + 0.5:
+            gx.append(px)
+            if x_labels:
+                text = format_tick(t, ax.xlog)
+                labels.append(("text", px - text_width(text) / 2, ax.bottom + line_h, text, _FONT_PX, False))
+    gy = []
+    for t, v in yticks:
+        _, py = ax.px(10 ** ax.x0 if ax.xlog else ax.x0, v)
+        py = float(py)
+        if ax.top - 0.5 <= py <= ax.bottom + 0.5:
+            gy.append(py)
+            text = format_tick(t, ax.ylog)
+            labels.append(("text", ax.left - text_width(text) - 5, py + asc / 2 - 1, text, _FONT_PX, False))
+    gx, gy = np.array(gx), np.array(gy)
+    return [(
+        "segments",
+        np.concatenate([gx, np.full(len(gy), ax.left)]),
+        np.concatenate([np.full(len(gx), ax.top), gy]),
+        np.concatenate([gx, np.full(len(gy), ax.right)]),
+        np.concatenate([np.full(len(gx), ax.bottom), gy]),
+        _GRID, 1.0,
+    )] + labels
+
+
+def layout_ratio(fig, ax):
+    """The drawing operations of fig's ratio panel in ax (ratio_axes):
+    reference band around 1, each other dataset as steps with error bars,
+    as PlotTab._plot_ratio draws it. Bins without a ratio are left empty."""
+    r = fig.ratio
+    ops = _grid(ax)
+    ops.append(("clip", ax.left, ax.top, ax.width, ax.height))
+    # dashed line at 1
+    _, one = ax.px(fig.view[0], 1.0)
+    x1 = np.arange(ax.left, ax.right, 8.0)
+    ops.append(("segments", x1, np.full(len(x1), float(one)), np.minimum(x1 + 4.0, ax.right),
+                np.full(len(x1), float(one)), _BLACK, 1.0))
+    centers = (r.edges[:-1] + r.edges[1:]) / 2.0
+    for i, (label, color) in enumerate(zip(r.labels, r.colors)):
+        vals = r.values[i]
+        finite = np.isfinite(vals)
+        if label == r.ref_label:
+            lo = np.where(finite, vals - r.err_dn[i], 1.0)
+            hi = np.where(finite, vals + r.err_up[i], 1.0)
+            sx, sy_lo = build_step_coords(r.edges, lo)
+            _, sy_hi = build_step_coords(r.edges, hi)
+            px, py_lo = _clamp(ax, *ax.px(sx[1:-1], sy_lo[1:-1]))
+            _, py_hi = _clamp(ax, *ax.px(sx[1:-1], sy_hi[1:-1]))
+            ops.append(("area", np.concatenate([px, px[::-1]]), np.concatenate([py_hi, py_lo[::-1]]),
+                        _rgba(color["fill"])))
+            continue
+        line = _rgba(color["line"])
+        v = vals[finite]
+        lx, y = ax.px(r.edges[:-1][finite], v)
+        rx, _ = ax.px(r.edges[1:][finite], v)
+        ops.append(_hsegs(ax, lx, rx, y, line, 1.5))
+        join = finite[:-1] & finite[1:]
+        jx, y_a = ax.px(r.edges[1:-1][join], vals[:-1][join])
+        _, y_b = ax.px(r.edges[1:-1][join], vals[1:][join])
+        ops.append(_vsegs(ax, jx, y_a, y_b, line, 1.5))
+        cx, top = ax.px(centers[finite], v + r.err_up[i][finite])
+        _, bot = ax.px(centers[finite], v - r.err_dn[i][finite])
+        ops.append(_vsegs(ax, cx, top, bot, line, 1.2))
+    ops.append(("unclip",))
+    ops.append(("rect", ax.left, ax.top, ax.width, ax.height, None, _BLACK, 1.0))
+    ops.append(("text", 18, ax.top + ax.height / 2 + text_width("ratio") / 2, "ratio", _FONT_PX, True))
+    return ops
+
+
+def layout_figure(fig, width=FIGURE_SIZE[0], height=FIGURE_SIZE[1]):
+    """The drawing operations for fig on a width x height page, with the
+    ratio panel under the plot when fig has one."""
+    ops = [("rect", 0, 0, width, height, _WHITE, None, 0)]
+    if fig is None:
+        return ops
+
+    main, ratio = data_areas(fig, width, height)
+    ax = FigureAxes(fig, *main)
+    asc = _ASCENT * _FONT_PX
+    line_h = (_ASCENT + _DESCENT) * _FONT_PX
+
+    # grid + tick labels, x labels under the ratio panel if any
+    ops.extend(_grid(ax, x_labels=ratio is None))
+
+    # data, clipped to the axes
+    ops.append(("clip", ax.left, ax.top, ax.width, ax.height))
+    for s in fig.series:
+        line = _rgba(s.color["line"])
+        step_x, step_y = build_step_coords(s.edges, s.plot_vals)
+        px, py = _clamp(ax, *ax.px(step_x, step_y))
+        _, base = _clamp(ax, *ax.px(step_x[:1], np.array([s.fill_base if ax.ylog else 0.0])))
+        ops.append(("area", np.append(px, [px[-1], px[0]]),
+                    np.append(py, [base[0], base[0]]), _rgba(s.color["fill"])))
+        ops.append(("polyline", px, py, line, 1.5))
+        if s.err_dn is not None:
+            mask = s.vals > 0
+            if mask.any():
+                c = ((s.edges[:-1] + s.edges[1:]) / 2.0)[mask]
+                v = s.plot_vals[mask]
+                cx, top = ax.px(c, v + s.err_up[mask])
+                lo = v - s.err_dn[mask]
+                _, bot = ax.px(c, np.maximum(lo, 1e-30) if ax.ylog else lo)
+                ops.append(_vsegs(ax, cx, top, bot, line, 1.2))
+
+    r = fig.reference
+    if r is not None:
+        line = _rgba(r.color["line"])
+        centers = (r.edges[:-1] + r.edges[1:]) / 2.0
+        mask = r.vals > 0 if ax.ylog else np.isfinite(r.vals)
+        v = r.plot_vals[mask]
+        cx, cy = ax.px(centers[mask], v)
+        lx, _ = ax.px(r.edges[:-1][mask], v)
+        rx, _ = ax.px(r.edges[1:][mask], v)
+        ops.append(_hsegs(ax, lx, rx, cy, line, 1.2))
+        if r.err_dn is not None:
+            _, top = ax.px(centers[mask], v + r.err_up[mask])
+            lo = v - r.err_dn[mask]
+            _, bot = ax.px(centers[mask], np.maximum(lo, 1e-30) if ax.ylog else lo)
+            ops.append(_vsegs(ax, cx, top, bot, line, 1.2))
+        inside = (cx >= ax.left) & (cx <= ax.right) & (cy >= ax.top) & (cy <= ax.bottom)
+        ops.append(("dots", cx[inside], cy[inside], 3.0, line))
+    ops.append(("unclip",))
+
+    if ratio is not None:
+        ops.extend(layout_ratio(fig, ratio_axes(fig, *ratio)))
+
+    # frame, title + axis labels
+    ops.append(("rect", ax.left, ax.top, ax.width, ax.height, None, _BLACK, 1.0))
+    ops.append(("text", (width - text_width(fig.title, _TITLE_PX)) / 2, _TOP - 12,
+                fig.title, _TITLE_PX, False))
+    ops.append(("text", ax.left + ax.width / 2 - text_width(fig.xlabel) / 2, height - 12,
+                fig.xlabel, _FONT_PX, False))
+    ops.append(("text", 18, ax.top + ax.height / 2 + text_width(fig.ylabel) / 2,
+                fig.ylabel, _FONT_PX, True))
+
+    # legend (top-left, offset 10,10 like pw.addLegend)
+    entries = fig.series + ([r] if r is not None else [])
+    if entries:
+        row_h = line_h + 4
+        box_x, box_y = ax.left + 10, ax.top + 10
+        box_w = 40 + max(text_width(s.label) for s in entries) + 10
+        ops.append(("rect", box_x, box_y, box_w, row_h * len(entries) + 6,
+                    (255, 255, 255, 200), (0, 0, 0, 100), 1.0))
+        for i, s in enumerate(entries):
+            y = box_y + 3 + row_h * (i + 0.5)
+            line = _rgba(s.color["line"])
+            if s is r:
+                ops.append(("dots", np.array([box_x + 18]), np.array([y]), 3.0, line))
+            else:
+                ops.append(("segments", np.array([box_x + 6]), np.array([y]),
+                            np.array([box_x + 30]), np.array([y]), line, 3.0))
+            ops.append(("text", box_x + 38, y + asc / 2 - 1, s.label, _FONT_PX, False))
+    return ops
+
+
+# -- SVG --------------------------------------------------------------------
+
+def _esc(text):
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;").replace('"', "&quot;")
+
+
+def _svg_paint(kind, c):
+    out = f'{kind}="rgb({c[0]},{c[1]},{c[2]})"'
+    if c[3] < 255:
+        out += f' {kind}-opacity="{c[3] / 255:.3g}"'
+    return out
+
+
+def _svg_points(xs, ys):
+    return " ".join(f"{x:.2f},{y:.2f}" for x, y in zip(xs.tolist(), ys.tolist()))
+
+
+def figure_svg(fig, width=FIGURE_SIZE[0], height=FIGURE_SIZE[1]):
+    """SVG document of fig, as a string."""
+    out = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'viewBox="0 0 {width} {height}" font-family="Arial, Helvetica, sans-serif" '
+        'stroke-linecap="square" stroke-linejoin="bevel">',
+        f"<title>{_esc(fig.path if fig else '')}</title>",
+    ]
+    n_clip = 0
+    for op in layout_figure(fig, width, height):
+        kind = op[0]
+        if kind == "rect":
+            _, x, y, w, h, fill, stroke, lw = op
+            paint = _svg_paint("fill", fill) if fill else 'fill="none"'
+            if stroke:
+                paint += f' {_svg_paint("stroke", stroke)} stroke-width="{lw:g}"'
+            out.append(f'<rect x="{x:.2f}" y="{y:.2f}" width="{w:.2f}" height="{h:.2f}" {paint}/>')
+        elif kind == "segments":
+            _, x1, y1, x2, y2, c, lw = op
+            if len(x1):
+                d = "".join(f"M{a:.2f} {b:.2f}L{p:.2f} {q:.2f}" for a, b, p, q in
+                            zip(x1.tolist(), y1.tolist(), x2.tolist(), y2.tolist()))
+                out.append(f'<path d="{d}" fill="none" {_svg_paint("stroke", c)} stroke-width="{lw:g}"/>')
+        elif kind == "polyline":
+            _, xs, ys, c, lw = op
+            out.append(f'<polyline points="{_svg_points(xs, ys)}" fill="none" '
+                       f'{_svg_paint("stroke", c)} stroke-width="{lw:g}"/>')
+        elif kind == "area":
+            _, xs, ys, c = op
+            out.append(f'<polygon points="{_svg_points(xs, ys)}" {_svg_paint("fill", c)}/>')
+        elif kind == "dots":
+            _, xs, ys, rad, c = op
+            paint = f'{_svg_paint("fill", c)} {_svg_paint("stroke", c)} stroke-width="1.2"'
+            out.extend(f'<circle cx="{x:.2f}" cy="{y:.2f}" r="{rad:g}" {paint}/>'
+                       for x, y in zip(xs.tolist(), ys.tolist()))
+        elif kind == "text":
+            _, x, y, text, size, rotated = op
+            if not text:
+                continue
+            if rotated:
+                pos = f'transform="translate({x:.2f},{y:.2f}) rotate(-90)"'
+            else:
+                pos = f'x="{x:.2f}" y="{y:.2f}"'
+            out.append(f'<text {pos} font-size="{size:.4g}">{_esc(text)}</text>')
+        elif kind == "clip":
+            _, x, y, w, h = op
+            n_clip += 1
+            out.append(f'<defs><clipPath id="c{n_clip}"><rect x="{x:.2f}" y="{y:.2f}" '
+                       f'width="{w:.2f}" height="{h:.2f}"/></clipPath></defs>'
+                       f'<g clip-path="url(#c{n_clip})">')
+        elif kind == "unclip":
+            out.append("</g>")
+    out.append("</svg>\n")
+    return "\n".join(out)
+
+
+def write_svg(fig, path, width=FIGURE_SIZE[0], height=FIGURE_SIZE[1]):
+    Path(path).write_text(figure_svg(fig, width, height), encoding="utf-8")
+    return True
+
+
+# -- PDF --------------------------------------------------------------------
+
+# cubic Bezier control offset for a quarter circle
+_KAPPA = 0.5523
+
+
+def _pdf_text(text):
+    raw = text.encode("latin-1", "replace")
+    return raw.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)").decode("latin-1")
+
+
+def _pdf_path(xs, ys):
+    pts = zip(xs.tolist(), ys.tolist())
+    x, y = next(pts)
+    return " ".join([f"{x:.2f} {y:.2f} m"] + [f"{a:.2f} {b:.2f} l" for a, b in pts])
+
+
+class _PdfPage:
+    """Content stream of one page; alpha values used go to `alphas`."""
+
+    def __init__(self, alphas):
+        self.alphas = alphas
+        self.out = []
+
+    def _alpha(self, a):
+        name = f"/A{a}"
+        self.alphas.add(a)
+        self.out.append(f"{name} gs")
+
+    def fill(self, c):
+        self.out.append(f"{c[0] / 255:.3f} {c[1] / 255:.3f} {c[2] / 255:.3f} rg")
+        self._alpha(c[3])
+
+    def stroke(self, c, lw):
+        self.out.append(f"{c[0] / 255:.3f} {c[1] / 255:.3f} {c[2] / 255:.3f} RG {lw:g} w")
+        self._alpha(c[3])
+
+    def draw(self, ops, height):
+        out = self.out
+        # y down like the layout, text matrices flip glyphs back upright;
+        # square caps + bevel joins are the QPen defaults
+        out.append(f"1 0 0 -1 0 {height:g} cm 2 J 2 j")
+        for op in ops:
+            kind = op[0]
+            if kind == "rect":
+                _, x, y, w, h, fill, stroke, lw = op
+                box = f"{x:.2f} {y:.2f} {w:.2f} {h:.2f} re"
+                if fill:
+                    self.fill(fill)
+                    out.append(f"{box} f")
+                if stroke:
+                    self.stroke(stroke, lw)
+                    out.append(f"{box} S")
+            elif kind == "segments":
+                _, x1, y1, x2, y2, c, lw = op
+                if len(x1):
+                    self.stroke(c, lw)
+                    out.append(" ".join(f"{a:.2f} {b:.2f} m {p:.2f} {q:.2f} l" for a, b, p, q in
+                                        zip(x1.tolist(), y1.tolist(), x2.tolist(), y2.tolist())) + " S")
+            elif kind == "polyline":
+                _, xs, ys, c, lw = op
+                self.stroke(c, lw)
+                out.append(_pdf_path(xs, ys) + " S")
+            elif kind == "area":
+                _, xs, ys, c = op
+                self.fill(c)
+                out.append(_pdf_path(xs, ys) + " h f")
+            elif kind == "dots":
+                _, xs, ys, rad, c = op
+                self.fill(c)
+                self.stroke(c, 1.2)
+                k = rad * _KAPPA
+                for x, y in zip(xs.tolist(), ys.tolist()):
+                    out.append(
+                        f"{x + rad:.2f} {y:.2f} m "
+                        f"{x + rad:.2f} {y + k:.2f} {x + k:.2f} {y + rad:.2f} {x:.2f} {y + rad:.2f} c "
+                        f"{x - k:.2f} {y + rad:.2f} {x - rad:.2f} {y + k:.2f} {x - rad:.2f} {y:.2f} c "
+                        f"{x - rad:.2f} {y - k:.2f} {x - k:.2f} {y - rad:.2f} {x:.2f} {y - rad:.2f} c "
+                        f"{x + k:.2f} {y - rad:.2f} {x + rad:.2f} {y - k:.2f} {x + rad:.2f} {y:.2f} c B"
+                    )
+            elif kind == "text":
+                _, x, y, text, size, rotated = op
+                if not text:
+                    continue
+                self.fill(_BLACK)
+                m = "0 -1 -1 0" if rotated else "1 0 0 -1"
+                out.append(f"BT /F1 {size:.4g} Tf {m} {x:.2f} {y:.2f} Tm ({_pdf_text(text)}) Tj ET")
+            elif kind == "clip":
+                _, x, y, w, h = op
+                out.append(f"q {x:.2f} {y:.2f} {w:.2f} {h:.2f} re W n")
+            elif kind == "unclip":
+                out.append("Q")
+        return "\n".join(out).encode("latin-1")
+
+
+def pdf_page(fig, width=FIGURE_SIZE[0], height=FIGURE_SIZE[1]):
+    """(compressed content stream, alpha values used) of fig as one page,
+    for VectorPdf.add_rendered(); picklable, so pages can be made in
+    worker processes."""
+    alphas = set()
+    content = _PdfPage(alphas).draw(layout_figure(fig, width, height), height)
+    return zlib.compress(content, 6), alphas
+
+
+class VectorPdf:
+    """Multi-page PDF, one figure per page, written on close().
+
+    Pages are width x height points, the figure pixel size.
+    """
+
+    def __init__(self, path, width=FIGURE_SIZE[0], height=FIGURE_SIZE[1], title=""):
+        self.path = Path(path)
+        self.width, self.height = width, height
+        self.title = title
+        self._streams = []
+        self._alphas = set()
+
+    def __len__(self):
+        return len(self._streams)
+
+    def add_page(self, fig):
+        self.add_rendered(*pdf_page(fig, self.width, self.height))
+
+    def add_rendered(self, stream, alphas):
+        """Append a page made by pdf_page() at this document's size."""
+        self._streams.append(stream)
+        self._alphas.update(alphas)
+
+    def close(self):
+        if not self._streams:
+            self.add_page(None)
+        n = len(self._streams)
+        # objects: 1 catalog, 2 pages, 3 info, then (page, content) pairs
+        objs = [
+            b"<< /Type /Catalog /Pages 2 0 R >>",
+            ("<< /Type /Pages /Kids [" + " ".join(f"{4 + 2 * i} 0 R" for i in range(n))
+             + f"] /Count {n} >>").encode(),
+            f"<< /Producer (HEP-GUI) /Title ({_pdf_text(self.title)}) >>".encode("latin-1"),
+        ]
+        gstates = " ".join(f"/A{a} << /ca {a / 255:.3f} /CA {a / 255:.3f} >>" for a in sorted(self._alphas))
+        resources = (
+            "<< /Font << /F1 << /Type /Font /Subtype /Type1 /BaseFont /Helvetica "
+            f"/Encoding /WinAnsiEncoding >> >> /ExtGState << {gstates} >> >>"
+        )
+        for i, stream in enumerate(self._streams):
+            objs.append((
+                f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {self.width:g} {self.height:g}] "
+                f"/Resources {resources} /Contents {5 + 2 * i} 0 R >>"
+            ).encode())
+            objs.append(f"<< /Length {len(stream)} /Filter /FlateDecode >>\nstream\n".encode()
+                        + stream + b"\nendstream")
+
+        data = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        offsets = []
+        for num, body in enumerate(objs, 1):
+            offsets.append(len(data))
+            data += f"{num} 0 obj\n".encode() + body + b"\nendobj\n"
+        xref = len(data)
+        data += f"xref\n0 {len(objs) + 1}\n0000000000 65535 f \n".encode()
+        data += "".join(f"{off:010d} 00000 n \n" for off in offsets).encode()
+        data += (f"trailer\n<< /Size {len(objs) + 1} /Root 1 0 R /Info 3 0 R >>\n"
+                 f"startxref\n{xref}\n%%EOF\n").encode()
+
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, self.path)
+
+
+def write_pdf(fig, path, width=FIGURE_SIZE[0], height=FIGURE_SIZE[1]):
+    pdf = VectorPdf(path, width, height, title=fig.path if fig else "")
+    pdf.add_page(fig)
+    pdf.close()
+    return True
@@ -1,13 +1,22 @@
+from hep_gui.core.job_scheduler import job_scheduler
+
+
 class WorkflowEngine:
     """Connects tabs together: Generation to Analysis to Plots."""
 
-    def __init__(self, tabs, gen_tab, analysis_tab, plot_tab):
+    def __init__(self, tabs, gen_tab, analysis_tab, plot_tab, scheduler=None):
         self._tabs = tabs
         self._analysis_tab = analysis_tab
         self._plot_tab = plot_tab
+        self._scheduler = scheduler or job_scheduler()
+
+        # tab titles count the jobs each tab has queued or running
+        self._owners = {"generate": gen_tab, "analysis": analysis_tab}
+        self._titles = {tab: tabs.tabText(tabs.indexOf(tab)) for tab in self._owners.values()}
 
         gen_tab.run_succeeded.connect(self._on_generation_done)
         analysis_tab.run_succeeded.connect(self._on_analysis_done)
+        self._scheduler.job_state.connect(self._on_job_state)
 
     def _on_generation_done(self, hepmc_path):
         self._analysis_tab.set_hepmc_path(hepmc_path)
@@ -16,3 +25,11 @@ class WorkflowEngine:
     def _on_analysis_done(self, yoda_path):
         self._plot_tab.load_yoda_path(yoda_path)
         self._tabs.setCurrentWidget(self._plot_tab)
+
+    def _on_job_state(self, job):
+        tab = self._owners.get(job.owner)
+        if tab is None:
+            return
+        n = len(self._scheduler.jobs(job.owner))
+        title = self._titles[tab]
+        self._tabs.setTabText(self._tabs.indexOf(tab), f"{title} ({n})" if n else title)
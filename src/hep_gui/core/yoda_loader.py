@@ -0,0 +1,118 @@
+import queue
+import time
+from pathlib import Path
+
+from PySide6.QtCore import QThread, Signal
+
+from hep_gui.core.scan import load_scan
+from hep_gui.core.yoda_parser import index_yoda, is_plottable_block, read_block_at, store_block
+
+# parsed histos are handed to the GUI at most this often (seconds)
+_BATCH_INTERVAL = 0.05
+# pause after a requested histo is sent (milliseconds)
+_YIELD_MS = 40
+
+
+class YodaLoadWorker(QThread):
+    """Parse the plottable part of a .yoda file off the GUI thread.
+
+    Emits the block index first (path -> title), then parsed histos in
+    batches. Paths passed to request() jump the queue and are sent on
+    their own, so the observable on screen appears before the rest.
+    """
+
+    indexed = Signal(object)        # {path: title} of plottable blocks
+    histos_ready = Signal(object)   # {path: YodaHisto1D}, one batch
+    finished = Signal(object)       # {path: YodaHisto1D}, everything
+    error = Signal(str)
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = Path(path)
+        self._requests = queue.SimpleQueue()
+        self._cancelled = False
+
+    def request(self, histo_path):
+        """Parse histo_path next (thread-safe)."""
+        self._requests.put(histo_path)
+
+    def cancel(self):
+        self._cancelled = True
+
+    def _next_request(self, pending):
+        while True:
+            try:
+                path = self._requests.get_nowait()
+            except queue.Empty:
+                return None
+            if path in pending:
+                return path
+
+    def run(self):
+        try:
+            blocks = [b for b in index_yoda(self.path) if is_plottable_block(b)]
+            titles = {}
+            pending = {}  # path -> blocks, file order
+            for b in blocks:
+                titles.setdefault(b.path, b.title)
+                pending.setdefault(b.path, []).append(b)
+            self.indexed.emit(titles)
+
+            order = list(pending)
+            i = 0
+            results, batch = {}, {}
+            last = time.monotonic()
+            with open(self.path, "r") as f:
+                while not self._cancelled:
+                    path = self._next_request(pending)
+                    urgent = path is not None
+                    if path is None:
+                        while i < len(order) and order[i] not in pending:
+                            i += 1
+                        if i == len(order):
+                            break
+                        path = order[i]
+                    for b in pending.pop(path):
+                        store_block(results, read_block_at(f, b.offset))
+                    if path in results:
+                        batch[path] = results[path]
+                    now = time.monotonic()
+                    if batch and (urgent or now - last >= _BATCH_INTERVAL):
+                        self.histos_ready.emit(batch)
+                        batch, last = {}, now
+                        if urgent:
+                            # the GUI replots now, leave it the GIL meanwhile
+                            self.msleep(_YIELD_MS)
+            if self._cancelled:
+                return
+            if batch:
+                self.histos_ready.emit(batch)
+            self.finished.emit(results)
+        except Exception as e:
+            self.error.emit(f"{self.path.name}: {e}")
+
+
+class ScanLoadWorker(QThread):
+    """load_scan() off the GUI thread, for the Scan... viewer."""
+
+    progress = Signal(int, int)     # runs parsed, total
+    finished = Signal(object)       # ScanFamily
+    error = Signal(str)
+
+    def __init__(self, paths, search_dirs=None):
+        super().__init__()
+        self.paths = [Path(p) for p in paths]
+        self.search_dirs = search_dirs
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self):
+        try:
+            family = load_scan(self.paths, self.search_dirs, progress=self.progress.emit,
+                               is_cancelled=lambda: self._cancelled)
+            if family is not None:
+                self.finished.emit(family)
+        except Exception as e:
+            self.error.emit(str(e))
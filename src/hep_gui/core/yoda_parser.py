@@ -1,3 +1,4 @@
+import mmap
 import re
 from dataclasses import dataclass, field
 
@@ -9,6 +10,7 @@ _SUPPORTED_COUNTER = {"COUNTER"}
 _SKIPPED_TYPES = {"ESTIMATE0D"}
 
 _RE_BEGIN = re.compile(r"^BEGIN YODA_(\w+(?:<\w+>)?)_V3\s+(.+)$")
+_RE_BEGIN_BYTES = re.compile(rb"^[ \t]*BEGIN YODA_(\w+(?:<\w+>)?)_V3[ \t]+([^\r\n]+)", re.MULTILINE)
 
 
 @dataclass
@@ -20,6 +22,7 @@ class YodaHisto1D:
     err_dn: np.ndarray | None = None
     err_up: np.ndarray | None = None
     metadata: dict = field(default_factory=dict)
+    sumw2: np.ndarray | None = None  # HISTO1D / BINNEDHISTO only
 
 
 @dataclass
@@ -44,150 +47,206 @@ def _parse_edges(line):
     return [float(x.strip()) for x in inner.split(",")]
 
 
+@dataclass
+class YodaBlock:
+    """One BEGIN line found by index_yoda()."""
+    path: str
+    type: str      # raw type, e.g. HISTO1D or BINNEDESTIMATE<d>
+    title: str
+    offset: int    # byte offset of the BEGIN line
+
+
+def _split_type(raw_type):
+    # BINNEDESTIMATE<I> -> base=BINNEDESTIMATE, sub=I
+    if "<" in raw_type:
+        return raw_type.split("<")[0], raw_type.split("<")[1].rstrip(">")
+    return raw_type, ""
+
+
+def _skip_block(f):
+    line = f.readline()
+    while line and not line.startswith("END "):
+        line = f.readline()
+
+
+def _read_block(f, m):
+    """Parse the block whose BEGIN line matched m, f positioned right after it.
+
+    Returns a YodaHisto1D, a YodaCounter or None, and leaves f after END.
+    """
+    raw_type = m.group(1)
+    block_path = m.group(2).strip()
+    base_type, sub_type = _split_type(raw_type)
+
+    # string-binned -> not plottable
+    if sub_type.upper() == "S" or base_type in _SKIPPED_TYPES:
+        _skip_block(f)
+        return None
+    if base_type not in _SUPPORTED_1D and base_type not in _SUPPORTED_COUNTER:
+        _skip_block(f)
+        return None
+
+    # metadata until ---
+    metadata = {}
+    title = ""
+    line = f.readline()
+    while line and line.strip() != "---":
+        if ":" in line:
+            key, _, val = line.partition(":")
+            key = key.strip()
+            val = val.strip()
+            if key == "Title":
+                title = val
+            else:
+                metadata[key] = val
+        line = f.readline()
+
+    # data section until END
+    edges = None
+    data_rows = []
+    line = f.readline()
+    while line and not line.startswith("END "):
+        stripped = line.strip()
+        if stripped.startswith("Edges(A1):"):
+            edges = _parse_edges(stripped)
+        elif stripped.startswith("#") or stripped.startswith("ErrorLabels:"):
+            pass
+        elif stripped:
+            cols = stripped.split()
+            data_rows.append([_parse_float(c) for c in cols])
+        line = f.readline()
+
+    # build object
+    if base_type in _SUPPORTED_COUNTER:
+        if not data_rows:
+            return None
+        row = data_rows[0]
+        return YodaCounter(
+            path=block_path,
+            sum_w=row[0] if len(row) > 0 else 0.0,
+            sum_w2=row[1] if len(row) > 1 else 0.0,
+            num_entries=row[2] if len(row) > 2 else 0.0,
+        )
+
+    if not edges or not data_rows:
+        return None
+
+    # YODA V3 includes underflow + overflow rows
+    n_bins = len(edges) - 1
+    if len(data_rows) == n_bins + 2:
+        data_rows = data_rows[1:-1]
+
+    sumw2 = None
+    values = np.array([r[0] for r in data_rows])
+    if base_type in ("ESTIMATE1D", "BINNEDESTIMATE"):
+        err_dn = np.array([r[1] if len(r) > 1 else float("nan") for r in data_rows])
+        err_up = np.array([r[2] if len(r) > 2 else float("nan") for r in data_rows])
+    else:
+        sumw2 = np.array([r[1] if len(r) > 1 else float("nan") for r in data_rows])
+        err_dn = None
+        err_up = None
+
+    metadata["Type"] = base_type
+    return YodaHisto1D(
+        path=block_path,
+        title=title,
+        edges=edges,
+        values=values,
+        err_dn=err_dn,
+        err_up=err_up,
+        metadata=metadata,
+        sumw2=sumw2,
+    )
+
+
+def _is_estimate(obj):
+    return obj.metadata.get("Type") in ("ESTIMATE1D", "BINNEDESTIMATE")
+
+
+def store_block(results, obj):
+    """Add a parsed block to results, preferring finalized over raw on a shared path."""
+    if obj is None:
+        return
+    existing = results.get(obj.path)
+    if (isinstance(obj, YodaHisto1D) and isinstance(existing, YodaHisto1D)
+            and _is_estimate(existing) and not _is_estimate(obj)):
+        return
+    results[obj.path] = obj
+
+
 def parse_yoda(filepath):
     """Parse a YODA V3 file. Returns dict of path -> YodaHisto1D | YodaCounter."""
     results = {}
-
     with open(filepath, "r") as f:
-        line = f.readline()
-        while line:
+        for line in iter(f.readline, ""):
             m = _RE_BEGIN.match(line.strip())
-            if not m:
-                line = f.readline()
-                continue
+            if m:
+                store_block(results, _read_block(f, m))
+    return results
 
-            raw_type = m.group(1)
-            block_path = m.group(2).strip()
 
-            # BINNEDESTIMATE<I> -> base=BINNEDESTIMATE, sub=I
-            if "<" in raw_type:
-                base_type = raw_type.split("<")[0]
-                sub_type = raw_type.split("<")[1].rstrip(">")
-            else:
-                base_type = raw_type
-                sub_type = ""
-
-            # string-binned -> not plottable
-            if sub_type.upper() == "S":
-                while line and not line.startswith("END "):
-                    line = f.readline()
-                line = f.readline()
-                continue
-
-            if base_type in _SKIPPED_TYPES:
-                while line and not line.startswith("END "):
-                    line = f.readline()
-                line = f.readline()
-                continue
-
-            if base_type not in _SUPPORTED_1D and base_type not in _SUPPORTED_COUNTER:
-                while line and not line.startswith("END "):
-                    line = f.readline()
-                line = f.readline()
-                continue
-
-            # metadata until ---
-            metadata = {}
-            title = ""
-            line = f.readline()
-            while line and line.strip() != "---":
-                if ":" in line:
-                    key, _, val = line.partition(":")
-                    key = key.strip()
-                    val = val.strip()
-                    if key == "Title":
-                        title = val
-                    else:
-                        metadata[key] = val
-                line = f.readline()
-
-            # data section until END
-            edges = None
-            data_rows = []
-            line = f.readline()
-            while line and not line.startswith("END "):
-                stripped = line.strip()
-                if stripped.startswith("Edges(A1):"):
-                    edges = _parse_edges(stripped)
-                elif stripped.startswith("#") or stripped.startswith("ErrorLabels:"):
-                    pass
-                elif stripped:
-                    cols = stripped.split()
-                    data_rows.append([_parse_float(c) for c in cols])
-                line = f.readline()
-
-            # build object
-            if base_type in _SUPPORTED_COUNTER:
-                if data_rows:
-                    row = data_rows[0]
-                    results[block_path] = YodaCounter(
-                        path=block_path,
-                        sum_w=row[0] if len(row) > 0 else 0.0,
-                        sum_w2=row[1] if len(row) > 1 else 0.0,
-                        num_entries=row[2] if len(row) > 2 else 0.0,
-                    )
-
-            elif base_type in _SUPPORTED_1D:
-                if not edges or not data_rows:
-                    line = f.readline()
-                    continue
-
-                # YODA V3 includes underflow + overflow rows
-                n_bins = len(edges) - 1
-                if len(data_rows) == n_bins + 2:
-                    data_rows = data_rows[1:-1]
-
-                is_estimate = base_type in ("ESTIMATE1D", "BINNEDESTIMATE")
-
-                # prefer finalized over raw when both share a path
-                existing = results.get(block_path)
-                if existing and isinstance(existing, YodaHisto1D):
-                    existing_is_estimate = existing.metadata.get("Type") in ("ESTIMATE1D", "BINNEDESTIMATE")
-                    if existing_is_estimate and not is_estimate:
-                        line = f.readline()
-                        continue
-
-                if is_estimate:
-                    values = np.array([r[0] for r in data_rows])
-                    err_dn = np.array([r[1] if len(r) > 1 else float("nan") for r in data_rows])
-                    err_up = np.array([r[2] if len(r) > 2 else float("nan") for r in data_rows])
-                else:
-                    values = np.array([r[0] for r in data_rows])
-                    err_dn = None
-                    err_up = None
-
-                metadata["Type"] = base_type
-                results[block_path] = YodaHisto1D(
-                    path=block_path,
+def index_yoda(filepath):
+    """List the blocks of a YODA V3 file without parsing their data.
+
+    A regex scan over the mmapped bytes; much faster than parse_yoda, so
+    the observable list can be shown before the file is parsed.
+    """
+    blocks = []
+    with open(filepath, "rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            return blocks
+        with mm:
+            for m in _RE_BEGIN_BYTES.finditer(mm):
+                title = ""
+                meta_end = mm.find(b"\n---", m.end())
+                t = mm.find(b"\nTitle:", m.end(), meta_end if meta_end >= 0 else len(mm))
+                if t >= 0:
+                    eol = mm.find(b"\n", t + 1)
+                    title = mm[t + 7:eol if eol >= 0 else len(mm)].decode("utf-8", "replace").strip()
+                blocks.append(YodaBlock(
+                    path=m.group(2).decode("utf-8", "replace").strip(),
+                    type=m.group(1).decode("ascii"),
                     title=title,
-                    edges=edges,
-                    values=values,
-                    err_dn=err_dn,
-                    err_up=err_up,
-                    metadata=metadata,
-                )
+                    offset=m.start(),
+                ))
+    return blocks
 
-            line = f.readline()
 
-    return results
+def read_block_at(f, offset):
+    """Parse the single block starting at a byte offset from index_yoda().
+
+    f is the file opened in text mode; returns the object or None.
+    """
+    f.seek(offset)
+    m = _RE_BEGIN.match(f.readline().strip())
+    return _read_block(f, m) if m else None
+
+
+def is_plottable_block(block):
+    """Whether filter_plottable() would keep this block once parsed."""
+    base_type, sub_type = _split_type(block.type)
+    return (base_type in _SUPPORTED_1D and sub_type.upper() != "S"
+            and is_plottable_path(block.path))
+
+
+def is_plottable_path(path):
+    if path.startswith("/RAW/") or path.startswith("/TMP/"):
+        return False
+    if path.startswith("/_"):
+        return False
+    # private histos: /<analysis>/_<name>
+    parts = path.split("/")
+    if len(parts) >= 3 and parts[2].startswith("_"):
+        return False
+    # weight variations
+    return "[" not in path
 
 
 def filter_plottable(histos):
     """Keep only YodaHisto1D entries suitable for plotting."""
-    out = {}
-    for path, obj in histos.items():
-        if not isinstance(obj, YodaHisto1D):
-            continue
-        if path.startswith("/RAW/") or path.startswith("/TMP/"):
-            continue
-        if path.startswith("/_"):
-            continue
-        # private histos: /<analysis>/_<name>
-        parts = path.split("/")
-        if len(parts) >= 3 and parts[2].startswith("_"):
-            continue
-        # weight variations
-        if "[" in path:
-            continue
-        out[path] = obj
-    return out
+    return {
+        path: obj for path, obj in histos.items()
+        if isinstance(obj, YodaHisto1D) and is_plottable_path(path)
+    }
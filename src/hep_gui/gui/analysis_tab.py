@@ -8,28 +8,38 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Slot, Signal
 
 from hep_gui.config.constants import (
-    DATA_DIR, RUNS_DIR, ANALYSIS_DIR,
-    DOCKER_IMAGE, DOCKER_SHELL, RIVET_ANALYSES,
+    RUNS_DIR, ANALYSIS_DIR,
+    DOCKER_IMAGE, DOCKER_IMAGE_BAKED, DOCKER_SHELL, RIVET_ANALYSES,
 )
+from hep_gui.core.baked_image import exec_form, image_baker
 from hep_gui.core.docker_interface import (
-    get_docker_client, check_docker, check_image, DockerWorker,
+    docker_service,
     PullWorker, diagnose_docker_error,
 )
+from hep_gui.core.job_scheduler import (
+    Job, Resources, job_scheduler, RUNNING, FINISHED, CANCELLED,
+)
 from hep_gui.core.rivet_build import (
-    build_rivet_command, build_rivetbuild_command,
+    build_rivet_command, build_rivetbuild_command, rivet_argv, rivetbuild_argv,
     local_to_docker_path, yoda_output_name,
 )
+from hep_gui.core.scan import record_run_name
+from hep_gui.core.telemetry import TELEMETRY_FILE
 from hep_gui.gui.log_panel import LogPanel
+from hep_gui.gui.telemetry_view import TelemetryView
 
 
 class AnalysisTab(QWidget):
 
     run_succeeded = Signal(str)  # emitted with .yoda path on success
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, scheduler=None):
         super().__init__(parent)
-        self._worker = None
+        self._scheduler = scheduler or job_scheduler()
+        self._jobs = {}  # Job -> .yoda path (None for rivet-build)
+        self._inputs = {}  # rivet Job -> input HepMC path
         self._pull_worker = None
+        self._shown_job = None  # job followed by the telemetry view
         self._hepmc_path = None
         self._yoda_path = None
 
@@ -74,6 +84,8 @@ class AnalysisTab(QWidget):
         self.label_status = QLabel("Ready")
         row3.addWidget(self.label_status)
         row3.addStretch()
+        self.telemetry_view = TelemetryView()
+        row3.addWidget(self.telemetry_view)
         layout.addLayout(row3)
 
         # log panel
@@ -94,6 +106,9 @@ class AnalysisTab(QWidget):
         self.btn_run.clicked.connect(self.start_run)
         self.btn_cancel.clicked.connect(self.cancel_run)
         self.btn_upload_cc.clicked.connect(self._on_upload_cc)
+        self._scheduler.job_state.connect(self._on_job_state)
+        self._scheduler.job_log.connect(self._on_job_log)
+        self._scheduler.job_telemetry.connect(self._on_job_telemetry)
 
     # -- state management --
 
@@ -104,12 +119,24 @@ class AnalysisTab(QWidget):
         self.btn_upload_cc.setEnabled(True)
 
     def _set_state_running(self):
-        self.btn_run.setEnabled(False)
+        # more rivet runs can be queued while these go; not during an image pull
+        idle = self._pull_worker is None
+        self.btn_run.setEnabled(idle and self._hepmc_path is not None)
         self.btn_cancel.setEnabled(True)
-        self.btn_upload_cc.setEnabled(False)
-        self.label_status.setText("Running...")
+        self.btn_upload_cc.setEnabled(idle)
+        running = sum(job.state == RUNNING for job in self._jobs)
+        queued = len(self._jobs) - running
+        if idle and queued:
+            self.label_status.setText(f"Running {running}, queued {queued}")
+        elif idle and running > 1:
+            self.label_status.setText(f"Running {running}...")
+        else:
+            self.label_status.setText("Running...")
 
     def _set_state_finished(self, success):
+        if self._jobs:
+            self._set_state_running()
+            return
         self.btn_run.setEnabled(True)
         self.btn_cancel.setEnabled(False)
         self.btn_upload_cc.setEnabled(True)
@@ -121,7 +148,10 @@ class AnalysisTab(QWidget):
         """Pre-fill the HepMC path (for pipeline integration)."""
         self._hepmc_path = path
         self.input_hepmc.setText(str(path))
-        self._set_state_idle()
+        if self._jobs:
+            self._set_state_running()
+        else:
+            self._set_state_idle()
 
     def get_yoda_path(self):
         """Return the last generated .yoda path, or None."""
@@ -161,23 +191,7 @@ class AnalysisTab(QWidget):
             self.log_panel.append_line("ERROR: no analyses specified")
             return
 
-        ok, info = check_docker()
-        if not ok:
-            self.log_panel.append_line(f"ERROR: Docker not running -- {info}")
-            return
-
-        client = get_docker_client()
-        if not client:
-            self.log_panel.append_line("ERROR: cannot connect to Docker")
-            return
-
-        if not check_image(client, DOCKER_IMAGE):
-            self.log_panel.append_line(f"Image {DOCKER_IMAGE} not found, pulling...")
-            self._pull_worker = PullWorker(client, DOCKER_IMAGE)
-            self._pull_worker.progress.connect(self.log_panel.append_line)
-            self._pull_worker.finished.connect(self._on_pull_finished)
-            self._pull_worker.start()
-            self._set_state_running()
+        if not self._backend_ready(pull=True):
             return
 
         analyses = [a.strip() for a in analyses_text.split(",") if a.strip()]
@@ -185,26 +199,82 @@ class AnalysisTab(QWidget):
         yoda_name = yoda_output_name(self._hepmc_path)
         yoda_docker = f"/data/analysis/{yoda_name}"
 
-        cmd = build_rivet_command(analyses, docker_hepmc, yoda_docker)
-        volumes = {str(DATA_DIR): {"bind": "/data", "mode": "rw"}}
+        if exec_form(self._scheduler.backend):
+            # no shell to mkdir in: /data/analysis is made here, through the mount
+            ANALYSIS_DIR.mkdir(parents=True, exist_ok=True)
+            image, cmd = DOCKER_IMAGE_BAKED, rivet_argv(analyses, docker_hepmc, yoda_docker)
+        else:
+            image, cmd = DOCKER_IMAGE, build_rivet_command(analyses, docker_hepmc, yoda_docker)
+
+        # two runs on one input would write the same .yoda
+        if any(path is not None and path.name == yoda_name for path in self._jobs.values()):
+            self.log_panel.append_line(f"ERROR: {yoda_name} is already being produced")
+            return
 
-        self.log_panel.clear()
+        if not self._jobs:
+            self.log_panel.clear()
         self.log_panel.append_line(f"--- Running Rivet: {', '.join(analyses)} ---")
         self.log_panel.append_line(f"Input: {docker_hepmc}")
         self.log_panel.append_line(f"Output: {yoda_docker}")
 
-        self._yoda_path = ANALYSIS_DIR / yoda_name
-
-        self._worker = DockerWorker(client, DOCKER_IMAGE, cmd, volumes=volumes)
-        self._worker.log_line.connect(self.log_panel.append_line)
-        self._worker.finished.connect(self._on_run_finished)
-        self._worker.error.connect(self._on_error)
-        self._worker.start()
+        # rivet is single-threaded
+        job = Job(image, cmd, resources=Resources(cpus=1), name=yoda_name, owner="analysis", pooled=True)
+        self._jobs[job] = ANALYSIS_DIR / yoda_name
+        self._inputs[job] = Path(self._hepmc_path)
+        self._scheduler.submit(job)
+        self._start_bake()
         self._set_state_running()
 
+    def _backend_ready(self, pull):
+        """True if jobs can be submitted; else logs why, or (pull=True) starts the image pull."""
+        backend = self._scheduler.backend
+        if backend.name != "docker":
+            ok, info = backend.check("rivet")
+            if not ok:
+                self.log_panel.append_line(f"ERROR: {backend.name} backend not ready -- {info}")
+            return ok
+
+        docker = docker_service()
+        ok, info = docker.status()
+        if not ok:
+            self.log_panel.append_line(f"ERROR: Docker not running -- {info}")
+            return False
+
+        if not docker.has_image(DOCKER_IMAGE):
+            if not pull:
+                self.log_panel.append_line(f"ERROR: image {DOCKER_IMAGE} not found locally")
+                return False
+            self.log_panel.append_line(f"Image {DOCKER_IMAGE} not found, pulling...")
+            self._pull_worker = PullWorker(docker.client, DOCKER_IMAGE)
+            self._pull_worker.progress.connect(self.log_panel.append_line)
+            self._pull_worker.finished.connect(self._on_pull_finished)
+            self._pull_worker.start()
+            self._set_state_running()
+            return False
+        return True
+
+    def _start_bake(self):
+        """Derive the baked image in the background, for the next jobs (Docker
+        backend). A failed build is logged once and not retried on this base image."""
+        if self._scheduler.backend.name != "docker":
+            return
+        baker = image_baker()
+        error = baker.take_error()
+        if error:
+            self.log_panel.append_line(
+                f"ERROR: building {DOCKER_IMAGE_BAKED} failed -- {error}; "
+                f"jobs keep the login shell until {DOCKER_IMAGE} changes"
+            )
+        if baker.ensure():
+            self.log_panel.append_line(
+                f"Building {DOCKER_IMAGE_BAKED} from {DOCKER_IMAGE} in the background; "
+                f"jobs use the login shell until it is ready"
+            )
+
     def cancel_run(self):
-        if self._worker:
-            self._worker.stop_container()
+        if self._jobs:
+            for job in list(self._jobs):
+                self._scheduler.cancel(job)
             self.log_panel.append_line("--- Run cancelled ---")
 
     # -- upload .cc --
@@ -223,49 +293,92 @@ class AnalysisTab(QWidget):
         shutil.copy2(src, dst)
         self.log_panel.append_line(f"Copied {src.name} to {ANALYSIS_DIR}")
 
-        # build the .so in Docker
-        ok, info = check_docker()
-        if not ok:
-            self.log_panel.append_line(f"ERROR: Docker not running -- {info}")
-            return
-
-        client = get_docker_client()
-        if not client:
-            self.log_panel.append_line("ERROR: cannot connect to Docker")
+        # build the .so where the jobs run
+        if not self._backend_ready(pull=False):
             return
 
-        if not check_image(client, DOCKER_IMAGE):
-            self.log_panel.append_line(f"ERROR: image {DOCKER_IMAGE} not found locally")
-            return
-
-        cmd = build_rivetbuild_command(src.name)
-        volumes = {str(DATA_DIR): {"bind": "/data", "mode": "rw"}}
+        if exec_form(self._scheduler.backend):
+            image, cmd, workdir = DOCKER_IMAGE_BAKED, rivetbuild_argv(src.name), "/data/analysis"
+        else:
+            image, cmd, workdir = DOCKER_IMAGE, build_rivetbuild_command(src.name), None
 
         self.log_panel.append_line(f"--- Building {src.name} with rivet-build ---")
 
-        self._worker = DockerWorker(client, DOCKER_IMAGE, cmd, volumes=volumes)
-        self._worker.log_line.connect(self.log_panel.append_line)
-        self._worker.finished.connect(self._on_build_finished)
-        self._worker.error.connect(self._on_error)
-        self._worker.start()
+        # a build goes before queued rivet runs, which may need the new .so
+        job = Job(
+            image, cmd, resources=Resources(cpus=1), priority=1,
+            name=src.name, owner="analysis", pooled=True, workdir=workdir,
+        )
+        self._jobs[job] = None
+        self._scheduler.submit(job)
+        self._start_bake()
         self._set_state_running()
 
     # -- slots --
 
-    @Slot(int)
-    def _on_run_finished(self, exit_code):
-        success = exit_code == 0 and self._yoda_path and self._yoda_path.exists()
+    @Slot(object)
+    def _on_job_state(self, job):
+        if job not in self._jobs:
+            return
+        if job.state == RUNNING:
+            self._follow_telemetry(job)
+            self._set_state_running()
+        elif job.done:
+            yoda_path = self._jobs.pop(job)
+            hepmc_path = self._inputs.pop(job, None)
+            if yoda_path is not None:
+                self._save_telemetry(job, yoda_path.with_name(f"{yoda_path.stem}.{TELEMETRY_FILE}"))
+            if job.state == FINISHED and yoda_path is None:
+                self._on_build_finished(job.exit_code)
+            elif job.state == FINISHED:
+                self._on_run_finished(yoda_path, job.exit_code, hepmc_path)
+            elif job.state == CANCELLED:
+                self._set_state_finished(False)
+            else:
+                self._on_error(job.error)
+
+    @Slot(object, object)
+    def _on_job_telemetry(self, job, sample):
+        if job is self._shown_job:
+            self.telemetry_view.add_sample(sample)
+
+    def _follow_telemetry(self, job):
+        self._shown_job = job
+        samples = job.telemetry.samples() if job.telemetry is not None else ()
+        self.telemetry_view.show_job(job.name, samples)
+
+    def _save_telemetry(self, job, path):
+        if job.telemetry is not None and len(job.telemetry):
+            job.telemetry.save(path)
+        # the view stays on the last job until another one runs
+        if job is self._shown_job:
+            running = [j for j in self._jobs if j.state == RUNNING]
+            if running:
+                self._follow_telemetry(running[-1])
+
+    @Slot(object, list)
+    def _on_job_log(self, job, lines):
+        if job not in self._jobs:
+            return
+        if len(self._jobs) > 1:
+            lines = [line._replace(text=f"[{job.name}] {line.text}") for line in lines]
+        self.log_panel.append_lines(lines)
+
+    def _on_run_finished(self, yoda_path, exit_code, hepmc_path=None):
+        success = exit_code == 0 and yoda_path.exists()
 
         if success:
-            self.log_panel.append_line(f"--- Rivet finished, output: {self._yoda_path} ---")
-            self.run_succeeded.emit(str(self._yoda_path))
+            self._yoda_path = yoda_path
+            if hepmc_path is not None:
+                # the scan viewer finds the run's script through this
+                record_run_name(yoda_path, hepmc_path, RUNS_DIR)
+            self.log_panel.append_line(f"--- Rivet finished, output: {yoda_path} ---")
+            self.run_succeeded.emit(str(yoda_path))
         else:
             self.log_panel.append_line(f"--- Rivet failed (exit code {exit_code}) ---")
 
         self._set_state_finished(success)
-        self._worker = None
 
-    @Slot(int)
     def _on_build_finished(self, exit_code):
         if exit_code == 0:
             self.log_panel.append_line("--- rivet-build finished ---")
@@ -273,19 +386,17 @@ class AnalysisTab(QWidget):
             self.log_panel.append_line(f"--- rivet-build failed (exit code {exit_code}) ---")
 
         self._set_state_finished(exit_code == 0)
-        self._worker = None
 
     @Slot(bool)
     def _on_pull_finished(self, success):
         self._pull_worker = None
+        docker_service().invalidate(DOCKER_IMAGE)
         if success:
             self.log_panel.append_line("--- Image pulled. Click Run again. ---")
         else:
             self.log_panel.append_line("ERROR: image pull failed")
         self._set_state_finished(success)
 
-    @Slot(str)
     def _on_error(self, msg):
         self.log_panel.append_line(f"ERROR: {diagnose_docker_error(msg)}")
         self._set_state_finished(False)
-        self._worker = None
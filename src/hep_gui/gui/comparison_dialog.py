@@ -0,0 +1,62 @@
+import time
+
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QTableView, QHeaderView, QPushButton,
+    QAbstractItemView,
+)
+from PySide6.QtCore import Qt, Signal, Slot
+
+from hep_gui.core.comparison import compare_datasets
+from hep_gui.models.comparison_model import ComparisonTableModel, COLUMNS
+
+
+class ComparisonDialog(QDialog):
+    """Sortable table of dataset disagreements. Double-click jumps to the plot."""
+
+    observable_selected = Signal(str)
+
+    def __init__(self, parent, datasets, normalize=True):
+        super().__init__(parent)
+        self.setWindowTitle("Compare datasets")
+        self.resize(900, 500)
+
+        layout = QVBoxLayout(self)
+        self._label = QLabel()
+        layout.addWidget(self._label)
+
+        self._model = ComparisonTableModel(parent=self)
+        self.table = QTableView()
+        self.table.setModel(self._model)
+        self.table.setSortingEnabled(True)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.doubleClicked.connect(self._on_double_clicked)
+        layout.addWidget(self.table)
+
+        btn_row = QHBoxLayout()
+        btn_row.addStretch()
+        btn_close = QPushButton("Close")
+        btn_close.clicked.connect(self.close)
+        btn_row.addWidget(btn_close)
+        layout.addLayout(btn_row)
+
+        self.recompute(datasets, normalize)
+
+    def recompute(self, datasets, normalize=True):
+        t0 = time.perf_counter()
+        results = compare_datasets(datasets, normalize)
+        dt = time.perf_counter() - t0
+        self._model.set_comparisons(results)
+        # worst first
+        chi2_col = [c[1] for c in COLUMNS].index("chi2_ndf")
+        self.table.sortByColumn(chi2_col, Qt.DescendingOrder)
+        self._label.setText(
+            f"{len(results)} comparisons over {len(datasets)} datasets "
+            f"({dt * 1000:.0f} ms). Double-click a row to show the plot."
+        )
+
+    @Slot()
+    def _on_double_clicked(self, index):
+        self.observable_selected.emit(self._model.comparison(index.row()).path)
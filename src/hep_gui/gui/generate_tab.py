@@ -9,26 +9,36 @@ from PySide6.QtCore import Slot, Signal
 
 from hep_gui.config.constants import (
     DATA_DIR, SCRIPTS_DIR, RUNS_DIR,
-    DOCKER_IMAGE, MG5_BIN, DOCKER_SHELL, PYTHIA8_LIB,
+    DOCKER_IMAGE, DOCKER_IMAGE_BAKED, MG5_BIN, DOCKER_SHELL, PYTHIA8_LIB,
+    JOB_CPUS, JOB_MEM,
 )
+from hep_gui.core.baked_image import exec_form, image_baker
+from hep_gui.core.compiler_cache import with_ccache
 from hep_gui.core.docker_interface import (
-    get_docker_client, check_docker, check_image, DockerWorker,
+    docker_service,
     PullWorker, diagnose_docker_error,
 )
+from hep_gui.core.job_scheduler import (
+    Job, Resources, job_scheduler, RUNNING, FINISHED, CANCELLED,
+)
+from hep_gui.core.scan import RUN_SCRIPT_NAME
+from hep_gui.core.telemetry import TELEMETRY_FILE
 from hep_gui.gui.log_panel import LogPanel
+from hep_gui.gui.telemetry_view import TelemetryView
 
 
 class GenerateTab(QWidget):
 
     run_succeeded = Signal(str)  # emitted with .hepmc path on success
 
-    def __init__(self, script_tab, parent=None):
+    def __init__(self, script_tab, parent=None, scheduler=None):
         super().__init__(parent)
         self._script_tab = script_tab
-        self._worker = None
+        self._scheduler = scheduler or job_scheduler()
+        self._jobs = {}  # Job -> temp script, for the runs of this tab
         self._pull_worker = None
+        self._shown_job = None  # job followed by the telemetry view
         self._run_name = None
-        self._temp_script = None
 
         self._build_ui()
         self._connect_signals()
@@ -51,6 +61,9 @@ class GenerateTab(QWidget):
         self.label_status = QLabel("Ready")
         bar.addWidget(self.label_status)
 
+        self.telemetry_view = TelemetryView()
+        bar.addWidget(self.telemetry_view)
+
         layout.addLayout(bar)
 
         # log panel
@@ -60,12 +73,15 @@ class GenerateTab(QWidget):
     def _connect_signals(self):
         self.btn_run.clicked.connect(self.start_run)
         self.btn_cancel.clicked.connect(self.cancel_run)
+        self._scheduler.job_state.connect(self._on_job_state)
+        self._scheduler.job_log.connect(self._on_job_log)
+        self._scheduler.job_telemetry.connect(self._on_job_telemetry)
 
     # -- refresh when tab becomes visible --
 
     def showEvent(self, event):
         super().showEvent(event)
-        if not self._worker:
+        if not self._jobs and not self._pull_worker:
             self._set_state_idle()
 
     # -- state management --
@@ -78,11 +94,20 @@ class GenerateTab(QWidget):
         self.label_script.setText(path if path else "No script loaded")
 
     def _set_state_running(self):
-        self.btn_run.setEnabled(False)
+        # more runs can be queued while these go; not during an image pull
+        self.btn_run.setEnabled(self._pull_worker is None)
         self.btn_cancel.setEnabled(True)
-        self.label_status.setText("Running...")
+        if self._pull_worker is not None:
+            self.label_status.setText("Running...")
+            return
+        running = sum(job.state == RUNNING for job in self._jobs)
+        queued = len(self._jobs) - running
+        self.label_status.setText(f"Running {running}, queued {queued}" if queued else f"Running {running}...")
 
     def _set_state_finished(self, success):
+        if self._jobs:
+            self._set_state_running()
+            return
         self.btn_run.setEnabled(True)
         self.btn_cancel.setEnabled(False)
         if success:
@@ -98,23 +123,7 @@ class GenerateTab(QWidget):
             self.log_panel.append_line("ERROR: no script loaded")
             return
 
-        ok, info = check_docker()
-        if not ok:
-            self.log_panel.append_line(f"ERROR: Docker not running -- {info}")
-            return
-
-        client = get_docker_client()
-        if not client:
-            self.log_panel.append_line("ERROR: cannot connect to Docker")
-            return
-
-        if not check_image(client, DOCKER_IMAGE):
-            self.log_panel.append_line(f"Image {DOCKER_IMAGE} not found, pulling...")
-            self._pull_worker = PullWorker(client, DOCKER_IMAGE)
-            self._pull_worker.progress.connect(self.log_panel.append_line)
-            self._pull_worker.finished.connect(self._on_pull_finished)
-            self._pull_worker.start()
-            self._set_state_running()
+        if not self._backend_ready():
             return
 
         run_name = _extract_run_name(text)
@@ -122,31 +131,91 @@ class GenerateTab(QWidget):
             self.log_panel.append_line("ERROR: no 'output /work/<name>' line found in script")
             return
 
+        # two runs of one name would write into the same data/runs/<name>
+        if any(job.name == run_name for job in self._jobs):
+            self.log_panel.append_line(f"ERROR: run {run_name} is already queued or running")
+            return
+
         self._run_name = run_name
         self.label_script.setText(self._script_tab.get_current_path() or "(unsaved script)")
 
         # write temp script
-        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        self._temp_script = SCRIPTS_DIR / f"_run_{stamp}.txt"
-        self._temp_script.write_text(text, encoding="utf-8")
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        temp_script = SCRIPTS_DIR / f"_run_{stamp}.txt"
+        temp_script.write_text(self._scheduler.backend.map_text(text), encoding="utf-8")
+
+        # keep the script with the run so its `set` parameters can tag the outputs
+        run_dir = RUNS_DIR / run_name
+        run_dir.mkdir(parents=True, exist_ok=True)
+        (run_dir / RUN_SCRIPT_NAME).write_text(text, encoding="utf-8")
 
-        cmd = _build_command(self._temp_script.name, run_name)
+        if exec_form(self._scheduler.backend):
+            image, cmd = DOCKER_IMAGE_BAKED, _build_argv(temp_script.name, run_name)
+        else:
+            image, cmd = DOCKER_IMAGE, _build_command(temp_script.name, run_name)
         volumes = {str(DATA_DIR): {"bind": "/data", "mode": "rw"}}
 
-        self.log_panel.clear()
+        if not self._jobs:
+            self.log_panel.clear()
         self.log_panel.append_line(f"--- Starting MG5+Pythia8 run: {run_name} ---")
 
-        self._worker = DockerWorker(client, DOCKER_IMAGE, cmd, volumes=volumes)
-        self._worker.log_line.connect(self.log_panel.append_line)
-        self._worker.finished.connect(self._on_finished)
-        self._worker.error.connect(self._on_error)
-        self._worker.start()
-
+        job = Job(
+            image, cmd, volumes=volumes,
+            resources=Resources(cpus=JOB_CPUS, mem=JOB_MEM),
+            name=run_name, owner="generate",
+        )
+        self._jobs[job] = temp_script
+        self._scheduler.submit(job)
+        self._start_bake()
         self._set_state_running()
 
+    def _backend_ready(self):
+        """True if runs can be submitted; else logs why, or starts the image pull."""
+        backend = self._scheduler.backend
+        if backend.name != "docker":
+            ok, info = backend.check("MG5")
+            if not ok:
+                self.log_panel.append_line(f"ERROR: {backend.name} backend not ready -- {info}")
+            return ok
+
+        docker = docker_service()
+        ok, info = docker.status()
+        if not ok:
+            self.log_panel.append_line(f"ERROR: Docker not running -- {info}")
+            return False
+
+        if not docker.has_image(DOCKER_IMAGE):
+            self.log_panel.append_line(f"Image {DOCKER_IMAGE} not found, pulling...")
+            self._pull_worker = PullWorker(docker.client, DOCKER_IMAGE)
+            self._pull_worker.progress.connect(self.log_panel.append_line)
+            self._pull_worker.finished.connect(self._on_pull_finished)
+            self._pull_worker.start()
+            self._set_state_running()
+            return False
+        return True
+
+    def _start_bake(self):
+        """Derive the baked image in the background, for the next jobs (Docker
+        backend). A failed build is logged once and not retried on this base image."""
+        if self._scheduler.backend.name != "docker":
+            return
+        baker = image_baker()
+        error = baker.take_error()
+        if error:
+            self.log_panel.append_line(
+                f"ERROR: building {DOCKER_IMAGE_BAKED} failed -- {error}; "
+                f"runs keep the login shell until {DOCKER_IMAGE} changes"
+            )
+        if baker.ensure():
+            self.log_panel.append_line(
+                f"Building {DOCKER_IMAGE_BAKED} from {DOCKER_IMAGE} in the background; "
+                f"runs use the login shell until it is ready"
+            )
+
     def cancel_run(self):
-        if self._worker:
-            self._worker.stop_container()
+        if self._jobs:
+            for job in list(self._jobs):
+                self._scheduler.cancel(job)
             self.log_panel.append_line("--- Run cancelled ---")
 
     def get_run_name(self):
@@ -154,59 +223,101 @@ class GenerateTab(QWidget):
 
     # -- slots --
 
-    @Slot(int)
-    def _on_finished(self, exit_code):
-        self._cleanup_temp()
+    @Slot(object)
+    def _on_job_state(self, job):
+        if job not in self._jobs:
+            return
+        if job.state == RUNNING:
+            self._follow_telemetry(job)
+            if len(self._jobs) > 1:
+                self.log_panel.append_line(f"--- {job.name}: started ---")
+            self._set_state_running()
+        elif job.done:
+            _cleanup_temp(self._jobs.pop(job))
+            self._save_telemetry(job, RUNS_DIR / job.name / TELEMETRY_FILE)
+            if job.state == FINISHED:
+                self._on_finished(job.name, job.exit_code)
+            elif job.state == CANCELLED:
+                self._set_state_finished(False)
+            else:
+                self._on_error(job.error)
+
+    @Slot(object, object)
+    def _on_job_telemetry(self, job, sample):
+        if job is self._shown_job:
+            self.telemetry_view.add_sample(sample)
+
+    def _follow_telemetry(self, job):
+        self._shown_job = job
+        samples = job.telemetry.samples() if job.telemetry is not None else ()
+        self.telemetry_view.show_job(job.name, samples)
+
+    def _save_telemetry(self, job, path):
+        if job.telemetry is not None and len(job.telemetry):
+            job.telemetry.save(path)
+        # the view stays on the last job until another one runs
+        if job is self._shown_job:
+            running = [j for j in self._jobs if j.state == RUNNING]
+            if running:
+                self._follow_telemetry(running[-1])
+
+    @Slot(object, list)
+    def _on_job_log(self, job, lines):
+        if job not in self._jobs:
+            return
+        # with runs side by side, each line says which run it comes from
+        if len(self._jobs) > 1:
+            lines = [line._replace(text=f"[{job.name}] {line.text}") for line in lines]
+        self.log_panel.append_lines(lines)
 
+    def _on_finished(self, run_name, exit_code):
         # MG5 3.6.7 crashes on quit (exit 1 even when generation succeeded)
         # so we check for output files instead of trusting the exit code
-        success = self._check_output_files()
+        success = _check_output_files(run_name)
 
         if success:
-            out_dir = RUNS_DIR / self._run_name / "Events"
+            out_dir = RUNS_DIR / run_name / "Events"
             self.log_panel.append_line(f"--- HepMC files at: {out_dir} ---")
             # find the first .hepmc file for the workflow
             hepmc_files = list(out_dir.rglob("*.hepmc*"))
             if hepmc_files:
                 self.run_succeeded.emit(str(hepmc_files[0]))
         else:
-            self.log_panel.append_line(f"--- Run failed (exit code {exit_code}), no output files ---")
+            self.log_panel.append_line(f"--- Run {run_name} failed (exit code {exit_code}), no output files ---")
 
         self._set_state_finished(success)
-        self._worker = None
 
     @Slot(bool)
     def _on_pull_finished(self, success):
         self._pull_worker = None
+        docker_service().invalidate(DOCKER_IMAGE)
         if success:
             self.log_panel.append_line("--- Image pulled. Click Run again. ---")
         else:
             self.log_panel.append_line("ERROR: image pull failed")
         self._set_state_finished(success)
 
-    @Slot(str)
     def _on_error(self, msg):
-        self._cleanup_temp()
         self.log_panel.append_line(f"ERROR: {diagnose_docker_error(msg)}")
         self._set_state_finished(False)
-        self._worker = None
 
-    # -- helpers --
 
-    def _check_output_files(self):
-        if not self._run_name:
-            return False
-        events_dir = RUNS_DIR / self._run_name / "Events"
-        if not events_dir.exists():
-            return False
-        # look for .hepmc.gz or .hepmc files
-        hepmc = list(events_dir.rglob("*.hepmc*"))
-        return len(hepmc) > 0
+# -- helpers --
 
-    def _cleanup_temp(self):
-        if self._temp_script and self._temp_script.exists():
-            self._temp_script.unlink()
-            self._temp_script = None
+def _check_output_files(run_name):
+    if not run_name:
+        return False
+    events_dir = RUNS_DIR / run_name / "Events"
+    if not events_dir.exists():
+        return False
+    # look for .hepmc.gz or .hepmc files
+    hepmc = list(events_dir.rglob("*.hepmc*"))
+    return len(hepmc) > 0
+
+
+def _cleanup_temp(temp_script):
+    if temp_script.exists():
+        temp_script.unlink()
 
 
 def _extract_run_name(script_text):
@@ -216,12 +327,19 @@ def _extract_run_name(script_text):
     return None
 
 
+def _build_argv(script_filename, run_name):
+    """_build_command as an argv list, for the baked image."""
+    return ["hep-gui-run", "/work", "hep-gui-generate", f"/data/scripts/{script_filename}", run_name]
+
+
 def _build_command(script_filename, run_name):
-    return (
-        f'{DOCKER_SHELL} "'
+    run = (
         f"export LD_PRELOAD={PYTHIA8_LIB}/libpythia8.so "
         f"&& {MG5_BIN} /data/scripts/{script_filename} "
         f"; mkdir -p /data/runs/{run_name} "
         f"&& cp -r /work/{run_name}/Events /data/runs/{run_name}/"
-        f'"'
     )
+    # paths under /work made relative: the same process under another run
+    # name hits the cache as well
+    return f'{DOCKER_SHELL} "{with_ccache(run, "/work")}"'
+
@@ -0,0 +1,356 @@
+import numpy as np
+import pyqtgraph as pg
+from PySide6.QtCore import QRectF
+from PySide6.QtGui import QColor, QPainterPath
+
+# above this many visible bins per pixel column the path is decimated
+_DECIMATE_RATIO = 2
+
+
+def _log10(a):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.log10(np.maximum(a, 1e-300))
+
+
+def _y_bounds(y):
+    finite = y[np.isfinite(y)]
+    if not len(finite):
+        return None
+    return float(finite.min()), float(finite.max())
+
+
+class StepHistogramItem(pg.GraphicsObject):
+    """Filled step histogram with view-dependent level of detail.
+
+    Only bins inside the visible x range are turned into a path. When there
+    are more of them than pixel columns, each column keeps the min and max
+    of its bins (outline) and the max (fill), so narrow peaks stay visible.
+    Zooming in brings back full detail. Follows PlotItem.setLogMode.
+    """
+
+    def __init__(self, edges, values, pen=None, brush=None, fill_base=0.0):
+        super().__init__()
+        self._pen = pg.mkPen(pen) if pen is not None else pg.mkPen(None)
+        self._brush = pg.mkBrush(brush) if brush is not None else None
+        self._log = (False, False)
+        self._fill_path = QPainterPath()
+        self._line_path = QPainterPath()
+        self._view_key = None
+        self._bounds = QRectF()
+        self.setData(edges, values, fill_base)
+
+    # -- data --
+
+    def setData(self, edges, values, fill_base=None):
+        self._edges = np.asarray(edges, dtype=float)
+        self._values = np.asarray(values, dtype=float)
+        if fill_base is not None:
+            self._fill_base = float(fill_base)
+        self._transform()
+
+    def setLogMode(self, x, y):
+        if (x, y) == self._log:
+            return
+        self._log = (x, y)
+        self._transform()
+
+    def _transform(self):
+        x, y, base = self._edges, self._values, self._fill_base
+        if self._log[0]:
+            x = _log10(x)
+        if self._log[1]:
+            y = _log10(y)
+            base = float(_log10(np.array([base if base > 0 else 1e-300]))[0])
+        self._x, self._y, self._base = x, y, base
+
+        self.prepareGeometryChange()
+        finite = self._y[np.isfinite(self._y)]
+        if len(self._x) and len(finite):
+            y0 = min(finite.min(), base)
+            y1 = max(finite.max(), base)
+            self._bounds = QRectF(self._x[0], y0, self._x[-1] - self._x[0], y1 - y0)
+        else:
+            self._bounds = QRectF()
+        self._view_key = None
+        self._update_paths()
+
+    # -- level of detail --
+
+    def _visible_slice(self):
+        """(i0, i1, n_px): visible bin range and view width in pixels."""
+        n = len(self._y)
+        vb = self.getViewBox()
+        if vb is None:
+            return 0, n, max(n, 1)
+        (x0, x1), _ = vb.viewRange()
+        n_px = max(int(vb.width()), 1)
+        i0 = max(int(np.searchsorted(self._x, x0, side="right")) - 2, 0)
+        i1 = min(int(np.searchsorted(self._x, x1, side="left")) + 1, n)
+        return i0, max(i1, i0), n_px
+
+    def viewRangeChanged(self):
+        self._update_paths()
+
+    def _update_paths(self):
+        i0, i1, n_px = self._visible_slice()
+        decimate = (i1 - i0) > _DECIMATE_RATIO * n_px
+        # full-detail paths only depend on the slice, decimated ones on the width too
+        key = (i0, i1, n_px if decimate else None)
+        if key == self._view_key:
+            return
+        self._view_key = key
+
+        if i1 <= i0:
+            self._fill_path = QPainterPath()
+            self._line_path = QPainterPath()
+            self.update()
+            return
+
+        x = self._x[i0:i1 + 1]
+        y = self._y[i0:i1]
+        if decimate:
+            fill_x, fill_y, line_x, line_y = self._decimated(x, y, n_px)
+        else:
+            fill_x = np.repeat(x, 2)[1:-1]
+            fill_y = np.repeat(y, 2)
+            line_x, line_y = fill_x, fill_y
+
+        # close to the baseline at both ends, like build_step_coords
+        base = self._base
+        fill_x = np.concatenate(([fill_x[0]], fill_x, [fill_x[-1]]))
+        fill_y = np.concatenate(([base], fill_y, [base]))
+        if not decimate:
+            line_x, line_y = fill_x, fill_y
+        fill_y = np.where(np.isfinite(fill_y), fill_y, base)
+
+        self._fill_path = pg.arrayToQPath(fill_x, fill_y, connect="all")
+        self._fill_path.closeSubpath()
+        self._line_path = pg.arrayToQPath(line_x, line_y, connect="finite")
+        self.update()
+
+    @staticmethod
+    def _decimated(x, y, n_px):
+        """Min/max per pixel column over the bins in x[:-1]."""
+        cols = np.linspace(x[0], x[-1], n_px + 1)
+        starts = np.unique(np.searchsorted(x[:-1], cols[:-1], side="right") - 1)
+        starts = starts[(starts >= 0) & (starts < len(y))]
+        y_safe = np.where(np.isfinite(y), y, np.nan)
+        lo = np.fmin.reduceat(y_safe, starts)
+        hi = np.fmax.reduceat(y_safe, starts)
+        col_x = np.append(x[starts], x[-1])
+
+        # fill: step over columns at the column max
+        fill_x = np.repeat(col_x, 2)[1:-1]
+        fill_y = np.repeat(hi, 2)
+        # outline: vertical min->max stroke at each column center
+        centers = (col_x[:-1] + col_x[1:]) / 2.0
+        line_x = np.repeat(centers, 2)
+        line_y = np.column_stack((lo, hi)).ravel()
+        return fill_x, fill_y, line_x, line_y
+
+    # -- QGraphicsItem --
+
+    def dataBounds(self, ax, frac=1.0, orthoRange=None):
+        r = self._bounds
+        if r.isNull():
+            return None, None
+        if ax == 0:
+            return r.left(), r.right()
+        return r.top(), r.bottom()
+
+    def boundingRect(self):
+        return self._bounds
+
+    def paint(self, p, *_args):
+        if self._brush is not None:
+            p.fillPath(self._fill_path, self._brush)
+        p.setPen(self._pen)
+        p.drawPath(self._line_path)
+
+
+class StepBundleItem(pg.GraphicsObject):
+    """Many step outlines drawn as one item.
+
+    All curves are stacked into one coordinate array, broken between
+    curves by a `connect` mask, then cut into n_buckets runs of
+    consecutive curves, one color each along the colormap. N curves cost
+    n_buckets QPainterPaths instead of N scene items, so hundreds of
+    datasets still pan smoothly. Follows PlotItem.setLogMode.
+    """
+
+    def __init__(self, edges, values, cmap="viridis", width=1.0, alpha=200, n_buckets=16):
+        super().__init__()
+        self._cmap = pg.colormap.get(cmap) if isinstance(cmap, str) else cmap
+        self._width = width
+        self._alpha = alpha
+        self._n_buckets = n_buckets
+        self._log = (False, False)
+        self._paths = []  # [(QPen, QPainterPath)]
+        self._bounds = QRectF()
+        self.setData(edges, values)
+
+    # -- data --
+
+    def setData(self, edges, values):
+        """edges: one array shared by all curves, or one per curve.
+        values: (curves x bins) array or a list of arrays."""
+        if isinstance(edges, np.ndarray) and edges.ndim == 1:
+            values = np.asarray(values, dtype=float)
+            row = np.repeat(edges.astype(float), 2)[1:-1]
+            n, n_bins = values.shape
+            x = np.tile(row, n)
+            y = np.repeat(values, 2, axis=1).ravel()
+            sizes = np.full(n, 2 * n_bins)
+        else:
+            xs = [np.repeat(np.asarray(e, dtype=float), 2)[1:-1] for e in edges]
+            x = np.concatenate(xs) if xs else np.empty(0)
+            y = np.concatenate([np.repeat(np.asarray(v, dtype=float), 2) for v in values]) if xs else np.empty(0)
+            sizes = np.array([len(a) for a in xs], dtype=int)
+        self._raw = (x, y)
+        self._offsets = np.concatenate(([0], np.cumsum(sizes)))
+        self._transform()
+
+    def setLogMode(self, x, y):
+        if (x, y) == self._log:
+            return
+        self._log = (x, y)
+        self._transform()
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def curve_color(self, i):
+        """QColor of curve i, as used in its bucket."""
+        return self._bucket_color(self._bucket_of(np.array([i]))[0])
+
+    def _bucket_of(self, idx):
+        n = len(self)
+        n_buckets = min(self._n_buckets, n)
+        return np.minimum(idx * n_buckets // max(n, 1), n_buckets - 1)
+
+    def _bucket_color(self, b):
+        n = len(self)
+        n_buckets = min(self._n_buckets, n)
+        # color at the middle of the bucket's curves along the colormap
+        first = -(-b * n // n_buckets)
+        last = -(-(b + 1) * n // n_buckets) - 1
+        t = (first + last) / 2 / max(n - 1, 1)
+        color = QColor(self._cmap.map(t, mode="qcolor"))
+        color.setAlpha(self._alpha)
+        return color
+
+    def _transform(self):
+        x, y = self._raw
+        if self._log[0]:
+            x = _log10(x)
+        if self._log[1]:
+            y = _log10(y)
+        finite = np.isfinite(x) & np.isfinite(y)
+        connect = finite.copy()
+        connect[:-1] &= finite[1:]
+        connect[self._offsets[1:] - 1] = False  # no line from one curve to the next
+        x = np.where(finite, x, 0.0)
+        y = np.where(finite, y, 0.0)
+
+        self.prepareGeometryChange()
+        yb = _y_bounds(y[finite])
+        if yb is not None:
+            xf = x[finite]
+            self._bounds = QRectF(xf.min(), yb[0], xf.max() - xf.min(), yb[1] - yb[0])
+        else:
+            self._bounds = QRectF()
+
+        self._paths = []
+        n = len(self)
+        if n:
+            buckets = self._bucket_of(np.arange(n))
+            for b in np.unique(buckets):
+                curves = np.flatnonzero(buckets == b)
+                i0, i1 = self._offsets[curves[0]], self._offsets[curves[-1] + 1]
+                pen = pg.mkPen(self._bucket_color(int(b)), width=self._width)
+                self._paths.append((pen, pg.arrayToQPath(
+                    x[i0:i1], y[i0:i1], connect=connect[i0:i1], finiteCheck=False,
+                )))
+        self.update()
+
+    # -- QGraphicsItem --
+
+    def dataBounds(self, ax, frac=1.0, orthoRange=None):
+        r = self._bounds
+        if r.isNull():
+            return None, None
+        if ax == 0:
+            return r.left(), r.right()
+        return r.top(), r.bottom()
+
+    def boundingRect(self):
+        return self._bounds
+
+    def paint(self, p, *_args):
+        for pen, path in self._paths:
+            p.setPen(pen)
+            p.drawPath(path)
+
+
+class StepBandItem(pg.GraphicsObject):
+    """Filled band between two step curves, with an optional middle line.
+
+    Used for the median / quantile band of a many-dataset overlay.
+    Follows PlotItem.setLogMode.
+    """
+
+    def __init__(self, edges, lo, hi, middle=None, pen=None, brush=None):
+        super().__init__()
+        self._pen = pg.mkPen(pen) if pen is not None else pg.mkPen(None)
+        self._brush = pg.mkBrush(brush) if brush is not None else pg.mkBrush(None)
+        self._log = (False, False)
+        self._raw = (
+            np.asarray(edges, dtype=float), np.asarray(lo, dtype=float),
+            np.asarray(hi, dtype=float), None if middle is None else np.asarray(middle, dtype=float),
+        )
+        self._transform()
+
+    def setLogMode(self, x, y):
+        if (x, y) == self._log:
+            return
+        self._log = (x, y)
+        self._transform()
+
+    def _transform(self):
+        edges, lo, hi, mid = self._raw
+        sx = np.repeat(_log10(edges) if self._log[0] else edges, 2)[1:-1]
+        ty = _log10 if self._log[1] else (lambda a: a)
+        s_lo, s_hi = np.repeat(ty(lo), 2), np.repeat(ty(hi), 2)
+        ok = np.isfinite(s_lo) & np.isfinite(s_hi)
+
+        self.prepareGeometryChange()
+        self._fill_path = pg.arrayToQPath(
+            np.concatenate((sx[ok], sx[ok][::-1])),
+            np.concatenate((s_hi[ok], s_lo[ok][::-1])),
+        )
+        self._fill_path.closeSubpath()
+        self._mid_path = QPainterPath()
+        if mid is not None:
+            self._mid_path = pg.arrayToQPath(sx, np.repeat(ty(mid), 2), connect="finite")
+        lo_b, hi_b = _y_bounds(s_lo[ok]), _y_bounds(s_hi[ok])
+        if ok.any() and lo_b and hi_b:
+            self._bounds = QRectF(sx[0], lo_b[0], sx[-1] - sx[0], hi_b[1] - lo_b[0])
+        else:
+            self._bounds = QRectF()
+        self.update()
+
+    def dataBounds(self, ax, frac=1.0, orthoRange=None):
+        r = self._bounds
+        if r.isNull():
+            return None, None
+        if ax == 0:
+            return r.left(), r.right()
+        return r.top(), r.bottom()
+
+    def boundingRect(self):
+        return self._bounds
+
+    def paint(self, p, *_args):
+        p.fillPath(self._fill_path, self._brush)
+        p.setPen(self._pen)
+        p.drawPath(self._mid_path)
@@ -1,19 +1,44 @@
-import html
+import time
+from itertools import groupby
 
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QTextEdit, QPushButton, QFileDialog,
+    QWidget, QVBoxLayout, QHBoxLayout, QPlainTextEdit, QPushButton, QFileDialog,
 )
-from PySide6.QtGui import QFont
+from PySide6.QtCore import QTimer
+from PySide6.QtGui import QColor, QFont, QTextCharFormat, QTextCursor
+
+from hep_gui.core.log_framing import LogLine, format_line
 
 # patterns that indicate MG5 build output (Fortran compilation, linking, etc.)
 _BUILD_PATTERNS = ("gfortran", "compiling", "linking", "ar ", "ranlib", "creating library")
 
+# new lines are drawn at most this often (ms), in pieces of this many
+# lines for at most this long (s) per timer tick, so a flood of output
+# leaves the event loop time for input and painting
+_RENDER_INTERVAL = 40
+_RENDER_SLICE_LINES = 300
+_RENDER_BUDGET = 0.008
+
+# line highlighting: text color by kind
+_LINE_COLORS = {"error": "#cc0000", "warning": "#cc7700"}
+
+
+def _line_kind(text):
+    low = text.lower()
+    if "error" in low:
+        return "error"
+    if "warning" in low:
+        return "warning"
+    return None
+
 
 class LogPanel(QWidget):
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self._lines = []
+        # texts received but not drawn yet
+        self._pending = []
         self._filter_build = False
 
         toolbar = QHBoxLayout()
@@ -34,8 +59,10 @@ class LogPanel(QWidget):
         btn_clear.clicked.connect(self.clear)
         toolbar.addWidget(btn_clear)
 
-        self._text_edit = QTextEdit()
+        # plain text document: appends stay cheap with hundreds of thousands of lines
+        self._text_edit = QPlainTextEdit()
         self._text_edit.setReadOnly(True)
+        self._text_edit.setUndoRedoEnabled(False)
         self._text_edit.setFont(QFont("Consolas", 9))
 
         layout = QVBoxLayout(self)
@@ -43,30 +70,77 @@ class LogPanel(QWidget):
         layout.addLayout(toolbar)
         layout.addWidget(self._text_edit)
 
+        self._formats = {None: QTextCharFormat()}
+        for kind, color in _LINE_COLORS.items():
+            fmt = QTextCharFormat()
+            fmt.setForeground(QColor(color))
+            self._formats[kind] = fmt
+
+        self._render_timer = QTimer(self)
+        self._render_timer.setSingleShot(True)
+        self._render_timer.setInterval(_RENDER_INTERVAL)
+        self._render_timer.timeout.connect(self._render_pending)
+
     def append_line(self, text):
-        self._lines.append(text)
-        if self._filter_build and self._is_build_line(text):
-            return
-        self._append_html(text)
+        self.append_lines((text,))
+
+    def append_lines(self, lines):
+        """Append many lines with one document edit (batched worker output).
+
+        lines are LogLines from a worker, or plain strings (messages of
+        the GUI itself).
+        """
+        now = time.time()
+        lines = [line if isinstance(line, LogLine) else LogLine("app", now, line) for line in lines]
+        self._lines.extend(lines)
+        texts = [line.text for line in lines]
+        if self._filter_build:
+            texts = [text for text in texts if not self._is_build_line(text)]
+        if texts:
+            self._pending.extend(texts)
+            if not self._render_timer.isActive():
+                self._render_timer.start(_RENDER_INTERVAL)
+
+    def flush(self):
+        """Draw every line received so far now."""
+        self._render_timer.stop()
+        texts, self._pending = self._pending, []
+        if texts:
+            self._append_text(texts)
+
+    def _render_pending(self):
+        deadline = time.perf_counter() + _RENDER_BUDGET
+        while self._pending and time.perf_counter() < deadline:
+            texts = self._pending[:_RENDER_SLICE_LINES]
+            del self._pending[:_RENDER_SLICE_LINES]
+            self._append_text(texts)
+        if self._pending:
+            # behind: next slice as soon as queued events are handled
+            self._render_timer.start(0)
+        else:
+            self._render_timer.setInterval(_RENDER_INTERVAL)
 
     def clear(self):
         self._lines.clear()
+        self._pending.clear()
+        self._render_timer.stop()
         self._text_edit.clear()
 
-    def _append_html(self, text):
+    def _append_text(self, lines):
         sb = self._text_edit.verticalScrollBar()
         at_bottom = sb.value() >= sb.maximum() - 10
 
-        escaped = html.escape(text)
-        low = text.lower()
-        if "error" in low:
-            line_html = f'<span style="color:#cc0000">{escaped}</span>'
-        elif "warning" in low:
-            line_html = f'<span style="color:#cc7700">{escaped}</span>'
-        else:
-            line_html = escaped
-
-        self._text_edit.append(line_html)
+        # plain text with char formats: no HTML to build or parse,
+        # one insert per run of same-colored lines
+        doc = self._text_edit.document()
+        cursor = QTextCursor(doc)
+        cursor.movePosition(QTextCursor.End)
+        cursor.beginEditBlock()
+        sep = "\n" if not doc.isEmpty() else ""
+        for kind, run in groupby(lines, _line_kind):
+            cursor.insertText(sep + "\n".join(run), self._formats[kind])
+            sep = "\n"
+        cursor.endEditBlock()
 
         if at_bottom:
             sb.setValue(sb.maximum())
@@ -80,15 +154,19 @@ class LogPanel(QWidget):
         self._rerender()
 
     def _rerender(self):
+        self._pending.clear()
+        self._render_timer.stop()
         self._text_edit.clear()
-        for line in self._lines:
-            if self._filter_build and self._is_build_line(line):
-                continue
-            self._append_html(line)
+        texts = [line.text for line in self._lines]
+        if self._filter_build:
+            texts = [text for text in texts if not self._is_build_line(text)]
+        if texts:
+            self._append_text(texts)
 
     def _on_save(self):
         path, _ = QFileDialog.getSaveFileName(self, "Save log", "", "Text files (*.txt)")
         if not path:
             return
         with open(path, "w", encoding="utf-8") as f:
-            f.write("\n".join(self._lines))
+            # saved with receive time and stream, which the view leaves out
+            f.write("\n".join(format_line(line) for line in self._lines))
@@ -5,7 +5,10 @@ from PySide6.QtGui import QAction, QDesktopServices
 from PySide6.QtCore import Qt, QUrl
 
 from hep_gui.config.constants import APP_NAME, APP_VERSION, DOCKER_IMAGE
-from hep_gui.core.docker_interface import check_docker, check_image, get_docker_client
+from hep_gui.core.baked_image import image_baker
+from hep_gui.core.container_pool import container_pool
+from hep_gui.core.docker_interface import docker_service
+from hep_gui.core.job_scheduler import job_scheduler
 from hep_gui.gui.script_tab import ScriptTab
 from hep_gui.gui.generate_tab import GenerateTab
 from hep_gui.gui.analysis_tab import AnalysisTab
@@ -77,16 +80,26 @@ class MainWindow(QMainWindow):
         sb.addPermanentWidget(self._action_label)
 
     def _update_docker_status(self):
-        ok, info = check_docker()
+        backend = job_scheduler().backend
+        if backend.name != "docker":
+            ok, info = backend.check()
+            self._docker_label.setText(f"Local: {info}" if ok else f"Local: not ready -- {info}")
+            return
+
+        docker = docker_service()
+        ok, info = docker.status()
         if not ok:
             self._docker_label.setText("Docker: not running")
             return
 
-        client = get_docker_client()
-        has_image = check_image(client, DOCKER_IMAGE) if client else False
+        has_image = docker.has_image(DOCKER_IMAGE)
 
         if has_image:
             self._docker_label.setText(f"Docker: connected v{info} | image OK")
+            # first rivet / rivet-build job then starts without container
+            # setup, in the image exec_form() picks: the baked one once built
+            baker = image_baker()
+            baker.ensure(on_done=lambda ready: container_pool().warm(baker.tag if ready else DOCKER_IMAGE))
         else:
             self._docker_label.setText(f"Docker: connected v{info} | image missing")
 
@@ -1,24 +1,45 @@
+import dataclasses
+import time
 from pathlib import Path
 
 import numpy as np
 import pyqtgraph as pg
-from pyqtgraph import exporters
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QComboBox,
     QCheckBox, QLineEdit, QLabel, QFileDialog, QDialog, QTextEdit,
-    QMessageBox,
+    QMessageBox, QInputDialog, QProgressDialog, QMenu, QProgressBar, QSpinBox,
+    QApplication, QSizePolicy,
 )
-from PySide6.QtCore import Qt, Slot, QUrl, QMarginsF
-from PySide6.QtGui import QPainter, QPageLayout, QPageSize, QFont, QDesktopServices
+from PySide6.QtCore import Qt, Slot, QUrl, QEventLoop, QSize, QThread
+from PySide6.QtGui import QFont, QDesktopServices, QIcon
 
-from hep_gui.config.constants import ANALYSIS_DIR, DATA_DIR, COLORS, DOCKER_IMAGE_MKHTML
-from hep_gui.core.docker_interface import get_docker_client, check_docker, check_image, DockerWorker
-from hep_gui.core.rivet_build import build_mkhtml_command, local_to_docker_path
-from hep_gui.core.yoda_parser import parse_yoda, filter_plottable, YodaHisto1D
-from hep_gui.utils.normalization import normalize_to_area
-from hep_gui.utils.plot_helpers import (
-    build_step_coords, auto_log_scale, compute_view_range, get_axis_labels,
+from hep_gui.config.constants import (
+    ANALYSIS_DIR, BAND_COLOR, CACHE_DIR, DOCKER_IMAGE_MKHTML, MANY_DATASETS,
+    OVERLAY_CMAP, SESSIONS_DIR, THUMBNAIL_DIR,
 )
+from hep_gui.config.settings import load_settings, save_settings
+from hep_gui.core.batch_export import BatchExportWorker
+from hep_gui.core.headless import render_figure, unique_label
+from hep_gui.core.html_report import HtmlReportWorker
+from hep_gui.core.container_pool import ExecWorker, container_pool
+from hep_gui.core.docker_interface import docker_service
+from hep_gui.core.rivet_build import build_mkhtml_command, local_to_docker_path
+from hep_gui.core.plot_pipeline import BinReadout, FigureCache, build_band
+from hep_gui.core.yoda_loader import ScanLoadWorker, YodaLoadWorker
+from hep_gui.core.ref_index import RefIndexWorker
+from hep_gui.core.session import SESSION_SUFFIX, save_session, load_session
+from hep_gui.core.thumbnails import THUMB_SIZE, ThumbnailWorker
+from hep_gui.gui.comparison_dialog import ComparisonDialog
+from hep_gui.gui.histogram_item import StepBandItem, StepBundleItem, StepHistogramItem
+from hep_gui.gui.scan_viewer import ScanViewer
+from hep_gui.utils.plot_helpers import build_step_coords
+from hep_gui.utils.ratios import ratio_range
+from hep_gui.utils.rebinning import parse_edges_text
+
+MAX_ERROR_BARS = 5000
+# hover readout updates per second at most (mouse moves come much faster)
+READOUT_RATE = 60
+READOUT_TOOLTIP_ROWS = 40
 
 
 class PlotTab(QWidget):
@@ -26,16 +47,38 @@ class PlotTab(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
 
-        # loaded datasets: {label: {"path": Path, "histos": dict}}
+        # loaded datasets: {label: {"path": Path, "histos": dict, "titles": dict}}
+        # "titles" comes from the block index, before histos is complete
         self._datasets = {}
+        # background parsers still running: {label: YodaLoadWorker}
+        self._loaders = {}
         # all observable paths across loaded files (sorted)
         self._all_paths = []
         # last directory used in file dialog
         self._last_dir = str(ANALYSIS_DIR)
+        self._export_worker = None
+        self._scan_worker = None
+        # built figures (main plot + ratio), cleared when datasets change
+        self._figures = FigureCache()
+        self._compare_dialog = None
+        # local reference data (RefIndex), indexed in the background
+        self._ref_index = None
+        self._ref_worker = None
+        # observable icons: {path: png}, rendered in the background once loads finish
+        self._thumbs = {}
+        self._thumb_worker = None
+        self.thumbnail_dir = THUMBNAIL_DIR
+        # bin lookup of the plotted figure, for the hover readout
+        self._readout = None
+        self._readout_bin = None
 
         self._build_ui()
         self._connect_signals()
 
+        ref_dir = load_settings().get("ref_data_dir")
+        if ref_dir and Path(ref_dir).is_dir():
+            self.set_reference_dir(ref_dir, remember=False)
+
     # -- UI setup --
 
     def _build_ui(self):
@@ -47,6 +90,18 @@ class PlotTab(QWidget):
         self.btn_load = QPushButton("Load .yoda")
         ctrl.addWidget(self.btn_load)
 
+        self.btn_scan = QPushButton("Scan...")
+        self.btn_scan.setToolTip("Load a family of runs and slide through their scan parameters")
+        ctrl.addWidget(self.btn_scan)
+
+        self.btn_session = QPushButton("Session")
+        self.btn_session.setToolTip("Save or restore the loaded datasets and view as one file")
+        session_menu = QMenu(self)
+        self.action_session_open = session_menu.addAction("Open session...")
+        self.action_session_save = session_menu.addAction("Save session...")
+        self.btn_session.setMenu(session_menu)
+        ctrl.addWidget(self.btn_session)
+
         ctrl.addWidget(QLabel("Filter:"))
         self.filter_edit = QLineEdit()
         self.filter_edit.setPlaceholderText("type to filter observables...")
@@ -55,8 +110,14 @@ class PlotTab(QWidget):
 
         self.combo_obs = QComboBox()
         self.combo_obs.setMinimumWidth(350)
+        self.combo_obs.view().setIconSize(QSize(*THUMB_SIZE))
         ctrl.addWidget(self.combo_obs, stretch=1)
 
+        self.label_loading = QLabel()
+        self.label_loading.setStyleSheet("color: #666666")
+        self.label_loading.setVisible(False)
+        ctrl.addWidget(self.label_loading)
+
         self.cb_normalize = QCheckBox("Normalize")
         self.cb_normalize.setChecked(True)
         self.cb_normalize.setToolTip("Normalize to unit area")
@@ -68,13 +129,72 @@ class PlotTab(QWidget):
         self.cb_logx = QCheckBox("Log X")
         ctrl.addWidget(self.cb_logx)
 
+        self.cb_many = QCheckBox("Many")
+        self.cb_many.setToolTip(
+            f"Draw all datasets as thin lines colored along a colormap "
+            f"(on by itself past {MANY_DATASETS} datasets)")
+        ctrl.addWidget(self.cb_many)
+        self.cb_band = QCheckBox("Band")
+        self.cb_band.setToolTip("Median and 16-84% band over the datasets, per bin")
+        ctrl.addWidget(self.cb_band)
+
+        self.cb_ratio = QCheckBox("Ratio to:")
+        self.cb_ratio.setChecked(True)
+        self.cb_ratio.setToolTip("Show each dataset divided by the reference below the plot")
+        ctrl.addWidget(self.cb_ratio)
+        self.combo_ref = QComboBox()
+        self.combo_ref.setMinimumWidth(120)
+        ctrl.addWidget(self.combo_ref)
+
+        ctrl.addWidget(QLabel("Rebin:"))
+        self.spin_rebin = QSpinBox()
+        self.spin_rebin.setRange(1, 100)
+        self.spin_rebin.setToolTip("Merge N adjacent bins")
+        ctrl.addWidget(self.spin_rebin)
+        self.edit_rebin_edges = QLineEdit()
+        self.edit_rebin_edges.setPlaceholderText("or edges: 0, 20, 50, 100")
+        self.edit_rebin_edges.setToolTip("Rebin to these edges (must be existing bin edges)")
+        self.edit_rebin_edges.setMaximumWidth(160)
+        ctrl.addWidget(self.edit_rebin_edges)
+
+        self.btn_compare = QPushButton("Compare")
+        self.btn_compare.setToolTip("Rank observables by chi2/ndf, KS and max pull between datasets")
+        ctrl.addWidget(self.btn_compare)
+
+        self.cb_refdata = QCheckBox("Data")
+        self.cb_refdata.setChecked(True)
+        self.cb_refdata.setEnabled(False)
+        self.cb_refdata.setToolTip("No reference directory set")
+        ctrl.addWidget(self.cb_refdata)
+        self.btn_refdir = QPushButton("Ref data...")
+        self.btn_refdir.setToolTip("Directory of reference .yoda files (e.g. copied from the Rivet data directory)")
+        ctrl.addWidget(self.btn_refdir)
+
         layout.addLayout(ctrl)
 
         # center: plot
         self.plot_widget = pg.PlotWidget()
         self.plot_widget.setBackground("w")
         self.plot_widget.showGrid(x=True, y=True, alpha=0.3)
-        layout.addWidget(self.plot_widget, stretch=1)
+        layout.addWidget(self.plot_widget, stretch=3)
+        self.crosshair = pg.InfiniteLine(
+            angle=90, movable=False, pen=pg.mkPen((120, 120, 120), width=1, style=Qt.DashLine))
+        self.crosshair.setVisible(False)
+
+        # ratio panel, x axis follows the main plot
+        self.ratio_widget = pg.PlotWidget()
+        self.ratio_widget.setBackground("w")
+        self.ratio_widget.showGrid(x=True, y=True, alpha=0.3)
+        self.ratio_widget.setXLink(self.plot_widget)
+        self.ratio_widget.setLabel("left", "ratio")
+        self.ratio_widget.setVisible(False)
+        layout.addWidget(self.ratio_widget, stretch=1)
+
+        # bin contents under the mouse, one line (full list in the tooltip)
+        self.label_readout = QLabel()
+        self.label_readout.setStyleSheet("color: #333333; font-family: monospace")
+        self.label_readout.setSizePolicy(QSizePolicy.Ignored, QSizePolicy.Fixed)
+        layout.addWidget(self.label_readout)
 
         # bottom: labels + export
         bottom = QHBoxLayout()
@@ -96,29 +216,52 @@ class PlotTab(QWidget):
         self.btn_png = QPushButton("PNG")
         self.btn_svg = QPushButton("SVG")
         self.btn_pdf = QPushButton("PDF")
+        self.btn_export_all = QPushButton("Export all")
+        self.btn_export_all.setToolTip("Export every observable matching the filter")
         self.btn_html = QPushButton("Export HTML")
-        self.btn_html.setToolTip("Generate publication-quality HTML via rivet-mkhtml (Docker)")
+        self.btn_html.setToolTip("Generate an HTML page with one SVG per observable")
+        html_menu = QMenu(self)
+        self.action_html_native = html_menu.addAction("Native report (fast)")
+        self.action_html_docker = html_menu.addAction("rivet-mkhtml (Docker)")
+        self.btn_html.setMenu(html_menu)
         bottom.addWidget(self.btn_png)
         bottom.addWidget(self.btn_svg)
         bottom.addWidget(self.btn_pdf)
+        bottom.addWidget(self.btn_export_all)
         bottom.addWidget(self.btn_html)
 
         layout.addLayout(bottom)
 
     def _connect_signals(self):
+        self._mouse_proxy = pg.SignalProxy(
+            self.plot_widget.scene().sigMouseMoved, rateLimit=READOUT_RATE, slot=self._on_mouse_moved)
         self.btn_load.clicked.connect(self.load_yoda_files)
+        self.btn_compare.clicked.connect(self._on_compare)
+        self.btn_scan.clicked.connect(self._on_scan)
+        self.action_session_open.triggered.connect(self._on_open_session)
+        self.action_session_save.triggered.connect(self._on_save_session)
         self.combo_obs.currentIndexChanged.connect(self._on_observable_changed)
         self.filter_edit.textChanged.connect(self._apply_filter)
         self.cb_normalize.stateChanged.connect(self._on_controls_changed)
         self.cb_logy.stateChanged.connect(self._on_controls_changed)
         self.cb_logx.stateChanged.connect(self._on_controls_changed)
+        self.cb_many.stateChanged.connect(self._on_controls_changed)
+        self.cb_band.stateChanged.connect(self._on_controls_changed)
+        self.cb_ratio.stateChanged.connect(self._on_controls_changed)
+        self.cb_refdata.stateChanged.connect(self._on_controls_changed)
+        self.btn_refdir.clicked.connect(self._on_choose_ref_dir)
+        self.combo_ref.currentIndexChanged.connect(self._on_controls_changed)
+        self.spin_rebin.valueChanged.connect(self._on_controls_changed)
+        self.edit_rebin_edges.editingFinished.connect(self._on_controls_changed)
         self.edit_title.textEdited.connect(self._on_label_edited)
         self.edit_xlabel.textEdited.connect(self._on_label_edited)
         self.edit_ylabel.textEdited.connect(self._on_label_edited)
         self.btn_png.clicked.connect(lambda: self._export("png"))
         self.btn_svg.clicked.connect(lambda: self._export("svg"))
         self.btn_pdf.clicked.connect(lambda: self._export("pdf"))
-        self.btn_html.clicked.connect(self._on_export_html)
+        self.btn_export_all.clicked.connect(self._on_export_all)
+        self.action_html_native.triggered.connect(self._on_export_html)
+        self.action_html_docker.triggered.connect(self._on_export_html_docker)
 
     # -- public API --
 
@@ -132,40 +275,381 @@ class PlotTab(QWidget):
             self.load_yoda_path(f)
 
     def load_yoda_path(self, path):
-        """Load a single .yoda file without dialog (for programmatic use)."""
+        """Load a single .yoda file without dialog (for programmatic use).
+
+        Parsing runs in a YodaLoadWorker: the observable list fills from the
+        block index, the current observable is parsed first, the rest
+        follows in batches. See wait_for_loads().
+        """
         path = Path(path)
         if not path.exists():
             return
         self._last_dir = str(path.parent)
-        label = path.stem
-        # avoid label collisions
-        if label in self._datasets:
-            i = 2
-            while f"{label}_{i}" in self._datasets:
-                i += 1
-            label = f"{label}_{i}"
-
-        all_histos = parse_yoda(str(path))
-        plottable = filter_plottable(all_histos)
-        self._datasets[label] = {"path": path, "histos": plottable}
+        label = unique_label(path.stem, self._datasets)
+
+        self._datasets[label] = {"path": path, "histos": {}, "titles": {}}
+        if len(self._datasets) == MANY_DATASETS + 1:
+            self._set_checked(self.cb_many, True)
+        worker = YodaLoadWorker(path)
+        worker.indexed.connect(lambda titles, w=worker: self._on_load_indexed(w, titles))
+        worker.histos_ready.connect(lambda batch, w=worker: self._on_load_batch(w, batch))
+        worker.finished.connect(lambda histos, w=worker: self._on_load_done(w, histos))
+        worker.error.connect(lambda msg, w=worker: self._on_load_error(w, msg))
+        self._loaders[label] = worker
+        self.label_loading.setText(f"Loading {path.name}...")
+        self.label_loading.setVisible(True)
+        worker.start()
+
+    def is_loading(self):
+        return bool(self._loaders)
+
+    def wait_for_loads(self, timeout=30.0):
+        """Process events until every pending load is done. False on timeout."""
+        deadline = time.monotonic() + timeout
+        while self._loaders and time.monotonic() < deadline:
+            QApplication.processEvents(QEventLoop.AllEvents, 20)
+            QThread.msleep(1)
+        return not self._loaders
+
+    def set_reference_dir(self, ref_dir, remember=True, cache_dir=CACHE_DIR):
+        """Use the /REF histograms of ref_dir as data overlay.
+
+        The index is loaded (or built / refreshed) in a RefIndexWorker;
+        remember=True stores the directory in the settings.
+        """
+        if self._ref_worker:
+            self._ref_worker.cancel()
+            self._ref_worker.wait()
+        if remember:
+            settings = load_settings()
+            settings["ref_data_dir"] = str(ref_dir)
+            save_settings(settings)
+        self.cb_refdata.setEnabled(False)
+        self.cb_refdata.setToolTip(f"Indexing {ref_dir}...")
+        self._ref_worker = RefIndexWorker(ref_dir, cache_dir)
+        self._ref_worker.finished.connect(self._on_ref_index_ready)
+        self._ref_worker.error.connect(self._on_ref_index_error)
+        self._ref_worker.start()
+
+    def reference_index(self):
+        return self._ref_index
+
+    def view_state(self):
+        """Controls worth restoring with a session, as a JSON-friendly dict."""
+        return {
+            "observable": self.combo_obs.currentData(),
+            "filter": self.filter_edit.text(),
+            "normalize": self.cb_normalize.isChecked(),
+            "logx": self.cb_logx.isChecked(),
+            "logy": self.cb_logy.isChecked(),
+            "ratio": self.cb_ratio.isChecked(),
+            "many": self.cb_many.isChecked(),
+            "band": self.cb_band.isChecked(),
+            "ref": self.combo_ref.currentText(),
+            "rebin": self.spin_rebin.value(),
+            "rebin_edges": self.edit_rebin_edges.text(),
+        }
+
+    def save_session(self, path):
+        """Write the loaded datasets and view state to one bundle."""
+        save_session(path, self._datasets, self.view_state())
+
+    def restore_session(self, path):
+        """Replace the loaded datasets with a saved bundle. Source .yoda files are not needed."""
+        datasets, view = load_session(path)
+        self._cancel_loads()
+        for ds in datasets.values():
+            ds["titles"] = {p: h.title for p, h in ds["histos"].items()}
+        self._datasets = datasets
+        self._figures.clear()
+
+        # set every control first, then plot once
+        controls = (self.filter_edit, self.cb_normalize, self.cb_logx, self.cb_logy,
+                    self.cb_ratio, self.cb_many, self.cb_band, self.spin_rebin,
+                    self.edit_rebin_edges)
+        for w in controls:
+            w.blockSignals(True)
+        self.filter_edit.setText(view.get("filter", ""))
+        self.cb_normalize.setChecked(view.get("normalize", True))
+        self.cb_logx.setChecked(view.get("logx", False))
+        self.cb_logy.setChecked(view.get("logy", False))
+        self.cb_ratio.setChecked(view.get("ratio", True))
+        self.cb_many.setChecked(view.get("many", len(datasets) > MANY_DATASETS))
+        self.cb_band.setChecked(view.get("band", False))
+        self.spin_rebin.setValue(view.get("rebin", 1))
+        self.edit_rebin_edges.setText(view.get("rebin_edges", ""))
+        for w in controls:
+            w.blockSignals(False)
 
         self._rebuild_paths()
-        self._apply_filter()
+        self._rebuild_ref_combo()
+        idx = self.combo_ref.findText(view.get("ref", ""))
+        if idx >= 0:
+            self.combo_ref.blockSignals(True)
+            self.combo_ref.setCurrentIndex(idx)
+            self.combo_ref.blockSignals(False)
+        self._apply_filter(select=view.get("observable"))
+        self._start_thumbnails()
+
+    def select_observable(self, histo_path):
+        """Show histo_path, clearing the filter if it hides it."""
+        idx = self.combo_obs.findData(histo_path)
+        if idx < 0 and histo_path in self._all_paths:
+            self.filter_edit.setText("")
+            idx = self.combo_obs.findData(histo_path)
+        if idx >= 0:
+            self.combo_obs.setCurrentIndex(idx)
 
     # -- internal --
 
+    def _on_choose_ref_dir(self):
+        start = str(self._ref_index.ref_dir) if self._ref_index else self._last_dir
+        path = QFileDialog.getExistingDirectory(self, "Reference data directory", start)
+        if path:
+            self.set_reference_dir(path)
+
+    def _on_ref_index_ready(self, index):
+        if self.sender() is not self._ref_worker:
+            return  # superseded by another directory
+        self._ref_worker.wait()
+        self._ref_worker = None
+        self._ref_index = index
+        self.cb_refdata.setEnabled(True)
+        self.cb_refdata.setToolTip(f"{len(index)} reference histograms in {index.ref_dir}")
+        self._figures.clear()
+        self._on_controls_changed()
+
+    def _on_ref_index_error(self, msg):
+        if self.sender() is not self._ref_worker:
+            return
+        self._ref_worker.wait()
+        self._ref_worker = None
+        self.cb_refdata.setToolTip("No reference directory set")
+        QMessageBox.warning(self, "Reference data", f"Could not index reference data:\n{msg}")
+
+    def _on_save_session(self):
+        if not self._datasets:
+            QMessageBox.warning(self, "Save session", "No YODA files loaded.")
+            return
+        if self._busy_loading("Save session"):
+            return
+        SESSIONS_DIR.mkdir(parents=True, exist_ok=True)
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Save session", str(SESSIONS_DIR / f"session{SESSION_SUFFIX}"),
+            f"HEP-GUI session (*{SESSION_SUFFIX})",
+        )
+        if not path:
+            return
+        if not path.endswith(SESSION_SUFFIX):
+            path += SESSION_SUFFIX
+        try:
+            self.save_session(path)
+        except OSError as e:
+            QMessageBox.warning(self, "Save session", f"Could not write session:\n{e}")
+
+    def _on_open_session(self):
+        start = str(SESSIONS_DIR) if SESSIONS_DIR.exists() else self._last_dir
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Open session", start, f"HEP-GUI session (*{SESSION_SUFFIX});;All files (*)",
+        )
+        if not path:
+            return
+        try:
+            self.restore_session(path)
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(self, "Open session", f"Could not read session:\n{e}")
+
+    def _on_scan(self):
+        files, _ = QFileDialog.getOpenFileNames(
+            self, "Load scan runs", self._last_dir,
+            "YODA files (*.yoda);;All files (*)",
+        )
+        if len(files) < 2 or self._scan_worker:
+            return
+        self._scan_worker = ScanLoadWorker(files)
+        self._scan_worker.progress.connect(self._on_scan_progress)
+        self._scan_worker.finished.connect(self._on_scan_loaded)
+        self._scan_worker.error.connect(self._on_scan_error)
+        self.btn_scan.setEnabled(False)
+        self._on_scan_progress(0, len(files))
+        self._scan_worker.start()
+
+    def _on_scan_progress(self, done, total):
+        self.btn_scan.setText(f"Scan {done}/{total}")
+
+    def _end_scan_load(self):
+        self._scan_worker.wait()
+        self._scan_worker = None
+        self.btn_scan.setText("Scan...")
+        self.btn_scan.setEnabled(True)
+
+    def _on_scan_loaded(self, family):
+        self._end_scan_load()
+        if not family.values:
+            QMessageBox.warning(self, "Scan", "The selected runs share no observable with identical binning.")
+            return
+        ScanViewer(self, family).show()
+
+    def _on_scan_error(self, msg):
+        self._end_scan_load()
+        QMessageBox.warning(self, "Scan", f"Could not load the scan:\n{msg}")
+
+    def _on_compare(self):
+        if self._busy_loading("Compare"):
+            return
+        if len(self._datasets) < 2:
+            QMessageBox.warning(self, "Compare", "Load at least two YODA files to compare.")
+            return
+        if self._compare_dialog is None:
+            self._compare_dialog = ComparisonDialog(
+                self, self._datasets, self.cb_normalize.isChecked(),
+            )
+            self._compare_dialog.observable_selected.connect(self.select_observable)
+        else:
+            self._compare_dialog.recompute(self._datasets, self.cb_normalize.isChecked())
+        self._compare_dialog.show()
+        self._compare_dialog.raise_()
+
+    def _loader_dataset(self, worker):
+        """(label, dataset) fed by worker, or (None, None) once it was dropped."""
+        for label, w in self._loaders.items():
+            if w is worker:
+                return label, self._datasets.get(label)
+        return None, None
+
+    def _on_load_indexed(self, worker, titles):
+        _, ds = self._loader_dataset(worker)
+        if ds is None:
+            return
+        ds["titles"] = titles
+        self._figures.clear()
+        self._rebuild_paths()
+        self._rebuild_ref_combo()
+        self._apply_filter()
+
+    def _on_load_batch(self, worker, batch):
+        _, ds = self._loader_dataset(worker)
+        if ds is None:
+            return
+        ds["histos"].update(batch)
+        self._figures.clear()
+        current = self.combo_obs.currentData()
+        if current in batch:
+            self._do_plot(current)
+
+    def _on_load_done(self, worker, histos):
+        label, ds = self._loader_dataset(worker)
+        if label is None:
+            return
+        self._loaders.pop(label).wait()
+        if ds is not None:
+            ds["histos"] = histos
+            # blocks that failed to parse leave the list
+            ds["titles"] = {p: t for p, t in ds["titles"].items() if p in histos}
+            old_paths = self._all_paths
+            self._rebuild_paths()
+            if self._all_paths != old_paths:
+                self._apply_filter()
+        self._update_loading_label()
+        if not self._loaders:
+            self._start_thumbnails()
+
+    def _on_load_error(self, worker, msg):
+        label, _ = self._loader_dataset(worker)
+        if label is None:
+            return
+        self._loaders.pop(label).wait()
+        self._datasets.pop(label, None)
+        self._figures.clear()
+        self._rebuild_paths()
+        self._rebuild_ref_combo()
+        self._apply_filter()
+        self._update_loading_label()
+        if not self._loaders:
+            self._start_thumbnails()
+        QMessageBox.warning(self, "Load .yoda", f"Could not read file:\n{msg}")
+
+    def _cancel_loads(self):
+        for worker in self._loaders.values():
+            worker.cancel()
+            worker.wait()
+        self._loaders.clear()
+        self._update_loading_label()
+
+    def _start_thumbnails(self):
+        """(Re)start the icon worker for the current datasets."""
+        if self._thumb_worker is not None:
+            self._thumb_worker.cancel()
+            self._thumb_worker.wait()
+            self._thumb_worker = None
+        self._thumbs = {}
+        if not self._all_paths:
+            return
+        worker = ThumbnailWorker(self._datasets, self._all_paths, self.thumbnail_dir)
+        worker.ready.connect(lambda batch, w=worker: self._on_thumbnails(w, batch))
+        worker.finished.connect(lambda _n, w=worker: self._on_thumbnails_done(w))
+        worker.error.connect(lambda _msg, w=worker: self._on_thumbnails_done(w))
+        self._thumb_worker = worker
+        worker.start()
+
+    def _on_thumbnails(self, worker, batch):
+        if worker is not self._thumb_worker:
+            return
+        self._thumbs.update(batch)
+        for path, png in batch.items():
+            idx = self.combo_obs.findData(path)
+            if idx >= 0:
+                self.combo_obs.setItemIcon(idx, QIcon(png))
+
+    def _on_thumbnails_done(self, worker):
+        # icons are a nicety: on error, the list simply stays without them
+        if worker is self._thumb_worker:
+            worker.wait()
+            self._thumb_worker = None
+
+    def _set_checked(self, checkbox, checked):
+        checkbox.blockSignals(True)
+        checkbox.setChecked(checked)
+        checkbox.blockSignals(False)
+
+    def _update_loading_label(self):
+        if self._loaders:
+            names = ", ".join(w.path.name for w in self._loaders.values())
+            self.label_loading.setText(f"Loading {names}...")
+        self.label_loading.setVisible(bool(self._loaders))
+
+    def _busy_loading(self, title):
+        if self._loaders:
+            QMessageBox.information(self, title, "YODA files are still loading, try again in a moment.")
+            return True
+        return False
+
     def _rebuild_paths(self):
         """Rebuild the merged set of plottable paths from all datasets."""
         paths = set()
         for ds in self._datasets.values():
             paths.update(ds["histos"].keys())
+            paths.update(ds["titles"].keys())
         self._all_paths = sorted(paths)
 
-    def _apply_filter(self, _text=None):
-        """Re-populate combo with paths matching filter text."""
+    def _rebuild_ref_combo(self):
+        self.combo_ref.blockSignals(True)
+        prev = self.combo_ref.currentText()
+        self.combo_ref.clear()
+        self.combo_ref.addItems(list(self._datasets))
+        idx = self.combo_ref.findText(prev)
+        if idx >= 0:
+            self.combo_ref.setCurrentIndex(idx)
+        self.combo_ref.blockSignals(False)
+
+    def _apply_filter(self, _text=None, select=None):
+        """Re-populate combo with paths matching filter text.
+
+        Keeps the current observable selected, or `select` when given.
+        """
         filt = self.filter_edit.text().strip().lower()
         self.combo_obs.blockSignals(True)
-        prev = self.combo_obs.currentData()
+        prev = select or self.combo_obs.currentData()
         self.combo_obs.clear()
 
         for p in self._all_paths:
@@ -174,12 +658,15 @@ class PlotTab(QWidget):
             # find a title from any dataset that has this path
             title = ""
             for ds in self._datasets.values():
-                h = ds["histos"].get(p)
-                if h and h.title:
-                    title = h.title
+                title = ds["titles"].get(p, "")
+                if title:
                     break
             display = f"{p}  --  {title}" if title else p
-            self.combo_obs.addItem(display, userData=p)
+            png = self._thumbs.get(p)
+            if png:
+                self.combo_obs.addItem(QIcon(png), display, userData=p)
+            else:
+                self.combo_obs.addItem(display, userData=p)
 
         # try to restore previous selection
         if prev:
@@ -195,6 +682,9 @@ class PlotTab(QWidget):
     def _on_observable_changed(self, *_args):
         path = self.combo_obs.currentData()
         if path:
+            # not parsed yet: ask the loaders to do it next
+            for worker in self._loaders.values():
+                worker.request(path)
             self._do_plot(path)
 
     def _on_controls_changed(self, *_args):
@@ -202,138 +692,300 @@ class PlotTab(QWidget):
         if path:
             self._do_plot(path)
 
+    def _rebin_option(self):
+        """Current rebin setting for build_figure: None, N, or a tuple of edges."""
+        text = self.edit_rebin_edges.text().strip()
+        if text:
+            try:
+                edges = tuple(parse_edges_text(text))
+            except ValueError:
+                edges = ()
+            valid = len(edges) >= 2
+            self.edit_rebin_edges.setStyleSheet("" if valid else "color: #cc0000")
+            if valid:
+                return edges
+        else:
+            self.edit_rebin_edges.setStyleSheet("")
+        n = self.spin_rebin.value()
+        return n if n > 1 else None
+
     def _on_label_edited(self, *_args):
         pw = self.plot_widget
         pw.setTitle(self.edit_title.text())
         pw.setLabel("bottom", self.edit_xlabel.text())
         pw.setLabel("left", self.edit_ylabel.text())
 
-    def _extract(self, histo):
-        """Extract plottable arrays, replacing NaN with 0."""
-        edges = np.array(histo.edges, dtype=float)
-        n_bins = len(edges) - 1
-        vals = histo.values[:n_bins].copy()
-        vals = np.where(np.isnan(vals), 0, vals)
-
-        err_dn = err_up = None
-        if histo.err_dn is not None:
-            err_dn = np.abs(histo.err_dn[:n_bins])
-            err_up = histo.err_up[:n_bins]
-            err_dn = np.where(np.isnan(err_dn), 0, err_dn)
-            err_up = np.where(np.isnan(err_up), 0, err_up)
-
-        return edges, vals, err_dn, err_up
+    def _figure_options(self):
+        """build_figure options from the plot controls."""
+        return {
+            "normalize": self.cb_normalize.isChecked(),
+            "logx": self.cb_logx.isChecked(),
+            "logy": self.cb_logy.isChecked(),
+            "ref_label": self.combo_ref.currentText() or None,
+            "rebin": self._rebin_option(),
+            "references": self._ref_index if self.cb_refdata.isChecked() else None,
+        }
 
     def _do_plot(self, histo_path):
         pw = self.plot_widget
         pw.clear()
         pw.setLogMode(x=False, y=False)
 
-        do_norm = self.cb_normalize.isChecked()
-
-        # gather data from all datasets
-        plot_data = []
-        for label, ds in self._datasets.items():
-            histo = ds["histos"].get(histo_path)
-            if not histo:
-                continue
-            edges, vals, err_dn, err_up = self._extract(histo)
-            if do_norm:
-                vals, err_dn, err_up = normalize_to_area(edges, vals, err_dn, err_up)
-            plot_data.append((label, edges, vals, err_dn, err_up))
-
-        if not plot_data:
+        fig = self._figures.get(self._datasets, histo_path, **self._figure_options())
+        self._readout = BinReadout(fig) if fig is not None else None
+        self._readout_bin = None
+        self.label_readout.clear()
+        if fig is None:
+            self.ratio_widget.clear()
             return
-
-        # log scale: auto-detect from first dataset, then override with checkboxes
-        ref_edges, ref_vals = plot_data[0][1], plot_data[0][2]
-        xlog, ylog = auto_log_scale(ref_edges, ref_vals)
-        if self.cb_logx.isChecked():
-            xlog = True
-        if self.cb_logy.isChecked():
-            ylog = True
-
-        # labels
-        xlabel, ylabel = get_axis_labels(histo_path)
-        if do_norm:
-            ylabel = "normalized"
-        title = histo_path.rsplit("/", 1)[-1]
+        xlog, ylog = fig.xlog, fig.ylog
 
         # update label edits (without triggering textEdited)
         self.edit_title.blockSignals(True)
         self.edit_xlabel.blockSignals(True)
         self.edit_ylabel.blockSignals(True)
-        self.edit_title.setText(title)
-        self.edit_xlabel.setText(xlabel)
-        self.edit_ylabel.setText(ylabel)
+        self.edit_title.setText(fig.title)
+        self.edit_xlabel.setText(fig.xlabel)
+        self.edit_ylabel.setText(fig.ylabel)
         self.edit_title.blockSignals(False)
         self.edit_xlabel.blockSignals(False)
         self.edit_ylabel.blockSignals(False)
 
-        pw.setTitle(title)
-        pw.setLabel("bottom", xlabel)
-        pw.setLabel("left", ylabel)
+        pw.setTitle(fig.title)
+        pw.setLabel("bottom", fig.xlabel)
+        pw.setLabel("left", fig.ylabel)
         pw.setLogMode(x=xlog, y=ylog)
 
         legend = pw.addLegend(offset=(10, 10))
 
-        all_edges = []
-        all_vals = []
+        if self.cb_many.isChecked():
+            self._plot_many(fig)
+        else:
+            self._plot_series(fig)
+        if self.cb_band.isChecked():
+            self._plot_band(fig)
+        if fig.reference is not None:
+            self._plot_reference(fig)
+        self.crosshair.setVisible(False)
+        pw.addItem(self.crosshair, ignoreBounds=True)
 
-        for i, (label, edges, vals, err_dn, err_up) in enumerate(plot_data):
-            color = COLORS[i % len(COLORS)]
-            centers = (edges[:-1] + edges[1:]) / 2.0
+        # set view range
+        x_min, x_max, y_min, y_max = fig.view
+        if xlog:
+            pw.setXRange(np.log10(max(x_min, 1e-30)), np.log10(max(x_max, 1e-30)), padding=0.05)
+        else:
+            pw.setXRange(x_min, x_max, padding=0)
+        if ylog:
+            pw.setYRange(np.log10(max(y_min, 1e-30)), np.log10(max(y_max, 1e-30)), padding=0.05)
+        else:
+            pw.setYRange(y_min, y_max, padding=0)
 
-            # clamp zeros for log y
-            plot_vals = vals.copy()
-            if ylog:
-                positive = plot_vals[plot_vals > 0]
-                floor = positive.min() * 0.01 if len(positive) > 0 else 1e-10
-                plot_vals = np.where(plot_vals > 0, plot_vals, floor)
+        self._plot_ratio(fig)
 
-            step_x, step_y = build_step_coords(edges, plot_vals)
+    def _on_mouse_moved(self, event):
+        """Crosshair and bin readout, called at most READOUT_RATE times a second."""
+        (pos,) = event
+        vb = self.plot_widget.getViewBox()
+        if self._readout is None or not vb.sceneBoundingRect().contains(pos):
+            self.crosshair.setVisible(False)
+            return
+        x = vb.mapSceneToView(pos).x()
+        self.crosshair.setPos(x)
+        self.crosshair.setVisible(True)
+        self.show_readout(10 ** x if self.plot_widget.getPlotItem().ctrl.logXCheck.isChecked() else x)
+
+    def show_readout(self, x):
+        """Show the bin contents of every dataset at x (data units)."""
+        rows = self._readout.at(x) if self._readout is not None else []
+        key = (rows[0].lo, rows[0].hi) if rows else None
+        if key == self._readout_bin:
+            return  # same bin, nothing to redo
+        self._readout_bin = key
+        if not rows:
+            self.label_readout.clear()
+            self.label_readout.setToolTip("")
+            return
+        head = f"[{rows[0].lo:.6g}, {rows[0].hi:.6g}]"
+        lines = [_readout_line(r) for r in rows[:READOUT_TOOLTIP_ROWS]]
+        if len(rows) > READOUT_TOOLTIP_ROWS:
+            lines.append(f"... {len(rows) - READOUT_TOOLTIP_ROWS} more")
+        if len(rows) > MANY_DATASETS:
+            vals = np.array([r.value for r in rows])
+            q = np.quantile(vals, (0, 0.5, 1))
+            self.label_readout.setText(
+                f"{head}  {len(rows)} datasets: min {q[0]:.4g}  median {q[1]:.4g}  max {q[2]:.4g}")
+        else:
+            self.label_readout.setText(head + "  " + "   ".join(lines))
+        self.label_readout.setToolTip(head + "\n" + "\n".join(lines))
 
-            # fill between step curve and baseline
-            fill_top = pg.PlotCurveItem(step_x, step_y, pen=pg.mkPen(None))
-            if ylog:
-                base = plot_vals[plot_vals > 0].min() * 0.1 if np.any(plot_vals > 0) else 1e-10
-                fill_bot = pg.PlotCurveItem(step_x, np.full_like(step_y, base), pen=pg.mkPen(None))
-            else:
-                fill_bot = pg.PlotCurveItem(step_x, np.zeros_like(step_y), pen=pg.mkPen(None))
-            pw.addItem(pg.FillBetweenItem(fill_top, fill_bot, brush=color["fill"]))
+    def _plot_series(self, fig):
+        """Each series as a filled step histogram with error bars."""
+        pw = self.plot_widget
+        for s in fig.series:
+            color = s.color
+            edges, vals, plot_vals = s.edges, s.vals, s.plot_vals
+            centers = (edges[:-1] + edges[1:]) / 2.0
 
-            # step outline
-            pw.plot(step_x, step_y, pen=pg.mkPen(color["line"], width=1.5))
+            # filled step outline, decimated to the view for fine binnings
+            pw.addItem(StepHistogramItem(
+                edges, plot_vals, pen=pg.mkPen(color["line"], width=1.5),
+                brush=color["fill"], fill_base=s.fill_base,
+            ))
 
             # legend entry (invisible dummy trace)
-            pw.plot([], [], pen=pg.mkPen(color["line"], width=3), name=label)
+            pw.plot([], [], pen=pg.mkPen(color["line"], width=3), name=s.label)
 
-            # error bars on non-zero bins
-            if err_dn is not None:
+            # error bars on non-zero bins (unreadable, and slow to pan, past a few thousand)
+            if s.err_dn is not None and len(vals) <= MAX_ERROR_BARS:
                 mask = vals > 0
                 if mask.any():
                     pw.addItem(pg.ErrorBarItem(
                         x=centers[mask], y=plot_vals[mask],
-                        top=err_up[mask], bottom=err_dn[mask],
+                        top=s.err_up[mask], bottom=s.err_dn[mask],
                         pen=pg.mkPen(color["line"], width=1.2),
                     ))
 
-            all_edges.append(edges)
-            all_vals.append(plot_vals)
-
-        # set view range
-        x_min, x_max, y_min, y_max = compute_view_range(all_edges, all_vals, xlog, ylog)
-        if xlog:
-            pw.setXRange(np.log10(max(x_min, 1e-30)), np.log10(max(x_max, 1e-30)), padding=0.05)
-        else:
-            pw.setXRange(x_min, x_max, padding=0)
-        if ylog:
-            pw.setYRange(np.log10(max(y_min, 1e-30)), np.log10(max(y_max, 1e-30)), padding=0.05)
+    def _plot_many(self, fig):
+        """All series as one StepBundleItem: thin outlines, no fill or error bars."""
+        pw = self.plot_widget
+        series = fig.series
+        edges = series[0].edges
+        if all(np.array_equal(s.edges, edges) for s in series):
+            values = np.stack([s.plot_vals for s in series])
         else:
-            pw.setYRange(y_min, y_max, padding=0)
+            edges, values = [s.edges for s in series], [s.plot_vals for s in series]
+        bundle = StepBundleItem(edges, values, cmap=OVERLAY_CMAP)
+        pw.addItem(bundle)
+        # legend: the two ends of the colormap
+        pw.plot([], [], pen=pg.mkPen(bundle.curve_color(0), width=3), name=series[0].label)
+        if len(series) > 1:
+            pw.plot([], [], pen=pg.mkPen(bundle.curve_color(len(series) - 1), width=3),
+                    name=f"{series[-1].label} ({len(series)} datasets)")
+
+    def _plot_band(self, fig):
+        band = build_band(fig.series)
+        if band is None:
+            return
+        self.plot_widget.addItem(StepBandItem(
+            band.edges, band.lo, band.hi, band.median,
+            pen=pg.mkPen(BAND_COLOR["line"], width=2), brush=BAND_COLOR["fill"],
+        ))
+        self.plot_widget.plot([], [], pen=pg.mkPen(BAND_COLOR["line"], width=3),
+                              name=f"median, 16-84% ({band.n})")
+
+    def _plot_reference(self, fig):
+        """Reference data as black points with bin-width and error bars."""
+        pw = self.plot_widget
+        r = fig.reference
+        centers = (r.edges[:-1] + r.edges[1:]) / 2.0
+        mask = r.vals > 0 if fig.ylog else np.isfinite(r.vals)
+        if not mask.any():
+            return
+        color = r.color["line"]
+        # the scatter follows setLogMode, the error bar item needs mapped coords
+        pw.plot(
+            centers[mask], r.plot_vals[mask], pen=None, symbol="o", symbolSize=6,
+            symbolPen=pg.mkPen(color), symbolBrush=pg.mkBrush(color), name=r.label,
+        )
+
+        def tr(v, log):
+            return np.log10(np.maximum(v, 1e-30)) if log else v
+
+        x = tr(centers[mask], fig.xlog)
+        y = tr(r.plot_vals[mask], fig.ylog)
+        bars = dict(
+            x=x, y=y,
+            left=x - tr(r.edges[:-1][mask], fig.xlog),
+            right=tr(r.edges[1:][mask], fig.xlog) - x,
+        )
+        if r.err_dn is not None:
+            v = r.plot_vals[mask]
+            bars["top"] = tr(v + r.err_up[mask], fig.ylog) - y
+            lo = v - r.err_dn[mask]
+            if fig.ylog:
+                lo = np.maximum(lo, v * 1e-3)  # a bar down to zero would reach 1e-30
+            bars["bottom"] = y - tr(lo, fig.ylog)
+        pw.addItem(pg.ErrorBarItem(**bars, pen=pg.mkPen(color, width=1.2)))
+
+    def _plot_ratio(self, fig):
+        rw = self.ratio_widget
+        rw.clear()
+        show = self.cb_ratio.isChecked() and fig.ratio is not None
+        rw.setVisible(show)
+        if not show:
+            return
+
+        r = fig.ratio
+        rw.setLogMode(x=fig.xlog, y=False)
+        rw.addLine(y=1.0, pen=pg.mkPen((0, 0, 0), width=1, style=Qt.DashLine))
+        centers = (r.edges[:-1] + r.edges[1:]) / 2.0
+        # fill and error bar items don't follow setLogMode, map x by hand
+        xmap = (lambda x: np.log10(np.maximum(x, 1e-30))) if fig.xlog else (lambda x: x)
+        many = self.cb_many.isChecked()
+        if many:
+            rows = [i for i, label in enumerate(r.labels) if label != r.ref_label]
+            if rows:
+                rw.addItem(StepBundleItem(r.edges, r.values[rows], cmap=OVERLAY_CMAP))
+
+        for i, (label, color) in enumerate(zip(r.labels, r.colors)):
+            vals = r.values[i]
+            finite = np.isfinite(vals)
+            if label == r.ref_label:
+                # reference: uncertainty band around 1
+                lo = np.where(finite, vals - r.err_dn[i], 1.0)
+                hi = np.where(finite, vals + r.err_up[i], 1.0)
+                sx, sy_lo = build_step_coords(r.edges, lo)
+                _, sy_hi = build_step_coords(r.edges, hi)
+                sy_lo[[0, -1]] = sy_lo[[1, -2]]
+                sy_hi[[0, -1]] = sy_hi[[1, -2]]
+                rw.addItem(pg.FillBetweenItem(
+                    pg.PlotCurveItem(xmap(sx), sy_lo), pg.PlotCurveItem(xmap(sx), sy_hi),
+                    brush=color["fill"],
+                ))
+                continue
+            if many:
+                continue
+            step_x, step_y = build_step_coords(r.edges, np.where(finite, vals, np.nan))
+            step_y[[0, -1]] = step_y[[1, -2]]
+            rw.plot(step_x, step_y, pen=pg.mkPen(color["line"], width=1.5), connect="finite")
+            if finite.any():
+                rw.addItem(pg.ErrorBarItem(
+                    x=xmap(centers[finite]), y=vals[finite],
+                    top=r.err_up[i][finite], bottom=r.err_dn[i][finite],
+                    pen=pg.mkPen(color["line"], width=1.2),
+                ))
+
+        y_lo, y_hi = ratio_range(r.values, r.err_dn, r.err_up)
+        rw.setYRange(y_lo, y_hi, padding=0)
+
+    def current_figure(self):
+        """The figure on screen, with the edited labels and the current zoom."""
+        path = self.combo_obs.currentData()
+        if not path:
+            return None
+        fig = self._figures.get(self._datasets, path, **self._figure_options())
+        if fig is None:
+            return None
+        (x0, x1), (y0, y1) = self.plot_widget.getViewBox().viewRange()
+        if fig.xlog:
+            x0, x1 = _unpad_log(x0, x1)
+        if fig.ylog:
+            y0, y1 = _unpad_log(y0, y1)
+        return dataclasses.replace(
+            fig,
+            title=self.edit_title.text(),
+            xlabel=self.edit_xlabel.text(),
+            ylabel=self.edit_ylabel.text(),
+            view=(x0, x1, y0, y1),
+            ratio=fig.ratio if self.cb_ratio.isChecked() else None,
+        )
 
     def _export(self, fmt):
         """Export the current plot to PNG, SVG, or PDF."""
+        fig = self.current_figure()
+        if fig is None:
+            QMessageBox.warning(self, "Export", "Nothing to export.")
+            return
         filters = {
             "png": "PNG image (*.png)",
             "svg": "SVG image (*.svg)",
@@ -344,44 +996,108 @@ class PlotTab(QWidget):
         )
         if not path:
             return
+        render_figure(fig, path, fmt)
 
-        if fmt == "png":
-            exporter = exporters.ImageExporter(self.plot_widget.plotItem)
-            exporter.export(path)
-        elif fmt == "svg":
-            exporter = exporters.SVGExporter(self.plot_widget.plotItem)
-            exporter.export(path)
-        elif fmt == "pdf":
-            self._export_pdf(path)
-
-    def _export_pdf(self, path):
-        """Export plot to PDF via QPdfWriter."""
-        from PySide6.QtGui import QPdfWriter
-        writer = QPdfWriter(path)
-        writer.setPageLayout(QPageLayout(
-            QPageSize(QPageSize.A4), QPageLayout.Landscape, QMarginsF(10, 10, 10, 10),
-        ))
-        painter = QPainter(writer)
-        self.plot_widget.render(painter)
-        painter.end()
+    def _filtered_paths(self):
+        return [self.combo_obs.itemData(i) for i in range(self.combo_obs.count())]
+
+    def _on_export_all(self):
+        """Batch-export every filtered observable in the background."""
+        if self._busy_loading("Export all"):
+            return
+        paths = self._filtered_paths()
+        if not paths:
+            QMessageBox.warning(self, "Export all", "No observables to export.")
+            return
+        if self._export_worker:
+            return
+
+        fmt, ok = QInputDialog.getItem(
+            self, "Export all", f"Format for {len(paths)} plots:",
+            ["png", "svg", "pdf (multi-page)"], 0, False,
+        )
+        if not ok:
+            return
+        fmt = fmt.split()[0]
+
+        if fmt == "pdf":
+            out, _ = QFileDialog.getSaveFileName(
+                self, "Export all plots", self._last_dir, "PDF document (*.pdf)",
+            )
+        else:
+            out = QFileDialog.getExistingDirectory(self, "Export all plots", self._last_dir)
+        if not out:
+            return
+
+        self._export_worker = BatchExportWorker(
+            self._datasets, paths, fmt, out,
+            normalize=self.cb_normalize.isChecked(),
+            logx=self.cb_logx.isChecked(),
+            logy=self.cb_logy.isChecked(),
+            rebin=self._rebin_option(),
+            references=self._ref_index if self.cb_refdata.isChecked() else None,
+            ref_label=self.combo_ref.currentText() or None,
+            ratio=self.cb_ratio.isChecked(),
+        )
+        progress = QProgressDialog(f"Exporting {len(paths)} plots...", "Cancel", 0, len(paths), self)
+        progress.setWindowTitle("Export all")
+        progress.setMinimumDuration(0)
+        failed = []
+        progress.canceled.connect(self._export_worker.cancel)
+        self._export_worker.progress.connect(lambda done, _total: progress.setValue(done))
+        self._export_worker.failed.connect(lambda path, msg: failed.append(f"{path}: {msg}"))
+        self._export_worker.finished.connect(lambda n: self._on_export_all_done(progress, n, out, failed))
+        self._export_worker.error.connect(lambda msg: self._on_export_all_done(progress, -1, msg, failed))
+        self.btn_export_all.setEnabled(False)
+        self._export_worker.start()
+
+    def _on_export_all_done(self, progress, written, info, failed=()):
+        progress.close()
+        self._export_worker = None
+        self.btn_export_all.setEnabled(True)
+        if written < 0:
+            QMessageBox.warning(self, "Export all", f"Export failed:\n{info}")
+        elif failed:
+            shown = "\n".join(failed[:10]) + ("\n..." if len(failed) > 10 else "")
+            QMessageBox.warning(self, "Export all",
+                f"{written} plots written to\n{info}\n\n{len(failed)} failed:\n{shown}")
+        else:
+            QMessageBox.information(self, "Export all", f"{written} plots written to\n{info}")
+
+    def _html_output_dir(self):
+        if len(self._datasets) == 1:
+            ds = next(iter(self._datasets.values()))
+            return ANALYSIS_DIR / f"{Path(ds['path']).stem}_plots"
+        return ANALYSIS_DIR / "comparison_plots"
 
     def _on_export_html(self):
+        """Native HTML report, no Docker needed. Reruns only redo changed plots."""
+        if not self._datasets:
+            QMessageBox.warning(self, "Export HTML", "No YODA files loaded.")
+            return
+        if self._busy_loading("Export HTML"):
+            return
+
+        worker = HtmlReportWorker(
+            self._datasets, self._html_output_dir(),
+            normalize=self.cb_normalize.isChecked(),
+        )
+        dlg = HtmlReportDialog(self, worker, self._html_output_dir())
+        dlg.exec()
+
+    def _on_export_html_docker(self):
         if not self._datasets:
             QMessageBox.warning(self, "Export HTML", "No YODA files loaded.")
             return
 
-        ok, info = check_docker()
+        docker = docker_service()
+        ok, info = docker.status()
         if not ok:
             QMessageBox.warning(self, "Export HTML",
                 f"Docker is not running.\n{info}")
             return
 
-        client = get_docker_client()
-        if not client:
-            QMessageBox.warning(self, "Export HTML", "Cannot connect to Docker.")
-            return
-
-        if not check_image(client, DOCKER_IMAGE_MKHTML):
+        if not docker.has_image(DOCKER_IMAGE_MKHTML):
             QMessageBox.warning(self, "Export HTML",
                 f"Image {DOCKER_IMAGE_MKHTML} not found.\n"
                 f"Pull it manually:\n  docker pull {DOCKER_IMAGE_MKHTML}")
@@ -410,13 +1126,110 @@ class PlotTab(QWidget):
             local_dir = ANALYSIS_DIR / "comparison_plots"
 
         cmd = build_mkhtml_command(yoda_docker_paths, out_dir)
-        dlg = MkHtmlDialog(self, client, cmd, local_dir)
+        dlg = MkHtmlDialog(self, container_pool(), cmd, local_dir)
         dlg.exec()
 
 
+def _readout_line(row):
+    """'label: value +- err (ratio)' for the hover readout."""
+    text = f"{row.label}: {row.value:.4g}"
+    if np.isfinite(row.err_up):
+        if np.isclose(row.err_dn, row.err_up):
+            text += f" \u00b1 {row.err_up:.2g}"
+        else:
+            text += f" +{row.err_up:.2g}/-{row.err_dn:.2g}"
+    if np.isfinite(row.ratio):
+        text += f" ({row.ratio:.3f})"
+    return text
+
+
+def _unpad_log(lo, hi):
+    """Data range of a log axis shown with 5% padding (the painter adds it back)."""
+    span = (hi - lo) / 1.1
+    lo += 0.05 * span
+    return 10.0 ** lo, 10.0 ** (lo + span)
+
+
+def _open_output_dir(output_dir):
+    index = output_dir / "index.html"
+    if index.exists():
+        QDesktopServices.openUrl(QUrl.fromLocalFile(str(index)))
+    else:
+        QDesktopServices.openUrl(QUrl.fromLocalFile(str(output_dir)))
+
+
+class HtmlReportDialog(QDialog):
+
+    def __init__(self, parent, worker, output_dir):
+        super().__init__(parent)
+        self.setWindowTitle("HTML report")
+        self.resize(500, 160)
+        self._output_dir = output_dir
+        self._worker = worker
+
+        layout = QVBoxLayout(self)
+        self._label = QLabel(f"Writing {output_dir} ...")
+        layout.addWidget(self._label)
+        self._bar = QProgressBar()
+        layout.addWidget(self._bar)
+
+        btn_row = QHBoxLayout()
+        self._btn_cancel = QPushButton("Cancel")
+        self._btn_cancel.clicked.connect(self._on_cancel)
+        btn_row.addStretch()
+        btn_row.addWidget(self._btn_cancel)
+        self._btn_open = QPushButton("Open result")
+        self._btn_open.setEnabled(False)
+        self._btn_open.clicked.connect(lambda: _open_output_dir(self._output_dir))
+        btn_row.addWidget(self._btn_open)
+        layout.addLayout(btn_row)
+
+        self._failed = []
+        self._worker.progress.connect(self._on_progress)
+        self._worker.failed.connect(self._on_failed)
+        self._worker.finished.connect(self._on_finished)
+        self._worker.error.connect(self._on_error)
+        self._worker.start()
+
+    @Slot(int, int)
+    def _on_progress(self, done, total):
+        self._bar.setMaximum(total)
+        self._bar.setValue(done)
+
+    @Slot(str, str)
+    def _on_failed(self, histo_path, msg):
+        self._failed.append(f"{histo_path}: {msg}")
+
+    @Slot(int, int)
+    def _on_finished(self, rendered, skipped):
+        self._btn_cancel.setEnabled(False)
+        self._btn_open.setEnabled(True)
+        text = f"Done: {rendered} plots rendered, {skipped} unchanged\n{self._output_dir}"
+        if self._failed:
+            text += f"\n{len(self._failed)} failed:\n" + "\n".join(self._failed[:5])
+            if len(self._failed) > 5:
+                text += "\n..."
+        self._label.setText(text)
+
+    @Slot(str)
+    def _on_error(self, msg):
+        self._btn_cancel.setEnabled(False)
+        self._label.setText(f"ERROR: {msg}")
+
+    def _on_cancel(self):
+        self._worker.cancel()
+        self._label.setText("Cancelling...")
+
+    def reject(self):
+        # don't leave the thread running behind a closed dialog
+        self._worker.cancel()
+        self._worker.wait()
+        super().reject()
+
+
 class MkHtmlDialog(QDialog):
 
-    def __init__(self, parent, client, cmd, output_dir):
+    def __init__(self, parent, pool, cmd, output_dir):
         super().__init__(parent)
         self.setWindowTitle("rivet-mkhtml")
         self.resize(600, 400)
@@ -442,11 +1255,10 @@ class MkHtmlDialog(QDialog):
         layout.addLayout(btn_row)
 
         # start the worker
-        volumes = {str(DATA_DIR): {"bind": "/data", "mode": "rw"}}
         self._log.append("--- Running rivet-mkhtml ---")
 
-        self._worker = DockerWorker(client, DOCKER_IMAGE_MKHTML, cmd, volumes=volumes)
-        self._worker.log_line.connect(self._log.append)
+        self._worker = ExecWorker(pool, DOCKER_IMAGE_MKHTML, cmd)
+        self._worker.log_lines.connect(lambda lines: self._log.append("\n".join(line.text for line in lines)))
         self._worker.finished.connect(self._on_finished)
         self._worker.error.connect(self._on_error)
         self._worker.start()
@@ -473,8 +1285,4 @@ class MkHtmlDialog(QDialog):
             self._log.append("--- Cancelled ---")
 
     def _on_open(self):
-        index = self._output_dir / "index.html"
-        if index.exists():
-            QDesktopServices.openUrl(QUrl.fromLocalFile(str(index)))
-        else:
-            QDesktopServices.openUrl(QUrl.fromLocalFile(str(self._output_dir)))
+        _open_output_dir(self._output_dir)
@@ -0,0 +1,152 @@
+import numpy as np
+import pyqtgraph as pg
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QSlider, QPushButton, QCheckBox,
+)
+from PySide6.QtCore import Qt, QTimer, Slot
+
+from hep_gui.config.constants import COLORS
+
+
+class ScanViewer(QDialog):
+    """Slide through the runs of a ScanFamily.
+
+    The curve is one PlotDataItem in step mode; moving the slider only
+    indexes the preloaded (points x bins) array and calls setData once.
+    """
+
+    def __init__(self, parent, family):
+        super().__init__(parent)
+        self.setWindowTitle(f"Parameter scan ({len(family.labels)} runs)")
+        self.resize(900, 600)
+        self._family = family
+        self._values = None   # (points, bins) for the current observable, scan order
+        self._edges = None
+        self._order = np.arange(len(family.labels))
+
+        self._build_ui()
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(16)  # ~display rate
+        self._timer.timeout.connect(self._on_tick)
+
+        self._on_observable_changed()
+
+    def _build_ui(self):
+        layout = QVBoxLayout(self)
+
+        top = QHBoxLayout()
+        self.combo_obs = QComboBox()
+        self.combo_obs.addItems(self._family.paths)
+        top.addWidget(self.combo_obs, stretch=1)
+        top.addWidget(QLabel("Scan:"))
+        self.combo_key = QComboBox()
+        self.combo_key.addItems(self._family.scan_keys)
+        top.addWidget(self.combo_key)
+        self.cb_normalize = QCheckBox("Normalize")
+        self.cb_normalize.setChecked(True)
+        top.addWidget(self.cb_normalize)
+        self.cb_logy = QCheckBox("Log Y")
+        top.addWidget(self.cb_logy)
+        layout.addLayout(top)
+
+        self.plot_widget = pg.PlotWidget()
+        self.plot_widget.setBackground("w")
+        self.plot_widget.showGrid(x=True, y=True, alpha=0.3)
+        color = COLORS[0]
+        # envelope of the whole scan, behind the current curve
+        self._env_lo = pg.PlotDataItem(stepMode="center", pen=pg.mkPen(None))
+        self._env_hi = pg.PlotDataItem(stepMode="center", pen=pg.mkPen(None))
+        self._envelope = pg.FillBetweenItem(self._env_lo, self._env_hi, brush=(0, 0, 0, 25))
+        self.plot_widget.addItem(self._env_lo)
+        self.plot_widget.addItem(self._env_hi)
+        self.plot_widget.addItem(self._envelope)
+        self.curve = pg.PlotDataItem(
+            stepMode="center", pen=pg.mkPen(color["line"], width=1.5),
+            fillLevel=0, brush=color["fill"],
+        )
+        self.plot_widget.addItem(self.curve)
+        layout.addWidget(self.plot_widget, stretch=1)
+
+        bottom = QHBoxLayout()
+        self.btn_play = QPushButton("Play")
+        self.btn_play.setCheckable(True)
+        bottom.addWidget(self.btn_play)
+        self.slider = QSlider(Qt.Horizontal)
+        self.slider.setRange(0, max(len(self._family.labels) - 1, 0))
+        bottom.addWidget(self.slider, stretch=1)
+        self.label_point = QLabel()
+        self.label_point.setMinimumWidth(260)
+        bottom.addWidget(self.label_point)
+        layout.addLayout(bottom)
+
+        self.combo_obs.currentIndexChanged.connect(self._on_observable_changed)
+        self.combo_key.currentIndexChanged.connect(self._on_observable_changed)
+        self.cb_normalize.stateChanged.connect(self._on_observable_changed)
+        self.cb_logy.stateChanged.connect(self._on_observable_changed)
+        self.slider.valueChanged.connect(self.show_point)
+        self.btn_play.toggled.connect(self._on_play_toggled)
+
+    @Slot()
+    def _on_observable_changed(self, *_args):
+        path = self.combo_obs.currentText()
+        if not path:
+            return
+        fam = self._family
+        self._order = fam.order(self.combo_key.currentText())
+        vals = fam.normalized(path) if self.cb_normalize.isChecked() else fam.values[path]
+        self._values = vals[self._order]
+        self._edges = fam.edges[path]
+
+        ylog = self.cb_logy.isChecked()
+        self.plot_widget.setLogMode(x=False, y=ylog)
+        if ylog:
+            positive = self._values[self._values > 0]
+            floor = positive.min() * 0.01 if positive.size else 1e-10
+            self._values = np.where(self._values > 0, self._values, floor)
+
+        self._env_lo.setData(self._edges, self._values.min(axis=0))
+        self._env_hi.setData(self._edges, self._values.max(axis=0))
+        self.curve.setFillLevel(None if ylog else 0)
+        self.plot_widget.setTitle(path.rsplit("/", 1)[-1])
+        self.show_point(self.slider.value())
+
+        # fixed range over the whole scan so the axes don't jump while sliding
+        self.plot_widget.enableAutoRange(False)
+        self.plot_widget.setXRange(self._edges[0], self._edges[-1], padding=0.02)
+        hi = self._values.max()
+        if ylog:
+            lo = self._values.min()
+            self.plot_widget.setYRange(np.log10(lo), np.log10(hi), padding=0.05)
+        else:
+            self.plot_widget.setYRange(0, hi * 1.1 if hi > 0 else 1, padding=0)
+
+    @Slot(int)
+    def show_point(self, i):
+        if self._values is None or not len(self._values):
+            return
+        i = min(max(i, 0), len(self._values) - 1)
+        self.curve.setData(self._edges, self._values[i])
+        run = self._order[i]
+        params = self._family.params[run]
+        shown = ", ".join(f"{k}={params.get(k, float('nan')):g}" for k in self._family.scan_keys[:3])
+        self.label_point.setText(f"{self._family.labels[run]}  ({shown})")
+
+    @Slot(bool)
+    def _on_play_toggled(self, playing):
+        self.btn_play.setText("Pause" if playing else "Play")
+        if playing:
+            self._timer.start()
+        else:
+            self._timer.stop()
+
+    @Slot()
+    def _on_tick(self):
+        nxt = self.slider.value() + 1
+        if nxt > self.slider.maximum():
+            nxt = 0
+        self.slider.setValue(nxt)
+
+    def closeEvent(self, event):
+        self._timer.stop()
+        super().closeEvent(event)
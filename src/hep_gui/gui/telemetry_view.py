@@ -0,0 +1,95 @@
+from collections import deque
+
+from PySide6.QtWidgets import QWidget, QHBoxLayout, QLabel
+from PySide6.QtCore import QPointF, Qt
+from PySide6.QtGui import QColor, QPainter, QPen, QPolygonF
+
+# samples shown by a sparkline: two minutes at one per second
+SPARK_POINTS = 120
+
+_CPU_COLOR = "#1f77b4"
+_MEM_COLOR = "#2ca02c"
+
+
+def format_bytes(n):
+    if n < 1024:
+        return f"{n:.0f} B"
+    for unit in ("KB", "MB"):
+        n /= 1024
+        if n < 1024:
+            return f"{n:.1f} {unit}"
+    return f"{n / 1024:.1f} GB"
+
+
+class Sparkline(QWidget):
+    """Last SPARK_POINTS values as a line, scaled to at least floor."""
+
+    def __init__(self, color, floor=0.0, parent=None):
+        super().__init__(parent)
+        self._pen = QPen(QColor(color), 1.2)
+        self._floor = floor
+        self._values = deque(maxlen=SPARK_POINTS)
+        self.setFixedSize(SPARK_POINTS, 22)
+
+    def append(self, value):
+        self._values.append(value)
+        self.update()
+
+    def clear(self):
+        self._values.clear()
+        self.update()
+
+    def paintEvent(self, event):
+        if len(self._values) < 2:
+            return
+        w, h = self.width(), self.height() - 2
+        top = max(max(self._values), self._floor) or 1.0
+        step = w / (SPARK_POINTS - 1)
+        x0 = w - step * (len(self._values) - 1)
+        poly = QPolygonF([QPointF(x0 + i * step, 1 + h * (1 - v / top)) for i, v in enumerate(self._values)])
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(self._pen)
+        painter.drawPolyline(poly)
+        painter.end()
+
+
+class TelemetryView(QWidget):
+    """CPU and memory sparklines of one running job, with its I/O and network totals."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.label_job = QLabel()
+        self.spark_cpu = Sparkline(_CPU_COLOR, floor=100.0)
+        self.label_cpu = QLabel()
+        self.spark_mem = Sparkline(_MEM_COLOR)
+        self.label_mem = QLabel()
+        self.label_io = QLabel()
+        for label in (self.label_cpu, self.label_mem):
+            label.setMinimumWidth(70)
+
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        for w in (self.label_job, self.spark_cpu, self.label_cpu,
+                  self.spark_mem, self.label_mem, self.label_io):
+            layout.addWidget(w, 0, Qt.AlignVCenter)
+        self.setVisible(False)
+
+    def show_job(self, name, samples=()):
+        """Follow another job, starting from the samples it already has."""
+        self.label_job.setText(name)
+        self.spark_cpu.clear()
+        self.spark_mem.clear()
+        self.label_cpu.clear()
+        self.label_mem.clear()
+        self.label_io.clear()
+        for sample in list(samples)[-SPARK_POINTS:]:
+            self.add_sample(sample)
+
+    def add_sample(self, sample):
+        self.spark_cpu.append(sample.cpu)
+        self.spark_mem.append(sample.rss)
+        self.label_cpu.setText(f"CPU {sample.cpu:.0f}%")
+        self.label_mem.setText(format_bytes(sample.rss))
+        self.label_io.setText(f"disk {format_bytes(sample.blk)}  net {format_bytes(sample.net)}")
+        self.setVisible(True)
@@ -1,3 +1,4 @@
+import multiprocessing
 import sys
 from pathlib import Path
 
@@ -20,4 +21,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # plot export workers are spawned processes; needed in the frozen app
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,83 @@
+import numpy as np
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+# (header, Comparison attribute, numeric)
+COLUMNS = [
+    ("Observable", "path", False),
+    ("Dataset A", "label_a", False),
+    ("Dataset B", "label_b", False),
+    ("chi2/ndf", "chi2_ndf", True),
+    ("KS", "ks", True),
+    ("max pull", "max_pull", True),
+    ("ndf", "ndf", True),
+]
+
+
+class ComparisonTableModel(QAbstractTableModel):
+    """Read-only table over a list of Comparison, sortable by any column.
+
+    Sorting permutes an index array instead of the rows, so 10k+ rows
+    re-sort instantly.
+    """
+
+    def __init__(self, comparisons=None, parent=None):
+        super().__init__(parent)
+        self._rows = []
+        self._order = np.arange(0)
+        self._columns = {}
+        self.set_comparisons(comparisons or [])
+
+    def set_comparisons(self, comparisons):
+        self.beginResetModel()
+        self._rows = list(comparisons)
+        self._order = np.arange(len(self._rows))
+        self._columns = {}
+        for _, attr, numeric in COLUMNS:
+            values = [getattr(r, attr) for r in self._rows]
+            self._columns[attr] = np.array(values, dtype=float if numeric else object)
+        self.endResetModel()
+
+    def comparison(self, row):
+        return self._rows[self._order[row]]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return COLUMNS[section][0]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        _, attr, numeric = COLUMNS[index.column()]
+        value = getattr(self.comparison(index.row()), attr)
+        if role == Qt.DisplayRole:
+            if numeric and isinstance(value, float):
+                return "nan" if np.isnan(value) else f"{value:.3g}"
+            return str(value)
+        if role == Qt.TextAlignmentRole and numeric:
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        return None
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        _, attr, numeric = COLUMNS[column]
+        col = self._columns[attr]
+        self.layoutAboutToBeChanged.emit()
+        if numeric:
+            # NaN always last
+            keys = np.where(np.isnan(col), np.inf, col)
+            if order == Qt.DescendingOrder:
+                keys = np.where(np.isnan(col), np.inf, -col)
+            self._order = np.argsort(keys, kind="stable")
+        else:
+            self._order = np.array(
+                sorted(range(len(col)), key=col.__getitem__,
+                       reverse=order == Qt.DescendingOrder),
+                dtype=int,
+            )
+        self.layoutChanged.emit()
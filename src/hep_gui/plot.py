@@ -0,0 +1,88 @@
+"""Render every observable of a set of YODA files without the GUI.
+
+    python -m hep_gui.plot run_a.yoda run_b.yoda -o plots/ --format svg -j 8
+
+Same figures as the Plot tab (datasets overlaid, normalized unless
+--no-normalize, ratio to the first file or --ref-label below), one file
+per observable, rendered on the offscreen Qt platform across worker
+processes.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from hep_gui.config.constants import CACHE_DIR
+from hep_gui.core.headless import FORMATS, load_datasets, observable_paths, render_all
+from hep_gui.core.ref_index import open_ref_index
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="python -m hep_gui.plot",
+        description="Render every observable of YODA files to PNG/SVG/PDF.",
+    )
+    parser.add_argument("yoda", nargs="+", type=Path, help=".yoda files, overlaid in this order")
+    parser.add_argument("-o", "--output", type=Path, default=Path("plots"),
+                        help="output directory (default: ./plots)")
+    parser.add_argument("-f", "--format", choices=FORMATS, default="png")
+    parser.add_argument("--filter", default="", help="only paths containing this text")
+    parser.add_argument("--no-normalize", action="store_true", help="plot raw values, not unit area")
+    parser.add_argument("--logx", action="store_true", help="force log x axis")
+    parser.add_argument("--logy", action="store_true", help="force log y axis")
+    parser.add_argument("--rebin", type=int, default=1, metavar="N", help="merge N adjacent bins")
+    parser.add_argument("--ref-label", default=None,
+                        help="dataset used as ratio denominator (file stem, default: first)")
+    parser.add_argument("--no-ratio", action="store_true",
+                        help="no ratio panel under the plot (drawn with two or more files)")
+    parser.add_argument("--ref-dir", type=Path, default=None,
+                        help="directory of Rivet reference .yoda files to overlay as data")
+    parser.add_argument("--cache-dir", type=Path, default=CACHE_DIR,
+                        help="where the reference index is kept (default: data/.cache)")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="worker processes (default: one per CPU)")
+    parser.add_argument("-q", "--quiet", action="store_true", help="no progress output")
+    return parser, parser.parse_args(argv)
+
+
+def main(argv=None):
+    parser, args = _parse_args(argv)
+    missing = [str(p) for p in args.yoda if not p.is_file()]
+    if missing:
+        parser.error("file not found: " + ", ".join(missing))
+
+    t0 = time.perf_counter()
+    datasets = load_datasets(args.yoda)
+    if args.ref_label is not None and args.ref_label not in datasets:
+        parser.error(f"--ref-label {args.ref_label!r} is not one of: {', '.join(datasets)}")
+    references = None
+    if args.ref_dir is not None:
+        references = open_ref_index(args.ref_dir, args.cache_dir)
+
+    paths = observable_paths(datasets, args.filter)
+    if not paths:
+        print("no plottable observables found", file=sys.stderr)
+        return 1
+
+    def progress(done, total):
+        print(f"\r{done}/{total}", end="", flush=True)
+
+    written, errors = render_all(
+        datasets, args.output, args.format, paths, jobs=args.jobs,
+        progress=None if args.quiet else progress,
+        normalize=not args.no_normalize, logx=args.logx, logy=args.logy,
+        ref_label=args.ref_label, ratio=not args.no_ratio,
+        rebin=args.rebin if args.rebin > 1 else None, references=references,
+    )
+    if not args.quiet:
+        print()
+    for histo_path, msg in errors:
+        print(f"{histo_path}: {msg}", file=sys.stderr)
+    print(f"{written} plots written to {args.output} in {time.perf_counter() - t0:.1f}s"
+          + (f", {len(errors)} failed" if errors else ""))
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
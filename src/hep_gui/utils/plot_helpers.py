@@ -1,22 +1,30 @@
+from types import SimpleNamespace
+
 import numpy as np
 
 from hep_gui.config.constants import AXIS_LABELS
+from hep_gui.utils.ratios import ratio_range
+
+# exported figures: size and margins around the data area (px)
+FIGURE_SIZE = (800, 600)
+FIGURE_MARGINS = (80, 20, 40, 55)  # left, right, top, bottom
+# ratio panel under the plot: share of the data height (PlotTab stacks the
+# two widgets 3:1) and gap above it (px)
+RATIO_SHARE = 0.25
+RATIO_GAP = 8
 
 
 def build_step_coords(edges, values):
     """Build step-function x,y arrays for histogram rendering."""
+    edges = np.asarray(edges, dtype=float)
     n = len(values)
     x = np.empty(2 * n + 2)
-    y = np.empty(2 * n + 2)
+    y = np.zeros(2 * n + 2)
     x[0] = edges[0]
-    y[0] = 0
-    for i in range(n):
-        x[1 + 2 * i] = edges[i]
-        x[2 + 2 * i] = edges[i + 1]
-        y[1 + 2 * i] = values[i]
-        y[2 + 2 * i] = values[i]
+    x[1:-1:2] = edges[:-1]
+    x[2:-1:2] = edges[1:]
     x[-1] = edges[-1]
-    y[-1] = 0
+    y[1:-1] = np.repeat(values, 2)
     return x, y
 
 
@@ -74,3 +82,109 @@ def get_axis_labels(path):
     # fallback: last path component as xlabel
     parts = path.rstrip("/").split("/")
     return parts[-1] if parts else path, ""
+
+
+def nice_ticks(lo, hi, target=6):
+    """Round-number tick positions covering [lo, hi] for a linear axis."""
+    if not np.isfinite(lo) or not np.isfinite(hi) or hi <= lo:
+        return np.array([lo])
+    raw = (hi - lo) / max(target, 1)
+    mag = 10 ** np.floor(np.log10(raw))
+    for mult in (1, 2, 2.5, 5, 10):
+        step = mult * mag
+        if step >= raw:
+            break
+    first = np.ceil(lo / step) * step
+    ticks = np.arange(first, hi + step * 1e-9, step)
+    # kill -0.0 and float noise around zero
+    ticks[np.abs(ticks) < step * 1e-9] = 0.0
+    return ticks
+
+
+def log_ticks(lo, hi):
+    """Decade tick positions (as exponents) covering [lo, hi] for a log axis."""
+    if lo <= 0 or hi <= lo:
+        return np.array([0.0])
+    k0 = int(np.ceil(np.log10(lo) - 1e-9))
+    k1 = int(np.floor(np.log10(hi) + 1e-9))
+    if k1 < k0:
+        return np.array([float(np.floor(np.log10(lo)))])
+    step = max(1, (k1 - k0) // 8 + 1)
+    return np.arange(k0, k1 + 1, step, dtype=float)
+
+
+def format_tick(value, log=False):
+    """Tick label text. For log axes, value is the decade exponent."""
+    if log:
+        k = int(round(value))
+        if 0 <= k <= 3:
+            return str(10 ** k)
+        return f"1e{k}"
+    return f"{value:g}"
+
+
+class FigureAxes:
+    """Data -> pixel mapping of a PlotFigure drawn in the given data area."""
+
+    def __init__(self, fig, left, top, width, height):
+        self.left, self.top, self.width, self.height = left, top, width, height
+        self.right, self.bottom = left + width, top + height
+        self.xlog = fig.xlog
+        self.ylog = fig.ylog
+        x0, x1, y0, y1 = fig.view
+        self.x0, self.x1 = self._t(x0, self.xlog), self._t(x1, self.xlog)
+        self.y0, self.y1 = self._t(y0, self.ylog), self._t(y1, self.ylog)
+        if self.xlog:
+            # same 5% padding PlotTab passes to setXRange in log mode
+            pad = (self.x1 - self.x0) * 0.05
+            self.x0, self.x1 = self.x0 - pad, self.x1 + pad
+        if self.ylog:
+            pad = (self.y1 - self.y0) * 0.05
+            self.y0, self.y1 = self.y0 - pad, self.y1 + pad
+        if self.x1 <= self.x0:
+            self.x1 = self.x0 + 1
+        if self.y1 <= self.y0:
+            self.y1 = self.y0 + 1
+
+    @staticmethod
+    def _t(v, log):
+        if log:
+            return np.log10(np.maximum(v, 1e-30))
+        return np.asarray(v, dtype=float)
+
+    def px(self, x, y):
+        tx = (self._t(x, self.xlog) - self.x0) / (self.x1 - self.x0)
+        ty = (self._t(y, self.ylog) - self.y0) / (self.y1 - self.y0)
+        return self.left + tx * self.width, self.bottom - ty * self.height
+
+    def ticks(self):
+        """(x, y) tick lists of (label value, data position)."""
+        out = []
+        for log, lo, hi in ((self.xlog, self.x0, self.x1), (self.ylog, self.y0, self.y1)):
+            if log:
+                ticks = log_ticks(10 ** lo, 10 ** hi)
+                out.append([(t, 10 ** t) for t in ticks])
+            else:
+                out.append([(t, t) for t in nice_ticks(lo, hi)])
+        return out
+
+
+def data_areas(fig, width, height):
+    """(main, ratio) data areas of fig on a width x height figure, each
+    (left, top, width, height); ratio is None when fig has no ratio panel."""
+    left, right, top, bottom = FIGURE_MARGINS
+    w, h = width - left - right, height - top - bottom
+    if fig is None or fig.ratio is None:
+        return (left, top, w, h), None
+    h_ratio = (h - RATIO_GAP) * RATIO_SHARE
+    h_main = h - RATIO_GAP - h_ratio
+    return (left, top, w, h_main), (left, top + h_main + RATIO_GAP, w, h_ratio)
+
+
+def ratio_axes(fig, left, top, width, height):
+    """FigureAxes of fig's ratio panel: the x range of the plot, linear y
+    over ratio_range() like the PlotTab panel."""
+    r = fig.ratio
+    y_lo, y_hi = ratio_range(r.values, r.err_dn, r.err_up)
+    view = (fig.view[0], fig.view[1], y_lo, y_hi)
+    return FigureAxes(SimpleNamespace(xlog=fig.xlog, ylog=False, view=view), left, top, width, height)
@@ -0,0 +1,44 @@
+import numpy as np
+
+
+def compute_ratios(vals, err_dn, err_up, ref_index):
+    """Divide every row of vals (datasets x bins) by row ref_index.
+
+    Errors are propagated assuming uncorrelated datasets:
+    dr = r * sqrt((e / v)^2 + (e_ref / v_ref)^2). The reference row itself
+    gets only its own relative error (the usual band around 1).
+    Bins where the reference is <= 0 are NaN. Returns (ratio, err_dn, err_up).
+    """
+    vals = np.asarray(vals, dtype=float)
+    err_dn = np.zeros_like(vals) if err_dn is None else np.asarray(err_dn, dtype=float)
+    err_up = np.zeros_like(vals) if err_up is None else np.asarray(err_up, dtype=float)
+
+    ref = vals[ref_index]
+    valid = ref > 0
+    safe_ref = np.where(valid, ref, 1.0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.where(valid, vals / safe_ref, np.nan)
+        rel_ref_dn = np.where(valid, err_dn[ref_index] / safe_ref, np.nan)
+        rel_ref_up = np.where(valid, err_up[ref_index] / safe_ref, np.nan)
+        safe_vals = np.where(vals != 0, vals, 1.0)
+        rel_dn = np.where(vals != 0, err_dn / np.abs(safe_vals), 0.0)
+        rel_up = np.where(vals != 0, err_up / np.abs(safe_vals), 0.0)
+
+    r_dn = np.abs(ratio) * np.hypot(rel_dn, rel_ref_dn)
+    r_up = np.abs(ratio) * np.hypot(rel_up, rel_ref_up)
+    r_dn[ref_index] = rel_ref_dn
+    r_up[ref_index] = rel_ref_up
+    return ratio, r_dn, r_up
+
+
+def ratio_range(ratio, err_dn, err_up, lo=0.0, hi=3.0):
+    """y limits for the ratio panel, symmetric around 1 and clamped to [lo, hi]."""
+    finite = np.isfinite(ratio)
+    if not finite.any():
+        return 0.5, 1.5
+    spread = np.nanmax(np.abs(np.concatenate([
+        (ratio + err_up)[finite] - 1.0, (ratio - err_dn)[finite] - 1.0,
+    ])))
+    spread = min(max(spread * 1.1, 0.1), 2.0)
+    return max(lo, 1.0 - spread), min(hi, 1.0 + spread)
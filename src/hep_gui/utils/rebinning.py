@@ -0,0 +1,79 @@
+import numpy as np
+
+
+def merge_starts(n_bins, n):
+    """Start index of each merged bin when grouping n adjacent bins.
+
+    A last partial group is kept as a narrower bin.
+    """
+    return np.arange(0, n_bins, max(int(n), 1))
+
+
+def edges_starts(edges, new_edges, rtol=1e-6):
+    """Map new_edges onto existing edges.
+
+    Returns (starts, stop): new bin k covers old bins starts[k] .. starts[k+1]-1,
+    the last one ends at stop. Raises ValueError if an edge is not an
+    existing bin boundary.
+    """
+    edges = np.asarray(edges, dtype=float)
+    new_edges = np.unique(np.asarray(new_edges, dtype=float))
+    if len(new_edges) < 2:
+        raise ValueError("need at least two edges")
+    idx = np.searchsorted(edges, new_edges)
+    idx = np.clip(idx, 0, len(edges) - 1)
+    # allow the neighbour below to match too (float noise)
+    below = np.clip(idx - 1, 0, len(edges) - 1)
+    tol = rtol * max(np.ptp(edges), 1e-30)
+    use_below = np.abs(edges[below] - new_edges) < np.abs(edges[idx] - new_edges)
+    idx = np.where(use_below, below, idx)
+    bad = np.abs(edges[idx] - new_edges) > tol
+    if bad.any():
+        raise ValueError(f"{new_edges[bad][0]:g} is not a bin edge")
+    return idx[:-1], idx[-1]
+
+
+def rebin(edges, vals, err_dn, err_up, starts, stop=None, density=True):
+    """Merge bins of one or many histograms sharing the same edges.
+
+    vals / err_dn / err_up: (bins,) or (datasets, bins); errors may be None.
+    starts / stop: from merge_starts() or edges_starts().
+    density=True for estimates (values per unit x): merged value is the
+    width-weighted mean, err^2 = sum((e * w)^2) / W^2.
+    density=False for sum-of-weights histos: values add, errors in quadrature.
+    Returns (new_edges, vals, err_dn, err_up).
+    """
+    edges = np.asarray(edges, dtype=float)
+    vals = np.asarray(vals, dtype=float)
+    starts = np.asarray(starts)
+    if stop is None:
+        stop = len(edges) - 1
+    # reduceat sums up to the end of the array, so cut it at stop first
+    vals = vals[..., :stop]
+    widths = np.diff(edges)[:stop]
+    new_edges = np.append(edges[starts], edges[stop])
+    new_widths = np.diff(new_edges)
+
+    def _sum(a):
+        return np.add.reduceat(a, starts, axis=-1)
+
+    if density:
+        new_vals = _sum(vals * widths) / new_widths
+    else:
+        new_vals = _sum(vals)
+
+    def _err(e):
+        if e is None:
+            return None
+        e = np.asarray(e, dtype=float)[..., :stop]
+        if density:
+            return np.sqrt(_sum((e * widths) ** 2)) / new_widths
+        return np.sqrt(_sum(e * e))
+
+    return new_edges, new_vals, _err(err_dn), _err(err_up)
+
+
+def parse_edges_text(text):
+    """'0, 10, 20 50' -> [0.0, 10.0, 20.0, 50.0]. Raises ValueError."""
+    parts = text.replace(",", " ").split()
+    return [float(p) for p in parts]